@@ -14,6 +14,7 @@ import os
 import argparse
 import logging
 from pathlib import Path
+from typing import Optional
 
 # Add src to Python path
 src_path = Path(__file__).parent / "src"
@@ -31,6 +32,25 @@ def setup_logging(level: str = "INFO") -> None:
     )
 
 
+def forward_to_daemon(args) -> Optional[int]:
+    """
+    Run a headless command in a running CLI daemon (run.py daemon).
+    
+    Returns:
+        Exit code, or None if no daemon is listening
+    """
+    from headless.cli.daemon import forward_command
+    
+    if args.command == 'dump-ui':
+        params = {'output': os.path.abspath(args.output) if args.output else None, 'format': args.format}
+        return forward_command('dump_ui', params)
+    elif args.command == 'load-ui':
+        return forward_command('load_ui', {'input_path': os.path.abspath(args.input)})
+    elif args.command == 'validate-ui':
+        return forward_command('validate_ui', {'input_path': os.path.abspath(args.input)})
+    return None
+
+
 def main():
     """Main entry point for CellSorter application."""
     parser = argparse.ArgumentParser(description='CellSorter - Cell Analysis Platform')
@@ -52,6 +72,8 @@ def main():
     parser.add_argument('--log-level', default='INFO',
                        choices=['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'],
                        help='Set logging level')
+    parser.add_argument('--profile-startup', action='store_true',
+                       help='Print an import-time breakdown once the GUI is shown')
     
     # Headless-specific commands
     subparsers = parser.add_subparsers(dest='command', help='Headless commands')
@@ -70,8 +92,19 @@ def main():
     validate_parser = subparsers.add_parser('validate-ui', help='Validate UI definition')
     validate_parser.add_argument('input', help='Input file path')
     
+    # Daemon command
+    daemon_parser = subparsers.add_parser('daemon', help='Serve headless commands from a persistent process; '
+                                                         'later commands are forwarded to it')
+    daemon_parser.add_argument('--socket', help='Unix socket path (default: $CELLSORTER_DAEMON_SOCKET or a temp path)')
+    daemon_parser.add_argument('--stdio', action='store_true', help='Serve JSON-RPC on stdin/stdout')
+    
     args = parser.parse_args()
     
+    profiler = None
+    if args.profile_startup:
+        from utils.startup_profiler import StartupProfiler
+        profiler = StartupProfiler().install()
+    
     # Setup logging
     setup_logging(args.log_level)
     logger = logging.getLogger(__name__)
@@ -96,7 +129,26 @@ def main():
         sys.exit(1)
     
     # Handle headless commands
+    if args.command == 'daemon':
+        from headless.cli.daemon import main as daemon_main
+        daemon_args = ['--stdio'] if args.stdio else []
+        if args.socket:
+            daemon_args += ['--socket', args.socket]
+        sys.exit(daemon_main(daemon_args))
+    
     if args.command and requires_headless():
+        exit_code = None
+        if not is_dual_mode():
+            from headless.cli.daemon import DaemonError
+            try:
+                exit_code = forward_to_daemon(args)
+            except DaemonError as e:
+                print(f"Error: {e}", file=sys.stderr)
+                sys.exit(1)
+        
+        if exit_code is not None:
+            sys.exit(exit_code)
+        
         from headless.cli.cli_commands import HeadlessCLI
         cli = HeadlessCLI()
         
@@ -115,7 +167,10 @@ def main():
     if requires_gui():
         try:
             from PySide6.QtWidgets import QApplication
+            from PySide6.QtCore import QTimer
             from pages.main_window import MainWindow
+            if profiler:
+                profiler.mark("MainWindow imported")
             
             logger.info("Initializing GUI...")
             app = QApplication(sys.argv)
@@ -147,6 +202,16 @@ def main():
             
             window.show()
             
+            if profiler:
+                def report_startup():
+                    # Runs after the first event loop pass, including deferred widgets
+                    profiler.mark("Event loop started")
+                    profiler.uninstall()
+                    print(profiler.report(), file=sys.stderr)
+                
+                profiler.mark("MainWindow shown")
+                QTimer.singleShot(0, report_startup)
+            
             logger.info("Starting GUI event loop...")
             sys.exit(app.exec())
             
@@ -4,43 +4,40 @@ Components Module
 Modern UI components following shadcn/ui design patterns.
 """
 
-from .base.base_button import BaseButton, ButtonVariant, ButtonSize
-from .base.base_card import BaseCard
-from .base.base_input import BaseInput, InputState
-from .base.base_select import BaseSelect, SelectState
-from .base.base_textarea import BaseTextarea, TextareaState
+from utils.lazy_import import lazy_getattr, exports_by_module
 
-# Import Button alias from design_system for convenience
-from .design_system import Button
-
-from .tooltip_wrapper import (
-    TruncatedTextLabel, 
-    TooltipWrapper, 
-    TooltipPosition,
-    create_truncated_label,
-    wrap_with_tooltip
-)
-
-from .skeleton_loader import (
-    BaseSkeleton,
-    SkeletonAnimation,
-    SkeletonShape,
-    create_skeleton_text,
-    create_skeleton_card,
-    create_skeleton_table,
-    create_skeleton_list
-)
-
-from .scientific_widgets import (
-    ScatterPlotWidget,
-    ImageViewerWidget,
-    WellPlateWidget
-)
+# Components are imported on first access. Importing e.g.
+# components.dialogs.export_dialog runs this module first, and must not
+# load every base component and matplotlib with it.
+__getattr__ = lazy_getattr(__name__, globals(), exports_by_module({
+    '.base.base_button': ['BaseButton', 'ButtonVariant', 'ButtonSize'],
+    '.base.base_card': ['BaseCard'],
+    '.base.base_input': ['BaseInput', 'InputState'],
+    '.base.base_select': ['BaseSelect', 'SelectState'],
+    '.base.base_textarea': ['BaseTextarea', 'TextareaState'],
+    # Button alias from design_system for convenience
+    '.design_system': ['Button', 'DesignTokens'],
+    '.tooltip_wrapper': [
+        'TruncatedTextLabel',
+        'TooltipWrapper',
+        'TooltipPosition',
+        'create_truncated_label',
+        'wrap_with_tooltip',
+    ],
+    '.skeleton_loader': [
+        'BaseSkeleton',
+        'SkeletonAnimation',
+        'SkeletonShape',
+        'create_skeleton_text',
+        'create_skeleton_card',
+        'create_skeleton_table',
+        'create_skeleton_list',
+    ],
+    '.scientific_widgets': ['ScatterPlotWidget', 'ImageViewerWidget', 'WellPlateWidget'],
+}))
 
 # Widget imports temporarily removed - will be added when widgets are implemented
 
-from .design_system import DesignTokens
-
 __all__ = [
     # Base components
     'BaseButton',
@@ -9,9 +9,10 @@ from typing import Optional, Dict, Any, List
 from pathlib import Path
 import csv
 import json
+import threading
 from datetime import datetime
 import numpy as np
-from PIL import Image, ImageDraw
+from PIL import Image
 
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QLabel, QPushButton,
@@ -21,6 +22,15 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, QThread, Signal
 from PySide6.QtGui import QFont, QPixmap
 
+from models.extractor import Extractor
+from models.coordinate_transformer import CoordinateTransformer
+from models.overlay_renderer import PREVIEW_SCALES, overlay_layer, render_overlay
+from utils.exceptions import ExportError
+
+
+# Opacity of the selection fill drawn under each cell outline
+OVERLAY_FILL_ALPHA = 128 / 255
+
 
 class ExportWorker(QThread):
     """Worker thread for export operations."""
@@ -34,6 +44,7 @@ class ExportWorker(QThread):
         self.export_options = export_options
         self.session_data = session_data or {}
         self.is_cancelled = False
+        self.cancel_event = threading.Event()
         self.output_directory = export_options.get('output_directory', Path.cwd())
         
         # Ensure output directory exists
@@ -121,67 +132,51 @@ class ExportWorker(QThread):
     def _export_image(self) -> None:
         """Export image with overlays."""
         try:
-            # Get image path and selection data
-            image_file = self.session_data.get('data', {}).get('image_file')
-            selections = self.session_data.get('data', {}).get('selections', [])
+            data = self.session_data.get('data', {})
+            image_file = data.get('image_file')
+            selections = data.get('selections', [])
+            bounding_boxes = data.get('bounding_boxes', [])
             
             if not image_file or not Path(image_file).exists():
                 self.status_updated.emit("Skipping image export: No image loaded")
                 return
             
-            # Load original image
-            original_image = Image.open(image_file)
-            if original_image.mode != 'RGB':
-                original_image = original_image.convert('RGB')
-            
-            # Create overlay
-            overlay = Image.new('RGBA', original_image.size, (0, 0, 0, 0))
-            draw = ImageDraw.Draw(overlay)
-            
-            # Draw selection overlays
-            for selection in selections:
-                color = selection.get('color', '#FF0000')
-                # Convert hex color to RGB
-                if color.startswith('#'):
-                    color = tuple(int(color[i:i+2], 16) for i in (1, 3, 5))
-                else:
-                    color = (255, 0, 0)  # Default red
-                
-                # Add alpha for transparency
-                overlay_color = color + (128,)  # 50% transparency
-                
-                # Draw bounding boxes for selected cells
-                cell_indices = selection.get('cell_indices', [])
-                for cell_index in cell_indices:
-                    # Note: In a real implementation, you would get actual bounding box coordinates
-                    # For now, we'll draw placeholder rectangles
-                    x, y = (cell_index * 50) % original_image.width, (cell_index * 30) % original_image.height
-                    draw.rectangle([x, y, x+20, y+20], fill=overlay_color, outline=color + (255,), width=1)
+            if not bounding_boxes:
+                self.status_updated.emit("Skipping image export: No cell bounding boxes")
+                return
             
-            # Composite original image with overlay
-            if original_image.mode != 'RGBA':
-                original_image = original_image.convert('RGBA')
+            # Load original image; grayscale stays single channel until rendered
+            with Image.open(image_file) as original_image:
+                if original_image.mode not in ('L', 'RGB'):
+                    original_image = original_image.convert('RGB')
+                image_data = np.asarray(original_image)
             
-            composite = Image.alpha_composite(original_image, overlay)
+            # One translucent layer per selection, drawn in selection order
+            boxes = np.asarray(bounding_boxes, dtype=np.int64).reshape(-1, 4)
+            layers = [
+                overlay_layer(boxes, selection.get('cell_indices', []),
+                              selection.get('color', '#FF0000'), fill_alpha=OVERLAY_FILL_ALPHA)
+                for selection in selections
+            ]
             
-            # Save image
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             image_format = self.export_options.get('image_format', 'PNG').lower()
+            if image_format not in ('png', 'jpeg', 'tiff'):
+                image_format = 'png'  # No vector output; fall back to PNG
             image_filename = f"cellsorter_image_{timestamp}.{image_format}"
             image_path = Path(self.output_directory) / image_filename
             
-            if image_format == 'png':
-                composite.save(image_path, 'PNG', optimize=True)
-            elif image_format == 'jpeg':
-                rgb_image = composite.convert('RGB')
-                quality = self.export_options.get('image_quality', 95)
-                rgb_image.save(image_path, 'JPEG', quality=quality, optimize=True)
-            elif image_format == 'tiff':
-                composite.save(image_path, 'TIFF')
-            else:
-                composite.save(image_path, 'PNG')
+            def report(done: int, total: int) -> None:
+                self.progress_updated.emit(40 + int(done / total * 30))
             
-            self.status_updated.emit(f"Image exported: {image_filename}")
+            written = render_overlay(
+                image_data, layers, image_path, image_format,
+                downsample=self.export_options.get('image_downsample', 1),
+                quality=self.export_options.get('image_quality', 95),
+                progress_callback=report, cancel_event=self.cancel_event
+            )
+            if written is not None:
+                self.status_updated.emit(f"Image exported: {image_filename}")
             
         except Exception as e:
             raise Exception(f"Image export failed: {str(e)}")
@@ -194,85 +189,46 @@ class ExportWorker(QThread):
             selections = data.get('selections', [])
             calibration = data.get('calibration', {})
             image_file = data.get('image_file')
+            bounding_boxes = data.get('bounding_boxes', [])
             
             if not selections:
                 self.status_updated.emit("Skipping protocol export: No selections")
                 return
             
-            # Create protocol content
-            protocol_lines = []
+            if not bounding_boxes:
+                self.status_updated.emit("Skipping protocol export: No cell bounding boxes")
+                return
             
-            # IMAGE section
-            protocol_lines.append("[IMAGE]")
+            # Image metadata; only the header is read
+            image_info = {'file_path': image_file or '', 'filename': 'unknown',
+                          'width': 2048, 'height': 2048}
+            image_bounds = None
             if image_file:
-                image_path = Path(image_file)
-                protocol_lines.append(f"FILE = \"{image_path.stem}\"")
-                
-                # Try to get image dimensions
                 try:
                     with Image.open(image_file) as img:
-                        protocol_lines.append(f"WIDTH = {img.width}")
-                        protocol_lines.append(f"HEIGHT = {img.height}")
-                        protocol_lines.append(f"FORMAT = \"{img.format}\"")
-                except:
-                    protocol_lines.append("WIDTH = 2048")
-                    protocol_lines.append("HEIGHT = 2048")
-                    protocol_lines.append("FORMAT = \"TIFF\"")
-            else:
-                protocol_lines.append("FILE = \"unknown\"")
-                protocol_lines.append("WIDTH = 2048")
-                protocol_lines.append("HEIGHT = 2048")
-                protocol_lines.append("FORMAT = \"TIFF\"")
+                        image_bounds = (img.width, img.height)
+                    image_info['width'], image_info['height'] = image_bounds
+                except Exception:
+                    pass
+            
+            # Stage coordinates when calibration is available, pixels otherwise
+            transformer = None
+            if calibration.get('calibration_points'):
+                transformer = CoordinateTransformer()
+                if not transformer.import_calibration(calibration) or not transformer.is_calibrated():
+                    transformer = None
             
-            protocol_lines.append("")
-            
-            # IMAGING_LAYOUT section
-            protocol_lines.append("[IMAGING_LAYOUT]")
-            protocol_lines.append("PositionOnly = 1")
-            protocol_lines.append("AfterBefore = \"01\"")
-            protocol_lines.append(f"Points = {len(selections)}")
-            
-            # Add selection points
-            for i, selection in enumerate(selections, 1):
-                cell_indices = selection.get('cell_indices', [])
-                if not cell_indices:
-                    continue
-                
-                # Calculate average position (simplified for demo)
-                avg_x = sum(cell_indices) * 10 % 1000  # Simplified coordinate calculation
-                avg_y = sum(cell_indices) * 15 % 1000
-                
-                # Create crop region
-                crop_size = 50  # Default crop size
-                min_x = max(0, avg_x - crop_size // 2)
-                min_y = max(0, avg_y - crop_size // 2)
-                max_x = min_x + crop_size
-                max_y = min_y + crop_size
-                
-                # Apply coordinate transformation if available
-                if calibration.get('is_calibrated', False):
-                    # Apply transformation matrix (simplified)
-                    transform_matrix = calibration.get('transformation_matrix')
-                    if transform_matrix:
-                        # Apply transformation (simplified)
-                        min_x *= 0.1  # Convert to micrometers (example scaling)
-                        min_y *= 0.1
-                        max_x *= 0.1
-                        max_y *= 0.1
-                
-                color = selection.get('color', '#FF0000').replace('#', '').lower()
-                well_position = selection.get('well_position', f"A{i:02d}")
-                
-                point_line = f"P_{i} = \"{min_x:.4f}; {min_y:.4f}; {max_x:.4f}; {max_y:.4f};{color};{well_position};\""
-                protocol_lines.append(point_line)
-            
-            # Write protocol file
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             protocol_filename = f"cellsorter_protocol_{timestamp}.cxprotocol"
             protocol_path = Path(self.output_directory) / protocol_filename
             
-            with open(protocol_path, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(protocol_lines))
+            success = Extractor().export_protocol(
+                selections, bounding_boxes, transformer, str(protocol_path), image_info,
+                image_bounds=image_bounds,
+                backup=self.export_options.get('include_backup', True)
+            )
+            if not success:
+                raise ExportError("no extraction points could be written")
             
             self.status_updated.emit(f"Protocol exported: {protocol_filename}")
             
@@ -282,6 +238,7 @@ class ExportWorker(QThread):
     def cancel(self) -> None:
         """Cancel export operation."""
         self.is_cancelled = True
+        self.cancel_event.set()
 
 
 class ExportDialog(QDialog):
@@ -425,6 +382,11 @@ class ExportDialog(QDialog):
         self.image_quality_spinbox.setSuffix("%")
         image_format_layout.addRow("Quality:", self.image_quality_spinbox)
         
+        self.image_scale_combo = QComboBox()
+        for factor, name in PREVIEW_SCALES.items():
+            self.image_scale_combo.addItem(name, factor)
+        image_format_layout.addRow("Preview scale:", self.image_scale_combo)
+        
         self.image_dpi_spinbox = QSpinBox()
         self.image_dpi_spinbox.setRange(72, 600)
         self.image_dpi_spinbox.setValue(300)
@@ -521,6 +483,7 @@ class ExportDialog(QDialog):
             'export_image': self.export_image_checkbox.isChecked(),
             'image_format': self.image_format_combo.currentText(),
             'image_quality': self.image_quality_spinbox.value(),
+            'image_downsample': self.image_scale_combo.currentData(),
             'image_dpi': self.image_dpi_spinbox.value(),
             'include_labels': self.include_labels_checkbox.isChecked(),
             'include_wells': self.include_wells_checkbox.isChecked(),
@@ -6,15 +6,16 @@ Provides interface for exporting individual cell images from selections.
 
 from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
+import threading
+import time
 import numpy as np
-from PIL import Image, ImageDraw
 from PySide6.QtWidgets import QApplication
 
 try:
     from PySide6.QtWidgets import (
         QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
         QPushButton, QLabel, QHeaderView, QFileDialog, QMessageBox, QProgressBar,
-        QFrame, QAbstractItemView, QWidget
+        QFrame, QAbstractItemView, QWidget, QComboBox
     )
     from PySide6.QtCore import Qt, Signal, QThread, QObject, QTimer
     from PySide6.QtGui import QPixmap, QIcon, QColor
@@ -42,9 +43,94 @@ except ImportError:
     QIcon = object
     QColor = object
     QWidget = object
+    QComboBox = object
 
 from utils.logging_config import LoggerMixin
 from utils.error_handler import error_handler
+from models.image_exporter import (
+    CROP_CONTAINERS, export_cell_crops, export_crop_container, create_overlay_image,
+    square_crop_boxes
+)
+
+
+class CellImageExportWorker(QThread):
+    """Worker thread exporting cell crops and the overlay image for one selection."""
+    
+    progress_updated = Signal(int)  # percentage
+    status_updated = Signal(str)    # status message
+    export_finished = Signal(bool, str)  # success, message
+    
+    # Minimum seconds between progress signals
+    PROGRESS_INTERVAL = 0.1
+    
+    def __init__(self, image_data: np.ndarray, bounding_boxes: List[Tuple[int, int, int, int]],
+                 selection_data: Dict[str, Any], output_dir: str, max_workers: Optional[int] = None,
+                 container: str = 'files'):
+        super().__init__()
+        self.image_data = image_data
+        self.bounding_boxes = bounding_boxes
+        self.selection_data = selection_data
+        self.output_dir = Path(output_dir)
+        self.max_workers = max_workers
+        self.container = container
+        self.cancel_event = threading.Event()
+        self.crops_per_second = 0.0
+    
+    def run(self) -> None:
+        """Encode crops in a thread pool, then write the overlay image."""
+        label = self.selection_data.get('label', 'Selection')
+        cell_indices = self.selection_data.get('cell_indices', [])
+        color = self.selection_data.get('color', '#FF0000')
+        
+        start = time.perf_counter()
+        last_report = [0.0]
+        
+        def report(done: int, total: int) -> None:
+            now = time.perf_counter()
+            if done < total and now - last_report[0] < self.PROGRESS_INTERVAL:
+                return
+            last_report[0] = now
+            rate = done / max(now - start, 1e-9)
+            self.progress_updated.emit(int(done / total * 90))  # Reserve 10% for overlay
+            self.status_updated.emit(f"Exported cell {done}/{total} ({rate:,.0f} crops/s)")
+        
+        try:
+            if self.container == 'files':
+                counts = export_cell_crops(
+                    self.image_data, self.bounding_boxes, cell_indices, self.output_dir, label,
+                    max_workers=self.max_workers, progress_callback=report,
+                    cancel_event=self.cancel_event
+                )
+            else:
+                counts = export_crop_container(
+                    self.image_data, self.bounding_boxes, cell_indices, self.output_dir, label,
+                    container=self.container, max_workers=self.max_workers,
+                    progress_callback=report, cancel_event=self.cancel_event
+                )
+            elapsed = time.perf_counter() - start
+            self.crops_per_second = counts['exported'] / max(elapsed, 1e-9)
+            
+            if self.cancel_event.is_set():
+                self.export_finished.emit(False, f"Export cancelled after {counts['exported']} cell images")
+                return
+            
+            self.progress_updated.emit(90)
+            self.status_updated.emit("Creating overlay image...")
+            create_overlay_image(self.image_data, self.bounding_boxes, cell_indices, color,
+                                 self.output_dir / f"{label}.jpg")
+            
+            self.progress_updated.emit(100)
+            self.export_finished.emit(
+                True,
+                f"Exported {counts['exported']} cell images and overlay to {self.output_dir}\n"
+                f"({self.crops_per_second:,.0f} crops/s)"
+            )
+        except Exception as e:
+            self.export_finished.emit(False, f"Export failed: {e}")
+    
+    def cancel(self) -> None:
+        """Stop before the remaining crops are encoded."""
+        self.cancel_event.set()
 
 
 class ImageExportDialog(QDialog, LoggerMixin):
@@ -61,6 +147,7 @@ class ImageExportDialog(QDialog, LoggerMixin):
         self.selections_data = selections_data
         self.image_data = image_data
         self.bounding_boxes = bounding_boxes
+        self.export_worker: Optional[CellImageExportWorker] = None
         
         self.setup_ui()
         self.populate_table()
@@ -97,6 +184,16 @@ class ImageExportDialog(QDialog, LoggerMixin):
         
         layout.addWidget(self.table)
         
+        # Output container for the cell crops
+        container_layout = QHBoxLayout()
+        container_layout.addWidget(QLabel("Save cells as:"))
+        self.container_combo = QComboBox()
+        for key, name in CROP_CONTAINERS.items():
+            self.container_combo.addItem(name, key)
+        container_layout.addWidget(self.container_combo)
+        container_layout.addStretch()
+        layout.addLayout(container_layout)
+        
         # Progress section (initially hidden)
         self.progress_frame = QFrame()
         self.progress_frame.setVisible(False)
@@ -112,6 +209,10 @@ class ImageExportDialog(QDialog, LoggerMixin):
         progress_layout.addWidget(self.progress_bar)
         progress_layout.addWidget(self.progress_status)
         
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.clicked.connect(self.cancel_export)
+        progress_layout.addWidget(self.cancel_button, alignment=Qt.AlignRight)
+        
         layout.addWidget(self.progress_frame)
         
         # Button bar
@@ -205,143 +306,66 @@ class ImageExportDialog(QDialog, LoggerMixin):
         if not output_dir:
             return  # User cancelled
 
+        self.start_export(selection_data, output_dir)
+    
+    def start_export(self, selection_data: Dict[str, Any], output_dir: str) -> CellImageExportWorker:
+        """
+        Start exporting a selection's images in the background.
+        
+        Args:
+            selection_data: Selection data dictionary
+            output_dir: Output directory
+        
+        Returns:
+            The running worker
+        """
         # Show progress and disable buttons
         self.progress_frame.setVisible(True)
         self.progress_label.setText(f"Exporting {selection_data.get('label', 'Selection')}")
         self.progress_bar.setValue(0)
         self.progress_status.setText("Starting export...")
+        self.cancel_button.setEnabled(True)
         self._set_export_buttons_enabled(False)
         
-        # Process events to update UI
-        QApplication.processEvents()
-
-        try:
-            # Perform export synchronously
-            success, message = self._export_selection_sync(selection_data, output_dir)
-            
-            # Hide progress and re-enable buttons
-            self.progress_frame.setVisible(False)
-            self._set_export_buttons_enabled(True)
-            
-            # Show result
-            if success:
-                QMessageBox.information(self, "Export Complete", message)
-                self.log_info(f"Export completed successfully: {message}")
-            else:
-                QMessageBox.critical(self, "Export Failed", message)
-                self.log_error(f"Export failed: {message}")
-                
-        except Exception as e:
-            # Hide progress and re-enable buttons
-            self.progress_frame.setVisible(False)
-            self._set_export_buttons_enabled(True)
-            
-            error_msg = f"Export failed: {e}"
-            QMessageBox.critical(self, "Export Failed", error_msg)
-            self.log_error(error_msg)
-
-    def _export_selection_sync(self, selection_data: Dict[str, Any], output_dir: str) -> Tuple[bool, str]:
-        """Synchronously export selection images."""
-        try:
-            output_path = Path(output_dir)
-            output_path.mkdir(parents=True, exist_ok=True)
-            
-            label = selection_data.get('label', 'Selection')
-            cell_indices = selection_data.get('cell_indices', [])
-            color = selection_data.get('color', '#FF0000')
-            
-            total_steps = len(cell_indices) + 1  # +1 for overlay image
-            
-            # Export individual cell images
-            for i, cell_index in enumerate(cell_indices):
-                progress = int((i / total_steps) * 90)  # Reserve 10% for overlay
-                self.progress_bar.setValue(progress)
-                self.progress_status.setText(f"Exporting cell {i+1}/{len(cell_indices)}")
-                QApplication.processEvents()  # Update UI
-                
-                # Get bounding box for this cell
-                if cell_index < len(self.bounding_boxes):
-                    bbox = self.bounding_boxes[cell_index]
-                    min_x, min_y, max_x, max_y = bbox
-                    
-                    # Convert rectangle to square while preserving center
-                    square_bbox = self._convert_to_square_bbox(min_x, min_y, max_x, max_y)
-                    sq_min_x, sq_min_y, sq_max_x, sq_max_y = square_bbox
-                    
-                    # Crop cell region from image using square bbox
-                    cell_image = self.image_data[sq_min_y:sq_max_y, sq_min_x:sq_max_x]
-                    
-                    # Convert to PIL Image and save
-                    if cell_image.size > 0:  # Ensure valid crop
-                        # Convert numpy to PIL
-                        if len(cell_image.shape) == 3:
-                            # RGB image
-                            pil_image = Image.fromarray(cell_image.astype(np.uint8))
-                        else:
-                            # Grayscale image
-                            pil_image = Image.fromarray(cell_image.astype(np.uint8), mode='L')
-                        
-                        # Save with sequential numbering
-                        filename = f"{label}_{i+1:03d}.jpg"
-                        filepath = output_path / filename
-                        pil_image.save(filepath, 'JPEG', quality=95)
-                        
-                        self.log_info(f"Exported cell image: {filename}")
-            
-            # Create and save overlay image
-            self.progress_bar.setValue(90)
-            self.progress_status.setText("Creating overlay image...")
-            QApplication.processEvents()
-            
-            overlay_success = self._create_overlay_image_sync(label, cell_indices, color, output_path)
-            
-            self.progress_bar.setValue(100)
-            self.progress_status.setText("Export completed")
-            QApplication.processEvents()
-            
-            if overlay_success:
-                message = f"Exported {len(cell_indices)} cell images and overlay to {output_path}"
-                return True, message
-            else:
-                return False, "Failed to create overlay image"
-                
-        except Exception as e:
-            return False, f"Export failed: {e}"
+        self.export_worker = CellImageExportWorker(
+            self.image_data, self.bounding_boxes, selection_data, output_dir,
+            container=self.container_combo.currentData()
+        )
+        self.export_worker.progress_updated.connect(self.progress_bar.setValue)
+        self.export_worker.status_updated.connect(self.progress_status.setText)
+        self.export_worker.export_finished.connect(self._on_export_finished)
+        self.export_worker.start()
+        return self.export_worker
+    
+    def cancel_export(self):
+        """Cancel a running export."""
+        if self.export_worker is not None and self.export_worker.isRunning():
+            self.export_worker.cancel()
+            self.cancel_button.setEnabled(False)
+            self.progress_status.setText("Cancelling...")
+    
+    def _on_export_finished(self, success: bool, message: str):
+        """Handle export completion."""
+        self.progress_status.setText(message)
+        self.cancel_button.setEnabled(False)
+        self._set_export_buttons_enabled(True)
+        
+        # Show result
+        if success:
+            QMessageBox.information(self, "Export Complete", message)
+            self.log_info(f"Export completed successfully: {message}")
+        elif self.export_worker is not None and self.export_worker.cancel_event.is_set():
+            self.log_info(message)
+        else:
+            QMessageBox.critical(self, "Export Failed", message)
+            self.log_error(f"Export failed: {message}")
 
     def _create_overlay_image_sync(self, label: str, cell_indices: List[int], color: str, output_path: Path) -> bool:
         """Create overlay image with marked selection areas synchronously."""
         try:
-            # Convert original image to PIL
-            if len(self.image_data.shape) == 3:
-                # RGB image
-                overlay_image = Image.fromarray(self.image_data.astype(np.uint8))
-            else:
-                # Grayscale - convert to RGB for colored overlays
-                gray_array = self.image_data.astype(np.uint8)
-                rgb_array = np.stack([gray_array, gray_array, gray_array], axis=2)
-                overlay_image = Image.fromarray(rgb_array)
-            
-            # Create drawing context
-            draw = ImageDraw.Draw(overlay_image)
-            
-            # Parse color (remove # if present)
-            color_hex = color.replace('#', '')
-            color_rgb = tuple(int(color_hex[i:i+2], 16) for i in (0, 2, 4))
-            
-            # Draw bounding boxes for selected cells
-            for cell_index in cell_indices:
-                if cell_index < len(self.bounding_boxes):
-                    bbox = self.bounding_boxes[cell_index]
-                    min_x, min_y, max_x, max_y = bbox
-                    
-                    # Draw rectangle outline with thinner border
-                    draw.rectangle([min_x, min_y, max_x, max_y], 
-                                 outline=color_rgb, width=1)
-            
-            # Save overlay image
             overlay_filename = f"{label}.jpg"
-            overlay_filepath = output_path / overlay_filename
-            overlay_image.save(overlay_filepath, 'JPEG', quality=95)
+            create_overlay_image(self.image_data, self.bounding_boxes, cell_indices, color,
+                                 Path(output_path) / overlay_filename)
             
             self.log_info(f"Created overlay image: {overlay_filename}")
             return True
@@ -356,10 +380,13 @@ class ImageExportDialog(QDialog, LoggerMixin):
             button = self.table.cellWidget(row, 5)
             if button:
                 button.setEnabled(enabled)
+        self.container_combo.setEnabled(enabled)
     
     def closeEvent(self, event):
         """Handle dialog close event."""
-        # No threads to cleanup anymore - just close
+        if self.export_worker is not None and self.export_worker.isRunning():
+            self.export_worker.cancel()
+            self.export_worker.wait()
         event.accept()
 
     def _convert_to_square_bbox(self, min_x: int, min_y: int, max_x: int, max_y: int) -> Tuple[int, int, int, int]:
@@ -372,54 +399,5 @@ class ImageExportDialog(QDialog, LoggerMixin):
         Returns:
             Tuple of (sq_min_x, sq_min_y, sq_max_x, sq_max_y) for square bbox
         """
-        # Calculate current dimensions
-        width = max_x - min_x
-        height = max_y - min_y
-        
-        # Use the longer side as the square size
-        square_size = max(width, height)
-        
-        # Calculate center of original bbox
-        center_x = (min_x + max_x) // 2
-        center_y = (min_y + max_y) // 2
-        
-        # Calculate square bbox centered on the original center
-        half_size = square_size // 2
-        sq_min_x = center_x - half_size
-        sq_min_y = center_y - half_size
-        sq_max_x = sq_min_x + square_size
-        sq_max_y = sq_min_y + square_size
-        
-        # Get image dimensions for boundary checking
-        img_height, img_width = self.image_data.shape[:2]
-        
-        # Adjust if square goes outside image boundaries
-        if sq_min_x < 0:
-            # Shift right
-            offset = -sq_min_x
-            sq_min_x = 0
-            sq_max_x = square_size
-        elif sq_max_x > img_width:
-            # Shift left
-            offset = sq_max_x - img_width
-            sq_max_x = img_width
-            sq_min_x = img_width - square_size
-            
-        if sq_min_y < 0:
-            # Shift down
-            offset = -sq_min_y
-            sq_min_y = 0
-            sq_max_y = square_size
-        elif sq_max_y > img_height:
-            # Shift up
-            offset = sq_max_y - img_height
-            sq_max_y = img_height
-            sq_min_y = img_height - square_size
-        
-        # Final boundary check - ensure coordinates are within image
-        sq_min_x = max(0, sq_min_x)
-        sq_min_y = max(0, sq_min_y)
-        sq_max_x = min(img_width, sq_max_x)
-        sq_max_y = min(img_height, sq_max_y)
-        
-        return (sq_min_x, sq_min_y, sq_max_x, sq_max_y)
+        square = square_crop_boxes(np.array([(min_x, min_y, max_x, max_y)]), self.image_data.shape)[0]
+        return tuple(int(value) for value in square)
@@ -6,6 +6,8 @@ Provides interface for exporting protocol files from selections.
 
 from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
+import threading
+import time
 import numpy as np
 from PySide6.QtWidgets import QApplication
 
@@ -13,7 +15,7 @@ try:
     from PySide6.QtWidgets import (
         QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
         QPushButton, QLabel, QHeaderView, QFileDialog, QMessageBox, QProgressBar,
-        QFrame, QAbstractItemView, QSizePolicy, QWidget
+        QFrame, QAbstractItemView, QSizePolicy, QWidget, QCheckBox
     )
     from PySide6.QtCore import Qt, Signal, QThread, QObject, QTimer
     from PySide6.QtGui import QPixmap, QIcon, QColor, QFont
@@ -43,9 +45,69 @@ except ImportError:
     QSizePolicy = object
     QFont = object
     QWidget = object
+    QCheckBox = object
 
 from utils.logging_config import LoggerMixin
 from utils.error_handler import error_handler
+from utils.exceptions import ExportError
+from models.extractor import Extractor
+from models.protocol_writer import protocol_image_fields, render_protocol
+
+
+class BatchProtocolExportWorker(QThread):
+    """Worker thread exporting protocols for many selections at once."""
+    
+    progress_updated = Signal(int)  # percentage
+    status_updated = Signal(str)    # status message
+    export_finished = Signal(bool, str)  # success, message
+    
+    def __init__(self, selections: List[Any], bounding_boxes: List[Tuple[int, int, int, int]],
+                 coordinate_transformer, output_dir: str, image_info: Dict[str, Any],
+                 image_bounds: Optional[Tuple[int, int]] = None, combined: bool = False):
+        super().__init__()
+        self.selections = selections
+        self.bounding_boxes = bounding_boxes
+        self.coordinate_transformer = coordinate_transformer
+        self.output_dir = output_dir
+        self.image_info = image_info
+        self.image_bounds = image_bounds
+        self.combined = combined
+        self.cancel_event = threading.Event()
+        self.written_paths: List[Path] = []
+    
+    def run(self) -> None:
+        """Generate all protocols in a thread pool."""
+        start = time.perf_counter()
+        
+        def report(done: int, total: int) -> None:
+            self.progress_updated.emit(int(done * 100 / total))
+            self.status_updated.emit(f"Exported {done} of {total} protocols")
+        
+        try:
+            self.status_updated.emit(f"Preparing {len(self.selections)} selections...")
+            self.written_paths = Extractor().export_protocol_batch(
+                self.selections, self.bounding_boxes, self.coordinate_transformer,
+                self.output_dir, self.image_info, image_bounds=self.image_bounds,
+                combined=self.combined, progress_callback=report,
+                cancel_event=self.cancel_event
+            )
+        except Exception as e:
+            self.export_finished.emit(False, f"Batch export failed: {e}")
+            return
+        
+        elapsed = time.perf_counter() - start
+        if self.cancel_event.is_set():
+            self.export_finished.emit(False, f"Cancelled after {len(self.written_paths)} protocols")
+        elif not self.written_paths:
+            self.export_finished.emit(False, "No protocols exported: selections contain no valid cells")
+        else:
+            self.export_finished.emit(
+                True, f"Exported {len(self.written_paths)} protocols in {elapsed:.2f}s"
+            )
+    
+    def cancel(self) -> None:
+        """Stop before the remaining protocols are written."""
+        self.cancel_event.set()
 
 
 class ProtocolExportDialog(QDialog, LoggerMixin):
@@ -65,6 +127,8 @@ class ProtocolExportDialog(QDialog, LoggerMixin):
         self.bounding_boxes = bounding_boxes
         self.coordinate_transformer = coordinate_transformer
         self.image_info = image_info
+        self.extractor = Extractor(self)
+        self.batch_worker: Optional[BatchProtocolExportWorker] = None
         
         self.setWindowTitle("Export Protocol")
         self.setModal(True)
@@ -127,12 +191,24 @@ class ProtocolExportDialog(QDialog, LoggerMixin):
         progress_layout.addWidget(self.progress_bar)
         progress_layout.addWidget(self.progress_status)
         
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.clicked.connect(self.cancel_batch_export)
+        progress_layout.addWidget(self.cancel_button, alignment=Qt.AlignRight)
+        
         layout.addWidget(self.progress_frame)
         
         # Button bar
         button_layout = QHBoxLayout()
+        
+        self.combine_checkbox = QCheckBox("Combine into one protocol")
+        button_layout.addWidget(self.combine_checkbox)
         button_layout.addStretch()
         
+        self.export_all_button = QPushButton("Export All...")
+        self.export_all_button.clicked.connect(self.export_all_selections)
+        self.export_all_button.setEnabled(bool(self.selections_data))
+        button_layout.addWidget(self.export_all_button)
+        
         self.close_button = QPushButton("Close")
         self.close_button.clicked.connect(self.close)
         button_layout.addWidget(self.close_button)
@@ -229,109 +305,115 @@ class ProtocolExportDialog(QDialog, LoggerMixin):
         if not output_file:
             return  # User cancelled
 
-        try:
-            # Generate protocol content
-            protocol_content = self._generate_protocol_content(selection_data)
-            
-            # Write to file
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(protocol_content)
-            
+        # Stream the protocol through the shared engine
+        success = self.extractor.export_protocol(
+            [selection_data], self.bounding_boxes, self.coordinate_transformer,
+            output_file, self.image_info, image_bounds=self._image_bounds(), backup=False
+        )
+        
+        if success:
             QMessageBox.information(
                 self, 
                 "Protocol Exported", 
                 f"Protocol successfully exported to:\n{output_file}"
             )
             self.log_info(f"Protocol exported: {output_file}")
-            
-        except Exception as e:
-            error_msg = f"Failed to export protocol: {e}"
+        else:
+            error_msg = "Failed to export protocol: no cells could be converted to stage coordinates"
             QMessageBox.critical(self, "Export Failed", error_msg)
             self.log_error(error_msg)
 
+    @error_handler("Exporting all selection protocols")
+    def export_all_selections(self):
+        """Export protocols for every selection in a background worker pool."""
+        if self.batch_worker is not None and self.batch_worker.isRunning():
+            return
+        
+        if not self.coordinate_transformer.is_calibrated():
+            QMessageBox.warning(self, "Calibration Required", 
+                              "Coordinate calibration is required for protocol export")
+            return
+        
+        output_dir = QFileDialog.getExistingDirectory(
+            self, "Select Output Directory for Protocols", str(Path.home())
+        )
+        if not output_dir:
+            return  # User cancelled
+        
+        self.start_batch_export(output_dir, combined=self.combine_checkbox.isChecked())
+    
+    def start_batch_export(self, output_dir: str, combined: bool = False) -> BatchProtocolExportWorker:
+        """
+        Start exporting every selection to output_dir without blocking the UI.
+        
+        Args:
+            output_dir: Directory receiving the protocol files
+            combined: Write one protocol with every selection
+        
+        Returns:
+            The running worker
+        """
+        self.batch_worker = BatchProtocolExportWorker(
+            list(self.selections_data.values()), self.bounding_boxes, self.coordinate_transformer,
+            output_dir, self.image_info, image_bounds=self._image_bounds(), combined=combined
+        )
+        self.batch_worker.progress_updated.connect(self.progress_bar.setValue)
+        self.batch_worker.status_updated.connect(self.progress_status.setText)
+        self.batch_worker.export_finished.connect(self._on_batch_export_finished)
+        
+        self.progress_label.setText(f"Exporting {len(self.selections_data)} selections...")
+        self.progress_bar.setValue(0)
+        self.progress_frame.setVisible(True)
+        self.cancel_button.setEnabled(True)
+        self._set_export_buttons_enabled(False)
+        
+        self.batch_worker.start()
+        return self.batch_worker
+    
+    def cancel_batch_export(self):
+        """Cancel a running batch export."""
+        if self.batch_worker is not None and self.batch_worker.isRunning():
+            self.batch_worker.cancel()
+            self.cancel_button.setEnabled(False)
+            self.progress_status.setText("Cancelling...")
+    
+    def _on_batch_export_finished(self, success: bool, message: str):
+        """Handle batch export completion."""
+        self.progress_status.setText(message)
+        self.cancel_button.setEnabled(False)
+        self._set_export_buttons_enabled(True)
+        
+        if success:
+            self.progress_bar.setValue(100)
+            self.log_info(message)
+        else:
+            self.log_warning(message)
+    
+    def _set_export_buttons_enabled(self, enabled: bool):
+        """Enable or disable all export buttons."""
+        self.export_all_button.setEnabled(enabled and bool(self.selections_data))
+        for row in range(self.table.rowCount()):
+            container = self.table.cellWidget(row, 5)
+            if container:
+                for button in container.findChildren(QPushButton):
+                    button.setEnabled(enabled)
+    
     def _generate_protocol_content(self, selection_data: Dict[str, Any]) -> str:
         """Generate .cxprotocol file content."""
-        lines = []
-        
-        # [IMAGE] section
-        lines.append("[IMAGE]")
-        lines.append(f'FILE = "{self.image_info["filename"]}"')
-        lines.append(f'WIDTH = {self.image_info["width"]}')
-        lines.append(f'HEIGHT = {self.image_info["height"]}')
-        lines.append(f'FORMAT = "{self.image_info["format"]}"')
-        lines.append("")
-        
-        # [IMAGING_LAYOUT] section
-        lines.append("[IMAGING_LAYOUT]")
-        lines.append("PositionOnly = 1")
-        lines.append('AfterBefore = "01"')
-        
-        # Get cells for this selection
-        cell_indices = getattr(selection_data, 'cell_indices', [])
-        lines.append(f"Points = {len(cell_indices)}")
-        
-        # Debug logging
-        self.log_info(f"Generating protocol for {len(cell_indices)} cells")
-        self.log_info(f"Available bounding boxes: {len(self.bounding_boxes)}")
-        self.log_info(f"Cell indices: {cell_indices[:10]}...")  # Show first 10
-        
-        # Generate points
-        point_count = 0
-        for i, cell_index in enumerate(cell_indices, 1):
-            if cell_index < len(self.bounding_boxes):
-                bbox = self.bounding_boxes[cell_index]
-                min_x, min_y, max_x, max_y = bbox
-
-                # Convert rectangle to square while preserving center
-                # NOTE: The logic for converting to square and then to stage coordinates is complex.
-                # Here we will just use the center of the original bounding box.
-                center_x = (min_x + max_x) // 2
-                center_y = (min_y + max_y) // 2
-                
-                # Convert pixel coordinates to stage coordinates
-                try:
-                    stage_coords = self.coordinate_transformer.pixel_to_stage(center_x, center_y)
-                    if not stage_coords:
-                        self.log_error(f"Coordinate conversion failed for cell {cell_index}")
-                        continue
-                        
-                    stage_x = stage_coords.stage_x
-                    stage_y = stage_coords.stage_y
-                    
-                    # Create a bounding box based on the center point for the protocol.
-                    # This part seems to have a specific format expected by the user.
-                    # The previous logic had stage_min and stage_max, let's replicate a simplified version.
-                    # Let's assume a fixed size for the exported bounding box for simplicity for now.
-                    half_size = 5.0 # in stage units, example value
-                    final_min_x = stage_x - half_size
-                    final_max_x = stage_x + half_size
-                    final_min_y = stage_y - half_size
-                    final_max_y = stage_y + half_size
-                    
-                    # Get selection info
-                    color_code = getattr(selection_data, 'color', '#FF0000')
-                    color_name = self._rgb_to_color_name(color_code)
-                    well = getattr(selection_data, 'well_position', 'A01')
-                    # Use actual selection label instead of Cell_XXX
-                    selection_label = getattr(selection_data, 'label', 'Selection')
-                    note = f"{selection_label}_{i:03d}"
-                    
-                    # Format: "X_min; Y_min; X_max; Y_max; color; well; note"
-                    point_line = f'P_{i} = "{final_min_x:.4f}; {final_min_y:.4f}; {final_max_x:.4f}; {final_max_y:.4f}; {color_name}; {well}; {note}"'
-                    lines.append(point_line)
-                    point_count += 1
-                    
-                except Exception as e:
-                    self.log_error(f"Failed to convert coordinates for cell {cell_index}: {e}")
-                    # Skip this cell if coordinate conversion fails
-                    continue
-            else:
-                self.log_error(f"Cell index {cell_index} out of bounds (max: {len(self.bounding_boxes)})")
- 
-        self.log_info(f"Generated {point_count} points for protocol")
-
-        return '\n'.join(lines)
-
+        points = self.extractor.compute_protocol_points(
+            [selection_data], self.bounding_boxes, self.coordinate_transformer, self._image_bounds()
+        )
+        if points is None:
+            raise ExportError("Failed to convert cell coordinates to stage coordinates")
+        
+        self.log_info(f"Generated {len(points)} points for protocol")
+        return render_protocol(protocol_image_fields(self.image_info), points)
+    
+    def _image_bounds(self) -> Optional[Tuple[int, int]]:
+        """Image (width, height) used to keep crops inside the image."""
+        if 'width' in self.image_info and 'height' in self.image_info:
+            return (self.image_info['width'], self.image_info['height'])
+        return None
 
     def _convert_to_square_bbox(self, min_x: int, min_y: int, max_x: int, max_y: int) -> Tuple[int, int, int, int]:
         """
@@ -395,43 +477,9 @@ class ProtocolExportDialog(QDialog, LoggerMixin):
         
         return (sq_min_x, sq_min_y, sq_max_x, sq_max_y)
     
-    def _rgb_to_color_name(self, rgb_color: str) -> str:
-        """
-        Convert RGB color code to readable color name.
-        
-        Args:
-            rgb_color: Color string like '#FF0000' or 'ff0000'
-            
-        Returns:
-            Color name like 'red', 'blue', etc.
-        """
-        # Remove # if present and convert to uppercase
-        color_code = rgb_color.replace('#', '').upper()
-        
-        # Color mapping from RGB codes to names
-        color_map = {
-            'FF0000': 'red',
-            '00FF00': 'green', 
-            '0000FF': 'blue',
-            'FFFF00': 'yellow',
-            'FF00FF': 'magenta',
-            '00FFFF': 'cyan',
-            'C0C0C0': 'lightgray',
-            '800000': 'darkred',
-            '008000': 'darkgreen',
-            '000080': 'darkblue',
-            '808000': 'darkyellow',
-            '800080': 'darkmagenta',
-            '008080': 'darkcyan',
-            '808080': 'darkgray',
-            'FFFFFF': 'white',
-            '000000': 'black'
-            
-        }
-        
-        # Return mapped color name or default to original if not found
-        return color_map.get(color_code, color_code.lower())
-
     def closeEvent(self, event):
         """Handle dialog close event."""
+        if self.batch_worker is not None and self.batch_worker.isRunning():
+            self.batch_worker.cancel()
+            self.batch_worker.wait()
         event.accept() 
\ No newline at end of file
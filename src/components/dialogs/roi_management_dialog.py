@@ -18,6 +18,7 @@ from utils.logging_config import LoggerMixin
 from utils.error_handler import error_handler
 # coordinate_transformer 임포트 추가
 from models.coordinate_transformer import CoordinateTransformer
+from services.thumbnail_service import ThumbnailService
 
 
 class ROIManagementDialog(QDialog, LoggerMixin):
@@ -39,6 +40,7 @@ class ROIManagementDialog(QDialog, LoggerMixin):
     
     # Signals
     cell_inclusion_changed = Signal(str, int, bool)  # selection_id, cell_index, is_included
+    cells_inclusion_changed = Signal(str, list, bool)  # selection_id, cell_indices, is_included (bulk)
     cell_navigation_requested = Signal(int)  # cell_index for main image navigation
     changes_confirmed = Signal(str, dict)  # selection_id, changes_data
     
@@ -47,14 +49,17 @@ class ROIManagementDialog(QDialog, LoggerMixin):
                  row_data: Optional[CellRowData] = None,
                  image_handler=None, 
                  csv_parser=None,
-                 coordinate_transformer: Optional[CoordinateTransformer] = None):
+                 coordinate_transformer: Optional[CoordinateTransformer] = None,
+                 thumbnail_service: Optional[ThumbnailService] = None):
         super().__init__(parent)
         
         self.row_data = row_data
         self.image_handler = image_handler
         self.csv_parser = csv_parser
         self.coordinate_transformer = coordinate_transformer
+        self.thumbnail_service = thumbnail_service
         self.initial_states: Dict[int, bool] = {}
+        self._change_state_pending = False
         self.changes_made = False
         
         self.setup_dialog_properties()
@@ -147,7 +152,8 @@ class ROIManagementDialog(QDialog, LoggerMixin):
         self.cell_manager = RowCellManager(
             image_handler=self.image_handler, 
             csv_parser=self.csv_parser,
-            coordinate_transformer=self.coordinate_transformer
+            coordinate_transformer=self.coordinate_transformer,
+            thumbnail_service=self.thumbnail_service
         )
         
         # 다이얼로그 컨텍스트에서는 RowCellManager의 Close 버튼을 숨김
@@ -244,6 +250,7 @@ class ROIManagementDialog(QDialog, LoggerMixin):
         # Cell manager signal forwarding
         if hasattr(self, 'cell_manager') and self.cell_manager:
             self.cell_manager.cell_inclusion_changed.connect(self.on_cell_inclusion_changed)
+            self.cell_manager.cells_inclusion_changed.connect(self.on_cells_inclusion_changed)
             self.cell_manager.cell_navigation_requested.connect(self.on_cell_navigation_requested)
             
             # Debug logging for signal connections
@@ -282,12 +289,26 @@ class ROIManagementDialog(QDialog, LoggerMixin):
         
         # Then, update the change state. Schedule with a single shot timer 
         # to ensure the cell_manager's internal state has updated before we check it.
-        QTimer.singleShot(0, self._update_change_state)
+        self._schedule_change_state_update()
         
         self.log_info(f"Cell {cell_index} inclusion changed: {is_included}")
     
+    def on_cells_inclusion_changed(self, selection_id: str, cell_indices: list, is_included: bool) -> None:
+        """Handle bulk inclusion changes (Include All / Exclude All)."""
+        self.cells_inclusion_changed.emit(selection_id, cell_indices, is_included)
+        self._schedule_change_state_update()
+        
+        self.log_info(f"{len(cell_indices)} cells inclusion changed: {is_included}")
+    
+    def _schedule_change_state_update(self) -> None:
+        """Queue one change-state check for all changes made in this event loop pass."""
+        if not self._change_state_pending:
+            self._change_state_pending = True
+            QTimer.singleShot(0, self._update_change_state)
+    
     def _update_change_state(self):
         """Update the changes_made flag and button state."""
+        self._change_state_pending = False
         self.changes_made = self._has_changes_from_initial()
         self.confirm_button.setEnabled(self.changes_made)
     
@@ -298,14 +319,10 @@ class ROIManagementDialog(QDialog, LoggerMixin):
     
     def _has_changes_from_initial(self) -> bool:
         """Check if any cells have been changed from their initial state."""
-        if not hasattr(self.cell_manager, 'cell_items') or not self.cell_manager.cell_items:
-            return False
-
-        for cell_item in self.cell_manager.cell_items:
-            cell_index = cell_item.cell_index
+        for cell_index, is_included in self.cell_manager.cell_model.cell_states():
             if cell_index in self.initial_states:
                 initial_state = self.initial_states[cell_index]
-                if initial_state != cell_item.is_included:
+                if initial_state != is_included:
                     return True # A change was found
         return False # No changes found
     
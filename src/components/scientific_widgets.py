@@ -15,6 +15,7 @@ from PySide6.QtGui import QPainter, QColor, QFont
 
 from components.design_system import DesignTokens
 from services.theme_manager import ThemeManager
+from services.style_registry import register_style, set_style_property, style_registry
 
 
 class ScatterPlotWidget(QWidget):
@@ -161,6 +162,7 @@ class WellPlateWidget(QWidget):
     def _setup_ui(self):
         """Set up the 96-well plate layout."""
         self.setProperty("role", "well-plate")
+        style_registry().ensure_applied()
         
         # Main layout
         main_layout = QVBoxLayout(self)
@@ -174,14 +176,6 @@ class WellPlateWidget(QWidget):
         # Create frame for the plate
         plate_frame = QFrame()
         plate_frame.setProperty("role", "well-plate-frame")
-        plate_frame.setStyleSheet(f"""
-            QFrame[role="well-plate-frame"] {{
-                background-color: var(--card);
-                border: 1px solid var(--border);
-                border-radius: {DesignTokens.RADIUS_LG}px;
-                padding: {DesignTokens.SPACING_4}px;
-            }}
-        """)
         
         # Grid layout for wells
         grid_layout = QGridLayout(plate_frame)
@@ -191,13 +185,7 @@ class WellPlateWidget(QWidget):
         for col in range(self.LAYOUT['columns']):
             label = QLabel(f"{col + 1:02d}")
             label.setAlignment(Qt.AlignCenter)
-            label.setStyleSheet(f"""
-                QLabel {{
-                    font-size: {DesignTokens.TEXT_XS}px;
-                    font-weight: {DesignTokens.FONT_MEDIUM};
-                    color: var(--muted-foreground);
-                }}
-            """)
+            label.setProperty("role", "well-plate-label")
             grid_layout.addWidget(label, 0, col + 1)
         
         # Add row labels (A-H) and wells
@@ -205,13 +193,7 @@ class WellPlateWidget(QWidget):
             # Row label
             row_label = QLabel(chr(65 + row))
             row_label.setAlignment(Qt.AlignCenter)
-            row_label.setStyleSheet(f"""
-                QLabel {{
-                    font-size: {DesignTokens.TEXT_XS}px;
-                    font-weight: {DesignTokens.FONT_MEDIUM};
-                    color: var(--muted-foreground);
-                }}
-            """)
+            row_label.setProperty("role", "well-plate-label")
             grid_layout.addWidget(row_label, row + 1, 0)
             
             # Wells
@@ -231,31 +213,6 @@ class WellPlateWidget(QWidget):
         button.setFixedSize(QSize(self.LAYOUT['well_size'], self.LAYOUT['well_size']))
         button.setCursor(Qt.PointingHandCursor)
         
-        # Styling
-        button.setStyleSheet(f"""
-            QPushButton[role="well"] {{
-                border-radius: {self.LAYOUT['well_size'] // 2}px;
-                font-size: {DesignTokens.TEXT_XS - 2}px;
-                font-weight: {DesignTokens.FONT_SEMIBOLD};
-            }}
-            
-            QPushButton[role="well"][state="empty"] {{
-                background-color: var(--muted);
-                color: var(--muted-foreground);
-                border: 1px solid var(--border);
-            }}
-            
-            QPushButton[role="well"][state="assigned"] {{
-                background-color: var(--primary);
-                color: var(--primary-foreground);
-                border: 1px solid var(--primary);
-            }}
-            
-            QPushButton[role="well"]:hover {{
-                background-color: var(--accent);
-            }}
-        """)
-        
         # Connect click signal
         button.clicked.connect(lambda: self.well_clicked.emit(well_id))
         
@@ -272,18 +229,15 @@ class WellPlateWidget(QWidget):
         """
         if well_id in self.wells:
             button = self.wells[well_id]
-            button.setProperty("state", state)
             
+            # Only a custom color needs a stylesheet of its own
+            custom_style = ""
             if state == "assigned" and color:
-                # Apply custom color if provided
-                button.setStyleSheet(button.styleSheet() + f"""
-                    QPushButton[role="well"][state="assigned"] {{
-                        background-color: {color};
-                    }}
-                """)
+                custom_style = f'QPushButton[role="well"][state="assigned"] {{ background-color: {color}; }}'
+            if button.styleSheet() != custom_style:
+                button.setStyleSheet(custom_style)
             
-            button.style().unpolish(button)
-            button.style().polish(button)
+            set_style_property(button, "state", state)
     
     def get_empty_wells(self) -> List[str]:
         """Get list of empty wells."""
@@ -296,4 +250,43 @@ class WellPlateWidget(QWidget):
     def clear_all_wells(self):
         """Clear all well assignments."""
         for well_id in self.wells:
-            self.set_well_state(well_id, "empty")
\ No newline at end of file
+            self.set_well_state(well_id, "empty")
+
+
+# Plate frame, labels and wells share application-level rules
+register_style('well-plate', f"""
+    QFrame[role="well-plate-frame"] {{
+        background-color: var(--card);
+        border: 1px solid var(--border);
+        border-radius: {DesignTokens.RADIUS_LG}px;
+        padding: {DesignTokens.SPACING_4}px;
+    }}
+
+    QLabel[role="well-plate-label"] {{
+        font-size: {DesignTokens.TEXT_XS}px;
+        font-weight: {DesignTokens.FONT_MEDIUM};
+        color: var(--muted-foreground);
+    }}
+
+    QPushButton[role="well"] {{
+        border-radius: {WellPlateWidget.LAYOUT['well_size'] // 2}px;
+        font-size: {DesignTokens.TEXT_XS - 2}px;
+        font-weight: {DesignTokens.FONT_SEMIBOLD};
+    }}
+
+    QPushButton[role="well"][state="empty"] {{
+        background-color: var(--muted);
+        color: var(--muted-foreground);
+        border: 1px solid var(--border);
+    }}
+
+    QPushButton[role="well"][state="assigned"] {{
+        background-color: var(--primary);
+        color: var(--primary-foreground);
+        border: 1px solid var(--primary);
+    }}
+
+    QPushButton[role="well"]:hover {{
+        background-color: var(--accent);
+    }}
+""")
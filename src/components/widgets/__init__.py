@@ -4,8 +4,15 @@ CellSorter Widget Components
 Custom Qt widgets for the CellSorter application.
 """
 
-from components.widgets.scatter_plot import ScatterPlotWidget, ScatterPlotCanvas
-from components.widgets.well_plate import WellPlateWidget
-from components.widgets.selection_panel import SelectionPanel
+from utils.lazy_import import lazy_getattr
+
+# Imported on first access: importing one widget module must not load
+# matplotlib through the scatter plot.
+__getattr__ = lazy_getattr(__name__, globals(), {
+    'ScatterPlotWidget': '.scatter_plot',
+    'ScatterPlotCanvas': '.scatter_plot_canvas',
+    'WellPlateWidget': '.well_plate',
+    'SelectionPanel': '.selection_panel',
+})
 
 __all__ = ['ScatterPlotWidget', 'ScatterPlotCanvas', 'WellPlateWidget', 'SelectionPanel']
\ No newline at end of file
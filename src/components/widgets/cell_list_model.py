@@ -0,0 +1,506 @@
+"""
+Cell List Model
+
+Virtualized model and item delegates for per-cell lists. Views built on
+CellListModel only paint the rows that are visible; cell metadata and
+thumbnails are looked up when a row is first displayed instead of being
+built for every cell up front.
+"""
+
+from collections import OrderedDict
+from typing import Optional, List, Dict, Any, Callable, Iterable, Iterator, Tuple
+
+import numpy as np
+from PySide6.QtWidgets import (
+    QApplication, QStyle, QStyledItemDelegate, QStyleOptionButton, QStyleOptionViewItem
+)
+from PySide6.QtCore import (
+    Qt, Signal, QAbstractListModel, QModelIndex, QRect, QSize, QTimer, QEvent
+)
+from PySide6.QtGui import QPainter, QPixmap, QColor, QFont, QPalette
+
+
+# Provides metadata for a cell index, or None if the cell is unknown
+MetadataProvider = Callable[[int], Optional[Dict[str, Any]]]
+
+
+def format_metadata(metadata: Optional[Dict[str, Any]]) -> str:
+    """Format cell metadata for display."""
+    if not metadata:
+        return "No metadata available"
+
+    parts = []
+    if 'area' in metadata:
+        parts.append(f"Area: {metadata['area']:.1f}")
+    if 'intensity' in metadata:
+        parts.append(f"Intensity: {metadata['intensity']:.1f}")
+    if 'perimeter' in metadata:
+        parts.append(f"Perimeter: {metadata['perimeter']:.1f}")
+
+    return " | ".join(parts) if parts else "Cell properties available"
+
+
+def format_metadata_compact(metadata: Optional[Dict[str, Any]]) -> str:
+    """Format cell metadata for compact display."""
+    if not metadata:
+        return ""
+
+    # Show only the most important metric in compact form
+    if 'area' in metadata:
+        return f"A:{metadata['area']:.0f}"
+    elif 'intensity' in metadata:
+        return f"I:{metadata['intensity']:.0f}"
+
+    return ""
+
+
+class CellListModel(QAbstractListModel):
+    """
+    List model of cells with inclusion state.
+
+    Inclusion is kept in a boolean array so statistics and bulk changes do
+    not touch individual rows. Metadata comes from a provider callable and
+    is cached for recently displayed rows only.
+    """
+
+    # Item data roles
+    CellIndexRole = Qt.UserRole + 1
+    IncludedRole = Qt.UserRole + 2
+    MetadataRole = Qt.UserRole + 3
+    ThumbnailRole = Qt.UserRole + 4
+    SelectedRole = Qt.UserRole + 5
+
+    # Metadata entries kept for displayed rows
+    METADATA_CACHE_SIZE = 2048
+
+    # Signals
+    inclusion_changed = Signal(int, bool)  # cell_index, is_included (single-cell edits)
+    thumbnails_requested = Signal(list)  # cell indices displayed without a thumbnail
+
+    def __init__(self, metadata_provider: Optional[MetadataProvider] = None, parent=None):
+        super().__init__(parent)
+
+        self.metadata_provider = metadata_provider
+        self._cell_indices: List[int] = []
+        self._rows: Dict[int, int] = {}
+        self._included = np.zeros(0, dtype=bool)
+        self._selected_row: Optional[int] = None
+        self._metadata_cache: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._thumbnails: Dict[int, QPixmap] = {}
+        self._thumbnails_wanted: set = set()
+        self._thumbnail_misses: List[int] = []
+
+        # Collect the misses of one paint pass into a single request
+        self._request_timer = QTimer(self)
+        self._request_timer.setSingleShot(True)
+        self._request_timer.setInterval(0)
+        self._request_timer.timeout.connect(self._flush_thumbnail_requests)
+
+    # Qt model interface
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._cell_indices)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid() or not 0 <= index.row() < len(self._cell_indices):
+            return None
+
+        row = index.row()
+        cell_index = self._cell_indices[row]
+        if role == Qt.DisplayRole:
+            return f"Cell {cell_index}"
+        if role == self.CellIndexRole:
+            return cell_index
+        if role in (self.IncludedRole, Qt.CheckStateRole):
+            included = bool(self._included[row])
+            if role == self.IncludedRole:
+                return included
+            return Qt.Checked if included else Qt.Unchecked
+        if role == self.SelectedRole:
+            return row == self._selected_row
+        if role == self.MetadataRole:
+            return self.metadata(row)
+        if role == Qt.ToolTipRole:
+            return format_metadata(self.metadata(row))
+        if role == self.ThumbnailRole:
+            return self._thumbnail_for_display(cell_index)
+        return None
+
+    def setData(self, index: QModelIndex, value: Any, role: int = Qt.EditRole) -> bool:
+        if not index.isValid() or role not in (Qt.CheckStateRole, self.IncludedRole):
+            return False
+
+        if role == Qt.CheckStateRole:
+            included = Qt.CheckState(value) == Qt.Checked
+        else:
+            included = bool(value)
+
+        return self._set_row_included(index.row(), included, notify=True)
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlags:
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsUserCheckable
+
+    # Cells
+
+    def set_cells(self, cell_indices: Iterable[int], included: Optional[Iterable[bool]] = None,
+                  thumbnails: Optional[Dict[int, QPixmap]] = None) -> None:
+        """
+        Replace the cells shown by the model.
+
+        Args:
+            cell_indices: Cell indices in display order
+            included: Initial inclusion per cell (default: all included)
+            thumbnails: Initial thumbnails by cell index
+        """
+        self.beginResetModel()
+        self._cell_indices = [int(cell_index) for cell_index in cell_indices]
+        self._rows = {cell_index: row for row, cell_index in enumerate(self._cell_indices)}
+        if included is None:
+            self._included = np.ones(len(self._cell_indices), dtype=bool)
+        else:
+            self._included = np.fromiter(included, dtype=bool, count=len(self._cell_indices))
+        self._selected_row = None
+        self._metadata_cache.clear()
+        self._thumbnails = dict(thumbnails or {})
+        self._thumbnails_wanted.clear()
+        self._thumbnail_misses.clear()
+        self.endResetModel()
+
+    def clear(self) -> None:
+        """Remove all cells."""
+        self.set_cells([])
+
+    @property
+    def cell_indices(self) -> List[int]:
+        """Cell indices in display order."""
+        return self._cell_indices
+
+    def cell_index(self, row: int) -> int:
+        """Cell index shown in a row."""
+        return self._cell_indices[row]
+
+    def row_of(self, cell_index: int) -> Optional[int]:
+        """Row showing a cell, or None if the cell is not in the model."""
+        return self._rows.get(cell_index)
+
+    def index_of(self, cell_index: int) -> QModelIndex:
+        """Model index of a cell (invalid if the cell is not in the model)."""
+        row = self._rows.get(cell_index)
+        return self.index(row) if row is not None else QModelIndex()
+
+    # Inclusion
+
+    def is_included(self, cell_index: int) -> bool:
+        """Inclusion state of a cell."""
+        return bool(self._included[self._rows[cell_index]])
+
+    def set_included(self, cell_index: int, included: bool, notify: bool = True) -> bool:
+        """
+        Set the inclusion of one cell.
+
+        Args:
+            cell_index: Cell to change
+            included: New inclusion state
+            notify: Emit inclusion_changed (views are updated either way)
+
+        Returns:
+            True if the state changed
+        """
+        row = self._rows.get(cell_index)
+        if row is None:
+            return False
+        return self._set_row_included(row, bool(included), notify)
+
+    def _set_row_included(self, row: int, included: bool, notify: bool) -> bool:
+        """Update one row's inclusion and its views."""
+        if bool(self._included[row]) == included:
+            return False
+        self._included[row] = included
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole, self.IncludedRole])
+        if notify:
+            self.inclusion_changed.emit(self._cell_indices[row], included)
+        return True
+
+    def set_all_included(self, included: bool) -> List[int]:
+        """
+        Set the inclusion of all cells with a single model update.
+
+        Returns:
+            Indices of the cells whose state changed
+        """
+        changed_rows = np.flatnonzero(self._included != included)
+        if len(changed_rows) == 0:
+            return []
+
+        self._included[:] = included
+        self.dataChanged.emit(self.index(int(changed_rows[0])), self.index(int(changed_rows[-1])),
+                              [Qt.CheckStateRole, self.IncludedRole])
+        return [self._cell_indices[row] for row in changed_rows]
+
+    def included_count(self) -> int:
+        """Number of included cells."""
+        return int(np.count_nonzero(self._included))
+
+    def included_cells(self) -> List[int]:
+        """Indices of included cells in display order."""
+        return [self._cell_indices[row] for row in np.flatnonzero(self._included)]
+
+    def excluded_cells(self) -> List[int]:
+        """Indices of excluded cells in display order."""
+        return [self._cell_indices[row] for row in np.flatnonzero(~self._included)]
+
+    def cell_states(self) -> Iterator[Tuple[int, bool]]:
+        """(cell_index, is_included) pairs in display order."""
+        return zip(self._cell_indices, self._included.tolist())
+
+    # Selection
+
+    @property
+    def selected_cell(self) -> Optional[int]:
+        """Index of the highlighted cell."""
+        return self._cell_indices[self._selected_row] if self._selected_row is not None else None
+
+    def set_selected_cell(self, cell_index: Optional[int]) -> None:
+        """Highlight one cell (None clears the highlight)."""
+        row = self._rows.get(cell_index) if cell_index is not None else None
+        previous, self._selected_row = self._selected_row, row
+        for changed in {previous, row} - {None}:
+            self.dataChanged.emit(self.index(changed), self.index(changed), [self.SelectedRole])
+
+    # Metadata
+
+    def set_metadata_provider(self, metadata_provider: Optional[MetadataProvider]) -> None:
+        """Change where metadata is fetched from."""
+        self.metadata_provider = metadata_provider
+        self._metadata_cache.clear()
+        if self._cell_indices:
+            self.dataChanged.emit(self.index(0), self.index(len(self._cell_indices) - 1),
+                                  [self.MetadataRole, Qt.ToolTipRole])
+
+    def metadata(self, row: int) -> Dict[str, Any]:
+        """Metadata of the cell in a row, fetched on first use."""
+        cell_index = self._cell_indices[row]
+        cached = self._metadata_cache.get(cell_index)
+        if cached is not None:
+            self._metadata_cache.move_to_end(cell_index)
+            return cached
+
+        metadata = {}
+        if self.metadata_provider is not None:
+            try:
+                metadata = self.metadata_provider(cell_index) or {}
+            except Exception:
+                metadata = {}
+
+        self._metadata_cache[cell_index] = metadata
+        if len(self._metadata_cache) > self.METADATA_CACHE_SIZE:
+            self._metadata_cache.popitem(last=False)
+        return metadata
+
+    # Thumbnails
+
+    def want_thumbnails(self, cell_indices: Iterable[int]) -> None:
+        """Request thumbnails for these cells when they are displayed without one."""
+        self._thumbnails_wanted.update(cell_indices)
+
+    def set_thumbnail(self, cell_index: int, pixmap: Optional[QPixmap]) -> None:
+        """Set (or clear) the thumbnail of a cell."""
+        if pixmap is None or pixmap.isNull():
+            self._thumbnails.pop(cell_index, None)
+        else:
+            self._thumbnails[cell_index] = pixmap
+            self._thumbnails_wanted.discard(cell_index)
+
+        row = self._rows.get(cell_index)
+        if row is not None:
+            self.dataChanged.emit(self.index(row), self.index(row), [self.ThumbnailRole])
+
+    def thumbnail(self, cell_index: int) -> Optional[QPixmap]:
+        """Thumbnail of a cell, if set."""
+        return self._thumbnails.get(cell_index)
+
+    def _thumbnail_for_display(self, cell_index: int) -> Optional[QPixmap]:
+        """Thumbnail for painting; a missing wanted thumbnail is queued for request."""
+        pixmap = self._thumbnails.get(cell_index)
+        if pixmap is None and cell_index in self._thumbnails_wanted:
+            self._thumbnails_wanted.discard(cell_index)
+            self._thumbnail_misses.append(cell_index)
+            self._request_timer.start()
+        return pixmap
+
+    def _flush_thumbnail_requests(self) -> None:
+        """Emit the thumbnails missed since the last flush."""
+        misses, self._thumbnail_misses = self._thumbnail_misses, []
+        if misses:
+            self.thumbnails_requested.emit(misses)
+
+
+class _CellDelegateBase(QStyledItemDelegate):
+    """Shared painting helpers for cell delegates."""
+
+    BORDER_WIDTH = 2
+    RADIUS = 8
+
+    def _paint_frame(self, painter: QPainter, option: QStyleOptionViewItem,
+                     rect: QRect, selected: bool, included: bool) -> None:
+        """Rounded frame whose colors follow the selection/inclusion state."""
+        palette = option.palette
+        if selected:
+            border = palette.color(QPalette.Highlight)
+            background = QColor(border)
+            background.setAlpha(26)
+        elif not included:
+            border = palette.color(QPalette.Mid)
+            background = palette.color(QPalette.AlternateBase)
+        else:
+            border = palette.color(QPalette.Midlight)
+            background = palette.color(QPalette.Base)
+        if option.state & QStyle.State_MouseOver and not selected:
+            border = palette.color(QPalette.Dark)
+
+        painter.setPen(border)
+        painter.setBrush(background)
+        half = self.BORDER_WIDTH // 2
+        painter.drawRoundedRect(rect.adjusted(half, half, -half, -half), self.RADIUS, self.RADIUS)
+
+    def _text_color(self, option: QStyleOptionViewItem, included: bool) -> QColor:
+        """Foreground color; excluded cells are muted."""
+        role = QPalette.Text if included else QPalette.PlaceholderText
+        return option.palette.color(role)
+
+
+class CellRowDelegate(_CellDelegateBase):
+    """
+    Paints a cell as a compact row: checkbox, "Cell N" and a short metric.
+
+    Clicking the checkbox (or pressing space) toggles inclusion through the
+    model's CheckStateRole.
+    """
+
+    ROW_HEIGHT = 40
+    MARGIN = 8
+    SPACING = 8
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        # Rows stretch to the viewport width
+        return QSize(0, self.ROW_HEIGHT)
+
+    def checkbox_rect(self, option: QStyleOptionViewItem) -> QRect:
+        """Area of the inclusion checkbox within a row."""
+        style = option.widget.style() if option.widget else QApplication.style()
+        size = style.pixelMetric(QStyle.PM_IndicatorWidth, None, option.widget)
+        rect = option.rect
+        return QRect(rect.left() + self.MARGIN, rect.top() + (rect.height() - size) // 2, size, size)
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex) -> None:
+        included = bool(index.data(CellListModel.IncludedRole))
+        selected = bool(index.data(CellListModel.SelectedRole))
+        style = option.widget.style() if option.widget else QApplication.style()
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        rect = option.rect.adjusted(0, 2, 0, -2)
+        self._paint_frame(painter, option, rect, selected, included)
+
+        # Inclusion checkbox
+        check_option = QStyleOptionButton()
+        check_option.rect = self.checkbox_rect(option)
+        check_option.state = QStyle.State_Enabled | (QStyle.State_On if included else QStyle.State_Off)
+        style.drawPrimitive(QStyle.PE_IndicatorCheckBox, check_option, painter, option.widget)
+
+        # Cell index label
+        font = QFont(option.font)
+        font.setPixelSize(12)
+        font.setWeight(QFont.DemiBold)
+        painter.setFont(font)
+        painter.setPen(self._text_color(option, included))
+        text_left = check_option.rect.right() + self.SPACING
+        text_rect = QRect(text_left, rect.top(), rect.right() - text_left - self.MARGIN, rect.height())
+        label = index.data(Qt.DisplayRole)
+        painter.drawText(text_rect, Qt.AlignVCenter | Qt.AlignLeft, label)
+
+        # Compact metadata
+        metadata_text = format_metadata_compact(index.data(CellListModel.MetadataRole))
+        if metadata_text:
+            label_width = painter.fontMetrics().horizontalAdvance(label)
+            font.setPixelSize(10)
+            font.setWeight(QFont.Normal)
+            painter.setFont(font)
+            painter.setPen(option.palette.color(QPalette.PlaceholderText))
+            painter.drawText(text_rect.adjusted(label_width + self.SPACING, 0, 0, 0),
+                             Qt.AlignVCenter | Qt.AlignLeft, metadata_text)
+        painter.restore()
+
+    def editorEvent(self, event: QEvent, model, option: QStyleOptionViewItem, index: QModelIndex) -> bool:
+        if event.type() == QEvent.MouseButtonRelease:
+            if event.button() != Qt.LeftButton or not self.checkbox_rect(option).contains(event.position().toPoint()):
+                return False
+        elif event.type() == QEvent.MouseButtonPress or event.type() == QEvent.MouseButtonDblClick:
+            # Swallow presses on the checkbox so they do not start a drag/edit
+            return (event.button() == Qt.LeftButton
+                    and self.checkbox_rect(option).contains(event.position().toPoint()))
+        elif event.type() == QEvent.KeyPress:
+            if event.key() not in (Qt.Key_Space, Qt.Key_Select):
+                return False
+        else:
+            return False
+
+        included = bool(index.data(CellListModel.IncludedRole))
+        return model.setData(index, Qt.Unchecked if included else Qt.Checked, Qt.CheckStateRole)
+
+
+class CellThumbnailDelegate(_CellDelegateBase):
+    """Paints a cell as a square tile with its thumbnail and "Cell N" below."""
+
+    TILE_SIZE = 120
+    IMAGE_SIZE = 80
+    PADDING = 8
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        return QSize(self.TILE_SIZE, self.TILE_SIZE)
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex) -> None:
+        included = bool(index.data(CellListModel.IncludedRole))
+        selected = bool(index.data(CellListModel.SelectedRole))
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        rect = option.rect
+        self._paint_frame(painter, option, rect, selected, included)
+
+        # Thumbnail image area
+        image_rect = QRect(rect.left() + (rect.width() - self.IMAGE_SIZE) // 2,
+                           rect.top() + self.PADDING, self.IMAGE_SIZE, self.IMAGE_SIZE)
+        pixmap = index.data(CellListModel.ThumbnailRole)
+        font = QFont(option.font)
+        if pixmap is not None and not pixmap.isNull():
+            if pixmap.width() > self.IMAGE_SIZE or pixmap.height() > self.IMAGE_SIZE:
+                pixmap = pixmap.scaled(self.IMAGE_SIZE, self.IMAGE_SIZE,
+                                       Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            target = QRect(0, 0, pixmap.width(), pixmap.height())
+            target.moveCenter(image_rect.center())
+            if not included:
+                painter.setOpacity(0.5)
+            painter.drawPixmap(target, pixmap)
+            painter.setOpacity(1.0)
+        else:
+            painter.setPen(option.palette.color(QPalette.Midlight))
+            painter.setBrush(option.palette.color(QPalette.AlternateBase))
+            painter.drawRoundedRect(image_rect, 4, 4)
+            font.setPixelSize(10)
+            painter.setFont(font)
+            painter.setPen(option.palette.color(QPalette.PlaceholderText))
+            painter.drawText(image_rect, Qt.AlignCenter, "No Image")
+
+        # Cell index label
+        font.setPixelSize(11)
+        font.setWeight(QFont.Medium)
+        painter.setFont(font)
+        painter.setPen(self._text_color(option, included))
+        label_rect = QRect(rect.left(), image_rect.bottom() + 4,
+                           rect.width(), rect.bottom() - image_rect.bottom() - self.PADDING)
+        painter.drawText(label_rect, Qt.AlignCenter, index.data(Qt.DisplayRole))
+        painter.restore()
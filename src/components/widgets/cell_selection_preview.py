@@ -5,19 +5,21 @@ Shows a preview of selected cells before final save operation.
 Provides visual feedback to users and allows confirmation/cancellation.
 """
 
-from typing import Optional, List, Dict, Any, Callable
+from typing import Optional, List, Dict, Any, Callable, Iterable
 from dataclasses import dataclass
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, 
-    QScrollArea, QFrame, QPushButton, QSizePolicy
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QListView, QAbstractItemView,
+    QFrame, QPushButton, QSizePolicy
 )
-from PySide6.QtCore import Signal, Qt, QTimer
-from PySide6.QtGui import QPixmap, QPainter, QColor, QBrush
+from PySide6.QtCore import Signal, Qt, QTimer, QModelIndex
+from PySide6.QtGui import QPixmap, QPainter, QColor, QBrush, QImage
 
 from components.base.base_button import BaseButton, ButtonVariant, ButtonSize
+from components.widgets.cell_list_model import CellListModel, CellThumbnailDelegate
 from config.design_tokens import Colors, Spacing, BorderRadius, Typography
 from utils.logging_config import LoggerMixin
 from utils.error_handler import error_handler
+from services.thumbnail_service import ThumbnailService
 
 
 @dataclass
@@ -34,140 +36,12 @@ class CellThumbnailData:
             self.metadata = {}
 
 
-class CellThumbnailWidget(QFrame, LoggerMixin):
-    """Individual cell thumbnail widget for preview."""
-    
-    # Signals
-    clicked = Signal(int)  # cell_index
-    inclusion_changed = Signal(int, bool)  # cell_index, is_included
-    
-    def __init__(self, cell_data: CellThumbnailData, parent: Optional[QWidget] = None):
-        super().__init__(parent)
-        
-        self.cell_data = cell_data
-        self._is_selected = False
-        
-        self.setup_ui()
-        self.update_appearance()
-    
-    def setup_ui(self) -> None:
-        """Set up the thumbnail widget UI."""
-        self.setFixedSize(120, 120)  # Standard thumbnail size
-        self.setFrameStyle(QFrame.StyledPanel)
-        self.setCursor(Qt.PointingHandCursor)
-        
-        layout = QVBoxLayout(self)
-        layout.setSpacing(4)
-        layout.setContentsMargins(8, 8, 8, 8)
-        
-        # Thumbnail image area
-        self.image_label = QLabel()
-        self.image_label.setAlignment(Qt.AlignCenter)
-        self.image_label.setMinimumSize(80, 80)
-        self.image_label.setStyleSheet("""
-            QLabel {
-                background-color: var(--muted);
-                border: 1px solid var(--border);
-                border-radius: 4px;
-            }
-        """)
-        
-        # Cell index label
-        self.index_label = QLabel(f"Cell {self.cell_data.cell_index}")
-        self.index_label.setAlignment(Qt.AlignCenter)
-        self.index_label.setStyleSheet("""
-            QLabel {
-                font-size: 11px;
-                color: var(--muted-foreground);
-                font-weight: 500;
-            }
-        """)
-        
-        layout.addWidget(self.image_label)
-        layout.addWidget(self.index_label)
-        
-        # Load thumbnail if available
-        if self.cell_data.thumbnail_pixmap:
-            self.set_thumbnail(self.cell_data.thumbnail_pixmap)
-        else:
-            self.set_placeholder()
-    
-    def set_thumbnail(self, pixmap: QPixmap) -> None:
-        """Set the thumbnail image."""
-        if pixmap and not pixmap.isNull():
-            # Scale pixmap to fit while maintaining aspect ratio
-            scaled_pixmap = pixmap.scaled(
-                80, 80, 
-                Qt.KeepAspectRatio, 
-                Qt.SmoothTransformation
-            )
-            self.image_label.setPixmap(scaled_pixmap)
-        else:
-            self.set_placeholder()
-    
-    def set_placeholder(self) -> None:
-        """Set placeholder when no thumbnail is available."""
-        self.image_label.setText("No Image")
-        self.image_label.setStyleSheet("""
-            QLabel {
-                background-color: var(--muted);
-                border: 1px solid var(--border);
-                border-radius: 4px;
-                color: var(--muted-foreground);
-                font-size: 10px;
-            }
-        """)
-    
-    def set_selected(self, selected: bool) -> None:
-        """Set the selected state of the thumbnail."""
-        self._is_selected = selected
-        self.update_appearance()
-    
-    def update_appearance(self) -> None:
-        """Update the visual appearance based on state."""
-        if self._is_selected:
-            border_color = "var(--primary)"
-            background_color = "var(--primary)/10"
-        elif not self.cell_data.is_included:
-            border_color = "var(--muted)"
-            background_color = "var(--muted)/50"
-        else:
-            border_color = "var(--border)"
-            background_color = "var(--background)"
-        
-        self.setStyleSheet(f"""
-            CellThumbnailWidget {{
-                border: 2px solid {border_color};
-                border-radius: 8px;
-                background-color: {background_color};
-            }}
-            CellThumbnailWidget:hover {{
-                border-color: var(--ring);
-                background-color: var(--accent);
-            }}
-        """)
-    
-    def mousePressEvent(self, event) -> None:
-        """Handle mouse press events."""
-        if event.button() == Qt.LeftButton:
-            self.clicked.emit(self.cell_data.cell_index)
-        super().mousePressEvent(event)
-    
-    def mouseDoubleClickEvent(self, event) -> None:
-        """Handle double-click to toggle inclusion."""
-        if event.button() == Qt.LeftButton:
-            self.cell_data.is_included = not self.cell_data.is_included
-            self.inclusion_changed.emit(self.cell_data.cell_index, self.cell_data.is_included)
-            self.update_appearance()
-        super().mouseDoubleClickEvent(event)
-
-
 class CellSelectionPreview(QWidget, LoggerMixin):
     """
     Cell selection preview component showing thumbnails before save.
     
     Features:
-    - Grid layout of cell thumbnails
+    - Virtualized grid of cell thumbnails (only visible tiles are painted)
     - Visual feedback for selected cells  
     - Confirmation and cancellation buttons
     - Statistics display
@@ -185,12 +59,14 @@ class CellSelectionPreview(QWidget, LoggerMixin):
         
         # Data storage
         self.cell_thumbnails: List[CellThumbnailData] = []
-        self.thumbnail_widgets: List[CellThumbnailWidget] = []
+        self._data_by_cell: Dict[int, CellThumbnailData] = {}
+        self.cell_model = CellListModel(metadata_provider=self._cell_metadata, parent=self)
         self.selected_cell_index: Optional[int] = None
+        self.thumbnail_service: Optional[ThumbnailService] = None
         
         # Configuration
         self.thumbnails_per_row = 6
-        self.max_thumbnails = 50  # Performance limit
+        self.max_thumbnails: Optional[int] = None  # Optional cap; the grid is virtualized
         
         self.setup_ui()
         self.connect_signals()
@@ -260,30 +136,39 @@ class CellSelectionPreview(QWidget, LoggerMixin):
     
     def setup_thumbnails_grid(self, parent_layout: QVBoxLayout) -> None:
         """Set up the scrollable thumbnails grid."""
-        # Scroll area for thumbnails
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        scroll_area.setMinimumHeight(300)
-        scroll_area.setMaximumHeight(500)
-        
-        # Grid container widget
-        self.grid_container = QWidget()
-        self.grid_layout = QGridLayout(self.grid_container)
-        self.grid_layout.setSpacing(12)
-        self.grid_layout.setContentsMargins(8, 8, 8, 8)
-        
-        scroll_area.setWidget(self.grid_container)
-        scroll_area.setStyleSheet("""
-            QScrollArea {
+        # Icon-mode list view; tiles are painted by the delegate on demand
+        self.cell_view = QListView()
+        self.cell_view.setModel(self.cell_model)
+        self.cell_view.setItemDelegate(CellThumbnailDelegate(self.cell_view))
+        self.cell_view.setViewMode(QListView.IconMode)
+        self.cell_view.setFlow(QListView.LeftToRight)
+        self.cell_view.setWrapping(True)
+        self.cell_view.setResizeMode(QListView.Adjust)
+        self.cell_view.setMovement(QListView.Static)
+        self.cell_view.setUniformItemSizes(True)
+        self.cell_view.setSpacing(6)
+        self.cell_view.setSelectionMode(QAbstractItemView.NoSelection)
+        self.cell_view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.cell_view.setMouseTracking(True)
+        self.cell_view.setCursor(Qt.PointingHandCursor)
+        self.cell_view.setMinimumHeight(300)
+        self.cell_view.setMaximumHeight(500)
+        self.cell_view.setStyleSheet("""
+            QListView {
                 border: 1px solid var(--border);
                 border-radius: 8px;
                 background-color: var(--background);
             }
         """)
+        self._update_grid_width()
         
-        parent_layout.addWidget(scroll_area)
+        parent_layout.addWidget(self.cell_view)
+    
+    def _update_grid_width(self) -> None:
+        """Size the grid to show thumbnails_per_row tiles side by side."""
+        tile = CellThumbnailDelegate.TILE_SIZE + 2 * self.cell_view.spacing()
+        scrollbar = self.cell_view.verticalScrollBar().sizeHint().width()
+        self.cell_view.setMinimumWidth(self.thumbnails_per_row * tile + scrollbar + 2 * self.cell_view.frameWidth())
     
     def setup_statistics(self, parent_layout: QVBoxLayout) -> None:
         """Set up the statistics display."""
@@ -366,6 +251,59 @@ class CellSelectionPreview(QWidget, LoggerMixin):
         """Connect widget signals."""
         self.cancel_button.clicked.connect(self.on_cancel_clicked)
         self.confirm_button.clicked.connect(self.on_confirm_clicked)
+        self.cell_view.clicked.connect(self.on_view_clicked)
+        self.cell_view.doubleClicked.connect(self.on_view_double_clicked)
+        self.cell_model.inclusion_changed.connect(self.on_inclusion_changed)
+        self.cell_model.thumbnails_requested.connect(self.request_thumbnails)
+    
+    def _cell_metadata(self, cell_index: int) -> Optional[Dict[str, Any]]:
+        """Metadata of a loaded cell, read when its tile is displayed."""
+        cell_data = self._data_by_cell.get(cell_index)
+        return cell_data.metadata if cell_data is not None else None
+    
+    def set_thumbnail_service(self, service: Optional[ThumbnailService]) -> None:
+        """
+        Generate missing thumbnails from cell bounding boxes with a shared service.
+        
+        Args:
+            service: Thumbnail service with the current image set, or None
+        """
+        if self.thumbnail_service is not None:
+            self.thumbnail_service.thumbnail_ready.disconnect(self.on_thumbnail_ready)
+        self.thumbnail_service = service
+        if service is not None:
+            service.thumbnail_ready.connect(self.on_thumbnail_ready)
+    
+    def request_thumbnails(self, cell_indices: Optional[Iterable[int]] = None) -> None:
+        """
+        Request thumbnails for cells that have a bounding box but no image.
+        
+        Args:
+            cell_indices: Cells to request (the model asks for tiles as they
+                are displayed); defaults to all loaded cells
+        """
+        if self.thumbnail_service is None:
+            return
+        
+        if cell_indices is None:
+            cell_indices = self._data_by_cell.keys()
+        size = CellThumbnailDelegate.IMAGE_SIZE
+        for cell_index in list(cell_indices):
+            cell_data = self._data_by_cell.get(cell_index)
+            if cell_data is None or cell_data.thumbnail_pixmap is not None or cell_data.bounding_box is None:
+                continue
+            image = self.thumbnail_service.request(cell_index, cell_data.bounding_box, size)
+            if image is not None:
+                self.on_thumbnail_ready(cell_index, size, image)
+    
+    def on_thumbnail_ready(self, cell_index: int, size: int, image: QImage) -> None:
+        """Show a thumbnail delivered by the thumbnail service."""
+        cell_data = self._data_by_cell.get(cell_index)
+        if cell_data is None or size != CellThumbnailDelegate.IMAGE_SIZE:
+            return
+        if cell_data.thumbnail_pixmap is None:
+            cell_data.thumbnail_pixmap = QPixmap.fromImage(image)
+            self.cell_model.set_thumbnail(cell_index, cell_data.thumbnail_pixmap)
     
     @error_handler("Loading cell selection preview")
     def load_cells(self, cell_data: List[CellThumbnailData]) -> None:
@@ -378,25 +316,27 @@ class CellSelectionPreview(QWidget, LoggerMixin):
         # Clear existing thumbnails
         self.clear_thumbnails()
         
-        # Limit thumbnails for performance
-        if len(cell_data) > self.max_thumbnails:
+        # Optional cap on the number of cells shown
+        if self.max_thumbnails is not None and len(cell_data) > self.max_thumbnails:
             self.log_warning(f"Too many cells ({len(cell_data)}), limiting to {self.max_thumbnails}")
             cell_data = cell_data[:self.max_thumbnails]
         
-        self.cell_thumbnails = cell_data
-        
-        # Create thumbnail widgets
-        for i, cell_data in enumerate(self.cell_thumbnails):
-            thumbnail_widget = CellThumbnailWidget(cell_data)
-            thumbnail_widget.clicked.connect(self.on_thumbnail_clicked)
-            thumbnail_widget.inclusion_changed.connect(self.on_inclusion_changed)
-            
-            # Add to grid layout
-            row = i // self.thumbnails_per_row
-            col = i % self.thumbnails_per_row
-            self.grid_layout.addWidget(thumbnail_widget, row, col)
-            
-            self.thumbnail_widgets.append(thumbnail_widget)
+        self.cell_thumbnails = list(cell_data)
+        self._data_by_cell = {data.cell_index: data for data in self.cell_thumbnails}
+        
+        # Populate the model; tiles are painted only when scrolled into view
+        self.cell_model.set_cells(
+            [data.cell_index for data in self.cell_thumbnails],
+            [data.is_included for data in self.cell_thumbnails],
+            thumbnails={data.cell_index: data.thumbnail_pixmap
+                        for data in self.cell_thumbnails if data.thumbnail_pixmap is not None}
+        )
+        
+        # Missing images are generated in the background once their tiles are displayed
+        self.cell_model.want_thumbnails(
+            data.cell_index for data in self.cell_thumbnails
+            if data.thumbnail_pixmap is None and data.bounding_box is not None
+        )
         
         # Update statistics
         self.update_statistics()
@@ -404,24 +344,16 @@ class CellSelectionPreview(QWidget, LoggerMixin):
         self.log_info(f"Loaded {len(self.cell_thumbnails)} cells for preview")
     
     def clear_thumbnails(self) -> None:
-        """Clear all thumbnail widgets."""
-        for widget in self.thumbnail_widgets:
-            widget.deleteLater()
-        
-        self.thumbnail_widgets.clear()
-        self.cell_thumbnails.clear()
+        """Clear all thumbnails."""
+        self.cell_model.clear()
+        self._data_by_cell.clear()
+        self.cell_thumbnails = []
         self.selected_cell_index = None
-        
-        # Clear grid layout
-        while self.grid_layout.count():
-            child = self.grid_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
     
     def update_statistics(self) -> None:
         """Update the statistics display."""
-        total_count = len(self.cell_thumbnails)
-        included_count = sum(1 for cell in self.cell_thumbnails if cell.is_included)
+        total_count = self.cell_model.rowCount()
+        included_count = self.cell_model.included_count()
         excluded_count = total_count - included_count
         
         self.total_cells_label.setText(f"Total: {total_count}")
@@ -431,11 +363,21 @@ class CellSelectionPreview(QWidget, LoggerMixin):
         # Enable/disable confirm button based on included count
         self.confirm_button.setEnabled(included_count > 0)
     
+    def on_view_clicked(self, index: QModelIndex) -> None:
+        """Handle a click on a thumbnail tile."""
+        if index.isValid():
+            self.on_thumbnail_clicked(index.data(CellListModel.CellIndexRole))
+    
+    def on_view_double_clicked(self, index: QModelIndex) -> None:
+        """Handle double-click on a tile to toggle inclusion."""
+        if index.isValid():
+            included = index.data(CellListModel.IncludedRole)
+            self.cell_model.setData(index, not included, CellListModel.IncludedRole)
+    
     def on_thumbnail_clicked(self, cell_index: int) -> None:
         """Handle thumbnail click."""
         # Update selected state
-        for widget in self.thumbnail_widgets:
-            widget.set_selected(widget.cell_data.cell_index == cell_index)
+        self.cell_model.set_selected_cell(cell_index)
         
         self.selected_cell_index = cell_index
         
@@ -447,10 +389,9 @@ class CellSelectionPreview(QWidget, LoggerMixin):
     def on_inclusion_changed(self, cell_index: int, is_included: bool) -> None:
         """Handle cell inclusion/exclusion change."""
         # Update data
-        for cell_data in self.cell_thumbnails:
-            if cell_data.cell_index == cell_index:
-                cell_data.is_included = is_included
-                break
+        cell_data = self._data_by_cell.get(cell_index)
+        if cell_data is not None:
+            cell_data.is_included = is_included
         
         # Update statistics
         self.update_statistics()
@@ -487,7 +428,4 @@ class CellSelectionPreview(QWidget, LoggerMixin):
         """Set the number of thumbnails per row."""
         if count > 0:
             self.thumbnails_per_row = count
-            # Rebuild layout if cells are loaded
-            if self.cell_thumbnails:
-                current_data = self.cell_thumbnails.copy()
-                self.load_cells(current_data) 
\ No newline at end of file
+            self._update_grid_width() 
\ No newline at end of file
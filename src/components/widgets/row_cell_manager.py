@@ -5,22 +5,73 @@ Provides interface for examining and managing individual cells within each selec
 Allows users to inspect cell quality and toggle cell inclusion/exclusion.
 """
 
-from typing import Optional, List, Dict, Any, Callable
+from typing import Optional, List, Dict, Any, Callable, Iterator, Mapping, Sequence
 from dataclasses import dataclass
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
-    QFrame, QScrollArea, QListWidget, QListWidgetItem,
-    QCheckBox, QSplitter, QTextEdit, QGroupBox, QSizePolicy
+    QFrame, QListView, QAbstractItemView,
+    QSplitter, QTextEdit, QGroupBox, QSizePolicy
 )
-from PySide6.QtCore import Signal, Qt, QSize
+from PySide6.QtCore import Signal, Qt, QSize, QModelIndex
 from PySide6.QtGui import QPixmap, QPainter, QColor, QFont, QMouseEvent, QImage
 import numpy as np
 
 from components.base.base_button import BaseButton, ButtonVariant, ButtonSize
+from components.widgets.cell_list_model import CellListModel, CellRowDelegate
 from config.design_tokens import Colors, Spacing, BorderRadius, Typography
 from utils.logging_config import LoggerMixin
 from utils.error_handler import error_handler
 from models.coordinate_transformer import CoordinateTransformer
+from services.thumbnail_service import ThumbnailService
+
+
+class CellMetadataView(Mapping):
+    """
+    Read-only mapping from cell index to a metadata dict, built on access.
+    
+    Holds only the cell indices and a row factory, so creating it costs the
+    same regardless of how many columns the cell table has; each dict is
+    built when a row is looked up (e.g. when it is displayed).
+    """
+    
+    def __init__(self, cell_indices: Sequence[int],
+                 row_factory: Callable[[int, int], Optional[Dict[str, Any]]]):
+        """
+        Args:
+            cell_indices: Cells covered by the view
+            row_factory: Builds the metadata of (cell_index, position in cell_indices)
+        """
+        self._cell_indices = cell_indices
+        self._row_factory = row_factory
+        self._positions: Optional[Dict[int, int]] = None
+    
+    @classmethod
+    def from_table(cls, table, cell_indices: Sequence[int]) -> 'CellMetadataView':
+        """View of DataFrame rows (by index label) for the given cells."""
+        return cls(cell_indices, lambda cell_index, position: table.loc[cell_index].to_dict())
+    
+    def _position(self, cell_index: int) -> Optional[int]:
+        if self._positions is None:
+            self._positions = {index: position for position, index in enumerate(self._cell_indices)}
+        return self._positions.get(cell_index)
+    
+    def __getitem__(self, cell_index: int) -> Dict[str, Any]:
+        position = self._position(cell_index)
+        if position is None:
+            raise KeyError(cell_index)
+        metadata = self._row_factory(cell_index, position)
+        if metadata is None:
+            raise KeyError(cell_index)
+        return metadata
+    
+    def __contains__(self, cell_index: object) -> bool:
+        return self._position(cell_index) is not None
+    
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._cell_indices)
+    
+    def __len__(self) -> int:
+        return len(self._cell_indices)
 
 
 @dataclass
@@ -30,165 +81,19 @@ class CellRowData:
     selection_label: str
     selection_color: str
     cell_indices: List[int]
-    cell_metadata: Dict[int, Dict[str, Any]] = None
+    cell_metadata: Mapping[int, Dict[str, Any]] = None  # dict or CellMetadataView
     
     def __post_init__(self):
         if self.cell_metadata is None:
             self.cell_metadata = {}
 
 
-class CellRowItem(QFrame, LoggerMixin):
-    """Individual cell item widget for row management."""
-    
-    # Signals
-    cell_toggled = Signal(int, bool)  # cell_index, is_included
-    cell_selected = Signal(int)  # cell_index
-    
-    def __init__(self, cell_index: int, cell_metadata: Dict[str, Any], 
-                 is_included: bool = True, parent: Optional[QWidget] = None):
-        super().__init__(parent)
-        
-        self.cell_index = cell_index
-        self.cell_metadata = cell_metadata
-        self.is_included = is_included
-        self._is_selected = False
-        
-        self.setup_ui()
-        self.update_appearance()
-    
-    def setup_ui(self) -> None:
-        """Set up the cell item UI."""
-        self.setFixedHeight(40)  # Reduced from 80 to 40 (50% reduction)
-        self.setFrameStyle(QFrame.StyledPanel)
-        self.setCursor(Qt.PointingHandCursor)
-        
-        layout = QHBoxLayout(self)
-        layout.setSpacing(8)  # Reduced spacing
-        layout.setContentsMargins(8, 4, 8, 4)  # Reduced margins
-        
-        # Inclusion checkbox
-        self.inclusion_checkbox = QCheckBox()
-        self.inclusion_checkbox.setChecked(self.is_included)
-        self.inclusion_checkbox.stateChanged.connect(self.on_inclusion_changed)
-        self.inclusion_checkbox.setToolTip("Include/exclude this cell from selection")
-        
-        # Cell info section - single line layout
-        # Cell index label
-        self.index_label = QLabel(f"Cell {self.cell_index}")
-        self.index_label.setStyleSheet("""
-            QLabel {
-                font-weight: 600;
-                font-size: 12px;
-                color: var(--foreground);
-            }
-        """)
-        
-        # Cell metadata display (simplified)
-        metadata_text = self._format_metadata_compact()
-        self.metadata_label = QLabel(metadata_text)
-        self.metadata_label.setStyleSheet("""
-            QLabel {
-                font-size: 10px;
-                color: var(--muted-foreground);
-                margin-left: 8px;
-            }
-        """)
-        
-        layout.addWidget(self.inclusion_checkbox)
-        layout.addWidget(self.index_label)
-        layout.addWidget(self.metadata_label)
-        layout.addStretch()
-        # Removed thumbnail_label (image button)
-    
-    def _format_metadata(self) -> str:
-        """Format cell metadata for display."""
-        if not self.cell_metadata:
-            return "No metadata available"
-        
-        parts = []
-        if 'area' in self.cell_metadata:
-            parts.append(f"Area: {self.cell_metadata['area']:.1f}")
-        if 'intensity' in self.cell_metadata:
-            parts.append(f"Intensity: {self.cell_metadata['intensity']:.1f}")
-        if 'perimeter' in self.cell_metadata:
-            parts.append(f"Perimeter: {self.cell_metadata['perimeter']:.1f}")
-        
-        return " | ".join(parts) if parts else "Cell properties available"
-    
-    def _format_metadata_compact(self) -> str:
-        """Format cell metadata for compact display."""
-        if not self.cell_metadata:
-            return ""
-        
-        # Show only the most important metric in compact form
-        if 'area' in self.cell_metadata:
-            return f"A:{self.cell_metadata['area']:.0f}"
-        elif 'intensity' in self.cell_metadata:
-            return f"I:{self.cell_metadata['intensity']:.0f}"
-        
-        return ""
-    
-    def set_thumbnail(self, pixmap: QPixmap) -> None:
-        """Set the thumbnail image for the cell."""
-        if pixmap and not pixmap.isNull():
-            scaled_pixmap = pixmap.scaled(
-                60, 60, 
-                Qt.KeepAspectRatio, 
-                Qt.SmoothTransformation
-            )
-            self.thumbnail_label.setPixmap(scaled_pixmap)
-    
-    def set_selected(self, selected: bool) -> None:
-        """Set the selected state of the cell item."""
-        self._is_selected = selected
-        self.update_appearance()
-    
-    def update_appearance(self) -> None:
-        """Update visual appearance based on state."""
-        if self._is_selected:
-            border_color = "var(--primary)"
-            background_color = "var(--primary)/10"
-        elif not self.is_included:
-            border_color = "var(--muted)"
-            background_color = "var(--muted)/30"
-        else:
-            border_color = "var(--border)"
-            background_color = "var(--background)"
-        
-        self.setStyleSheet(f"""
-            CellRowItem {{
-                border: 2px solid {border_color};
-                border-radius: 8px;
-                background-color: {background_color};
-            }}
-            CellRowItem:hover {{
-                border-color: var(--ring);
-                background-color: var(--accent);
-            }}
-        """)
-    
-    def on_inclusion_changed(self, state: int) -> None:
-        """Handle inclusion checkbox state change."""
-        self.is_included = bool(state)
-        self.cell_toggled.emit(self.cell_index, self.is_included)
-        self.update_appearance()
-        
-        status = "included" if self.is_included else "excluded"
-        self.log_info(f"Cell {self.cell_index} {status}")
-    
-    def mousePressEvent(self, event) -> None:
-        """Handle mouse press events."""
-        if event.button() == Qt.LeftButton:
-            self.cell_selected.emit(self.cell_index)
-        super().mousePressEvent(event)
-
-
 class RowCellManager(QWidget, LoggerMixin):
     """
     Row-by-Row Cell Management Interface.
     
     Provides functionality to:
-    - Display individual cells within a selected row/selection
+    - Display individual cells within a selected row/selection (virtualized list)
     - Allow inclusion/exclusion of specific cells
     - Show cell metadata and thumbnails
     - Navigate to cells in main image view
@@ -196,22 +101,35 @@ class RowCellManager(QWidget, LoggerMixin):
     
     # Signals
     cell_inclusion_changed = Signal(str, int, bool)  # selection_id, cell_index, is_included
+    cells_inclusion_changed = Signal(str, list, bool)  # selection_id, cell_indices, is_included (bulk)
     cell_navigation_requested = Signal(int)  # cell_index for main image navigation
     row_management_closed = Signal()
     
+    # Edge length of the image region shown around a cell
+    CELL_CROP_SIZE = 100
+    # Requested thumbnail size (the cell image label)
+    CELL_IMAGE_SIZE = 256
+    # Cells whose images are generated ahead when a row is loaded / a cell is selected
+    PREFETCH_ON_LOAD = 32
+    PREFETCH_AHEAD = 8
+    
     def __init__(self, 
                  image_handler=None, 
                  csv_parser=None, 
                  coordinate_transformer: Optional[CoordinateTransformer] = None,
-                 parent: Optional[QWidget] = None):
+                 parent: Optional[QWidget] = None,
+                 thumbnail_service: Optional[ThumbnailService] = None):
         super().__init__(parent)
         
         self.image_handler = image_handler
         self.csv_parser = csv_parser
         self.coordinate_transformer = coordinate_transformer
+        self.thumbnail_service = thumbnail_service
+        if thumbnail_service is not None:
+            thumbnail_service.thumbnail_ready.connect(self.on_thumbnail_ready)
         
         self.current_row_data: Optional[CellRowData] = None
-        self.cell_items: List[CellRowItem] = []
+        self.cell_model = CellListModel(metadata_provider=self._cell_metadata, parent=self)
         self.selected_cell_index: Optional[int] = None
         
         self.setup_ui()
@@ -340,21 +258,19 @@ class RowCellManager(QWidget, LoggerMixin):
         
         list_layout.addLayout(self.stats_layout)
         
-        # Scrollable cell list
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        scroll_area.setMinimumHeight(300)
+        # Cell list; only visible rows are painted by the delegate
+        self.cell_list_view = QListView()
+        self.cell_list_view.setModel(self.cell_model)
+        self.cell_list_view.setItemDelegate(CellRowDelegate(self.cell_list_view))
+        self.cell_list_view.setUniformItemSizes(True)
+        self.cell_list_view.setSpacing(2)
+        self.cell_list_view.setSelectionMode(QAbstractItemView.NoSelection)
+        self.cell_list_view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.cell_list_view.setMouseTracking(True)
+        self.cell_list_view.setMinimumHeight(300)
+        self.cell_list_view.setCursor(Qt.PointingHandCursor)
         
-        self.cell_list_widget = QWidget()
-        self.cell_list_layout = QVBoxLayout(self.cell_list_widget)
-        self.cell_list_layout.setSpacing(4)
-        self.cell_list_layout.setContentsMargins(0, 0, 0, 0)
-        self.cell_list_layout.addStretch()  # Push items to top
-        
-        scroll_area.setWidget(self.cell_list_widget)
-        list_layout.addWidget(scroll_area)
+        list_layout.addWidget(self.cell_list_view)
         
         splitter.addWidget(list_frame)
     
@@ -465,6 +381,8 @@ class RowCellManager(QWidget, LoggerMixin):
         self.select_all_button.clicked.connect(self.on_select_all_clicked)
         self.exclude_all_button.clicked.connect(self.on_exclude_all_clicked)
         self.close_button.clicked.connect(self.on_close_clicked)
+        self.cell_list_view.clicked.connect(self.on_cell_clicked)
+        self.cell_model.inclusion_changed.connect(self.on_cell_toggled)
     
     @error_handler("Loading row data")
     def load_row_data(self, row_data: CellRowData) -> None:
@@ -481,36 +399,21 @@ class RowCellManager(QWidget, LoggerMixin):
             f"Selection: {row_data.selection_label} ({len(row_data.cell_indices)} cells)"
         )
         
-        # Clear existing cell items
+        # Clear existing cells and show the new ones (metadata is fetched per visible row)
         self.clear_cell_items()
-        
-        # Create cell items
-        for cell_index in row_data.cell_indices:
-            cell_metadata = row_data.cell_metadata.get(cell_index, {})
-            cell_item = CellRowItem(cell_index, cell_metadata, is_included=True)
-            
-            # Connect signals
-            cell_item.cell_toggled.connect(self.on_cell_toggled)
-            cell_item.cell_selected.connect(self.on_cell_selected)
-            
-            # Add to layout (before stretch)
-            self.cell_list_layout.insertWidget(
-                self.cell_list_layout.count() - 1, 
-                cell_item
-            )
-            self.cell_items.append(cell_item)
+        self.cell_model.set_cells(row_data.cell_indices)
         
         # Update statistics
         self.update_statistics()
         
+        # Generate the first cell images in the background
+        self.prefetch_cell_images(row_data.cell_indices[:self.PREFETCH_ON_LOAD])
+        
         self.log_info(f"Loaded row data: {row_data.selection_label} with {len(row_data.cell_indices)} cells")
     
     def clear_cell_items(self) -> None:
-        """Clear all cell items."""
-        for item in self.cell_items:
-            item.deleteLater()
-        
-        self.cell_items.clear()
+        """Clear all cells."""
+        self.cell_model.clear()
         self.selected_cell_index = None
         self.selected_cell_label.setText("No cell selected")
         self.cell_image_label.setText("Click a cell to view its image")
@@ -522,23 +425,28 @@ class RowCellManager(QWidget, LoggerMixin):
         if not self.current_row_data:
             return
         
-        total_count = len(self.cell_items)
-        included_count = sum(1 for item in self.cell_items if item.is_included)
+        total_count = self.cell_model.rowCount()
+        included_count = self.cell_model.included_count()
         excluded_count = total_count - included_count
         
         self.total_cells_label.setText(f"Total: {total_count}")
         self.included_cells_label.setText(f"Included: {included_count}")
         self.excluded_cells_label.setText(f"Excluded: {excluded_count}")
     
+    def _cell_metadata(self, cell_index: int) -> Optional[Dict[str, Any]]:
+        """Metadata of a cell, looked up when its row is first displayed."""
+        if self.current_row_data and cell_index in self.current_row_data.cell_metadata:
+            return self.current_row_data.cell_metadata[cell_index]
+        if not self.csv_parser:
+            return None
+        
+        cell_data = self.csv_parser.get_data_by_index(cell_index)
+        return cell_data.to_dict() if cell_data is not None else None
+    
     def on_cell_toggled(self, cell_index: int, is_included: bool) -> None:
-        """Handle cell item inclusion toggle."""
-        # Find the corresponding cell item and explicitly update its state.
-        # This ensures the manager and the item are always in sync.
-        for item in self.cell_items:
-            if item.cell_index == cell_index:
-                item.is_included = is_included
-                item.update_appearance() # Visually reflect the change
-                break
+        """Handle cell inclusion toggle."""
+        # Keep the model in sync when called directly (no-op for model edits)
+        self.cell_model.set_included(cell_index, is_included, notify=False)
         
         self.update_statistics()
         
@@ -553,11 +461,18 @@ class RowCellManager(QWidget, LoggerMixin):
         status = "included" if is_included else "excluded"
         self.log_info(f"Cell {cell_index} {status}")
     
+    def on_cell_clicked(self, index: QModelIndex) -> None:
+        """Handle a click on a cell row."""
+        if index.isValid():
+            self.on_cell_selected(index.data(CellListModel.CellIndexRole))
+    
     def on_cell_selected(self, cell_index: int) -> None:
         """Handle cell selection."""
         # Update visual selection
-        for item in self.cell_items:
-            item.set_selected(item.cell_index == cell_index)
+        self.cell_model.set_selected_cell(cell_index)
+        index = self.cell_model.index_of(cell_index)
+        if index.isValid():
+            self.cell_list_view.scrollTo(index)
         
         self.selected_cell_index = cell_index
         
@@ -567,6 +482,13 @@ class RowCellManager(QWidget, LoggerMixin):
         # Load and display cell image
         self.load_cell_image(cell_index)
         
+        # Prepare images of the next cells in the row
+        position = self.cell_model.row_of(cell_index)
+        if position is not None:
+            self.prefetch_cell_images(
+                self.cell_model.cell_indices[position + 1:position + 1 + self.PREFETCH_AHEAD]
+            )
+        
         self.navigate_button.setEnabled(True)
         
         self.log_info(f"Cell {cell_index} selected")
@@ -602,6 +524,52 @@ class RowCellManager(QWidget, LoggerMixin):
         return QPixmap.fromImage(image.copy())
 
 
+    def _cell_region(self, cell_index: int) -> Optional[tuple]:
+        """Image region (min_x, min_y, max_x, max_y) shown for a cell."""
+        pixel_coords = self.get_cell_coordinates(cell_index)
+        if pixel_coords is None:
+            return None
+        
+        pixel_x, pixel_y = int(pixel_coords[0]), int(pixel_coords[1])
+        half = self.CELL_CROP_SIZE // 2
+        return (pixel_x - half, pixel_y - half,
+                pixel_x - half + self.CELL_CROP_SIZE, pixel_y - half + self.CELL_CROP_SIZE)
+    
+    def _sync_thumbnail_image(self) -> bool:
+        """Point the thumbnail service at the handler's current image."""
+        image_data = getattr(self.image_handler, 'image_data', None)
+        if self.thumbnail_service is None or image_data is None:
+            return False
+        self.thumbnail_service.set_image(
+            image_data, getattr(self.image_handler, 'current_file_path', None)
+        )
+        return True
+    
+    def prefetch_cell_images(self, cell_indices: List[int]) -> None:
+        """Queue background generation of cell images that are likely to be viewed."""
+        if not cell_indices or not self._sync_thumbnail_image():
+            return
+        
+        regions = []
+        for cell_index in cell_indices:
+            region = self._cell_region(cell_index)
+            if region is not None:
+                regions.append((cell_index, region))
+        self.thumbnail_service.prefetch(regions, self.CELL_IMAGE_SIZE)
+    
+    def on_thumbnail_ready(self, cell_index: int, size: int, image: QImage) -> None:
+        """Show a background-generated image if it belongs to the selected cell."""
+        if size == self.CELL_IMAGE_SIZE and cell_index == self.selected_cell_index:
+            self._show_cell_pixmap(QPixmap.fromImage(image))
+    
+    def _show_cell_pixmap(self, pixmap: QPixmap) -> None:
+        """Display a cell image scaled to the image panel."""
+        self.cell_image_label.setPixmap(pixmap.scaled(
+            self.cell_image_label.size(),
+            Qt.KeepAspectRatio,
+            Qt.SmoothTransformation
+        ))
+    
     def load_cell_image(self, cell_index: int) -> None:
         """Load and display the image for a specific cell."""
         if not self.image_handler or not self.current_row_data:
@@ -609,6 +577,21 @@ class RowCellManager(QWidget, LoggerMixin):
             return
 
         try:
+            if self._sync_thumbnail_image():
+                region = self._cell_region(cell_index)
+                if region is None:
+                    self.cell_image_label.setText(f"No coordinates for cell {cell_index}")
+                    return
+                
+                image = self.thumbnail_service.request(cell_index, region, self.CELL_IMAGE_SIZE)
+                if image is not None:
+                    self._show_cell_pixmap(QPixmap.fromImage(image))
+                else:
+                    # Delivered through on_thumbnail_ready
+                    self.cell_image_label.setPixmap(QPixmap())
+                    self.cell_image_label.setText(f"Loading image\nfor cell {cell_index}...")
+                return
+            
             pixel_coords = self.get_cell_coordinates(cell_index)
 
             if pixel_coords is None:
@@ -618,7 +601,7 @@ class RowCellManager(QWidget, LoggerMixin):
             pixel_x, pixel_y = pixel_coords
 
             # Get cropped image
-            crop_size = 100  # pixels
+            crop_size = self.CELL_CROP_SIZE  # pixels
             cropped_image_np = self.image_handler.get_image_region(
                 int(pixel_x), int(pixel_y), crop_size, crop_size
             )
@@ -626,11 +609,7 @@ class RowCellManager(QWidget, LoggerMixin):
             if cropped_image_np is not None:
                 pixmap = self._numpy_to_qpixmap(cropped_image_np)
                 if not pixmap.isNull():
-                    self.cell_image_label.setPixmap(pixmap.scaled(
-                        self.cell_image_label.size(),
-                        Qt.KeepAspectRatio,
-                        Qt.SmoothTransformation
-                    ))
+                    self._show_cell_pixmap(pixmap)
                 else:
                     self.cell_image_label.setText(f"Could not display\nimage for cell {cell_index}")
             else:
@@ -667,20 +646,24 @@ class RowCellManager(QWidget, LoggerMixin):
     
     def on_select_all_clicked(self) -> None:
         """Handle select all cells click."""
-        for item in self.cell_items:
-            if not item.is_included:
-                item.inclusion_checkbox.setChecked(True)
-        
+        self._set_all_included(True)
         self.log_info("All cells included")
     
     def on_exclude_all_clicked(self) -> None:
         """Handle exclude all cells click."""
-        for item in self.cell_items:
-            if item.is_included:
-                item.inclusion_checkbox.setChecked(False)
-        
+        self._set_all_included(False)
         self.log_info("All cells excluded")
     
+    def _set_all_included(self, is_included: bool) -> None:
+        """Change every cell in one model update and report the changed cells at once."""
+        changed_cells = self.cell_model.set_all_included(is_included)
+        self.update_statistics()
+        
+        if self.current_row_data and changed_cells:
+            self.cells_inclusion_changed.emit(
+                self.current_row_data.selection_id, changed_cells, is_included
+            )
+    
     def get_cell_coordinates(self, cell_index: int) -> Optional[tuple[int, int]]:
         """Get transformed coordinates for a given cell index."""
         if not self.csv_parser:
@@ -719,8 +702,8 @@ class RowCellManager(QWidget, LoggerMixin):
     
     def get_included_cells(self) -> List[int]:
         """Get list of included cell indices."""
-        return [item.cell_index for item in self.cell_items if item.is_included]
+        return self.cell_model.included_cells()
     
     def get_excluded_cells(self) -> List[int]:
         """Get list of excluded cell indices."""
-        return [item.cell_index for item in self.cell_items if not item.is_included] 
\ No newline at end of file
+        return self.cell_model.excluded_cells()
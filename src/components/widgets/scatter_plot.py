@@ -14,18 +14,17 @@ from PySide6.QtWidgets import (
     QTabWidget, QSplitter, QCheckBox, QDialog, QListWidget, QListWidgetItem,
     QDialogButtonBox
 )
-from PySide6.QtCore import Signal, QObject, Qt
-
-import matplotlib
-matplotlib.use('Qt5Agg')
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-from matplotlib.widgets import RectangleSelector
-import matplotlib.pyplot as plt
+from PySide6.QtCore import Signal, QObject, Qt, QTimer
 
+from utils.lazy_import import lazy_getattr
 from utils.logging_config import LoggerMixin
 from utils.error_handler import error_handler
 
+# matplotlib is imported with the first canvas, after the window is shown
+__getattr__ = lazy_getattr(__name__, globals(), {
+    'ScatterPlotCanvas': 'components.widgets.scatter_plot_canvas',
+})
+
 
 class ColumnSelectionDialog(QDialog):
     """다이얼로그를 통한 컬럼 선택 위젯"""
@@ -160,407 +159,6 @@ class CustomAxisComboBox(QPushButton):
                 self.setCurrentText(new_selection)
 
 
-class ScatterPlotCanvas(FigureCanvas, LoggerMixin):
-    """
-    Matplotlib canvas for interactive scatter plots with rectangle selection.
-    """
-    
-    # Signals
-    selection_changed = Signal(list)  # List of selected indices
-    
-    def __init__(self, parent=None, width=10, height=8, dpi=100):
-        self.figure = Figure(figsize=(width, height), dpi=dpi)
-        self.axes = self.figure.add_subplot(111)
-        
-        super().__init__(self.figure)
-        self.setParent(parent)
-        
-        # Set minimum size for the canvas
-        self.setMinimumSize(600, 480)  # 10*60 x 8*60 pixels minimum
-        
-        # Data storage
-        self.x_data: Optional[np.ndarray] = None
-        self.y_data: Optional[np.ndarray] = None
-        self.scatter_plot = None
-        self.selected_indices: List[int] = []
-        
-        # Selection tool
-        self.rectangle_selector: Optional[RectangleSelector] = None
-        self.selection_enabled = False
-        self.point_selection_enabled = False
-        
-        # Prevent infinite signal loops
-        self._updating_highlights = False
-        
-        # Multiple selection mode management
-        self._multiple_selection_mode = False
-        self._current_selections: Dict[str, Dict[str, Any]] = {}  # Track multiple selections
-        
-        # Mouse events connected for rectangle selection only
-        
-        # Color configuration - will be set by theme manager
-        self.theme_manager = None  # Will be injected
-        self.default_color = '#1f77b4'  # matplotlib default blue
-        self.selected_color = '#ff7f0e'  # orange for selected points
-        self.expression_color = '#2ca02c'  # green for expression selection
-        self.point_size = 20
-        self.point_alpha = 0.6
-        
-        # Setup figure style
-        self.figure.patch.set_facecolor('white')
-        self.axes.set_facecolor('white')
-        self.figure.tight_layout()
-        
-        self.log_info("Scatter plot canvas initialized")
-    
-    @error_handler("Plotting scatter data")
-    def plot_data(self, x_data: np.ndarray, y_data: np.ndarray, 
-                  x_label: str = "X", y_label: str = "Y", 
-                  x_log: bool = False, y_log: bool = False) -> None:
-        """
-        Plot scatter data on the canvas.
-        
-        Args:
-            x_data: X coordinate data
-            y_data: Y coordinate data  
-            x_label: Label for X axis
-            y_label: Label for Y axis
-            x_log: Whether to use log scale for X axis
-            y_log: Whether to use log scale for Y axis
-        """
-        self.x_data = x_data
-        self.y_data = y_data
-        self.selected_indices = []
-        
-        # Reset multiple selection state when creating new plot
-        self._multiple_selection_mode = False
-        self._current_selections.clear()
-        
-        # Clear previous plot
-        self.axes.clear()
-        
-        # Create scatter plot
-        self.scatter_plot = self.axes.scatter(
-            x_data, y_data,
-            c=self.default_color,
-            s=self.point_size,
-            alpha=self.point_alpha,
-            edgecolors='none'
-        )
-        
-        # Set log scales if requested
-        if x_log:
-            self.axes.set_xscale('log')
-        if y_log:
-            self.axes.set_yscale('log')
-        
-        # Set labels and title
-        self.axes.set_xlabel(x_label, fontsize=11)
-        self.axes.set_ylabel(y_label, fontsize=11)
-        self.axes.set_title(f"{y_label} vs {x_label}", fontsize=12, fontweight='bold')
-        
-        # Style the plot
-        self.axes.grid(True, alpha=0.3)
-        self.axes.spines['top'].set_visible(False)
-        self.axes.spines['right'].set_visible(False)
-        
-        # Refresh canvas
-        self.figure.tight_layout()
-        self.draw()
-        
-        self.log_info(f"Plotted {len(x_data):,} data points (X log: {x_log}, Y log: {y_log})")
-    
-    def enable_rectangle_selection(self, enabled: bool = True) -> None:
-        """
-        Enable or disable rectangle selection tool.
-        
-        Args:
-            enabled: Whether to enable selection
-        """
-        if enabled and self.x_data is not None:
-            if self.rectangle_selector is None:
-                self.rectangle_selector = RectangleSelector(
-                    self.axes,
-                    self._on_rectangle_select,
-                    useblit=True,
-                    button=[1],  # Left mouse button
-                    minspanx=5, minspany=5,  # Minimum selection size
-                    spancoords='pixels',
-                    interactive=True
-                )
-            self.rectangle_selector.set_active(True)
-            self.selection_enabled = True
-            self.log_info("Rectangle selection enabled")
-        else:
-            if self.rectangle_selector:
-                self.rectangle_selector.set_active(False)
-            self.selection_enabled = False
-            self.log_info("Rectangle selection disabled")
-    
-    # Point selection removed as per design specification
-    
-    def _on_mouse_click(self, event) -> None:
-        """
-        Handle mouse click events for point selection.
-        
-        Args:
-            event: Mouse click event
-        """
-        if not self.point_selection_enabled or event.inaxes != self.axes:
-            return
-        
-        if self.x_data is None or self.y_data is None:
-            return
-        
-        # Find the closest point to the click
-        if event.xdata is None or event.ydata is None:
-            return
-        
-        # Calculate distances to all points
-        distances = np.sqrt((self.x_data - event.xdata)**2 + (self.y_data - event.ydata)**2)
-        
-        # Find the closest point
-        closest_idx = np.argmin(distances)
-        
-        # Check if the click is close enough (within reasonable distance)
-        # Convert to display coordinates for distance check
-        xy_pixels = self.axes.transData.transform(np.column_stack([self.x_data, self.y_data]))
-        click_pixels = self.axes.transData.transform([event.xdata, event.ydata])
-        
-        distances_pixels = np.sqrt(np.sum((xy_pixels - click_pixels)**2, axis=1))
-        
-        # Only select if click is within 10 pixels of the point
-        if distances_pixels[closest_idx] <= 10:
-            # Toggle selection of the clicked point
-            if closest_idx in self.selected_indices:
-                self.selected_indices.remove(closest_idx)
-                self.log_info(f"Deselected point {closest_idx}")
-            else:
-                self.selected_indices.append(closest_idx)
-                self.log_info(f"Selected point {closest_idx}")
-            
-            # Update visual highlighting
-            self._update_selection_visual()
-            
-            # Emit signal
-            self.selection_changed.emit(self.selected_indices)
-            
-            self.log_info(f"Point selection: {len(self.selected_indices)} points selected")
-    
-    def _on_rectangle_select(self, eclick, erelease) -> None:
-        """
-        Handle rectangle selection callback.
-        
-        Args:
-            eclick: Mouse button press event
-            erelease: Mouse button release event
-        """
-        if self.x_data is None or self.y_data is None:
-            return
-        
-        # Get rectangle bounds
-        x1, x2 = sorted([eclick.xdata, erelease.xdata])
-        y1, y2 = sorted([eclick.ydata, erelease.ydata])
-        
-        # Find points within rectangle
-        mask = ((self.x_data >= x1) & (self.x_data <= x2) & 
-                (self.y_data >= y1) & (self.y_data <= y2))
-        
-        self.selected_indices = np.where(mask)[0].tolist()
-        
-        # Exit multiple selection mode when making new rectangle selection
-        self._multiple_selection_mode = False
-        self._current_selections.clear()
-        
-        # Set flag to prevent _update_selection_visual from emitting signals
-        self._updating_highlights = True
-        
-        # Update visual highlighting (without signal emission)
-        self._update_selection_visual()
-        
-        # Reset flag
-        self._updating_highlights = False
-        
-        # Clear the rectangle selector to remove the visual rectangle
-        if self.rectangle_selector:
-            self.rectangle_selector.set_visible(False)
-            self.draw_idle()
-        
-        # Emit signal only once
-        self.selection_changed.emit(self.selected_indices)
-        
-        self.log_info(f"Selected {len(self.selected_indices)} points in rectangle")
-    
-    def _update_selection_visual(self) -> None:
-        """Update visual highlighting of selected points."""
-        if self.scatter_plot is None or self.x_data is None:
-            return
-        
-        # If in multiple selection mode, don't override existing colors
-        if self._multiple_selection_mode and self._current_selections:
-            self.log_info("Skipping visual update - multiple selection mode active")
-            return
-        
-        # Reset all colors to default
-        colors = [self.default_color] * len(self.x_data)
-        
-        # Highlight selected points
-        for idx in self.selected_indices:
-            if 0 <= idx < len(colors):
-                colors[idx] = self.selected_color
-        
-        # Update scatter plot colors
-        self.scatter_plot.set_color(colors)
-        self.draw_idle()
-        
-        # Don't emit signals during programmatic updates to avoid infinite loops
-        if not self._updating_highlights:
-            self.selection_changed.emit(self.selected_indices)
-    
-    def highlight_points(self, indices: List[int], color: str = None) -> None:
-        """
-        Highlight specific points with a given color.
-        
-        Args:
-            indices: List of point indices to highlight
-            color: Color for highlighting (defaults to selected_color)
-        """
-        if self.scatter_plot is None or self.x_data is None:
-            return
-        
-        if color is None:
-            color = self.selected_color
-        
-        # Set flag to prevent signal emission (avoid infinite loops)
-        self._updating_highlights = True
-        
-        # Exit multiple selection mode when switching to single selection
-        self._multiple_selection_mode = False
-        self._current_selections.clear()
-        
-        self.selected_indices = indices
-        
-        # Update visual highlighting with custom color
-        colors = [self.default_color] * len(self.x_data)
-        for idx in self.selected_indices:
-            if 0 <= idx < len(colors):
-                colors[idx] = color
-        
-        # Update scatter plot colors
-        self.scatter_plot.set_color(colors)
-        self.draw_idle()
-        
-        # Reset flag
-        self._updating_highlights = False
-        
-        self.log_info(f"Highlighted {len(indices)} points with color {color}")
-    
-    def highlight_multiple_selections(self, selections: Dict[str, Dict[str, Any]]) -> None:
-        """
-        Highlight multiple selections with different colors.
-        
-        Args:
-            selections: Dictionary with selection_id as key and dict with 'indices' and 'color' as value
-        """
-        if self.scatter_plot is None or self.x_data is None:
-            return
-        
-        # If selections is empty, clear all selections
-        if not selections:
-            self.clear_selection()
-            return
-        
-        # Set flag to prevent signal emission (avoid infinite loops)
-        self._updating_highlights = True
-        
-        # Enable multiple selection mode
-        self._multiple_selection_mode = len(selections) > 1
-        self._current_selections = selections.copy()
-        
-        # Reset all colors to default
-        colors = [self.default_color] * len(self.x_data)
-        
-        # Apply colors for each selection (later selections will override earlier ones if there are conflicts)
-        all_selected_indices = []
-        for selection_id, selection_data in selections.items():
-            indices = selection_data.get('indices', [])
-            color = selection_data.get('color', self.selected_color)
-            all_selected_indices.extend(indices)
-            
-            for idx in indices:
-                if 0 <= idx < len(colors):
-                    colors[idx] = color
-        
-        # Only update selected_indices if not in multiple selection mode
-        # This prevents single-selection methods from overriding multiple selections
-        if not self._multiple_selection_mode:
-            self.selected_indices = all_selected_indices
-        else:
-            # Clear single selection state when in multiple selection mode
-            self.selected_indices = []
-        
-        # Update scatter plot colors
-        self.scatter_plot.set_color(colors)
-        self.draw_idle()
-        
-        # Reset flag
-        self._updating_highlights = False
-        
-        total_highlighted = sum(len(sel_data.get('indices', [])) for sel_data in selections.values())
-        self.log_info(f"Highlighted {total_highlighted} points across {len(selections)} selections")
-    
-    def clear_selection(self) -> None:
-        """Clear current selection and reset all visual highlighting."""
-        if self.scatter_plot is None or self.x_data is None:
-            return
-        
-        # Set flag to prevent signal emission
-        self._updating_highlights = True
-        
-        # Clear all selection states
-        self.selected_indices = []
-        self._multiple_selection_mode = False
-        self._current_selections.clear()
-        
-        # Reset all colors to default
-        colors = [self.default_color] * len(self.x_data)
-        self.scatter_plot.set_color(colors)
-        self.draw_idle()
-        
-        # Reset flag
-        self._updating_highlights = False
-        
-        self.log_info("Cleared all selections and highlighting")
-    
-    def get_selected_indices(self) -> List[int]:
-        """
-        Get currently selected point indices.
-        
-        Returns:
-            List of selected point indices
-        """
-        return self.selected_indices.copy()
-    
-    def export_plot(self, file_path: str, dpi: int = 300) -> bool:
-        """
-        Export the current plot to an image file.
-        
-        Args:
-            file_path: Output file path
-            dpi: Image resolution
-        
-        Returns:
-            True if successful, False otherwise
-        """
-        try:
-            self.figure.savefig(file_path, dpi=dpi, bbox_inches='tight')
-            self.log_info(f"Plot exported to {file_path}")
-            return True
-        except Exception as e:
-            self.log_error(f"Failed to export plot: {e}")
-            return False
-
-
 class ScatterPlotWidget(QWidget, LoggerMixin):
     """
     Complete scatter plot widget with controls and interactive canvas.
@@ -578,6 +176,7 @@ class ScatterPlotWidget(QWidget, LoggerMixin):
         # Data storage
         self.data: Optional[pd.DataFrame] = None
         self.available_columns: List[str] = []
+        self._canvas = None
         
         # UI setup
         self.setup_ui()
@@ -593,15 +192,33 @@ class ScatterPlotWidget(QWidget, LoggerMixin):
         controls_panel = self._create_controls_panel()
         layout.addWidget(controls_panel)
         
-        # Main content area
-        self.canvas = ScatterPlotCanvas(self)
-        layout.addWidget(self.canvas)
+        # Main content area: the canvas is created on first use or once the
+        # event loop runs, so the window is shown before matplotlib loads
+        QTimer.singleShot(0, self, self._ensure_canvas)
         
         # Initially disable controls
         self.x_combo.setEnabled(False)
         self.y_combo.setEnabled(False)
         self.rect_button.setEnabled(False)
     
+    @property
+    def canvas(self) -> 'ScatterPlotCanvas':
+        """Matplotlib canvas, created on first access."""
+        return self._ensure_canvas()
+    
+    @canvas.setter
+    def canvas(self, canvas: 'ScatterPlotCanvas') -> None:
+        self._canvas = canvas
+    
+    def _ensure_canvas(self) -> 'ScatterPlotCanvas':
+        """Create the canvas below the controls if it does not exist yet."""
+        if self._canvas is None:
+            ScatterPlotCanvas = __getattr__('ScatterPlotCanvas')
+            self._canvas = ScatterPlotCanvas(self)
+            self.layout().addWidget(self._canvas)
+            self._canvas.selection_changed.connect(self._on_selection_changed)
+        return self._canvas
+    
     def _create_controls_panel(self) -> QWidget:
         """Create the controls panel."""
         panel = QWidget()
@@ -703,7 +320,6 @@ class ScatterPlotWidget(QWidget, LoggerMixin):
     def connect_signals(self) -> None:
         """Connect widget signals."""
         self.rect_button.toggled.connect(self.toggle_rectangle_selection)
-        self.canvas.selection_changed.connect(self._on_selection_changed)
         
         # Connect custom combo boxes - auto refresh plot when axis changes
         self.x_combo.currentTextChanged.connect(lambda text: self.create_plot())
@@ -824,10 +440,10 @@ class ScatterPlotWidget(QWidget, LoggerMixin):
         """
         # Skip signal emission if we're updating highlights programmatically
         if self.canvas._updating_highlights:
-            self.log_info(f"Skipping signal emission during programmatic highlight update: {len(indices)} points")
+            self.log_debug(f"Skipping signal emission during programmatic highlight update: {len(indices)} points")
             return
             
-        self.log_info(f"Selection changed: {len(indices)} points selected")
+        self.log_throttled("selection_changed", f"Selection changed: {len(indices)} points selected")
         
         # Determine selection method based on active tool
         method = "unknown"
@@ -6,8 +6,8 @@ Selection management panel with table view and well plate visualization.
 
 from typing import Optional, List, Dict, Any
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
-    QHeaderView, QPushButton, QLabel, QCheckBox, QFrame, QSplitter,
+    QWidget, QVBoxLayout, QHBoxLayout,
+    QHeaderView, QPushButton, QLabel, QFrame, QSplitter,
     QComboBox, QLineEdit, QMessageBox, QSizePolicy, QColorDialog, QAbstractItemView
 )
 from PySide6.QtCore import Signal, Qt
@@ -20,7 +20,10 @@ from PySide6.QtWidgets import QFrame as QtFrame, QHeaderView as QtHeaderView, QA
 from PySide6.QtWidgets import QMessageBox as QtMessageBox
 
 from components.widgets.well_plate import WellPlateWidget
-from components.widgets.row_cell_manager import RowCellManager, CellRowData
+from components.widgets.row_cell_manager import RowCellManager, CellRowData, CellMetadataView
+from components.widgets.selection_table_model import (
+    SelectionTableModel, SelectionTableView, CheckBoxDelegate, ColorChipDelegate, DeleteButtonDelegate
+)
 from components.base.base_button import BaseButton
 from components.dialogs.custom_color_dialog import CustomColorDialog
 from components.dialogs.well_selection_dialog import WellSelectionDialog
@@ -135,7 +138,7 @@ class SelectionPanel(QWidget, LoggerMixin):
         table_layout.addWidget(table_header)
         
         # Selection table
-        self.selection_table = QTableWidget()
+        self.selection_table = SelectionTableView()
         self.setup_table()
         table_layout.addWidget(self.selection_table)
         
@@ -281,9 +284,18 @@ class SelectionPanel(QWidget, LoggerMixin):
     
     def setup_table(self) -> None:
         """Setup the selection table with proper headers and behavior."""
-        headers = ["", "Label", "Color", "Well", "Cells", "Delete"]
-        self.selection_table.setColumnCount(len(headers))
-        self.selection_table.setHorizontalHeaderLabels(headers)
+        # Rows are painted from selections_data by the model and delegates
+        self.table_model = SelectionTableModel(color_name=self._get_color_name, parent=self)
+        self.selection_table.setModel(self.table_model)
+        
+        self.color_delegate = ColorChipDelegate(self.selection_table)
+        self.delete_delegate = DeleteButtonDelegate(self.selection_table)
+        self.selection_table.setItemDelegateForColumn(
+            SelectionTableModel.ENABLED_COLUMN, CheckBoxDelegate(self.selection_table)
+        )
+        self.selection_table.setItemDelegateForColumn(SelectionTableModel.COLOR_COLUMN, self.color_delegate)
+        self.selection_table.setItemDelegateForColumn(SelectionTableModel.DELETE_COLUMN, self.delete_delegate)
+        self.selection_table.setMouseTracking(True)  # Delete button hover
         
         # Configure headers
         header = self.selection_table.horizontalHeader()
@@ -314,11 +326,18 @@ class SelectionPanel(QWidget, LoggerMixin):
     
     def connect_signals(self) -> None:
         """Connect widget signals."""
-        self.selection_table.cellChanged.connect(self.on_table_cell_changed)
-        # Re-enable itemSelectionChanged to update delete button state
-        self.selection_table.itemSelectionChanged.connect(self.on_table_selection_changed)
+        self.table_model.enabled_changed.connect(self.on_enabled_changed)
+        self.table_model.field_edited.connect(self.on_selection_field_edited)
+        self.color_delegate.clicked.connect(self.on_color_clicked)
+        self.delete_delegate.clicked.connect(self.delete_selection)
+        # Update delete button state on row selection changes
+        self.selection_table.selectionModel().selectionChanged.connect(
+            lambda selected, deselected: self.on_table_selection_changed()
+        )
         self.well_plate.well_clicked.connect(self.on_well_clicked)
-        self.selection_table.cellDoubleClicked.connect(self.on_table_cell_double_clicked)
+        self.selection_table.doubleClicked.connect(
+            lambda index: self.on_table_cell_double_clicked(index.row(), index.column())
+        )
     
     @error_handler("Loading selections data")
     def load_selections(self, selections: List['CellSelection']) -> None:
@@ -346,154 +365,13 @@ class SelectionPanel(QWidget, LoggerMixin):
         self.log_info(f"{len(selections)} selections loaded into the panel.")
     
     def refresh_table(self) -> None:
-        """Refresh the selection table display."""
-        # Store current row count to check if we need to add/remove rows
-        current_row_count = self.selection_table.rowCount()
-        new_row_count = len(self.selections_data)
-        
-        # Update row count if needed
-        self.selection_table.setRowCount(new_row_count)
-        
-        for row, (selection_id, data) in enumerate(self.selections_data.items()):
-            # Check if checkbox already exists to avoid recreating it
-            existing_container = self.selection_table.cellWidget(row, 0)
-            existing_checkbox = None
-            
-            if existing_container:
-                existing_checkboxes = existing_container.findChildren(QCheckBox)
-                if existing_checkboxes:
-                    existing_checkbox = existing_checkboxes[0]
-            
-            if existing_checkbox:
-                # Reuse existing checkbox - update state and ensure signal connection
-                existing_checkbox.blockSignals(True)
-                existing_checkbox.setChecked(data.get('enabled', True))
-                existing_checkbox.blockSignals(False)
-                
-                # Ensure signal connection exists (reconnect if needed)
-                try:
-                    existing_checkbox.stateChanged.disconnect()
-                except:
-                    pass
-                
-                def create_checkbox_handler(sel_id):
-                    return lambda state: self.on_enabled_changed(sel_id, bool(state))
-                
-                existing_checkbox.stateChanged.connect(create_checkbox_handler(selection_id))
-                checkbox_container = existing_container
-            else:
-                # Create new checkbox only when needed
-                enabled_checkbox = QCheckBox()
-                enabled_checkbox.setChecked(data.get('enabled', True))
-                
-                # Create closure function to capture selection_id properly
-                def create_checkbox_handler(sel_id):
-                    return lambda state: self.on_enabled_changed(sel_id, bool(state))
-                
-                enabled_checkbox.stateChanged.connect(create_checkbox_handler(selection_id))
-
-                # Create container that blocks table interaction
-                class CheckboxContainer(QWidget):
-                    def __init__(self):
-                        super().__init__()
-                        
-                    def mousePressEvent(self, event):
-                        # Block all mouse events to prevent table row selection
-                        event.accept()
-                        
-                    def mouseReleaseEvent(self, event):
-                        # Block all mouse events to prevent table row selection  
-                        event.accept()
-                        
-                    def mouseMoveEvent(self, event):
-                        # Block all mouse events to prevent table row selection
-                        event.accept()
-
-                checkbox_container = CheckboxContainer()
-                c_layout = QHBoxLayout(checkbox_container)
-                c_layout.setContentsMargins(0, 0, 0, 0)
-                c_layout.setAlignment(Qt.AlignCenter)
-                c_layout.addWidget(enabled_checkbox)
-                self.selection_table.setCellWidget(row, 0, checkbox_container)
-            
-            # Label (editable)
-            label_item = QTableWidgetItem(data.get('label', ''))
-            label_item.setData(Qt.UserRole, selection_id)
-            # Ensure label is editable in-place
-            label_item.setFlags(label_item.flags() | Qt.ItemIsEditable)
-            self.selection_table.setItem(row, 1, label_item)
-            
-            # Color display: chip + name centered
-            color_hex = data.get('color', '#FF0000')
-            color_name = self._get_color_name(color_hex)
-
-            color_widget = QWidget()
-            h_layout = QHBoxLayout(color_widget)
-            h_layout.setContentsMargins(0, 0, 0, 0)
-            h_layout.setAlignment(Qt.AlignCenter)
-            chip = QFrame()
-            chip.setFixedSize(12, 12)
-            chip.setStyleSheet(f"background-color: {color_hex}; border: 1px solid #333; border-radius: 2px;")
-            name_label = QLabel(color_name)
-            name_label.setStyleSheet("font-size:11px;")
-            h_layout.addWidget(chip)
-            h_layout.addSpacing(4)
-            h_layout.addWidget(name_label)
-
-            color_widget.setCursor(Qt.PointingHandCursor)
-            color_widget.mousePressEvent = lambda event, sid=selection_id: self.on_color_clicked(sid)
-            self.selection_table.setCellWidget(row, 2, color_widget)
-            
-            # Well position
-            well_position_text = data.get('well_position', '')
-            well_item = QTableWidgetItem(well_position_text)
-            well_item.setData(Qt.UserRole, selection_id)
-            well_item.setTextAlignment(Qt.AlignCenter)
-            self.selection_table.setItem(row, 3, well_item)
-            
-            # Cell count
-            cell_count = len(data.get('cell_indices', []))
-            count_item = QTableWidgetItem(str(cell_count))
-            count_item.setFlags(count_item.flags() & ~Qt.ItemIsEditable)  # Read-only
-            self.selection_table.setItem(row, 4, count_item)
-            
-            # Delete button - always create and show for each row
-            delete_btn = QPushButton("Delete")
-            # Adjust button size to exactly match the current row height
-            row_height = self.selection_table.rowHeight(row)
-            if row_height == 0:
-                # Fallback to default section size when rowHeight not yet computed
-                row_height = self.selection_table.verticalHeader().defaultSectionSize()
-
-            # Match the cell height with tiny offset to avoid floating gap
-            delete_btn.setFixedHeight(max(18, row_height - 4))
+        """
+        Sync the selection table with selections_data.
 
-            # Allow width/height to expand within the cell as needed
-            delete_btn.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-            delete_btn.clicked.connect(
-                lambda checked, sid=selection_id: self.delete_selection(sid)
-            )
-            delete_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #dc3545;
-                    color: white;
-                    border: none;
-                    border-radius: 4px;
-                    font-weight: 500;
-                    font-size: 11px;
-                }
-                QPushButton:hover {
-                    background-color: #c82333;
-                }
-            """)
-            self.selection_table.setCellWidget(row, 5, delete_btn)
-        
-        # Ensure delete button heights match final row heights
-        for r in range(self.selection_table.rowCount()):
-            widget = self.selection_table.cellWidget(r, 5)
-            if widget:
-                final_height = self.selection_table.rowHeight(r)
-                widget.setFixedHeight(max(18, final_height - 4))
+        Added and deleted selections insert or remove their rows; existing
+        rows are repainted from the data, nothing is rebuilt.
+        """
+        self.table_model.set_selections(self.selections_data)
     
     def refresh_well_plate(self) -> None:
         """Refresh the well plate display."""
@@ -512,7 +390,7 @@ class SelectionPanel(QWidget, LoggerMixin):
     
     def on_enabled_changed(self, selection_id: str, enabled: bool) -> None:
         """Handle selection enabled/disabled, ensuring UI & model sync."""
-        self.log_info(f"📋 on_enabled_changed called: {selection_id}, enabled={enabled}, type={type(enabled)}")
+        self.log_debug(f"📋 on_enabled_changed called: {selection_id}, enabled={enabled}, type={type(enabled)}")
         
         if selection_id not in self.selections_data:
             self.log_info(f"⚠️ Selection {selection_id} not found in data")
@@ -520,24 +398,24 @@ class SelectionPanel(QWidget, LoggerMixin):
 
         # Update data model
         old_enabled = self.selections_data[selection_id]['enabled']
-        self.log_info(f"📊 Data state: old_enabled={old_enabled}, new_enabled={enabled}")
+        self.log_debug(f"📊 Data state: old_enabled={old_enabled}, new_enabled={enabled}")
         
         self.selections_data[selection_id]['enabled'] = enabled
+        self.table_model.update_selection(selection_id)
 
         if self._updating_selection:
             # Avoid recursive loops
-            self.log_info(
+            self.log_debug(
                 f"⏸️ Skipping signal emission for enabled change during programmatic update: {selection_id}"
             )
             return
 
         # Only proceed if the state actually changed
         if old_enabled == enabled:
-            self.log_info(f"🔄 Selection {selection_id} enabled state unchanged: {enabled} (old={old_enabled})")
+            self.log_debug(f"🔄 Selection {selection_id} enabled state unchanged: {enabled} (old={old_enabled})")
             return
 
         # Update well plate to reflect changes (only enabled selections show)
-        # Don't refresh the entire table to avoid recreating checkboxes during interaction
         self.refresh_well_plate()
 
         # For enabled/disabled state changes, emit both signals
@@ -548,34 +426,19 @@ class SelectionPanel(QWidget, LoggerMixin):
 
         self.log_info(f"✅ Selection {selection_id} {'enabled' if enabled else 'disabled'} - signals emitted for external updates")
     
-    def on_table_cell_changed(self, row: int, column: int) -> None:
-        """Handle table cell changes."""
+    def on_selection_field_edited(self, selection_id: str, field: str, value: str) -> None:
+        """Handle in-place edits of the label and well columns."""
         # Skip signal emission if we're updating selections programmatically (avoid infinite loops)
         if self._updating_selection:
-            self.log_info(f"Skipping signal emission during programmatic update: row {row}, column {column}")
+            self.log_info(f"Skipping signal emission during programmatic update: {selection_id}, {field}")
             return
-            
-        if column == 1:  # Label column
-            item = self.selection_table.item(row, column)
-            if item:
-                selection_id = item.data(Qt.UserRole)
-                new_label = item.text()
-                if selection_id in self.selections_data:
-                    self.selections_data[selection_id]['label'] = new_label
-                    self.refresh_well_plate()
-                    self.selection_updated.emit(selection_id, {'label': new_label})
-                    self.log_info(f"Updated label for selection {selection_id}: {new_label}")
-        
-        elif column == 3:  # Well position column
-            item = self.selection_table.item(row, column)
-            if item:
-                selection_id = item.data(Qt.UserRole)
-                new_well = item.text()
-                if selection_id in self.selections_data:
-                    self.selections_data[selection_id]['well_position'] = new_well
-                    self.refresh_well_plate()
-                    self.selection_updated.emit(selection_id, {'well_position': new_well})
-                    self.log_info(f"Updated well for selection {selection_id}: {new_well}")
+        
+        if selection_id in self.selections_data:
+            self.selections_data[selection_id][field] = value
+            self.table_model.update_selection(selection_id)
+            self.refresh_well_plate()
+            self.selection_updated.emit(selection_id, {field: value})
+            self.log_info(f"Updated {field} for selection {selection_id}: {value}")
     
     def on_table_selection_changed(self) -> None:
         """Handle table selection changes to update delete button state and ROI management."""
@@ -666,7 +529,9 @@ class SelectionPanel(QWidget, LoggerMixin):
                 self.log_info(f"Assigned well {well_position} to selection {selection_id}")
             
             # Refresh UI
-            self.refresh_table()
+            self.table_model.update_selection(selection_id)
+            if conflicting_selection:
+                self.table_model.update_selection(conflicting_selection)
             self.refresh_well_plate()
     
     def on_color_clicked(self, selection_id: str) -> None:
@@ -689,7 +554,7 @@ class SelectionPanel(QWidget, LoggerMixin):
             self.selections_data[selection_id]['color'] = new_color_hex
             
             # Refresh UI
-            self.refresh_table()
+            self.table_model.update_selection(selection_id)
             self.refresh_well_plate()
             
             # Emit signal for external updates
@@ -706,11 +571,7 @@ class SelectionPanel(QWidget, LoggerMixin):
         # Get selection IDs to delete
         selection_ids = []
         for index in selected_rows:
-            row = index.row()
-            label_item = self.selection_table.item(row, 1)
-            if label_item:
-                selection_id = label_item.data(Qt.UserRole)
-                selection_ids.append(selection_id)
+            selection_ids.append(self.table_model.selection_id(index.row()))
         
         # Confirm deletion
         if len(selection_ids) == 1:
@@ -845,7 +706,7 @@ class SelectionPanel(QWidget, LoggerMixin):
             
             try:
                 self.selections_data[selection_id].update(data)
-                self.refresh_table()
+                self.table_model.update_selection(selection_id)
                 self.refresh_well_plate()
                 self.log_info(f"Updated selection {selection_id}")
             finally:
@@ -887,23 +748,14 @@ class SelectionPanel(QWidget, LoggerMixin):
                 if new_well:
                     self.selections_data[sid]['well_position'] = new_well
                     self.selection_updated.emit(sid, {'well_position': new_well})
-                    self.refresh_table()
+                    self.table_model.update_selection(sid)
                     self.refresh_well_plate()
 
     def update_checkbox_state(self, selection_id: str, enabled: bool) -> None:
-        """Update individual checkbox state without refreshing entire table."""
-        for row in range(self.selection_table.rowCount()):
-            label_item = self.selection_table.item(row, 1)
-            if label_item and label_item.data(Qt.UserRole) == selection_id:
-                container = self.selection_table.cellWidget(row, 0)
-                if container:
-                    checkboxes = container.findChildren(QCheckBox)
-                    if checkboxes:
-                        checkbox = checkboxes[0]
-                        checkbox.blockSignals(True)
-                        checkbox.setChecked(enabled)
-                        checkbox.blockSignals(False)
-                        break
+        """Update one selection's checkbox without signals or a table refresh."""
+        if selection_id in self.selections_data:
+            self.selections_data[selection_id]['enabled'] = enabled
+            self.table_model.update_selection(selection_id)
 
     def update_calibration_status(self, is_calibrated: bool) -> None:
         """
@@ -943,16 +795,20 @@ class SelectionPanel(QWidget, LoggerMixin):
         """Create CellRowData from selection data."""
         # Extract cell indices and metadata from selection data
         cell_indices = selection_data.get('cell_indices', list(range(selection_data.get('cell_count', 0))))
-        cell_metadata = selection_data.get('cell_metadata', {}).copy()
-        
-        # Ensure all cell indices have metadata
-        for i, cell_idx in enumerate(cell_indices):
-            if cell_idx not in cell_metadata:
-                cell_metadata[cell_idx] = {
-                    'area': 100 + i * 10,
-                    'intensity': 50 + i * 5,
-                    'perimeter': 30 + i * 3
-                }
+        known_metadata = selection_data.get('cell_metadata', {})
+        
+        def row_metadata(cell_idx: int, i: int) -> Dict[str, Any]:
+            # Cells without stored metadata get placeholder values
+            if cell_idx in known_metadata:
+                return known_metadata[cell_idx]
+            return {
+                'area': 100 + i * 10,
+                'intensity': 50 + i * 5,
+                'perimeter': 30 + i * 3
+            }
+        
+        # Built per row when the dialog displays it
+        cell_metadata = CellMetadataView(cell_indices, row_metadata)
         
         return CellRowData(
             selection_id=selection_id,
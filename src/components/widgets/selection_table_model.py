@@ -0,0 +1,353 @@
+"""
+Selection Table Model
+
+Table model, view and item delegates for the selection panel. Rows are
+read from the panel's selections data when painted; changes to one
+selection repaint that row only, and added or deleted selections insert
+or remove rows instead of rebuilding the table.
+"""
+
+from typing import Optional, List, Dict, Any, Callable
+
+from PySide6.QtWidgets import (
+    QApplication, QStyle, QStyledItemDelegate, QStyleOptionButton, QStyleOptionViewItem, QTableView
+)
+from PySide6.QtCore import Qt, Signal, QAbstractTableModel, QModelIndex, QRect, QSize, QEvent
+from PySide6.QtGui import QPainter, QColor, QFont, QFontMetricsF, QPalette
+
+
+class SelectionTableModel(QAbstractTableModel):
+    """
+    Table model over the selection panel's selections data.
+
+    The model holds a reference to the panel's {selection_id: data} dict and
+    does not change it: checkbox toggles and in-place edits are reported
+    through enabled_changed and field_edited, and the panel calls
+    update_selection() once it has applied them.
+    """
+
+    # Columns
+    ENABLED_COLUMN = 0
+    LABEL_COLUMN = 1
+    COLOR_COLUMN = 2
+    WELL_COLUMN = 3
+    CELLS_COLUMN = 4
+    DELETE_COLUMN = 5
+    HEADERS = ["", "Label", "Color", "Well", "Cells", "Delete"]
+
+    # Columns edited in place and the data field they edit
+    EDITABLE_FIELDS = {LABEL_COLUMN: 'label', WELL_COLUMN: 'well_position'}
+
+    # Item data roles; the selection id keeps the role the table items used
+    SelectionIdRole = Qt.UserRole
+    ColorRole = Qt.UserRole + 1
+    EnabledRole = Qt.UserRole + 2
+
+    # Signals
+    enabled_changed = Signal(str, bool)  # selection_id, enabled (checkbox toggled)
+    field_edited = Signal(str, str, str)  # selection_id, field, new value
+
+    def __init__(self, color_name: Optional[Callable[[str], str]] = None, parent=None):
+        super().__init__(parent)
+
+        self.color_name = color_name or (lambda hex_code: hex_code)
+        self._selections: Dict[str, Dict[str, Any]] = {}
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+
+    # Qt model interface
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._ids)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole) -> Any:
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and 0 <= section < len(self.HEADERS):
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid() or not 0 <= index.row() < len(self._ids):
+            return None
+
+        selection_id = self._ids[index.row()]
+        data = self._selections.get(selection_id, {})
+        column = index.column()
+        if role == self.SelectionIdRole:
+            return selection_id
+        if role == self.ColorRole:
+            return data.get('color', '#FF0000')
+        if role == self.EnabledRole:
+            return bool(data.get('enabled', True))
+        if role == Qt.CheckStateRole and column == self.ENABLED_COLUMN:
+            return Qt.Checked if data.get('enabled', True) else Qt.Unchecked
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            if column in self.EDITABLE_FIELDS:
+                return data.get(self.EDITABLE_FIELDS[column], '')
+            if column == self.COLOR_COLUMN:
+                return self.color_name(data.get('color', '#FF0000'))
+            if column == self.CELLS_COLUMN:
+                return str(len(data.get('cell_indices', [])))
+            if column == self.DELETE_COLUMN:
+                return "Delete"
+            return None
+        if role == Qt.TextAlignmentRole and column == self.WELL_COLUMN:
+            return Qt.AlignCenter
+        return None
+
+    def setData(self, index: QModelIndex, value: Any, role: int = Qt.EditRole) -> bool:
+        if not index.isValid() or not 0 <= index.row() < len(self._ids):
+            return False
+
+        selection_id = self._ids[index.row()]
+        column = index.column()
+        if role == Qt.CheckStateRole and column == self.ENABLED_COLUMN:
+            self.enabled_changed.emit(selection_id, Qt.CheckState(value) == Qt.Checked)
+            return True
+        if role == Qt.EditRole and column in self.EDITABLE_FIELDS:
+            field = self.EDITABLE_FIELDS[column]
+            value = str(value)
+            if self._selections.get(selection_id, {}).get(field, '') == value:
+                return False
+            self.field_edited.emit(selection_id, field, value)
+            return True
+        return False
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlags:
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() == self.ENABLED_COLUMN:
+            flags |= Qt.ItemIsUserCheckable
+        elif index.column() in self.EDITABLE_FIELDS:
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    # Selections
+
+    def set_selections(self, selections: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Show the selections in a dict, in its order.
+
+        Compared with the rows shown, appended selections are inserted and a
+        single deleted selection is removed, keeping the view's row selection;
+        other changes reset the model. Unchanged rows are repainted with one
+        dataChanged.
+
+        Args:
+            selections: {selection_id: data}, kept by reference
+        """
+        self._selections = selections
+        ids = list(selections)
+        old_ids = self._ids
+        if ids == old_ids:
+            if ids:
+                self.dataChanged.emit(self.index(0, 0), self.index(len(ids) - 1, len(self.HEADERS) - 1))
+            return
+
+        if len(ids) > len(old_ids) and ids[:len(old_ids)] == old_ids:
+            self.beginInsertRows(QModelIndex(), len(old_ids), len(ids) - 1)
+            self._set_ids(ids)
+            self.endInsertRows()
+            return
+
+        if len(ids) == len(old_ids) - 1:
+            row = next((row for row, (old, new) in enumerate(zip(old_ids, ids)) if old != new), len(ids))
+            if old_ids[:row] + old_ids[row + 1:] == ids:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                self._set_ids(ids)
+                self.endRemoveRows()
+                return
+
+        self.beginResetModel()
+        self._set_ids(ids)
+        self.endResetModel()
+
+    def _set_ids(self, ids: List[str]) -> None:
+        self._ids = ids
+        self._rows = {selection_id: row for row, selection_id in enumerate(ids)}
+
+    def update_selection(self, selection_id: str) -> bool:
+        """
+        Repaint the row of one selection after its data changed.
+
+        Returns:
+            True if the selection is shown
+        """
+        row = self._rows.get(selection_id)
+        if row is None:
+            return False
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.HEADERS) - 1))
+        return True
+
+    def selection_id(self, row: int) -> str:
+        """Selection shown in a row."""
+        return self._ids[row]
+
+    def row_of(self, selection_id: str) -> Optional[int]:
+        """Row showing a selection, or None if it is not in the model."""
+        return self._rows.get(selection_id)
+
+
+class SelectionTableView(QTableView):
+    """Table view for a SelectionTableModel; the color and delete cells show a pointing cursor."""
+
+    CLICKABLE_COLUMNS = (SelectionTableModel.COLOR_COLUMN, SelectionTableModel.DELETE_COLUMN)
+
+    def rowCount(self) -> int:
+        """Number of rows shown (as QTableWidget.rowCount)."""
+        model = self.model()
+        return model.rowCount() if model is not None else 0
+
+    def mouseMoveEvent(self, event) -> None:
+        index = self.indexAt(event.position().toPoint())
+        if index.isValid() and index.column() in self.CLICKABLE_COLUMNS:
+            self.viewport().setCursor(Qt.PointingHandCursor)
+        else:
+            self.viewport().unsetCursor()
+        super().mouseMoveEvent(event)
+
+
+class _SelectionDelegateBase(QStyledItemDelegate):
+    """Paints the cell background (selection, alternate rows) without the item's own content."""
+
+    def _style(self, option: QStyleOptionViewItem) -> QStyle:
+        return option.widget.style() if option.widget else QApplication.style()
+
+    def _paint_background(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex) -> None:
+        background = QStyleOptionViewItem(option)
+        self.initStyleOption(background, index)
+        background.text = ""
+        background.features &= ~QStyleOptionViewItem.HasCheckIndicator
+        self._style(option).drawControl(QStyle.CE_ItemViewItem, background, painter, option.widget)
+
+
+class CheckBoxDelegate(_SelectionDelegateBase):
+    """
+    Centered enable checkbox.
+
+    Clicks anywhere in the cell are kept from changing the row selection;
+    clicking the checkbox (or pressing space) toggles it through the model's
+    CheckStateRole.
+    """
+
+    def checkbox_rect(self, option: QStyleOptionViewItem) -> QRect:
+        """Area of the checkbox within a cell."""
+        style = self._style(option)
+        size = style.pixelMetric(QStyle.PM_IndicatorWidth, None, option.widget)
+        rect = QRect(0, 0, size, size)
+        rect.moveCenter(option.rect.center())
+        return rect
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex) -> None:
+        self._paint_background(painter, option, index)
+        check_option = QStyleOptionButton()
+        check_option.rect = self.checkbox_rect(option)
+        checked = index.data(Qt.CheckStateRole) == Qt.Checked
+        check_option.state = QStyle.State_Enabled | (QStyle.State_On if checked else QStyle.State_Off)
+        self._style(option).drawPrimitive(QStyle.PE_IndicatorCheckBox, check_option, painter, option.widget)
+
+    def editorEvent(self, event: QEvent, model, option: QStyleOptionViewItem, index: QModelIndex) -> bool:
+        if event.type() == QEvent.MouseButtonRelease:
+            if event.button() != Qt.LeftButton:
+                return False
+            if not self.checkbox_rect(option).contains(event.position().toPoint()):
+                return True
+        elif event.type() in (QEvent.MouseButtonPress, QEvent.MouseButtonDblClick):
+            # Swallow presses anywhere in the cell so they do not select the row
+            return event.button() == Qt.LeftButton
+        elif event.type() == QEvent.KeyPress:
+            if event.key() not in (Qt.Key_Space, Qt.Key_Select):
+                return False
+        else:
+            return False
+
+        checked = index.data(Qt.CheckStateRole) == Qt.Checked
+        return model.setData(index, Qt.Unchecked if checked else Qt.Checked, Qt.CheckStateRole)
+
+
+class _ClickableCellDelegate(_SelectionDelegateBase):
+    """Cell acting as a button: a left click emits clicked with the row's selection id."""
+
+    clicked = Signal(str)  # selection_id
+
+    def editorEvent(self, event: QEvent, model, option: QStyleOptionViewItem, index: QModelIndex) -> bool:
+        if event.type() not in (QEvent.MouseButtonPress, QEvent.MouseButtonDblClick, QEvent.MouseButtonRelease):
+            return False
+        if event.button() != Qt.LeftButton:
+            return False
+        # Presses are swallowed so they do not select the row
+        if event.type() == QEvent.MouseButtonRelease and option.rect.contains(event.position().toPoint()):
+            self.clicked.emit(index.data(SelectionTableModel.SelectionIdRole))
+        return True
+
+
+class ColorChipDelegate(_ClickableCellDelegate):
+    """Color chip and color name, centered in the cell."""
+
+    CHIP_SIZE = 12
+    SPACING = 4
+    MARGIN = 6
+    FONT_SIZE = 11
+
+    def _font(self, option: QStyleOptionViewItem) -> QFont:
+        font = QFont(option.font)
+        font.setPixelSize(self.FONT_SIZE)
+        return font
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        text_width = QFontMetricsF(self._font(option)).horizontalAdvance(index.data(Qt.DisplayRole) or "")
+        return QSize(self.CHIP_SIZE + self.SPACING + int(text_width) + 2 * self.MARGIN + 1, self.CHIP_SIZE)
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex) -> None:
+        self._paint_background(painter, option, index)
+
+        painter.save()
+        font = self._font(option)
+        painter.setFont(font)
+        name = index.data(Qt.DisplayRole) or ""
+        text_width = painter.fontMetrics().horizontalAdvance(name)
+        rect = option.rect
+        left = rect.left() + max(self.MARGIN, (rect.width() - self.CHIP_SIZE - self.SPACING - text_width) // 2)
+
+        chip = QRect(left, rect.top() + (rect.height() - self.CHIP_SIZE) // 2, self.CHIP_SIZE, self.CHIP_SIZE)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(QColor("#333333"))
+        painter.setBrush(QColor(index.data(SelectionTableModel.ColorRole)))
+        painter.drawRoundedRect(chip.adjusted(0, 0, -1, -1), 2, 2)
+
+        text_left = chip.right() + 1 + self.SPACING
+        selected = option.state & QStyle.State_Selected
+        painter.setPen(option.palette.color(QPalette.HighlightedText if selected else QPalette.Text))
+        painter.drawText(QRect(text_left, rect.top(), rect.right() - text_left, rect.height()),
+                         Qt.AlignVCenter | Qt.AlignLeft, name)
+        painter.restore()
+
+
+class DeleteButtonDelegate(_ClickableCellDelegate):
+    """Red "Delete" button filling the cell."""
+
+    INSET = 2
+    RADIUS = 4
+    COLOR = QColor("#dc3545")
+    HOVER_COLOR = QColor("#c82333")
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex) -> None:
+        self._paint_background(painter, option, index)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        button = option.rect.adjusted(self.INSET, self.INSET, -self.INSET, -self.INSET)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(self.HOVER_COLOR if option.state & QStyle.State_MouseOver else self.COLOR)
+        painter.drawRoundedRect(button, self.RADIUS, self.RADIUS)
+
+        font = QFont(option.font)
+        font.setPixelSize(11)
+        font.setWeight(QFont.Medium)
+        painter.setFont(font)
+        painter.setPen(Qt.white)
+        painter.drawText(button, Qt.AlignCenter, index.data(Qt.DisplayRole))
+        painter.restore()
@@ -0,0 +1,44 @@
+"""
+CellSorter Core Package
+
+Qt-free data model: the cell table, selections, calibration, crop and
+protocol extraction, and image loading. Models notify observers through
+core.observer callbacks; the classes in models/ are thin Qt adapters
+that expose the same notifications as signals.
+
+Nothing in this package imports PySide6, so batch and multiprocessing
+workers can use it without a Qt installation or event loop.
+
+Names are imported from their submodules on first access, so the image
+loader does not pull in pandas and the cell table does not pull in OpenCV.
+"""
+
+from utils.lazy_import import lazy_getattr, exports_by_module
+
+__getattr__ = lazy_getattr(__name__, globals(), exports_by_module({
+    '.observer': ['Callback', 'CallbackList'],
+    '.cell_table': ['CellTable', 'parse_cell_csv', 'validate_cell_table'],
+    '.selections': ['SelectionModel', 'CellSelection', 'SelectionStatus'],
+    '.calibration': ['CalibrationModel', 'CalibrationPoint', 'TransformationResult'],
+    '.extraction': ['ExtractionModel', 'BoundingBox', 'CropRegion', 'ExtractionPoint'],
+    '.image_loader': ['load_image_file'],
+}))
+
+__all__ = [
+    'Callback',
+    'CallbackList',
+    'CellTable',
+    'parse_cell_csv',
+    'validate_cell_table',
+    'SelectionModel',
+    'CellSelection',
+    'SelectionStatus',
+    'CalibrationModel',
+    'CalibrationPoint',
+    'TransformationResult',
+    'ExtractionModel',
+    'BoundingBox',
+    'CropRegion',
+    'ExtractionPoint',
+    'load_image_file',
+]
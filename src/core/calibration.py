@@ -0,0 +1,877 @@
+"""
+CellSorter Calibration
+
+Calibration system for pixel-to-stage coordinate transformation. Two
+points define a similarity transform; N points are fitted by least
+squares with a similarity, affine or projective model and optional
+RANSAC outlier rejection. An optional grid warp corrects local stage
+and lens nonlinearity on top of the global fit. models.coordinate_transformer
+adds the Qt signals for the GUI.
+"""
+
+from typing import Optional, List, Tuple, Dict, Any, NamedTuple
+from dataclasses import dataclass
+from itertools import combinations
+from math import comb
+import numpy as np
+
+from config.settings import COORDINATE_ACCURACY_MICROMETERS
+from utils.exceptions import CalibrationError, TransformationError
+from core.observer import Callback
+from utils.error_handler import error_handler
+from utils.logging_config import LoggerMixin
+from models.grid_warp import GridWarp, WARP_METHODS, fit_residual_interpolator
+
+
+class CalibrationPoint(NamedTuple):
+    """Calibration point with pixel and stage coordinates."""
+    pixel_x: int
+    pixel_y: int
+    stage_x: float  # micrometers
+    stage_y: float  # micrometers
+    label: str = ""
+
+
+@dataclass
+class TransformationResult:
+    """Result of coordinate transformation."""
+    stage_x: float
+    stage_y: float
+    confidence: float  # 0.0 to 1.0
+    error_estimate_um: float  # estimated error in micrometers
+
+
+# Supported transformation models and the minimum points each requires
+TRANSFORMATION_MODELS: Dict[str, int] = {
+    'similarity': 2,  # uniform scale, rotation and translation
+    'affine': 3,      # adds anisotropic scale and shear
+    'projective': 4,  # full homography
+}
+
+
+def _fit_similarity(pixel: np.ndarray, stage: np.ndarray) -> np.ndarray:
+    """
+    Least-squares similarity fit.
+    
+    Solves x' = a*x - b*y + tx, y' = b*x + a*y + ty for (a, b, tx, ty).
+    
+    Returns:
+        2x3 transformation matrix
+    """
+    n = len(pixel)
+    ones, zeros = np.ones(n), np.zeros(n)
+    design = np.empty((2 * n, 4))
+    design[0::2] = np.column_stack([pixel[:, 0], -pixel[:, 1], ones, zeros])
+    design[1::2] = np.column_stack([pixel[:, 1], pixel[:, 0], zeros, ones])
+    
+    if np.linalg.matrix_rank(design) < 4:
+        raise CalibrationError("Calibration points are degenerate for a similarity transform")
+    
+    a, b, tx, ty = np.linalg.lstsq(design, stage.reshape(-1), rcond=None)[0]
+    return np.array([
+        [a, -b, tx],
+        [b, a, ty]
+    ])
+
+
+def _fit_affine(pixel: np.ndarray, stage: np.ndarray) -> np.ndarray:
+    """
+    Least-squares full affine fit.
+    
+    Returns:
+        2x3 transformation matrix
+    """
+    design = np.column_stack([pixel, np.ones(len(pixel))])
+    
+    if np.linalg.matrix_rank(design) < 3:
+        raise CalibrationError("Calibration points are collinear; affine transform is undefined")
+    
+    return np.linalg.lstsq(design, stage, rcond=None)[0].T
+
+
+def _normalization_matrix(points: np.ndarray) -> np.ndarray:
+    """Similarity that centers points and scales mean distance to sqrt(2)."""
+    centroid = points.mean(axis=0)
+    mean_distance = np.linalg.norm(points - centroid, axis=1).mean()
+    scale = np.sqrt(2) / mean_distance if mean_distance > 0 else 1.0
+    return np.array([
+        [scale, 0, -scale * centroid[0]],
+        [0, scale, -scale * centroid[1]],
+        [0, 0, 1]
+    ])
+
+
+def _fit_projective(pixel: np.ndarray, stage: np.ndarray) -> np.ndarray:
+    """
+    Normalized direct linear transform (DLT) homography fit.
+    
+    Returns:
+        3x3 transformation matrix with H[2, 2] == 1
+    """
+    pixel_norm = _normalization_matrix(pixel)
+    stage_norm = _normalization_matrix(stage)
+    src = _apply_transform(pixel_norm, pixel)
+    dst = _apply_transform(stage_norm, stage)
+    
+    x, y = src[:, 0], src[:, 1]
+    u, v = dst[:, 0], dst[:, 1]
+    ones, zeros = np.ones(len(src)), np.zeros(len(src))
+    system = np.empty((2 * len(src), 9))
+    system[0::2] = np.column_stack([-x, -y, -ones, zeros, zeros, zeros, u * x, u * y, u])
+    system[1::2] = np.column_stack([zeros, zeros, zeros, -x, -y, -ones, v * x, v * y, v])
+    
+    _, singular_values, vt = np.linalg.svd(system)
+    if singular_values[7] <= singular_values[0] * 1e-10:
+        raise CalibrationError("Calibration points are degenerate for a projective transform")
+    
+    homography = np.linalg.inv(stage_norm) @ vt[-1].reshape(3, 3) @ pixel_norm
+    if np.isclose(homography[2, 2], 0):
+        raise CalibrationError("Projective transform is singular")
+    
+    return homography / homography[2, 2]
+
+
+_MODEL_FITTERS = {
+    'similarity': _fit_similarity,
+    'affine': _fit_affine,
+    'projective': _fit_projective,
+}
+
+
+def _apply_transform(matrix: np.ndarray, xy: np.ndarray) -> np.ndarray:
+    """
+    Apply a 2x3 affine or 3x3 projective matrix to an (N, 2) point array.
+    
+    Args:
+        matrix: Transformation matrix
+        xy: Array of shape (N, 2)
+    
+    Returns:
+        Transformed array of shape (N, 2)
+    """
+    points = np.asarray(xy, dtype=np.float64)
+    if points.size == 0:
+        points = points.reshape(0, 2)
+    
+    if points.ndim != 2 or points.shape[1] != 2:
+        raise TransformationError(f"Expected point array of shape (N, 2), got {points.shape}")
+    
+    transformed = points @ matrix[:, :2].T + matrix[:, 2]
+    if matrix.shape[0] == 3:
+        # Projective: divide by the homogeneous coordinate
+        transformed = transformed[:, :2] / transformed[:, 2:3]
+    
+    return transformed
+
+
+def _invert_transform(matrix: np.ndarray) -> np.ndarray:
+    """Invert a 2x3 affine or 3x3 projective matrix, keeping its shape."""
+    if matrix.shape[0] == 2:
+        # For 2x3 matrix, we need to extend to 3x3 and invert
+        extended_matrix = np.vstack([matrix, [0, 0, 1]])
+        return np.linalg.inv(extended_matrix)[:2, :]
+    
+    inverse = np.linalg.inv(matrix)
+    return inverse / inverse[2, 2]
+
+
+class CalibrationModel(LoggerMixin):
+    """
+    Calibration system for pixel-to-stage coordinate transformation.
+    
+    Features:
+    - Two-point calibration with similarity transformation
+    - N-point least-squares fit (similarity, affine, projective)
+    - RANSAC outlier rejection with per-point residuals
+    - Optional thin-plate spline / mesh warp for large-slide nonlinearity
+    - Real-time coordinate transformation
+    - Accuracy estimation and validation
+    - Error checking and quality metrics
+    """
+    
+    # Notifications
+    calibration_updated = Callback(bool)  # is_valid
+    transformation_ready = Callback()
+    calibration_cleared = Callback()
+    
+    def __init__(self):
+        # Calibration data
+        self.calibration_points: List[CalibrationPoint] = []
+        self.transform_matrix: Optional[np.ndarray] = None
+        self.inverse_transform_matrix: Optional[np.ndarray] = None
+        
+        # Quality metrics
+        self.calibration_quality: Dict[str, Any] = {}
+        self._is_calibrated = False
+        
+        # Configuration
+        self.min_distance_pixels = 50  # Minimum distance between calibration points
+        self.max_error_micrometers = COORDINATE_ACCURACY_MICROMETERS * 10  # 1.0 um max error
+        self.max_calibration_points: Optional[int] = 2  # Two-point workflow; None for N-point
+        self.transformation_model = 'similarity'  # One of TRANSFORMATION_MODELS
+        self.ransac_threshold_um: Optional[float] = None  # Inlier threshold; None disables RANSAC
+        self.ransac_iterations = 500  # Maximum sampled subsets
+        self.warp_method: Optional[str] = None  # One of WARP_METHODS; None for global transform only
+        self.warp_grid_spacing = 64.0  # Warp lookup grid node spacing in pixels
+        self.warp_bounds: Optional[Tuple[float, float, float, float]] = None  # Warp grid extent in pixels
+        self.warp_smoothing = 0.0  # Thin-plate spline smoothing (0 interpolates exactly)
+        self.warp: Optional[GridWarp] = None
+        
+        self.log_info("Coordinate transformer initialized")
+    
+    @error_handler("Adding calibration point")
+    def add_calibration_point(self, pixel_x: int, pixel_y: int, 
+                            stage_x: float, stage_y: float, 
+                            label: str = "") -> bool:
+        """
+        Add a calibration point.
+        
+        Args:
+            pixel_x: Pixel X coordinate
+            pixel_y: Pixel Y coordinate
+            stage_x: Stage X coordinate in micrometers
+            stage_y: Stage Y coordinate in micrometers
+            label: Optional label for the point
+        
+        Returns:
+            True if point added successfully, False otherwise
+        """
+        # Validate input
+        if not self._validate_coordinates(pixel_x, pixel_y, stage_x, stage_y):
+            return False
+        
+        # Check if we already have maximum points
+        max_points = self.max_calibration_points
+        if max_points is not None and len(self.calibration_points) >= max_points:
+            self.log_warning("Maximum calibration points reached, replacing oldest")
+            del self.calibration_points[:len(self.calibration_points) - max_points + 1]
+        
+        # Create calibration point
+        point = CalibrationPoint(pixel_x, pixel_y, stage_x, stage_y, label)
+        
+        # Check minimum distance from existing points
+        for existing_point in self.calibration_points:
+            distance = np.sqrt((pixel_x - existing_point.pixel_x)**2 + 
+                             (pixel_y - existing_point.pixel_y)**2)
+            if distance < self.min_distance_pixels:
+                self.log_warning(f"Calibration point too close to existing point (distance: {distance:.1f} pixels)")
+                return False
+        
+        # Add point
+        self.calibration_points.append(point)
+        
+        # Recalculate transformation if we have enough points
+        if len(self.calibration_points) >= self.min_calibration_points():
+            success = self._calculate_transformation()
+            if success:
+                self.transformation_ready.emit()
+        
+        self.calibration_updated.emit(self.is_calibrated())
+        
+        self.log_info(f"Added calibration point {len(self.calibration_points)}: "
+                     f"pixel({pixel_x}, {pixel_y}) -> stage({stage_x:.2f}, {stage_y:.2f})")
+        
+        return True
+    
+    @error_handler("Setting calibration points")
+    def set_calibration_points(self, points: List[CalibrationPoint],
+                               model: Optional[str] = None) -> bool:
+        """
+        Replace all calibration points and fit the transformation in one step.
+        
+        Unlike add_calibration_point, this ignores max_calibration_points and
+        is the entry point for N-point calibration.
+        
+        Args:
+            points: Calibration points
+            model: Optional transformation model (see TRANSFORMATION_MODELS)
+        
+        Returns:
+            True if the transformation was fitted successfully, False otherwise
+        """
+        if model is not None:
+            if model not in TRANSFORMATION_MODELS:
+                self.log_error(f"Unknown transformation model: {model}")
+                return False
+            self.transformation_model = model
+        
+        for point in points:
+            if not self._validate_coordinates(point.pixel_x, point.pixel_y,
+                                              point.stage_x, point.stage_y):
+                return False
+        
+        self.calibration_points = [CalibrationPoint(*point) for point in points]
+        
+        success = (len(self.calibration_points) >= self.min_calibration_points()
+                   and self._calculate_transformation())
+        if success:
+            self.transformation_ready.emit()
+        else:
+            self._is_calibrated = False
+        
+        self.calibration_updated.emit(self.is_calibrated())
+        
+        self.log_info(f"Set {len(self.calibration_points)} calibration points "
+                      f"({self.transformation_model} model)")
+        
+        return bool(success)
+    
+    def min_calibration_points(self) -> int:
+        """
+        Get the minimum number of points required by the current model.
+        
+        Returns:
+            Minimum calibration point count
+        """
+        min_points = TRANSFORMATION_MODELS.get(self.transformation_model, 2)
+        if self.warp_method is not None:
+            min_points = max(min_points, WARP_METHODS.get(self.warp_method, 3))
+        return min_points
+    
+    def _validate_coordinates(self, pixel_x: int, pixel_y: int, 
+                            stage_x: float, stage_y: float) -> bool:
+        """
+        Validate coordinate inputs.
+        
+        Args:
+            pixel_x, pixel_y: Pixel coordinates
+            stage_x, stage_y: Stage coordinates
+        
+        Returns:
+            True if valid, False otherwise
+        """
+        # Check pixel coordinates (should be non-negative)
+        if pixel_x < 0 or pixel_y < 0:
+            self.log_error(f"Invalid pixel coordinates: ({pixel_x}, {pixel_y})")
+            return False
+        
+        # Check stage coordinates (reasonable range check)
+        if abs(stage_x) > 100000 or abs(stage_y) > 100000:  # 100mm max range
+            self.log_error(f"Stage coordinates out of range: ({stage_x}, {stage_y})")
+            return False
+        
+        return True
+    
+    @error_handler("Calculating transformation matrix")
+    def _calculate_transformation(self) -> bool:
+        """
+        Fit the transformation matrix to the calibration points.
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        min_points = self.min_calibration_points()
+        if len(self.calibration_points) < min_points:
+            self.log_error(f"Need at least {min_points} calibration points for "
+                           f"{self.transformation_model} transformation")
+            return False
+        
+        try:
+            # Extract coordinates
+            pixel_coords = np.array([[p.pixel_x, p.pixel_y] for p in self.calibration_points], dtype=np.float64)
+            stage_coords = np.array([[p.stage_x, p.stage_y] for p in self.calibration_points], dtype=np.float64)
+            
+            # Avoid division by zero
+            if np.allclose(pixel_coords, pixel_coords[0]):
+                self.log_error("Calibration points have identical pixel coordinates")
+                return False
+            
+            # Least-squares fit, optionally on a RANSAC consensus set
+            self.transform_matrix, inlier_mask = self._fit_robust(pixel_coords, stage_coords)
+            
+            # Local correction of the remaining residuals
+            self.warp = self._build_warp(self.transform_matrix,
+                                         pixel_coords[inlier_mask], stage_coords[inlier_mask])
+            
+            # Calculate inverse transformation
+            self.inverse_transform_matrix = _invert_transform(self.transform_matrix)
+            
+            # Validate transformation
+            self._validate_transformation(inlier_mask)
+            
+            self._is_calibrated = True
+            self.log_info("Transformation matrix calculated successfully")
+            return True
+            
+        except Exception as e:
+            self.log_error(f"Failed to calculate transformation: {e}")
+            self._is_calibrated = False
+            return False
+    
+    def _fit_robust(self, pixel_coords: np.ndarray,
+                    stage_coords: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Fit the current model, rejecting outliers with RANSAC if enabled.
+        
+        Args:
+            pixel_coords: (N, 2) pixel coordinates
+            stage_coords: (N, 2) stage coordinates
+        
+        Returns:
+            Tuple of (transformation matrix, boolean inlier mask)
+        """
+        fit = _MODEL_FITTERS[self.transformation_model]
+        min_points = TRANSFORMATION_MODELS[self.transformation_model]
+        point_count = len(pixel_coords)
+        
+        if self.ransac_threshold_um is None or point_count <= min_points:
+            return fit(pixel_coords, stage_coords), np.ones(point_count, dtype=bool)
+        
+        # Enumerate every minimal subset when cheap, otherwise sample randomly
+        if comb(point_count, min_points) <= self.ransac_iterations:
+            subsets = (list(subset) for subset in combinations(range(point_count), min_points))
+        else:
+            rng = np.random.default_rng(0)
+            subsets = (rng.choice(point_count, min_points, replace=False)
+                       for _ in range(self.ransac_iterations))
+        
+        best_mask = None
+        best_error = np.inf
+        
+        for subset in subsets:
+            try:
+                candidate = fit(pixel_coords[subset], stage_coords[subset])
+            except (CalibrationError, np.linalg.LinAlgError):
+                continue
+            
+            errors = np.linalg.norm(_apply_transform(candidate, pixel_coords) - stage_coords, axis=1)
+            mask = errors <= self.ransac_threshold_um
+            error = float(errors[mask].sum())
+            
+            if (best_mask is None or mask.sum() > best_mask.sum() or
+                    (mask.sum() == best_mask.sum() and error < best_error)):
+                best_mask, best_error = mask, error
+        
+        if best_mask is None or best_mask.sum() < min_points:
+            raise CalibrationError("RANSAC found no consensus set within threshold")
+        
+        outliers = np.flatnonzero(~best_mask)
+        if outliers.size:
+            self.log_warning(f"Rejected {outliers.size} calibration outliers: {outliers.tolist()}")
+        
+        return fit(pixel_coords[best_mask], stage_coords[best_mask]), best_mask
+    
+    def _build_warp(self, matrix: np.ndarray, pixel_coords: np.ndarray,
+                    stage_coords: np.ndarray) -> Optional[GridWarp]:
+        """
+        Fit the configured warp to the residuals of a global transform.
+        
+        Args:
+            matrix: Global transformation matrix
+            pixel_coords: (N, 2) pixel coordinates of the fitted points
+            stage_coords: (N, 2) stage coordinates of the fitted points
+        
+        Returns:
+            GridWarp, or None if no warp method is configured
+        """
+        if self.warp_method is None:
+            return None
+        
+        residuals = stage_coords - _apply_transform(matrix, pixel_coords)
+        warp = GridWarp(self.warp_method, pixel_coords, residuals,
+                        bounds=self.warp_bounds, spacing=self.warp_grid_spacing,
+                        smoothing=self.warp_smoothing)
+        
+        self.log_info(f"Built {self.warp_method} warp on {warp.shape[1]}x{warp.shape[0]} lookup grid")
+        return warp
+    
+    def _forward(self, xy: np.ndarray) -> np.ndarray:
+        """Apply the global transform plus warp correction to (N, 2) pixels."""
+        stage = _apply_transform(self.transform_matrix, xy)
+        if self.warp is not None:
+            stage += self.warp(xy)
+        return stage
+    
+    def _inverse(self, xy: np.ndarray) -> np.ndarray:
+        """Invert _forward for (N, 2) stage coordinates."""
+        pixel = _apply_transform(self.inverse_transform_matrix, xy)
+        if self.warp is not None:
+            # Fixed-point iteration; converges quickly for small, smooth warps
+            stage = np.asarray(xy, dtype=np.float64).reshape(-1, 2)
+            for _ in range(5):
+                pixel = _apply_transform(self.inverse_transform_matrix, stage - self.warp(pixel))
+        return pixel
+    
+    def _validate_transformation(self, inlier_mask: Optional[np.ndarray] = None) -> None:
+        """
+        Validate the calculated transformation matrix.
+        
+        Reports per-point residuals, in-sample error over the inliers and
+        leave-one-out error (each inlier predicted from a fit to the others).
+        
+        Args:
+            inlier_mask: Optional boolean mask of points used in the fit
+        """
+        if self.transform_matrix is None:
+            return
+        
+        # Test transformation accuracy with calibration points
+        pixel_coords = np.array([[p.pixel_x, p.pixel_y] for p in self.calibration_points], dtype=np.float64)
+        stage_coords = np.array([[p.stage_x, p.stage_y] for p in self.calibration_points], dtype=np.float64)
+        if inlier_mask is None:
+            inlier_mask = np.ones(len(pixel_coords), dtype=bool)
+        
+        residuals = np.linalg.norm(self._forward(pixel_coords) - stage_coords, axis=1)
+        inlier_residuals = residuals[inlier_mask]
+        
+        # Calculate quality metrics
+        avg_error = float(inlier_residuals.mean()) if inlier_residuals.size else 0.0
+        max_error = float(inlier_residuals.max()) if inlier_residuals.size else 0.0
+        rms_error = float(np.sqrt(np.mean(inlier_residuals ** 2))) if inlier_residuals.size else 0.0
+        loo_errors = self._leave_one_out_errors(pixel_coords[inlier_mask], stage_coords[inlier_mask])
+        
+        self.calibration_quality = {
+            'average_error_um': avg_error,
+            'max_error_um': max_error,
+            'meets_accuracy_target': max_error <= self.max_error_micrometers,
+            'transformation_confidence': max(0.0, 1.0 - (max_error / self.max_error_micrometers)),
+            'transformation_model': self.transformation_model,
+            'rms_error_um': rms_error,
+            'residuals_um': residuals.tolist(),
+            'inlier_count': int(inlier_mask.sum()),
+            'outlier_indices': np.flatnonzero(~inlier_mask).tolist(),
+            'loo_average_error_um': float(loo_errors.mean()) if loo_errors is not None else None,
+            'loo_max_error_um': float(loo_errors.max()) if loo_errors is not None else None,
+            'warp_method': self.warp_method if self.warp is not None else None,
+            'warp_grid_error_um': self.warp.grid_error() if self.warp is not None else None
+        }
+        
+        if not self.calibration_quality['meets_accuracy_target']:
+            self.log_warning(f"Calibration accuracy below target: {max_error:.3f} µm > {self.max_error_micrometers:.3f} µm")
+        else:
+            self.log_info(f"Calibration meets accuracy target: max error {max_error:.3f} µm")
+        
+        if loo_errors is not None:
+            self.log_info(f"Leave-one-out error: mean {loo_errors.mean():.3f} µm, max {loo_errors.max():.3f} µm")
+    
+    def _leave_one_out_errors(self, pixel_coords: np.ndarray,
+                              stage_coords: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Predict each point from a fit to the remaining points.
+        
+        Args:
+            pixel_coords: (N, 2) pixel coordinates of the fitted points
+            stage_coords: (N, 2) stage coordinates of the fitted points
+        
+        Returns:
+            Array of N prediction errors in micrometers, or None if there are
+            not enough points to refit without one of them
+        """
+        point_count = len(pixel_coords)
+        if point_count <= self.min_calibration_points():
+            return None
+        
+        fit = _MODEL_FITTERS[self.transformation_model]
+        errors = np.empty(point_count)
+        
+        for i in range(point_count):
+            keep = np.arange(point_count) != i
+            held_out = pixel_coords[i:i + 1]
+            try:
+                matrix = fit(pixel_coords[keep], stage_coords[keep])
+                predicted = _apply_transform(matrix, held_out)
+                
+                if self.warp is not None:
+                    # Exact interpolator: measures the warp's interpolation error
+                    residuals = stage_coords[keep] - _apply_transform(matrix, pixel_coords[keep])
+                    interpolator = fit_residual_interpolator(
+                        self.warp_method, pixel_coords[keep], residuals, self.warp_smoothing
+                    )
+                    predicted = predicted + interpolator(held_out)
+            except (CalibrationError, np.linalg.LinAlgError):
+                return None
+            errors[i] = np.linalg.norm(predicted[0] - stage_coords[i])
+        
+        return errors
+    
+    def pixel_to_stage(self, pixel_x: int, pixel_y: int) -> Optional[TransformationResult]:
+        """
+        Transform pixel coordinates to stage coordinates.
+        
+        Args:
+            pixel_x: Pixel X coordinate
+            pixel_y: Pixel Y coordinate
+        
+        Returns:
+            TransformationResult or None if transformation not available
+        """
+        if not self.is_calibrated() or self.transform_matrix is None:
+            return None
+        
+        try:
+            # Apply transformation
+            stage_coords = self._forward([[pixel_x, pixel_y]])[0]
+            
+            # Get quality metrics
+            confidence = self.calibration_quality.get('transformation_confidence', 0.0)
+            error_estimate = self.calibration_quality.get('max_error_um', 0.0)
+            
+            return TransformationResult(
+                stage_x=float(stage_coords[0]),
+                stage_y=float(stage_coords[1]),
+                confidence=confidence,
+                error_estimate_um=error_estimate
+            )
+            
+        except Exception as e:
+            self.log_error(f"Transformation failed: {e}")
+            return None
+    
+    def stage_to_pixel(self, stage_x: float, stage_y: float) -> Optional[Tuple[int, int]]:
+        """
+        Transform stage coordinates to pixel coordinates (inverse transformation).
+        
+        Args:
+            stage_x: Stage X coordinate in micrometers
+            stage_y: Stage Y coordinate in micrometers
+        
+        Returns:
+            Tuple of (pixel_x, pixel_y) or None if transformation not available
+        """
+        if not self.is_calibrated() or self.inverse_transform_matrix is None:
+            return None
+        
+        try:
+            # Apply inverse transformation
+            pixel_coords = self._inverse([[stage_x, stage_y]])[0]
+            
+            return (int(round(pixel_coords[0])), int(round(pixel_coords[1])))
+            
+        except Exception as e:
+            self.log_error(f"Inverse transformation failed: {e}")
+            return None
+    
+    def pixel_to_stage_array(self, xy: np.ndarray) -> np.ndarray:
+        """
+        Transform N pixel coordinates to stage coordinates in one matrix product.
+        
+        A configured warp adds a constant-time grid lookup per point.
+        
+        Args:
+            xy: Array of shape (N, 2) with pixel (x, y) coordinates
+        
+        Returns:
+            Array of shape (N, 2) with stage (x, y) coordinates in micrometers
+        
+        Raises:
+            TransformationError: If not calibrated or input shape is invalid
+        """
+        if not self.is_calibrated() or self.transform_matrix is None:
+            raise TransformationError("Coordinate transformer is not calibrated")
+        
+        return self._forward(xy)
+    
+    def stage_to_pixel_array(self, xy: np.ndarray) -> np.ndarray:
+        """
+        Transform N stage coordinates to pixel coordinates (inverse transformation).
+        
+        Unlike stage_to_pixel, results are not rounded to integers.
+        
+        Args:
+            xy: Array of shape (N, 2) with stage (x, y) coordinates in micrometers
+        
+        Returns:
+            Array of shape (N, 2) with pixel (x, y) coordinates
+        
+        Raises:
+            TransformationError: If not calibrated or input shape is invalid
+        """
+        if not self.is_calibrated() or self.inverse_transform_matrix is None:
+            raise TransformationError("Coordinate transformer is not calibrated")
+        
+        return self._inverse(xy)
+    
+    def transform_bounding_boxes(self, bounding_boxes: List[Tuple[int, int, int, int]]) -> List[Tuple[float, float, float, float]]:
+        """
+        Transform a list of pixel bounding boxes to stage coordinates.
+        
+        Args:
+            bounding_boxes: List of (min_x, min_y, max_x, max_y) in pixels
+        
+        Returns:
+            List of (min_x, min_y, max_x, max_y) in stage coordinates
+        """
+        if not self.is_calibrated():
+            return []
+        
+        if not bounding_boxes:
+            return []
+        
+        # Transform both corners of every box in a single matrix product
+        corners = np.asarray(bounding_boxes, dtype=np.float64).reshape(-1, 2)
+        transformed_boxes = [
+            tuple(box) for box in self.pixel_to_stage_array(corners).reshape(-1, 4).tolist()
+        ]
+        
+        return transformed_boxes
+    
+    def clear_calibration(self) -> None:
+        """Clear all calibration data."""
+        self.calibration_points.clear()
+        self.transform_matrix = None
+        self.inverse_transform_matrix = None
+        self.warp = None
+        self.calibration_quality = {}
+        self._is_calibrated = False
+        
+        self.calibration_cleared.emit()
+        self.calibration_updated.emit(False)
+        
+        self.log_info("Calibration cleared")
+    
+    def remove_calibration_point(self, index: int) -> bool:
+        """
+        Remove a calibration point by index.
+        
+        Args:
+            index: Index of point to remove
+        
+        Returns:
+            True if removed successfully, False otherwise
+        """
+        if 0 <= index < len(self.calibration_points):
+            removed_point = self.calibration_points.pop(index)
+            
+            # Recalculate transformation if we still have enough points
+            if len(self.calibration_points) >= self.min_calibration_points():
+                self._calculate_transformation()
+            else:
+                self._is_calibrated = False
+                self.transform_matrix = None
+                self.inverse_transform_matrix = None
+                self.warp = None
+                self.calibration_quality = {}
+            
+            self.calibration_updated.emit(self.is_calibrated())
+            
+            self.log_info(f"Removed calibration point {index}: {removed_point}")
+            return True
+        
+        return False
+    
+    def get_calibration_info(self) -> Dict[str, Any]:
+        """
+        Get information about current calibration state.
+        
+        Returns:
+            Dictionary with calibration information
+        """
+        info = {
+            'is_calibrated': self.is_calibrated(),
+            'point_count': len(self.calibration_points),
+            'points': [
+                {
+                    'pixel': (p.pixel_x, p.pixel_y),
+                    'stage': (p.stage_x, p.stage_y),
+                    'label': p.label
+                }
+                for p in self.calibration_points
+            ],
+            'quality_metrics': self.calibration_quality.copy(),
+            'has_transformation_matrix': self.transform_matrix is not None
+        }
+        
+        return info
+    
+    def export_calibration(self) -> Dict[str, Any]:
+        """
+        Export calibration data for saving.
+        
+        Returns:
+            Dictionary with all calibration data
+        """
+        data = {
+            'calibration_points': [
+                {
+                    'pixel_x': p.pixel_x,
+                    'pixel_y': p.pixel_y,
+                    'stage_x': p.stage_x,
+                    'stage_y': p.stage_y,
+                    'label': p.label
+                }
+                for p in self.calibration_points
+            ],
+            'transform_matrix': self.transform_matrix.tolist() if self.transform_matrix is not None else None,
+            'calibration_quality': self.calibration_quality.copy(),
+            'transformation_model': self.transformation_model,
+            'warp_method': self.warp_method,
+            'warp_grid_spacing': self.warp_grid_spacing,
+            'warp_bounds': list(self.warp_bounds) if self.warp_bounds is not None else None,
+            'is_calibrated': self.is_calibrated()
+        }
+        
+        return data
+    
+    def import_calibration(self, data: Dict[str, Any]) -> bool:
+        """
+        Import calibration data from saved data.
+        
+        Args:
+            data: Calibration data dictionary
+        
+        Returns:
+            True if imported successfully, False otherwise
+        """
+        try:
+            # Clear current calibration
+            self.clear_calibration()
+            
+            # Import calibration points
+            for point_data in data.get('calibration_points', []):
+                point = CalibrationPoint(
+                    pixel_x=point_data['pixel_x'],
+                    pixel_y=point_data['pixel_y'],
+                    stage_x=point_data['stage_x'],
+                    stage_y=point_data['stage_y'],
+                    label=point_data.get('label', '')
+                )
+                self.calibration_points.append(point)
+            
+            # Import transformation model and matrix
+            self.transformation_model = data.get('transformation_model', self.transformation_model)
+            self.warp_method = data.get('warp_method', self.warp_method)
+            self.warp_grid_spacing = data.get('warp_grid_spacing', self.warp_grid_spacing)
+            if data.get('warp_bounds') is not None:
+                self.warp_bounds = tuple(data['warp_bounds'])
+            
+            # Import quality metrics
+            self.calibration_quality = data.get('calibration_quality', {})
+            
+            if data.get('transform_matrix'):
+                self.transform_matrix = np.array(data['transform_matrix'])
+                
+                # Recalculate inverse matrix
+                self.inverse_transform_matrix = _invert_transform(self.transform_matrix)
+                
+                # Rebuild the warp lookup grid from the saved inlier points
+                if self.warp_method is not None and self.calibration_points:
+                    outliers = set(self.calibration_quality.get('outlier_indices', []))
+                    inliers = [p for i, p in enumerate(self.calibration_points) if i not in outliers]
+                    self.warp = self._build_warp(
+                        self.transform_matrix,
+                        np.array([[p.pixel_x, p.pixel_y] for p in inliers], dtype=np.float64),
+                        np.array([[p.stage_x, p.stage_y] for p in inliers], dtype=np.float64)
+                    )
+            self._is_calibrated = data.get('is_calibrated', False)
+            
+            # Emit signals
+            self.calibration_updated.emit(self.is_calibrated())
+            if self.is_calibrated():
+                self.transformation_ready.emit()
+            
+            self.log_info(f"Imported calibration with {len(self.calibration_points)} points")
+            return True
+            
+        except Exception as e:
+            self.log_error(f"Failed to import calibration: {e}")
+            self.clear_calibration()
+            return False
+
+    def is_calibrated(self) -> bool:
+        """
+        Check if the coordinate transformer is calibrated.
+        
+        Returns:
+            True if calibrated, False otherwise
+        """
+        return self._is_calibrated
\ No newline at end of file
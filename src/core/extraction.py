@@ -0,0 +1,669 @@
+"""
+CellSorter Extraction
+
+Square crop calculation and .cxprotocol file generation for CosmoSort hardware.
+Handles coordinate transformation and protocol file export. models.extractor
+adds the Qt signals for the GUI.
+"""
+
+from typing import Optional, List, Tuple, Dict, Any, NamedTuple, Callable
+from dataclasses import dataclass
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import configparser
+import os
+import re
+import threading
+import time
+import numpy as np
+
+from core.observer import Callback
+from utils.error_handler import error_handler
+from utils.logging_config import LoggerMixin
+from utils.exceptions import ExportError, TransformationError
+from models.protocol_writer import (
+    ProtocolPoints, protocol_image_fields, selection_value, write_protocol
+)
+
+
+class BoundingBox(NamedTuple):
+    """Bounding box coordinates."""
+    min_x: float
+    min_y: float
+    max_x: float
+    max_y: float
+
+
+@dataclass
+class CropRegion:
+    """Square crop region data."""
+    center_x: float
+    center_y: float
+    size: float
+    min_x: float = 0.0
+    min_y: float = 0.0
+    max_x: float = 0.0
+    max_y: float = 0.0
+    
+    def __post_init__(self):
+        """Calculate min/max coordinates from center and size."""
+        half_size = self.size / 2
+        self.min_x = self.center_x - half_size
+        self.min_y = self.center_y - half_size
+        self.max_x = self.center_x + half_size
+        self.max_y = self.center_y + half_size
+
+
+# Structured record produced by the batch crop engine
+CROP_DTYPE = np.dtype([
+    ('center_x', np.float64),
+    ('center_y', np.float64),
+    ('size', np.float64),
+    ('min_x', np.float64),
+    ('min_y', np.float64),
+    ('max_x', np.float64),
+    ('max_y', np.float64),
+    ('valid', np.bool_),
+])
+
+
+@dataclass
+class ExtractionPoint:
+    """Single extraction point for protocol file."""
+    id: str
+    label: str
+    color: str
+    well_position: str
+    crop_region: CropRegion
+    metadata: Dict[str, Any]
+
+
+class ExtractionModel(LoggerMixin):
+    """
+    Extractor for generating square crop regions and .cxprotocol files.
+    
+    Features:
+    - Square crop calculation from bounding boxes
+    - Stage coordinate transformation
+    - .cxprotocol file generation for CosmoSort
+    - Validation and quality control
+    """
+    
+    # Notifications
+    extraction_completed = Callback(str)  # file_path
+    extraction_failed = Callback(str)  # error_message
+    progress_updated = Callback(int)  # percentage
+    
+    def __init__(self):
+        # Configuration
+        self.min_crop_size_pixels = 10  # Minimum crop size
+        self.max_crop_size_pixels = 1000  # Maximum crop size
+        self.crop_padding_factor = 1.2  # Add 20% padding around bounding box
+        
+        self.log_info("Extractor initialized")
+    
+    @error_handler("Calculating square crop")
+    def calculate_square_crop(self, bounding_box: BoundingBox, 
+                            image_bounds: Optional[Tuple[int, int]] = None) -> Optional[CropRegion]:
+        """
+        Calculate square crop region from bounding box.
+        
+        Args:
+            bounding_box: Input bounding box coordinates
+            image_bounds: Optional image bounds (width, height) for boundary checking
+        
+        Returns:
+            CropRegion object or None if invalid
+        """
+        crop = self.calculate_square_crops(np.array([bounding_box], dtype=np.float64), image_bounds)[0]
+        
+        if not crop['valid']:
+            width = bounding_box.max_x - bounding_box.min_x
+            height = bounding_box.max_y - bounding_box.min_y
+            if width <= 0 or height <= 0:
+                self.log_warning(f"Invalid bounding box dimensions: {width}x{height}")
+            else:
+                self.log_warning(f"Cannot create valid crop region within image bounds")
+            return None
+        
+        return CropRegion(
+            center_x=float(crop['center_x']),
+            center_y=float(crop['center_y']),
+            size=float(crop['size'])
+        )
+    
+    def calculate_square_crops(self, bounding_boxes: np.ndarray,
+                               image_bounds: Optional[Tuple[int, int]] = None) -> np.ndarray:
+        """
+        Calculate square crop regions for many bounding boxes at once.
+        
+        Vectorized equivalent of calculate_square_crop: padding, size
+        limits, boundary shifting and shrink-to-fit run as array operations.
+        
+        Args:
+            bounding_boxes: Array of shape (N, 4) with (min_x, min_y, max_x, max_y)
+            image_bounds: Optional image bounds (width, height) for boundary checking
+        
+        Returns:
+            Structured array of CROP_DTYPE records; invalid crops have valid=False
+        """
+        boxes = np.asarray(bounding_boxes, dtype=np.float64).reshape(-1, 4)
+        crops = np.zeros(len(boxes), dtype=CROP_DTYPE)
+        
+        # Calculate bounding box dimensions
+        width = boxes[:, 2] - boxes[:, 0]
+        height = boxes[:, 3] - boxes[:, 1]
+        valid = (width > 0) & (height > 0)
+        
+        # Calculate square size (use shorter dimension with padding), within size limits
+        crop_size = np.minimum(width, height) * self.crop_padding_factor
+        crop_size = np.minimum(np.maximum(crop_size, self.min_crop_size_pixels), self.max_crop_size_pixels)
+        
+        # Calculate center point
+        center_x = (boxes[:, 0] + boxes[:, 2]) / 2
+        center_y = (boxes[:, 1] + boxes[:, 3]) / 2
+        
+        shifted_x, shifted_y = center_x, center_y
+        
+        # Check image boundaries if provided
+        if image_bounds:
+            img_width, img_height = image_bounds
+            half_size = crop_size / 2
+            
+            # Shift crop regions to stay within image bounds (low edge first, then high edge)
+            shifted_x = center_x + np.maximum(half_size - center_x, 0)
+            shifted_x = shifted_x - np.maximum(shifted_x + half_size - img_width, 0)
+            shifted_y = center_y + np.maximum(half_size - center_y, 0)
+            shifted_y = shifted_y - np.maximum(shifted_y + half_size - img_height, 0)
+            
+            # Crops still out of bounds are larger than the image allows; shrink them to fit
+            out_of_bounds = (
+                (shifted_x - half_size < 0) | (shifted_y - half_size < 0) |
+                (shifted_x + half_size > img_width) | (shifted_y + half_size > img_height)
+            )
+            max_size_x = np.minimum(center_x * 2, (img_width - center_x) * 2)
+            max_size_y = np.minimum(center_y * 2, (img_height - center_y) * 2)
+            adjusted_size = np.minimum(np.minimum(max_size_x, max_size_y), crop_size)
+            
+            crop_size = np.where(out_of_bounds, adjusted_size, crop_size)
+            valid &= ~out_of_bounds | (adjusted_size >= self.min_crop_size_pixels)
+        
+        half_size = crop_size / 2
+        crops['center_x'] = shifted_x
+        crops['center_y'] = shifted_y
+        crops['size'] = crop_size
+        crops['min_x'] = shifted_x - half_size
+        crops['min_y'] = shifted_y - half_size
+        crops['max_x'] = shifted_x + half_size
+        crops['max_y'] = shifted_y + half_size
+        crops['valid'] = valid
+        
+        return crops
+    
+    def compute_protocol_points(self, selections_data: List[Any],
+                                bounding_boxes: List[BoundingBox],
+                                coordinate_transformer,
+                                image_bounds: Optional[Tuple[int, int]] = None) -> Optional[ProtocolPoints]:
+        """
+        Compute square crop regions for every selected cell in one batch.
+        
+        This is the shared engine behind extraction points and every protocol
+        export path; all selections (e.g. a full 96-well plate) are processed
+        in a single pass.
+        
+        Args:
+            selections_data: Selection dictionaries or Selection objects
+            bounding_boxes: List of bounding box coordinates (in pixels)
+            coordinate_transformer: CalibrationModel instance, or None for pixel coordinates
+            image_bounds: Optional image bounds for boundary checking
+        
+        Returns:
+            ProtocolPoints in stage coordinates, or None if transformation failed
+        """
+        boxes = np.asarray(bounding_boxes, dtype=np.float64).reshape(-1, 4)
+        
+        # Gather every selected cell so crops are computed in one batch
+        pending = []
+        
+        for selection_data in selections_data:
+            cell_indices = selection_value(selection_data, 'cell_indices', [])
+            
+            if not cell_indices:
+                continue
+            
+            for cell_index in cell_indices:
+                if cell_index >= len(bounding_boxes):
+                    self.log_warning(f"Cell index {cell_index} out of range")
+                    continue
+                
+                pending.append((selection_data, cell_index))
+        
+        if not pending:
+            return ProtocolPoints(centers=np.empty((0, 2)), sizes=np.empty(0))
+        
+        # Calculate crop regions in pixel coordinates
+        crops = self.calculate_square_crops(
+            boxes[np.array([cell_index for _, cell_index in pending])], image_bounds
+        )
+        valid = crops['valid']
+        if not valid.all():
+            self.log_warning(f"Skipped {int((~valid).sum())} cells without a valid crop region")
+        pending = [entry for entry, is_valid in zip(pending, valid.tolist()) if is_valid]
+        crops = crops[valid]
+        
+        centers_x, centers_y, sizes = crops['center_x'], crops['center_y'], crops['size']
+        
+        # Transform all crop corners to stage coordinates at once
+        if coordinate_transformer is not None and pending:
+            corners = np.trunc(np.column_stack([
+                crops['min_x'], crops['min_y'], crops['max_x'], crops['max_y']
+            ])).reshape(-1, 2)
+            
+            try:
+                stage_boxes = coordinate_transformer.pixel_to_stage_array(corners).reshape(-1, 4)
+            except TransformationError as e:
+                self.log_warning(f"Failed to transform coordinates for {len(pending)} cells: {e}")
+                return None
+            
+            centers_x = (stage_boxes[:, 0] + stage_boxes[:, 2]) / 2
+            centers_y = (stage_boxes[:, 1] + stage_boxes[:, 3]) / 2
+            sizes = np.abs(stage_boxes[:, 2:] - stage_boxes[:, :2]).max(axis=1)
+        
+        # Per-selection attributes are read once and repeated per cell
+        points = ProtocolPoints(centers=np.column_stack([centers_x, centers_y]), sizes=np.asarray(sizes))
+        attributes = {}
+        for selection_data, cell_index in pending:
+            key = id(selection_data)
+            if key not in attributes:
+                attributes[key] = (
+                    selection_value(selection_data, 'id', ''),
+                    selection_value(selection_data, 'label', 'Selection'),
+                    selection_value(selection_data, 'color', '#FF0000'),
+                    selection_value(selection_data, 'well_position', ''),
+                )
+            selection_id, label, color, well = attributes[key]
+            points.selection_ids.append(selection_id)
+            points.labels.append(f"{label}_{cell_index}")
+            points.colors.append(color)
+            points.wells.append(well)
+            points.cell_indices.append(cell_index)
+        
+        return points
+    
+    def create_extraction_points(self, selections_data: List[Dict[str, Any]], 
+                               bounding_boxes: List[BoundingBox],
+                               coordinate_transformer, 
+                               image_bounds: Optional[Tuple[int, int]] = None) -> List[ExtractionPoint]:
+        """
+        Create extraction points from selections and bounding boxes.
+        
+        Args:
+            selections_data: List of selection data dictionaries
+            bounding_boxes: List of bounding box coordinates (in pixels)
+            coordinate_transformer: CalibrationModel instance
+            image_bounds: Optional image bounds for boundary checking
+        
+        Returns:
+            List of ExtractionPoint objects
+        """
+        points = self.compute_protocol_points(
+            selections_data, bounding_boxes, coordinate_transformer, image_bounds
+        )
+        if points is None:
+            return []
+        
+        metadata = {
+            selection_data['id']: selection_data.get('metadata', {})
+            for selection_data in selections_data
+        }
+        
+        # Per-cell objects are only created here, for serialization
+        extraction_points = []
+        
+        for (center_x, center_y), size, selection_id, label, color, well, cell_index in zip(
+                points.centers.tolist(), points.sizes.tolist(), points.selection_ids,
+                points.labels, points.colors, points.wells, points.cell_indices):
+            # Create extraction point
+            point = ExtractionPoint(
+                id=f"{selection_id}_{cell_index}",
+                label=label,
+                color=color,
+                well_position=well,
+                crop_region=CropRegion(center_x=center_x, center_y=center_y, size=size),
+                metadata={
+                    'selection_id': selection_id,
+                    'cell_index': cell_index,
+                    'original_bbox': bounding_boxes[cell_index],
+                    'selection_metadata': metadata[selection_id]
+                }
+            )
+            
+            extraction_points.append(point)
+        
+        self.log_info(f"Created {len(extraction_points)} extraction points")
+        return extraction_points
+    
+    @error_handler("Generating protocol file")
+    def generate_protocol_file(self, extraction_points: List[ExtractionPoint], 
+                             output_path: str, image_info: Dict[str, Any],
+                             protocol_format: Optional[str] = None) -> bool:
+        """
+        Generate .cxprotocol file for CosmoSort hardware.
+        
+        Args:
+            extraction_points: List of extraction points
+            output_path: Output file path
+            image_info: Image metadata dictionary
+            protocol_format: Output layout name (see PROTOCOL_FORMATS)
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        if not extraction_points:
+            self.log_error("No extraction points to export")
+            return False
+        
+        # Gather point columns once; formatting happens in chunks while streaming
+        points = ProtocolPoints(
+            centers=np.array([(p.crop_region.center_x, p.crop_region.center_y)
+                              for p in extraction_points], dtype=np.float64),
+            sizes=np.array([p.crop_region.size for p in extraction_points], dtype=np.float64),
+            colors=[p.color for p in extraction_points],
+            wells=[p.well_position for p in extraction_points],
+            labels=[p.label for p in extraction_points],
+        )
+        
+        return self._write_protocol(points, output_path, image_info, protocol_format)
+    
+    @error_handler("Exporting protocol")
+    def export_protocol(self, selections_data: List[Any], bounding_boxes: List[BoundingBox],
+                        coordinate_transformer, output_path: str, image_info: Dict[str, Any],
+                        image_bounds: Optional[Tuple[int, int]] = None,
+                        protocol_format: Optional[str] = None, backup: bool = True) -> bool:
+        """
+        Write a .cxprotocol file straight from selections, without per-cell objects.
+        
+        Args:
+            selections_data: Selection dictionaries or Selection objects
+            bounding_boxes: List of bounding box coordinates (in pixels)
+            coordinate_transformer: CalibrationModel instance, or None for pixel coordinates
+            output_path: Output file path
+            image_info: Image metadata dictionary
+            image_bounds: Optional image bounds for boundary checking
+            protocol_format: Output layout name (see PROTOCOL_FORMATS)
+            backup: Whether to keep a timestamped backup next to the output
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        points = self.compute_protocol_points(
+            selections_data, bounding_boxes, coordinate_transformer, image_bounds
+        )
+        
+        if not points:
+            self.log_error("No extraction points to export")
+            return False
+        
+        return self._write_protocol(points, output_path, image_info, protocol_format, backup)
+    
+    def export_protocol_batch(self, selections_data: List[Any], bounding_boxes: List[BoundingBox],
+                              coordinate_transformer, output_dir: str, image_info: Dict[str, Any],
+                              image_bounds: Optional[Tuple[int, int]] = None, combined: bool = False,
+                              protocol_format: Optional[str] = None, max_workers: Optional[int] = None,
+                              progress_callback: Optional[Callable[[int, int], None]] = None,
+                              cancel_event: Optional[threading.Event] = None) -> List[Path]:
+        """
+        Export protocols for many selections (e.g. a full 96-well plate) at once.
+        
+        Crops and stage coordinates for all selections are computed in one
+        batch; the per-well files are then written by a thread pool. Safe to
+        call from a worker thread.
+        
+        Args:
+            selections_data: Selection dictionaries or Selection objects
+            bounding_boxes: List of bounding box coordinates (in pixels)
+            coordinate_transformer: CalibrationModel instance, or None for pixel coordinates
+            output_dir: Directory receiving the protocol files
+            image_info: Image metadata dictionary
+            image_bounds: Optional image bounds for boundary checking
+            combined: Write one protocol with every selection instead of one per selection
+            protocol_format: Output layout name (see PROTOCOL_FORMATS)
+            max_workers: Thread pool size (defaults to the CPU count, at most 8)
+            progress_callback: Called with (files_done, files_total) after each file
+            cancel_event: Set to stop before the remaining files are written
+        
+        Returns:
+            Paths of the files written, in selection order
+        """
+        points = self.compute_protocol_points(
+            selections_data, bounding_boxes, coordinate_transformer, image_bounds
+        )
+        if points is None:
+            raise ExportError("Failed to convert cell coordinates to stage coordinates")
+        
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        image_fields = protocol_image_fields(image_info)
+        
+        if combined:
+            jobs = [(output_dir / f"{image_fields['FILE']}_all_wells.cxprotocol", points)] if points else []
+        else:
+            labels = {
+                selection_value(selection, 'id', ''): selection_value(selection, 'label', 'Selection')
+                for selection in selections_data
+            }
+            taken = set()
+            jobs = []
+            for selection_id, positions in points.group_by_selection().items():
+                subset = points.take(positions)
+                path = self._unique_protocol_path(output_dir, subset.wells[0], labels[selection_id], taken)
+                jobs.append((path, subset))
+        
+        if not jobs:
+            self.log_error("No extraction points to export")
+            return []
+        
+        def write_job(path: Path, subset: ProtocolPoints) -> Optional[Path]:
+            if cancel_event is not None and cancel_event.is_set():
+                return None
+            write_protocol(path, image_fields, subset.boxes, subset.colors, subset.wells,
+                           subset.labels, protocol_format=protocol_format)
+            return path
+        
+        workers = max_workers or min(8, os.cpu_count() or 1)
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(write_job, path, subset) for path, subset in jobs]
+            try:
+                for done, future in enumerate(as_completed(futures), 1):
+                    future.result()
+                    if progress_callback is not None:
+                        progress_callback(done, len(jobs))
+                    if cancel_event is not None and cancel_event.is_set():
+                        break
+            finally:
+                # Drop queued files on cancellation or error; running writes finish atomically
+                executor.shutdown(wait=True, cancel_futures=True)
+        
+        # Writes that finished after cancellation still count
+        paths = [
+            future.result() for future in futures
+            if not future.cancelled() and future.exception() is None and future.result() is not None
+        ]
+        self.log_info(f"Exported {len(paths)} of {len(jobs)} protocol files "
+                      f"({len(points)} points) to {output_dir}")
+        return paths
+    
+    @staticmethod
+    def _unique_protocol_path(output_dir: Path, well: str, label: str, taken: set) -> Path:
+        """File name '<well>_<label>.cxprotocol' for one selection, made unique."""
+        stem = re.sub(r'[^\w\-]+', '_', f"{well or 'NoWell'}_{label}").strip('_')
+        
+        candidate, suffix = stem, 2
+        while candidate.lower() in taken:
+            candidate, suffix = f"{stem}_{suffix}", suffix + 1
+        taken.add(candidate.lower())
+        return output_dir / f"{candidate}.cxprotocol"
+    
+    def _write_protocol(self, points: ProtocolPoints, output_path: str,
+                        image_info: Dict[str, Any], protocol_format: Optional[str] = None,
+                        backup: bool = True) -> bool:
+        """Write protocol points through the streaming writer and emit the result."""
+        try:
+            # Write atomically, then back up the finished file
+            output_file = Path(output_path)
+            backup_path = write_protocol(
+                output_file, protocol_image_fields(image_info), points.boxes,
+                points.colors, points.wells, points.labels,
+                backup_path=output_file.with_suffix(f'.backup_{int(time.time())}.cxprotocol') if backup else None,
+                protocol_format=protocol_format
+            )
+            
+            self.log_info(f"Generated protocol file: {output_path} ({len(points)} points)")
+            if backup_path is not None:
+                self.log_info(f"Backup created: {backup_path}")
+            
+            # Emit signal
+            self.extraction_completed.emit(str(output_path))
+            
+            return True
+            
+        except Exception as e:
+            error_msg = f"Failed to generate protocol file: {e}"
+            self.log_error(error_msg)
+            self.extraction_failed.emit(error_msg)
+            return False
+    
+    def validate_protocol_file(self, file_path: str) -> Dict[str, Any]:
+        """
+        Validate a generated protocol file.
+        
+        Args:
+            file_path: Path to protocol file
+        
+        Returns:
+            Validation result dictionary
+        """
+        validation_result = {
+            'is_valid': False,
+            'errors': [],
+            'warnings': [],
+            'point_count': 0,
+            'file_size_bytes': 0
+        }
+        
+        try:
+            file_path = Path(file_path)
+            
+            if not file_path.exists():
+                validation_result['errors'].append("File does not exist")
+                return validation_result
+            
+            validation_result['file_size_bytes'] = file_path.stat().st_size
+            
+            # Parse the file
+            config = configparser.ConfigParser()
+            config.read(file_path, encoding='utf-8')
+            
+            # Check required sections
+            required_sections = ['IMAGE', 'IMAGING_LAYOUT']
+            for section in required_sections:
+                if not config.has_section(section):
+                    validation_result['errors'].append(f"Missing required section: {section}")
+            
+            if validation_result['errors']:
+                return validation_result
+            
+            # Validate IMAGE section
+            image_section = config['IMAGE']
+            required_image_keys = ['FILE', 'WIDTH', 'HEIGHT', 'FORMAT']
+            for key in required_image_keys:
+                if key not in image_section:
+                    validation_result['errors'].append(f"Missing IMAGE key: {key}")
+            
+            # Validate IMAGING_LAYOUT section
+            layout_section = config['IMAGING_LAYOUT']
+            if 'Points' not in layout_section:
+                validation_result['errors'].append("Missing Points in IMAGING_LAYOUT")
+                return validation_result
+            
+            try:
+                point_count = int(layout_section['Points'])
+                validation_result['point_count'] = point_count
+            except ValueError:
+                validation_result['errors'].append("Invalid Points value")
+                return validation_result
+            
+            # Validate point entries
+            for i in range(1, point_count + 1):
+                point_key = f'P_{i}'
+                if point_key not in layout_section:
+                    validation_result['errors'].append(f"Missing point entry: {point_key}")
+                    continue
+                
+                # Parse point data
+                point_data = layout_section[point_key].strip('"')
+                parts = [p.strip() for p in point_data.split(';')]
+                
+                if len(parts) < 6:
+                    validation_result['warnings'].append(f"Point {i} has incomplete data")
+                    continue
+                
+                # Validate coordinate format
+                try:
+                    float(parts[0])  # min_x
+                    float(parts[1])  # min_y
+                    float(parts[2])  # max_x
+                    float(parts[3])  # max_y
+                except ValueError:
+                    validation_result['errors'].append(f"Point {i} has invalid coordinates")
+            
+            # Final validation
+            validation_result['is_valid'] = len(validation_result['errors']) == 0
+            
+            if validation_result['is_valid']:
+                self.log_info(f"Protocol file validation passed: {file_path}")
+            else:
+                self.log_warning(f"Protocol file validation failed: {validation_result['errors']}")
+            
+        except Exception as e:
+            validation_result['errors'].append(f"Validation error: {e}")
+            self.log_error(f"Protocol file validation error: {e}")
+        
+        return validation_result
+    
+    def get_extraction_statistics(self, extraction_points: List[ExtractionPoint]) -> Dict[str, Any]:
+        """
+        Get statistics about extraction points.
+        
+        Args:
+            extraction_points: List of extraction points
+        
+        Returns:
+            Statistics dictionary
+        """
+        if not extraction_points:
+            return {
+                'total_points': 0,
+                'unique_wells': 0,
+                'unique_colors': 0,
+                'average_crop_size': 0.0,
+                'crop_size_range': (0.0, 0.0)
+            }
+        
+        crop_sizes = [point.crop_region.size for point in extraction_points]
+        wells = set(point.well_position for point in extraction_points if point.well_position)
+        colors = set(point.color for point in extraction_points)
+        
+        stats = {
+            'total_points': len(extraction_points),
+            'unique_wells': len(wells),
+            'unique_colors': len(colors),
+            'average_crop_size': np.mean(crop_sizes),
+            'crop_size_range': (min(crop_sizes), max(crop_sizes)),
+            'crop_size_std': np.std(crop_sizes),
+            'wells_used': sorted(list(wells)),
+            'colors_used': sorted(list(colors))
+        }
+        
+        return stats
\ No newline at end of file
@@ -0,0 +1,213 @@
+"""
+CellSorter Image Loader
+
+Decoding of microscopy images (TIFF, JPG, JPEG, PNG) into numpy arrays,
+without any Qt dependency. models.image_handler runs this in a worker
+thread for the GUI.
+"""
+
+import time
+from typing import Optional, Tuple, Dict, Any, Callable
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageFile
+
+from config.settings import SUPPORTED_IMAGE_FORMATS, MAX_IMAGE_SIZE_MB
+from utils.exceptions import ImageLoadError
+from utils.logging_config import get_logger
+
+# Enable loading of large images
+ImageFile.LOAD_TRUNCATED_IMAGES = True
+
+logger = get_logger(__name__)
+
+ProgressCallback = Optional[Callable[[int], None]]
+
+
+def load_image_file(file_path: str,
+                    progress_callback: ProgressCallback = None,
+                    is_cancelled: Optional[Callable[[], bool]] = None
+                    ) -> Optional[Tuple[np.ndarray, Dict[str, Any]]]:
+    """
+    Validate and decode an image file.
+
+    Args:
+        file_path: Path to the image
+        progress_callback: Optional callable receiving a percentage
+        is_cancelled: Optional callable polled between stages
+
+    Returns:
+        (image_data, metadata) tuple, or None if cancelled
+
+    Raises:
+        ImageLoadError: If the file is missing, unsupported, too large or unreadable
+    """
+    def report(percentage: int) -> None:
+        if progress_callback is not None:
+            progress_callback(percentage)
+
+    def cancelled() -> bool:
+        return is_cancelled is not None and is_cancelled()
+
+    start_time = time.time()
+    file_path = Path(file_path)
+
+    # Validate file
+    if not file_path.exists():
+        raise ImageLoadError(f"File not found: {file_path}")
+
+    if file_path.suffix.lower() not in SUPPORTED_IMAGE_FORMATS:
+        raise ImageLoadError(f"Unsupported format: {file_path.suffix}")
+
+    # Check file size
+    file_size_mb = file_path.stat().st_size / (1024 * 1024)
+    if file_size_mb > MAX_IMAGE_SIZE_MB:
+        raise ImageLoadError(f"File too large: {file_size_mb:.1f}MB > {MAX_IMAGE_SIZE_MB}MB")
+
+    report(10)
+
+    if cancelled():
+        return None
+
+    # Load image based on format
+    if file_path.suffix.lower() in ['.tiff', '.tif']:
+        image_data, metadata = load_tiff(file_path, progress_callback)
+    else:
+        image_data, metadata = load_standard_format(file_path, progress_callback)
+
+    report(90)
+
+    if cancelled():
+        return None
+
+    # Validate loading performance
+    load_time = time.time() - start_time
+    target_time = 5.0  # 5 seconds for 500MB
+    adjusted_target = target_time * (file_size_mb / 500)
+
+    if load_time > adjusted_target:
+        logger.warning(f"Image loading took {load_time:.2f}s, target was {adjusted_target:.2f}s")
+
+    # Add timing metadata
+    metadata.update({
+        'load_time_seconds': load_time,
+        'file_size_mb': file_size_mb,
+        'performance_target_met': load_time <= adjusted_target
+    })
+
+    report(100)
+
+    logger.info(f"Image loaded successfully: {file_path.name} "
+                f"({file_size_mb:.1f}MB, {load_time:.2f}s)")
+
+    return image_data, metadata
+
+
+def load_tiff(file_path: Path, progress_callback: ProgressCallback = None) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """
+    Load TIFF image with support for multi-channel and large files.
+
+    Args:
+        file_path: Path to TIFF file
+        progress_callback: Optional callable receiving a percentage
+
+    Returns:
+        Tuple of (image_data, metadata)
+    """
+    import cv2  # Deferred: OpenCV takes a large share of application start-up
+
+    report = progress_callback or (lambda percentage: None)
+    try:
+        # Try OpenCV first for standard TIFF files
+        image = cv2.imread(str(file_path), cv2.IMREAD_UNCHANGED)
+
+        if image is not None:
+            report(50)
+
+            # Convert BGR to RGB if color image
+            if len(image.shape) == 3 and image.shape[2] == 3:
+                image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+            metadata = {
+                'format': 'TIFF',
+                'shape': image.shape,
+                'dtype': str(image.dtype),
+                'channels': 1 if len(image.shape) == 2 else image.shape[2],
+                'bit_depth': image.dtype.itemsize * 8,
+                'loader': 'opencv'
+            }
+
+            return image, metadata
+
+        # Fallback to PIL for complex TIFF files
+        report(30)
+
+        with Image.open(file_path) as pil_image:
+            # Handle multi-frame TIFF (take first frame)
+            if hasattr(pil_image, 'n_frames') and pil_image.n_frames > 1:
+                logger.info(f"Multi-frame TIFF detected: {pil_image.n_frames} frames, using first frame")
+                pil_image.seek(0)
+
+            report(60)
+
+            # Convert to numpy array
+            image = np.array(pil_image)
+
+            metadata = {
+                'format': 'TIFF',
+                'shape': image.shape,
+                'dtype': str(image.dtype),
+                'channels': 1 if len(image.shape) == 2 else image.shape[2],
+                'mode': pil_image.mode,
+                'frames': getattr(pil_image, 'n_frames', 1),
+                'loader': 'pillow'
+            }
+
+            return image, metadata
+
+    except Exception as e:
+        raise ImageLoadError(f"Failed to load TIFF file: {e}")
+
+
+def load_standard_format(file_path: Path,
+                         progress_callback: ProgressCallback = None) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """
+    Load standard format images (JPG, JPEG, PNG).
+
+    Args:
+        file_path: Path to image file
+        progress_callback: Optional callable receiving a percentage
+
+    Returns:
+        Tuple of (image_data, metadata)
+    """
+    import cv2
+
+    try:
+        # Use OpenCV for standard formats
+        image = cv2.imread(str(file_path), cv2.IMREAD_UNCHANGED)
+
+        if image is None:
+            raise ImageLoadError(f"Failed to load image: {file_path}")
+
+        if progress_callback is not None:
+            progress_callback(50)
+
+        # Convert BGR to RGB for color images
+        if len(image.shape) == 3 and image.shape[2] == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+        metadata = {
+            'format': file_path.suffix.upper().lstrip('.'),
+            'shape': image.shape,
+            'dtype': str(image.dtype),
+            'channels': 1 if len(image.shape) == 2 else image.shape[2],
+            'bit_depth': image.dtype.itemsize * 8,
+            'loader': 'opencv'
+        }
+
+        return image, metadata
+
+    except Exception as e:
+        raise ImageLoadError(f"Failed to load {file_path.suffix} file: {e}")
@@ -0,0 +1,84 @@
+"""
+CellSorter Observer
+
+Minimal callback interface for the Qt-free model layer. Models declare
+notifications as class attributes and call connect()/emit() exactly like Qt
+signals:
+
+    class CalibrationModel:
+        calibration_updated = Callback(bool)
+
+        def fit(self):
+            ...
+            self.calibration_updated.emit(True)
+
+The Qt adapters in models/ subclass a model together with QObject and
+redeclare the same names as Signals, so the model's emits reach Qt slots
+there and plain Python callables everywhere else.
+"""
+
+from typing import Any, Callable, List, Optional
+
+from utils.logging_config import get_logger
+
+
+logger = get_logger(__name__)
+
+
+class CallbackList:
+    """Callables connected to one notification of one model instance."""
+
+    __slots__ = ('_callbacks',)
+
+    def __init__(self):
+        self._callbacks: List[Callable[..., Any]] = []
+
+    def connect(self, callback: Callable[..., Any]) -> None:
+        """Call callback on every emit."""
+        self._callbacks.append(callback)
+
+    def disconnect(self, callback: Optional[Callable[..., Any]] = None) -> None:
+        """Remove one callback, or all of them."""
+        if callback is None:
+            self._callbacks.clear()
+        else:
+            self._callbacks.remove(callback)
+
+    def emit(self, *args: Any) -> None:
+        """
+        Call every connected callback with args, in connection order.
+
+        A failing callback is logged and does not stop the others, as with
+        Qt slots.
+        """
+        for callback in list(self._callbacks):
+            try:
+                callback(*args)
+            except Exception:
+                logger.exception(f"Callback {callback!r} failed")
+
+    def __len__(self) -> int:
+        return len(self._callbacks)
+
+
+class Callback:
+    """
+    Notification declared on a model class, the Qt-free counterpart of Signal.
+
+    Argument types are documentation only. Each instance gets its own
+    CallbackList on first access.
+    """
+
+    def __init__(self, *types: type):
+        self.types = types
+        self.name = ''
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance: Any, owner: type) -> Any:
+        if instance is None:
+            return self
+        # Cached in the instance dictionary, which shadows this descriptor afterwards
+        callbacks = instance.__dict__[self.name] = CallbackList()
+        return callbacks
@@ -4,11 +4,18 @@ Headless GUI Development System for CellSorter
 This module provides infrastructure for developing and maintaining PySide6 GUIs 
 in headless environments, enabling AI agents and developers to work with UI 
 purely through structured text formats.
+
+Names are imported from their submodules on first access, so the GUI can
+check the mode without loading the UI model and its YAML dependencies.
 """
 
-from .display_detector import DisplayDetector, has_display, get_display_info
-from .mode_manager import ModeManager, is_dev_mode, set_dev_mode, get_mode_info
-from .ui_model import UIModel, Widget, Layout
+from utils.lazy_import import lazy_getattr, exports_by_module
+
+__getattr__ = lazy_getattr(__name__, globals(), exports_by_module({
+    '.display_detector': ['DisplayDetector', 'has_display', 'get_display_info'],
+    '.mode_manager': ['ModeManager', 'is_dev_mode', 'set_dev_mode', 'get_mode_info'],
+    '.ui_model': ['UIModel', 'Widget', 'Layout'],
+}))
 
 __all__ = [
     'DisplayDetector',
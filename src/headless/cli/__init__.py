@@ -3,12 +3,21 @@ Headless CLI Tools
 
 Command-line interface tools for headless GUI development.
 Provides tools for UI manipulation, validation, and editing.
+
+Names are imported on first access, so the daemon client in
+headless.cli.daemon starts without loading the serializers.
 """
 
-from .ui_tools import UITools
-from .cli_commands import HeadlessCLI
+from utils.lazy_import import lazy_getattr
+
+__getattr__ = lazy_getattr(__name__, globals(), {
+    'UITools': '.ui_tools',
+    'HeadlessCLI': '.cli_commands',
+    'CLIDaemon': '.daemon',
+})
 
 __all__ = [
     'UITools',
     'HeadlessCLI',
-] 
\ No newline at end of file
+    'CLIDaemon',
+]
\ No newline at end of file
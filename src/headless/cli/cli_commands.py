@@ -9,8 +9,9 @@ import argparse
 import json
 import sys
 import os
+import time
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 
 from ..ui_model import UIModel
 from ..session_manager import HeadlessSessionManager
@@ -18,9 +19,19 @@ from ..main_window_adapter import MainWindowAdapter
 from .ui_tools import UITools, UIToolsError
 from ..mode_manager import ModeManager
 
+# A file modified this recently may change again within the same mtime tick
+# without changing size, so its cached parse is not trusted
+RACY_WINDOW_NS = 2_000_000_000
+
 
 class HeadlessCLI:
-    """Main CLI interface for headless UI development."""
+    """
+    Main CLI interface for headless UI development.
+    
+    Parsed UI files and validators are kept for the lifetime of the
+    instance, so a long-running instance (see headless.cli.daemon) only
+    re-parses a file after it changed on disk.
+    """
     
     def __init__(self, project_root: Optional[Path] = None):
         self.project_root = project_root or Path.cwd()
@@ -30,6 +41,9 @@ class HeadlessCLI:
         self.ui_model: Optional[UIModel] = None
         self.adapter: Optional[MainWindowAdapter] = None
         self._active_session: Optional[str] = None
+        self._model_cache: Dict[str, Tuple[Tuple[int, int], UIModel]] = {}
+        self._schema_validator = None
+        self._semantic_validator = None
     
     def create_parser(self) -> argparse.ArgumentParser:
         """Create the main argument parser."""
@@ -80,6 +94,12 @@ class HeadlessCLI:
         # Mode info
         subparsers.add_parser('mode-info', help='Show current mode information')
         
+        # Batch processing
+        batch_parser = subparsers.add_parser('batch', help='Generate protocols for many slides')
+        batch_parser.add_argument('manifest', help='Batch manifest (JSON or YAML)')
+        batch_parser.add_argument('--output', help="Output directory (overrides the manifest's output_dir)")
+        batch_parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+        
         return parser
     
     def run(self, args: Optional[List[str]] = None) -> int:
@@ -94,6 +114,8 @@ class HeadlessCLI:
                 return self._handle_model_command(parsed_args)
             elif parsed_args.command == 'mode-info':
                 return self._handle_mode_info()
+            elif parsed_args.command == 'batch':
+                return self._handle_batch_command(parsed_args)
             else:
                 parser.print_help()
                 return 1
@@ -236,6 +258,38 @@ class HeadlessCLI:
             print(f"Failed to get mode info: {e}", file=sys.stderr)
             return 1
     
+    def _handle_batch_command(self, args) -> int:
+        """Handle batch processing command."""
+        from services.batch_processor import load_manifest, run_batch
+        
+        try:
+            manifest = load_manifest(args.manifest, args.output)
+        except Exception as e:
+            print(f"Failed to load manifest: {e}", file=sys.stderr)
+            return 1
+        
+        def on_slide_finished(done: int, total: int, result) -> None:
+            if result.succeeded:
+                print(f"[{done}/{total}] {result.name}: {len(result.protocols)} protocols, "
+                      f"{result.points} points in {result.total_seconds:.2f}s")
+            else:
+                print(f"[{done}/{total}] {result.name}: FAILED - {result.error}", file=sys.stderr)
+        
+        print(f"Processing {len(manifest.slides)} slides...")
+        report = run_batch(manifest.slides, workers=args.workers, progress_callback=on_slide_finished)
+        json_path, csv_path = report.write(manifest.output_dir)
+        
+        summary = report.summary()
+        print("Batch Summary:")
+        print(f"  Slides: {summary['succeeded']} succeeded, {summary['failed']} failed")
+        print(f"  Wall Time: {summary['wall_seconds']:.1f}s ({summary['slides_per_minute']} slides/min)")
+        print("  Stage Time:")
+        for stage, seconds in summary['stage_seconds'].items():
+            print(f"    {stage}: {seconds:.2f}s")
+        print(f"  Report: {json_path}, {csv_path}")
+        
+        return 0 if not report.failed else 1
+    
     def dump_ui(self, output: Optional[str] = None, format: str = 'yaml') -> None:
         """
         Dump current UI definition to file or stdout.
@@ -279,19 +333,7 @@ class HeadlessCLI:
             input_path: Path to UI definition file
         """
         try:
-            # Determine format from extension
-            if input_path.endswith('.yaml') or input_path.endswith('.yml'):
-                from ..serializers.yaml_serializer import YAMLSerializer
-                serializer = YAMLSerializer()
-            else:
-                from ..serializers.json_serializer import JSONSerializer
-                serializer = JSONSerializer()
-            
-            # Load and deserialize
-            with open(input_path, 'r') as f:
-                content = f.read()
-                
-            self.ui_model = serializer.deserialize(content)
+            self.ui_model = self._read_model(input_path)
             
             # Apply to adapter if available
             if self.adapter:
@@ -314,13 +356,15 @@ class HeadlessCLI:
             from ..validators.schema_validator import SchemaValidator
             from ..validators.semantic_validator import SemanticValidator
             
+            if self._schema_validator is None:
+                self._schema_validator = SchemaValidator()
+                self._semantic_validator = SemanticValidator()
+            
             # Load UI definition
-            with open(input_path, 'r') as f:
-                content = f.read()
+            ui_model = self._read_model(input_path)
             
             # Validate schema
-            schema_validator = SchemaValidator()
-            schema_errors = schema_validator.validate(content)
+            schema_errors = self._schema_validator.validate(ui_model)
             
             if schema_errors:
                 print("Schema validation errors:")
@@ -331,8 +375,7 @@ class HeadlessCLI:
             print("✓ Schema validation passed")
             
             # Validate semantics
-            semantic_validator = SemanticValidator()
-            semantic_errors = semantic_validator.validate(content)
+            semantic_errors = self._semantic_validator.validate(ui_model)
             
             if semantic_errors:
                 print("Semantic validation errors:")
@@ -347,6 +390,36 @@ class HeadlessCLI:
             print(f"Error validating UI: {e}")
             raise
     
+    def _read_model(self, input_path: str) -> UIModel:
+        """
+        Deserialize a UI definition file, reusing the last result while the
+        file's modification time and size are unchanged (and not too recent
+        to tell edits apart).
+        
+        The cached model is shared between calls, so callers must not edit it.
+        """
+        path = os.path.abspath(input_path)
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        
+        cached = self._model_cache.get(path)
+        if cached is not None and cached[0] == signature and time.time_ns() - stat.st_mtime_ns > RACY_WINDOW_NS:
+            return cached[1]
+        
+        # Determine format from extension
+        if path.endswith(('.yaml', '.yml')):
+            from ..serializers.yaml_serializer import YAMLSerializer
+            serializer = YAMLSerializer()
+        else:
+            from ..serializers.json_serializer import JSONSerializer
+            serializer = JSONSerializer()
+        
+        with open(path, 'r') as f:
+            ui_model = serializer.deserialize(f.read())
+        
+        self._model_cache[path] = (signature, ui_model)
+        return ui_model
+    
     def interactive_mode(self) -> None:
         """
         Start interactive headless session.
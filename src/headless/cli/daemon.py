@@ -0,0 +1,367 @@
+"""
+Headless CLI Daemon
+
+Long-running process that serves headless CLI commands, so scripts and AI
+agents issuing many dump-ui / load-ui / validate-ui calls pay the Python,
+serializer and validator start-up once instead of per command. One
+HeadlessCLI instance keeps the loaded model, parsed UI files and
+validators between requests.
+
+Requests are newline-delimited JSON-RPC 2.0 over a Unix socket or
+stdin/stdout:
+
+    {"jsonrpc": "2.0", "id": 1, "method": "validate_ui", "params": {"input_path": "/abs/ui.yaml"}}
+    {"jsonrpc": "2.0", "id": 1, "result": {"exit_code": 0, "stdout": "...", "stderr": "", "elapsed_ms": 1.8}}
+
+Commands are run one at a time. Their console output is captured and
+returned with the result, together with the time spent serving them.
+
+Only the standard library is imported at module level, so the thin client
+(forward_command) starts quickly; the CLI is imported when a daemon starts.
+"""
+
+import contextlib
+import inspect
+import io
+import json
+import logging
+import os
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, TextIO
+
+logger = logging.getLogger(__name__)
+
+SOCKET_ENV_VAR = 'CELLSORTER_DAEMON_SOCKET'
+CONNECT_TIMEOUT = 0.5
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+COMMAND_FAILED = -32000
+
+
+class DaemonError(Exception):
+    """Raised when the daemon cannot be started or a forwarded command fails."""
+    pass
+
+
+def default_socket_path() -> str:
+    """Socket path from CELLSORTER_DAEMON_SOCKET, or a per-user path in the temp directory."""
+    path = os.environ.get(SOCKET_ENV_VAR)
+    if path:
+        return path
+    user = os.getuid() if hasattr(os, 'getuid') else os.environ.get('USERNAME', 'user')
+    return os.path.join(tempfile.gettempdir(), f'cellsorter-headless-{user}.sock')
+
+
+@dataclass
+class CommandStats:
+    """Latency statistics of one daemon method."""
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    
+    def add(self, elapsed_ms: float) -> None:
+        """Record one served request."""
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+    
+    def to_dict(self) -> Dict[str, float]:
+        """Convert to dictionary."""
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total_ms / self.count, 3) if self.count else 0.0,
+            'max_ms': round(self.max_ms, 3),
+        }
+
+
+class CLIDaemon:
+    """Serves JSON-RPC requests with one warm HeadlessCLI."""
+    
+    def __init__(self, cli=None):
+        if cli is None:
+            from .cli_commands import HeadlessCLI
+            cli = HeadlessCLI()
+        self.cli = cli
+        self.stats: Dict[str, CommandStats] = {}
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+        self._server: Optional[socketserver.BaseServer] = None
+        self._stopping = False
+        self._methods: Dict[str, Callable[..., Any]] = {
+            'dump_ui': self.cli.dump_ui,
+            'load_ui': self.cli.load_ui,
+            'validate_ui': self.cli.validate_ui,
+            'run_command': self.cli.run_command,
+            'run': self.cli.run,
+        }
+    
+    def handle_line(self, line: str) -> Optional[str]:
+        """
+        Serve one request line.
+        
+        Returns:
+            The response line, or None for a notification (no id)
+        """
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            return self._encode(None, error=_error(PARSE_ERROR, f"Invalid JSON: {e}"))
+        
+        if not isinstance(request, dict) or not isinstance(request.get('method'), str):
+            return self._encode(None, error=_error(INVALID_REQUEST, "Expected an object with a method"))
+        
+        request_id = request.get('id')
+        params = request.get('params') or {}
+        if not isinstance(params, dict):
+            return self._encode(request_id, error=_error(INVALID_PARAMS, "params must be an object"))
+        
+        result, error = self.handle(request['method'], params)
+        if 'id' not in request:
+            return None
+        return self._encode(request_id, result=result, error=error)
+    
+    def handle(self, method: str, params: Dict[str, Any]):
+        """
+        Run one method.
+        
+        Returns:
+            (result, error) where exactly one is None
+        """
+        if method == 'ping':
+            return {'pid': os.getpid(), 'uptime_s': round(time.monotonic() - self.started, 3)}, None
+        if method == 'stats':
+            return {name: stats.to_dict() for name, stats in self.stats.items()}, None
+        if method == 'shutdown':
+            self.stop()
+            return {'stopping': True}, None
+        
+        command = self._methods.get(method)
+        if command is None:
+            return None, _error(METHOD_NOT_FOUND, f"Unknown method: {method}")
+        if method in ('run', 'run_command') and not params.get('args'):
+            # Without arguments both would start the interactive prompt
+            return None, _error(INVALID_PARAMS, f"{method} needs a non-empty args list")
+        try:
+            inspect.signature(command).bind(**params)
+        except TypeError as e:
+            return None, _error(INVALID_PARAMS, f"{method}: {e}")
+        
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with self._lock:
+            start = time.perf_counter()
+            try:
+                with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                    value = command(**params)
+                exit_code = value if isinstance(value, int) else 0
+                error = None
+            except Exception as e:
+                exit_code, error = 1, _error(COMMAND_FAILED, str(e))
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.stats.setdefault(method, CommandStats()).add(elapsed_ms)
+        
+        logger.info(f"{method} served in {elapsed_ms:.1f} ms")
+        output = {'stdout': stdout.getvalue(), 'stderr': stderr.getvalue(), 'elapsed_ms': round(elapsed_ms, 3)}
+        if error is not None:
+            error['data'] = output
+            return None, error
+        return dict(exit_code=exit_code, **output), None
+    
+    def serve_stdio(self, input_stream: Optional[TextIO] = None, output_stream: Optional[TextIO] = None) -> None:
+        """Serve requests line by line until end of input or a shutdown request."""
+        input_stream = input_stream or sys.stdin
+        output_stream = output_stream or sys.stdout
+        for line in input_stream:
+            if not line.strip():
+                continue
+            response = self.handle_line(line)
+            if response is not None:
+                output_stream.write(response + '\n')
+                output_stream.flush()
+            if self._stopping:
+                break
+    
+    def serve_socket(self, socket_path: Optional[str] = None, ready: Optional[threading.Event] = None) -> None:
+        """
+        Serve requests on a Unix socket until a shutdown request.
+        
+        Args:
+            socket_path: Socket to listen on, default_socket_path() if None
+            ready: Set once the socket accepts connections
+        
+        Raises:
+            DaemonError: If Unix sockets are unsupported or a daemon already listens on the path
+        """
+        if not hasattr(socket, 'AF_UNIX'):
+            raise DaemonError("Unix sockets are not supported on this platform; use stdio mode")
+        
+        socket_path = socket_path or default_socket_path()
+        if os.path.exists(socket_path):
+            if _connect(socket_path) is not None:
+                raise DaemonError(f"A daemon is already listening on {socket_path}")
+            os.unlink(socket_path)  # Left behind by a daemon that did not exit cleanly
+        
+        daemon = self
+        
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for raw_line in self.rfile:
+                    line = raw_line.decode('utf-8').strip()
+                    if not line:
+                        continue
+                    response = daemon.handle_line(line)
+                    if response is not None:
+                        self.wfile.write(response.encode('utf-8') + b'\n')
+                    if daemon._stopping:
+                        break
+        
+        class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+            daemon_threads = True
+        
+        with Server(socket_path, Handler) as server:
+            os.chmod(socket_path, 0o600)
+            self._server = server
+            logger.info(f"Headless CLI daemon listening on {socket_path} (pid {os.getpid()})")
+            if ready is not None:
+                ready.set()
+            try:
+                server.serve_forever()
+            finally:
+                self._server = None
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(socket_path)
+                logger.info(f"Headless CLI daemon stopped: {self.stats_summary()}")
+    
+    def stop(self) -> None:
+        """Stop serving after the current request."""
+        self._stopping = True
+        if self._server is not None:
+            # shutdown() waits for serve_forever, which runs on another thread
+            threading.Thread(target=self._server.shutdown, daemon=True).start()
+    
+    def stats_summary(self) -> str:
+        """One-line latency summary per method."""
+        if not self.stats:
+            return "no commands served"
+        return ", ".join(
+            f"{name}: {s.count} x {s.total_ms / s.count:.1f} ms (max {s.max_ms:.1f})"
+            for name, s in self.stats.items()
+        )
+    
+    @staticmethod
+    def _encode(request_id: Any, result: Any = None, error: Optional[Dict[str, Any]] = None) -> str:
+        response: Dict[str, Any] = {'jsonrpc': '2.0', 'id': request_id}
+        if error is not None:
+            response['error'] = error
+        else:
+            response['result'] = result
+        return json.dumps(response)
+
+
+def _error(code: int, message: str) -> Dict[str, Any]:
+    return {'code': code, 'message': message}
+
+
+def _connect(socket_path: str) -> Optional[socket.socket]:
+    """Connect to a daemon socket, None if nothing is listening."""
+    if not hasattr(socket, 'AF_UNIX') or not os.path.exists(socket_path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CONNECT_TIMEOUT)
+    try:
+        sock.connect(socket_path)
+    except OSError:
+        sock.close()
+        return None
+    sock.settimeout(None)
+    return sock
+
+
+def call_daemon(method: str, params: Optional[Dict[str, Any]] = None,
+                socket_path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Send one request to a running daemon.
+    
+    Returns:
+        The response object, or None if no daemon is listening
+    """
+    sock = _connect(socket_path or default_socket_path())
+    if sock is None:
+        return None
+    
+    request = {'jsonrpc': '2.0', 'id': 1, 'method': method, 'params': params or {}}
+    with sock, sock.makefile('rwb') as stream:
+        stream.write(json.dumps(request).encode('utf-8') + b'\n')
+        stream.flush()
+        line = stream.readline()
+    if not line:
+        raise DaemonError(f"Daemon closed the connection during {method}")
+    return json.loads(line)
+
+
+def forward_command(method: str, params: Optional[Dict[str, Any]] = None,
+                    socket_path: Optional[str] = None) -> Optional[int]:
+    """
+    Run a CLI command in a running daemon, echoing its output locally.
+    
+    Paths in params must be absolute, the daemon has its own working directory.
+    
+    Returns:
+        The command's exit code, or None if no daemon is listening
+        (the caller then runs the command itself)
+    
+    Raises:
+        DaemonError: If the command failed in the daemon
+    """
+    response = call_daemon(method, params, socket_path)
+    if response is None:
+        return None
+    
+    error = response.get('error')
+    output = error.get('data', {}) if error else response['result']
+    sys.stdout.write(output.get('stdout', ''))
+    sys.stderr.write(output.get('stderr', ''))
+    if 'elapsed_ms' in output:
+        logger.info(f"{method} served by daemon in {output['elapsed_ms']:.1f} ms")
+    
+    if error:
+        raise DaemonError(error['message'])
+    return output['exit_code']
+
+
+def main(args=None) -> int:
+    """Start a daemon: python -m headless.cli.daemon [--stdio | --socket PATH]."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="CellSorter headless CLI daemon")
+    parser.add_argument('--socket', help=f"Unix socket path (default: ${SOCKET_ENV_VAR} or a per-user temp path)")
+    parser.add_argument('--stdio', action='store_true', help="Serve JSON-RPC on stdin/stdout instead of a socket")
+    parsed_args = parser.parse_args(args)
+    
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr,
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    daemon = CLIDaemon()
+    try:
+        if parsed_args.stdio:
+            daemon.serve_stdio()
+        else:
+            daemon.serve_socket(parsed_args.socket)
+    except DaemonError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
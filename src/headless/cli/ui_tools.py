@@ -111,33 +111,4 @@ class UITools:
     
     def _model_to_ui(self, ui_model: UIModel) -> UI:
         """Convert UIModel to UI compatibility format."""
-        widgets = []
-        
-        if ui_model.root_widget:
-            widgets = self._flatten_widget_tree(ui_model.root_widget)
-        
-        return UI(
-            widgets=widgets,
-            layouts=[],
-            events=[],
-            metadata=ui_model.metadata.copy()
-        )
-    
-    def _flatten_widget_tree(self, widget, parent_name=None) -> List[Widget]:
-        """Flatten widget tree to list."""
-        from ..ui_compatibility import Widget as CompatWidget
-        
-        result = []
-        
-        # Convert widget
-        compat_widget = CompatWidget.from_base_widget(widget)
-        if parent_name:
-            compat_widget.parent = parent_name
-        
-        result.append(compat_widget)
-        
-        # Add children
-        for child in widget.children:
-            result.extend(self._flatten_widget_tree(child, widget.name))
-        
-        return result
+        return UI.from_ui_model(ui_model)
@@ -461,10 +461,20 @@ class MainWindowAdapter:
         logger.info("Export protocol requested")
         return {"exported": True, "message": "Export would be performed"}
     
-    def batch_process(self) -> Dict[str, Any]:
-        """Start batch processing in headless mode."""
-        logger.info("Batch processing requested")
-        return {"started": True, "message": "Batch processing would start"}
+    def batch_process(self, manifest_path: Optional[str] = None, output_dir: Optional[str] = None,
+                      workers: Optional[int] = None) -> Dict[str, Any]:
+        """Run a batch manifest and write its timing report."""
+        if not manifest_path:
+            return {"error": "No manifest provided"}
+        
+        from services.batch_processor import load_manifest, run_batch
+        
+        logger.info(f"Batch processing requested: {manifest_path}")
+        manifest = load_manifest(manifest_path, output_dir)
+        report = run_batch(manifest.slides, workers=workers)
+        json_path, csv_path = report.write(manifest.output_dir)
+        return {"completed": True, "summary": report.summary(),
+                "report": str(json_path), "report_csv": str(csv_path)}
     
     def undo(self) -> Dict[str, Any]:
         """Undo last action."""
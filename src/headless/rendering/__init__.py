@@ -8,9 +8,11 @@ Bridges headless definitions to actual GUI components.
 from .widget_factory import WidgetFactory
 from .ui_renderer import UIRenderer
 from .property_mapper import PropertyMapper
+from .ui_reloader import UIReloader
 
 __all__ = [
     'WidgetFactory',
     'UIRenderer', 
     'PropertyMapper',
+    'UIReloader',
 ] 
\ No newline at end of file
@@ -6,7 +6,7 @@ Handles property conversion and application to widgets.
 """
 
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Collection, Dict, Optional
 from PySide6.QtWidgets import QWidget
 from PySide6.QtCore import Qt, QSize
 
@@ -15,6 +15,8 @@ from ..ui_model import Geometry, SizePolicy, LayoutType
 
 logger = logging.getLogger(__name__)
 
+QWIDGETSIZE_MAX = 16777215
+
 
 class PropertyMappingError(Exception):
     """Raised when property mapping fails."""
@@ -78,6 +80,63 @@ class PropertyMapper:
         except Exception as e:
             raise PropertyMappingError(f"Failed to apply properties to {widget_def.name}: {e}") from e
     
+    def apply_changed_properties(self, qt_widget: QWidget, widget_def: Widget, fields: Collection[str]) -> None:
+        """
+        Re-apply only the changed fields of a widget definition to its Qt widget.
+        
+        Unlike apply_properties, cleared values are reset on the widget.
+        
+        Args:
+            qt_widget: Qt widget rendered from an earlier version of the definition
+            widget_def: Updated widget definition
+            fields: Changed field names, 'properties.<key>' for widget properties
+                (see headless.ui_diff.UIModelDiff)
+            
+        Raises:
+            PropertyMappingError: If property application fails
+        """
+        try:
+            if 'visible' in fields:
+                qt_widget.setVisible(widget_def.visible is not False)
+            
+            if 'enabled' in fields:
+                qt_widget.setEnabled(widget_def.enabled is not False)
+            
+            if 'tooltip' in fields:
+                qt_widget.setToolTip(widget_def.tooltip or "")
+            
+            if 'style_sheet' in fields:
+                qt_widget.setStyleSheet(widget_def.style_sheet or "")
+            
+            if 'geometry' in fields and widget_def.geometry:
+                self._apply_geometry(qt_widget, widget_def.geometry)
+            
+            if 'minimum_size' in fields:
+                size = widget_def.minimum_size
+                qt_widget.setMinimumSize(size.width if size else 0, size.height if size else 0)
+            
+            if 'maximum_size' in fields:
+                size = widget_def.maximum_size
+                qt_widget.setMaximumSize(
+                    size.width if size else QWIDGETSIZE_MAX,
+                    size.height if size else QWIDGETSIZE_MAX
+                )
+            
+            if 'size_policy' in fields:
+                self._apply_size_policy(qt_widget, widget_def.size_policy or SizePolicy())
+            
+            keys = {name[len('properties.'):] for name in fields if name.startswith('properties.')}
+            if keys:
+                if 'items' in keys and hasattr(qt_widget, 'clear') and hasattr(qt_widget, 'addItems'):
+                    # addItems appends to the existing entries
+                    qt_widget.clear()
+                self._apply_widget_specific_properties(qt_widget, widget_def, keys)
+            
+            logger.debug(f"Applied {len(fields)} changed properties to widget: {widget_def.name}")
+            
+        except Exception as e:
+            raise PropertyMappingError(f"Failed to apply changed properties to {widget_def.name}: {e}") from e
+    
     def _apply_geometry(self, qt_widget: QWidget, geometry: Geometry) -> None:
         """Apply geometry to widget."""
         qt_widget.setGeometry(
@@ -108,9 +167,12 @@ class PropertyMapper:
         qt_size_policy = QSizePolicy(h_policy, v_policy)
         qt_widget.setSizePolicy(qt_size_policy)
     
-    def _apply_widget_specific_properties(self, qt_widget: QWidget, widget_def: Widget) -> None:
-        """Apply widget-type specific properties."""
+    def _apply_widget_specific_properties(self, qt_widget: QWidget, widget_def: Widget,
+                                          keys: Optional[Collection[str]] = None) -> None:
+        """Apply widget-type specific properties, or only those in keys."""
         properties = widget_def.properties or {}
+        if keys is not None:
+            properties = {key: value for key, value in properties.items() if key in keys}
         
         # Apply text property for text-based widgets
         if 'text' in properties:
@@ -215,7 +277,7 @@ class PropertyMapper:
                 }
             
             max_size = qt_widget.maximumSize()
-            if max_size.width() < 16777215 or max_size.height() < 16777215:  # Qt's QWIDGETSIZE_MAX
+            if max_size.width() < QWIDGETSIZE_MAX or max_size.height() < QWIDGETSIZE_MAX:
                 properties['maximum_size'] = {
                     'width': max_size.width(),
                     'height': max_size.height()
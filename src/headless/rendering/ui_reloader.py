@@ -0,0 +1,79 @@
+"""
+UI Reloader
+
+Re-renders a UI definition file after it was edited. The new model is
+compared with the rendered one and only the changed widgets and
+properties are updated, so an edit shows up without rebuilding the window.
+"""
+
+import logging
+from pathlib import Path
+from typing import Optional
+from PySide6.QtWidgets import QWidget
+
+from ..ui_compatibility import UI
+from ..ui_diff import UIModelDiff, diff_ui_models
+from ..ui_model import UIModel
+from ..serializers import YAMLSerializer, JSONSerializer
+from .ui_renderer import UIRenderer
+
+logger = logging.getLogger(__name__)
+
+
+class UIReloader:
+    """Keeps a rendered UI in step with its definition file."""
+    
+    def __init__(self, renderer: Optional[UIRenderer] = None):
+        self.renderer = renderer or UIRenderer()
+        self.yaml_serializer = YAMLSerializer()
+        self.json_serializer = JSONSerializer()
+        self.root_widget: Optional[QWidget] = None
+        self._model: Optional[UIModel] = None
+    
+    @property
+    def model(self) -> Optional[UIModel]:
+        """The currently rendered UI model."""
+        return self._model
+    
+    def reload(self, file_path: str) -> UIModelDiff:
+        """
+        Load a UI definition file and bring the rendered UI up to date.
+        
+        The first load renders the whole UI; later loads apply the diff to
+        the rendered widgets and render again only when the structure
+        changed in a way that cannot be patched (see UIRenderer.apply_diff).
+        
+        Args:
+            file_path: YAML or JSON UI definition
+        
+        Returns:
+            Differences from the previously rendered model
+        
+        Raises:
+            SerializationError: If the file cannot be loaded
+            UIRenderingError: If rendering fails
+        """
+        if Path(file_path).suffix.lower() == '.json':
+            model = self.json_serializer.load(file_path)
+        else:
+            model = self.yaml_serializer.load(file_path)
+        
+        return self.apply_model(model)
+    
+    def apply_model(self, model: UIModel) -> UIModelDiff:
+        """Bring the rendered UI up to date with a model; see reload."""
+        diff = diff_ui_models(self._model, model)
+        if self._model is not None and diff.is_empty:
+            self._model = model
+            logger.debug("UI reload: no widget changes")
+            return diff
+        
+        ui_def = UI.from_ui_model(model)
+        if self._model is None or not self.renderer.apply_diff(diff, ui_def):
+            self.root_widget = self.renderer.render_ui(ui_def)
+            logger.info(f"UI rendered ({len(ui_def.widgets)} widgets)")
+        else:
+            logger.info(f"UI updated in place: {diff.summary()}")
+        
+        self._model = model
+        return diff
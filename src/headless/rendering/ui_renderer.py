@@ -14,6 +14,7 @@ from ..mode_manager import is_dev_mode
 from .widget_factory import WidgetFactory, WidgetCreationError
 from .property_mapper import PropertyMapper, PropertyMappingError
 from ..ui_model import LayoutType, LayoutItem
+from ..ui_diff import UIModelDiff
 
 logger = logging.getLogger(__name__)
 
@@ -59,25 +60,85 @@ class UIRenderer:
                 logger.warning("No widgets to render")
                 return None
             
-            # Create all widgets first
+            # Create each tree top-down; widgets whose parent is not defined start their own
+            root_widget = None
             for widget_def in ui_def.widgets:
-                parent_widget = None
-                if widget_def.parent_name:
-                    parent_widget = self.get_rendered_widget(widget_def.parent_name)
-                
-                qt_widget = self.widget_factory.create_widget(widget_def, parent_widget)
-                self.property_mapper.apply_properties(qt_widget, widget_def)
-                self._rendered_widgets[widget_def.name] = qt_widget
-                
-                logger.debug(f"Rendered widget: {widget_def.name}")
+                if widget_def.parent and ui_def.get_widget(widget_def.parent) is not None:
+                    continue
+                qt_widget = self._create_widget_hierarchy(widget_def, ui_def)
+                if root_widget is None and not widget_def.parent:
+                    root_widget = qt_widget
             
-            # Find and return root widget
-            root_widget = self.find_root_widget(ui_def.widgets)
             return root_widget
             
         except Exception as e:
             raise UIRenderingError(f"Failed to render UI: {e}") from e
     
+    def apply_diff(self, diff: UIModelDiff, ui_def: UI) -> bool:
+        """
+        Update the rendered widgets in place after the definition changed.
+        
+        Removed widgets are deleted, added subtrees are created under their
+        rendered parent and changed widgets only get their changed fields
+        re-applied.
+        
+        Args:
+            diff: Differences from the rendered definition to ui_def
+            ui_def: Updated UI definition
+            
+        Returns:
+            True if the changes were applied, False if the UI has to be
+            rendered again with render_ui (root replaced, widgets moved, or
+            widgets that were never rendered)
+            
+        Raises:
+            UIRenderingError: If applying the changes fails
+        """
+        if is_dev_mode():
+            raise UIRenderingError("Cannot render UI in development mode")
+        
+        if diff.requires_rebuild:
+            return False
+        
+        added = set(diff.added)
+        for name in diff.changed:
+            if name not in added and name not in self._rendered_widgets:
+                return False
+        for name in diff.added:
+            widget_def = ui_def.get_widget(name)
+            if widget_def is None or (widget_def.parent not in added and widget_def.parent not in self._rendered_widgets):
+                return False
+        
+        try:
+            for name in diff.removed:
+                qt_widget = self._rendered_widgets.pop(name, None)
+                if qt_widget is not None:
+                    qt_widget.hide()
+                    qt_widget.deleteLater()
+            
+            # Subtrees are created from their topmost added widget
+            for name in diff.added:
+                widget_def = ui_def.get_widget(name)
+                if widget_def.parent in added:
+                    continue
+                parent_widget = self._rendered_widgets[widget_def.parent]
+                qt_widget = self._create_widget_hierarchy(widget_def, ui_def, parent_widget)
+                if parent_widget.isVisible() and widget_def.visible is not False:
+                    qt_widget.show()
+            
+            for name, fields in diff.changed.items():
+                if name in added:
+                    continue
+                self.property_mapper.apply_changed_properties(
+                    self._rendered_widgets[name], ui_def.get_widget(name), fields
+                )
+            
+            logger.debug(f"Applied UI diff: {diff.summary()}")
+            return True
+            
+        except Exception as e:
+            raise UIRenderingError(f"Failed to apply UI changes: {e}") from e
+    
     def _is_test_environment(self) -> bool:
         """Check if running in test environment."""
         import sys
@@ -90,13 +151,13 @@ class UIRenderer:
                 return widget
         return None
     
-    def _create_widget_hierarchy(self, widget_def: Widget, all_widgets: List[Widget], parent_widget: Optional[QWidget] = None) -> QWidget:
+    def _create_widget_hierarchy(self, widget_def: Widget, ui_def: UI, parent_widget: Optional[QWidget] = None) -> QWidget:
         """
         Recursively create widget hierarchy.
         
         Args:
             widget_def: Widget definition to create
-            all_widgets: All widget definitions for finding children
+            ui_def: UI definition, whose parent index gives the children
             parent_widget: Parent Qt widget
             
         Returns:
@@ -110,11 +171,11 @@ class UIRenderer:
         
         # Store for later reference
         self._rendered_widgets[widget_def.name] = qt_widget
+        logger.debug(f"Rendered widget: {widget_def.name}")
         
         # Create child widgets
-        child_widgets = [w for w in all_widgets if w.parent == widget_def.name]
-        for child_def in child_widgets:
-            self._create_widget_hierarchy(child_def, all_widgets, qt_widget)
+        for child_def in ui_def.children_of(widget_def.name):
+            self._create_widget_hierarchy(child_def, ui_def, qt_widget)
         
         return qt_widget
     
@@ -15,6 +15,12 @@ from ..ui_model import UIModel
 
 logger = logging.getLogger(__name__)
 
+# LibYAML bindings parse and emit several times faster; PyYAML built without
+# them only has the pure-Python classes, which produce the same documents.
+_SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+_FullLoader = getattr(yaml, 'CFullLoader', yaml.FullLoader)
+_SafeDumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
 
 class YAMLSerializer(BaseSerializer):
     """YAML serializer for UI models."""
@@ -57,6 +63,7 @@ class YAMLSerializer(BaseSerializer):
             # Configure YAML output
             yaml_str = yaml.dump(
                 data,
+                Dumper=_SafeDumper,
                 default_flow_style=False,
                 indent=self.indent_size,
                 sort_keys=self.sort_keys,
@@ -88,9 +95,9 @@ class YAMLSerializer(BaseSerializer):
         try:
             # Parse YAML safely
             if self._use_safe_loader:
-                parsed_data = yaml.safe_load(data)
+                parsed_data = yaml.load(data, Loader=_SafeLoader)
             else:
-                parsed_data = yaml.load(data, Loader=yaml.FullLoader)
+                parsed_data = yaml.load(data, Loader=_FullLoader)
             
             if parsed_data is None:
                 parsed_data = {}
@@ -162,6 +169,7 @@ class YAMLSerializer(BaseSerializer):
             # Use specific formatting for AI
             yaml_str = yaml.dump(
                 data,
+                Dumper=_SafeDumper,
                 default_flow_style=False,
                 indent=2,  # Fixed indent for consistency
                 sort_keys=True,  # Sorted for predictability
@@ -7,10 +7,12 @@ for live development experience in headless mode.
 
 import os
 import time
+import hashlib
 import logging
+from fnmatch import fnmatchcase
 from pathlib import Path
-from typing import Dict, List, Optional, Callable, Set
-from threading import Thread, Event
+from typing import Dict, List, Optional, Callable, Iterator, Tuple
+from threading import Thread, Event, Condition
 from dataclasses import dataclass
 
 try:
@@ -20,9 +22,16 @@ try:
 except ImportError:
     WATCHDOG_AVAILABLE = False
     # Fallback to polling-based monitoring
+    FileSystemEventHandler = object
 
 logger = logging.getLogger(__name__)
 
+# Stats this close to the scan time may be followed by a change within the
+# same timestamp granularity, so they are checked again on the next poll
+RACY_WINDOW_NS = 2_000_000_000
+
+CHECKSUM_CHUNK_SIZE = 1 << 16
+
 
 @dataclass
 class FileChangeEvent:
@@ -33,15 +42,40 @@ class FileChangeEvent:
     checksum: Optional[str] = None
 
 
+@dataclass
+class _FileState:
+    """Last seen stat of a watched file; the checksum is computed on the first stat change."""
+    mtime_ns: Optional[int]  # None forces a content check on the next poll
+    size: int
+    checksum: Optional[str] = None
+
+
+@dataclass
+class _DirectoryListing:
+    """Cached listing of one directory, valid while the directory's mtime is unchanged."""
+    mtime_ns: Optional[int]
+    files: List[Path]
+    subdirectories: List[Path]
+
+
+def _is_racy(stat_result: os.stat_result) -> bool:
+    """Whether a later change could keep the same mtime."""
+    return time.time_ns() - stat_result.st_mtime_ns < RACY_WINDOW_NS
+
+
 class UIFileWatcher:
     """
     Watches UI definition files for changes and triggers reload callbacks.
     
     Supports both watchdog-based monitoring (preferred) and polling fallback.
+    Polling compares (mtime_ns, size) and only reads a file when its stat
+    changed; directories are listed again only when their own mtime changes.
     Includes debouncing to prevent excessive reloads during rapid changes.
     """
     
-    def __init__(self, 
+    POLL_INTERVAL = 1.0
+    
+    def __init__(self,
                  watch_directories: List[Path],
                  file_patterns: List[str] = None,
                  debounce_delay: float = 0.5):
@@ -61,12 +95,17 @@ class UIFileWatcher:
         self._observer: Optional[Observer] = None
         self._polling_thread: Optional[Thread] = None
         self._stop_event = Event()
-        self._file_checksums: Dict[Path, str] = {}
+        self._files: Dict[Path, _FileState] = {}
+        self._listings: Dict[Path, _DirectoryListing] = {}
+        
+        # Pending events are delivered by one long-lived debounce worker
         self._pending_events: Dict[Path, FileChangeEvent] = {}
-        self._debounce_timer: Optional[Thread] = None
+        self._pending_condition = Condition()
+        self._debounce_deadline = 0.0
+        self._debounce_worker: Optional[Thread] = None
         
         self._running = False
-        
+    
     def add_callback(self, event_type: str, callback: Callable[[FileChangeEvent], None]):
         """
         Add a callback for specific event types.
@@ -91,17 +130,26 @@ class UIFileWatcher:
             logger.warning("File watcher is already running")
             return True
         
-        # Initialize file checksums
+        self._stop_event.clear()
+        
+        # Record the current file stats
         self._scan_initial_files()
         
+        self._debounce_worker = Thread(target=self._debounce_loop, name="UIFileWatcher-debounce", daemon=True)
+        self._debounce_worker.start()
+        
         if WATCHDOG_AVAILABLE:
-            return self._start_watchdog()
+            started = self._start_watchdog()
         else:
             logger.warning("Watchdog not available, falling back to polling")
-            return self._start_polling()
+            started = self._start_polling()
+        
+        if not started:
+            self._stop_debounce_worker()
+        return started
     
     def stop(self):
-        """Stop monitoring files."""
+        """Stop monitoring files; pending events are delivered before returning."""
         if not self._running:
             return
         
@@ -118,8 +166,16 @@ class UIFileWatcher:
             self._polling_thread.join()
             self._polling_thread = None
         
-        if self._debounce_timer and self._debounce_timer.is_alive():
-            self._debounce_timer.join()
+        self._stop_debounce_worker()
+    
+    def _stop_debounce_worker(self):
+        """Wake the debounce worker so it flushes pending events and exits."""
+        self._stop_event.set()
+        with self._pending_condition:
+            self._pending_condition.notify()
+        if self._debounce_worker:
+            self._debounce_worker.join()
+            self._debounce_worker = None
     
     def _start_watchdog(self) -> bool:
         """Start watchdog-based monitoring."""
@@ -138,7 +194,7 @@ class UIFileWatcher:
             self._running = True
             logger.info("File watcher started using watchdog")
             return True
-            
+        
         except Exception as e:
             logger.error(f"Failed to start watchdog: {e}")
             return False
@@ -151,7 +207,7 @@ class UIFileWatcher:
             self._running = True
             logger.info("File watcher started using polling")
             return True
-            
+        
         except Exception as e:
             logger.error(f"Failed to start polling: {e}")
             return False
@@ -161,63 +217,134 @@ class UIFileWatcher:
         while not self._stop_event.is_set():
             try:
                 self._check_file_changes()
-                time.sleep(1.0)  # Poll every second
+                self._stop_event.wait(self.POLL_INTERVAL)
             except Exception as e:
                 logger.error(f"Error in polling loop: {e}")
-                time.sleep(5.0)  # Wait longer on error
+                self._stop_event.wait(5.0)  # Wait longer on error
     
     def _scan_initial_files(self):
-        """Scan initial files and store checksums."""
-        for directory in self.watch_directories:
-            if not directory.exists():
-                continue
-                
-            for pattern in self.file_patterns:
-                for file_path in directory.rglob(pattern):
-                    if file_path.is_file():
-                        checksum = self._calculate_checksum(file_path)
-                        self._file_checksums[file_path] = checksum
+        """Scan initial files and store their stats (contents are not read)."""
+        self._files.clear()
+        self._listings.clear()
+        for file_path, stat_result in self._iter_watched_files():
+            self._files[file_path] = self._file_state(file_path, stat_result)
         
-        logger.debug(f"Initial scan found {len(self._file_checksums)} files")
+        logger.debug(f"Initial scan found {len(self._files)} files")
     
     def _check_file_changes(self):
-        """Check for file changes using checksums."""
+        """Check for file changes, reading only files whose stat changed."""
         current_files = set()
         
         # Check existing and new files
-        for directory in self.watch_directories:
-            if not directory.exists():
-                continue
-                
-            for pattern in self.file_patterns:
-                for file_path in directory.rglob(pattern):
-                    if file_path.is_file():
-                        current_files.add(file_path)
-                        
-                        current_checksum = self._calculate_checksum(file_path)
-                        previous_checksum = self._file_checksums.get(file_path)
-                        
-                        if previous_checksum is None:
-                            # New file
-                            self._file_checksums[file_path] = current_checksum
-                            self._handle_file_event(file_path, 'created', current_checksum)
-                        elif current_checksum != previous_checksum:
-                            # Modified file
-                            self._file_checksums[file_path] = current_checksum
-                            self._handle_file_event(file_path, 'modified', current_checksum)
+        for file_path, stat_result in self._iter_watched_files():
+            current_files.add(file_path)
+            change = self._update_file_state(file_path, stat_result)
+            if change:
+                self._handle_file_event(file_path, change, self._files[file_path].checksum)
         
         # Check for deleted files
-        deleted_files = set(self._file_checksums.keys()) - current_files
+        deleted_files = set(self._files) - current_files
         for file_path in deleted_files:
-            del self._file_checksums[file_path]
+            del self._files[file_path]
             self._handle_file_event(file_path, 'deleted')
     
+    def _file_state(self, file_path: Path, stat_result: os.stat_result,
+                    checksum: Optional[str] = None) -> _FileState:
+        if _is_racy(stat_result):
+            # Checked again next time; the checksum tells whether it really changed
+            return _FileState(None, stat_result.st_size, checksum or self._calculate_checksum(file_path))
+        return _FileState(stat_result.st_mtime_ns, stat_result.st_size, checksum)
+    
+    def _update_file_state(self, file_path: Path, stat_result: os.stat_result) -> Optional[str]:
+        """
+        Record a file's current stat.
+        
+        Returns:
+            'created' for a new file, 'modified' if its content changed, else None
+        """
+        state = self._files.get(file_path)
+        if state is None:
+            self._files[file_path] = self._file_state(file_path, stat_result, self._calculate_checksum(file_path))
+            return 'created'
+        
+        if state.mtime_ns == stat_result.st_mtime_ns and state.size == stat_result.st_size:
+            return None
+        
+        # Stat changed: compare contents when the previous checksum is known
+        checksum = self._calculate_checksum(file_path)
+        previous_checksum = state.checksum
+        self._files[file_path] = self._file_state(file_path, stat_result, checksum)
+        return None if checksum == previous_checksum else 'modified'
+    
+    def _iter_watched_files(self) -> Iterator[Tuple[Path, os.stat_result]]:
+        """Yield watched files with their stats, using the cached directory listings."""
+        seen_directories = set()
+        pending = list(self.watch_directories)
+        while pending:
+            directory = pending.pop()
+            if directory in seen_directories:
+                continue
+            listing = self._directory_listing(directory)
+            if listing is None:
+                continue
+            seen_directories.add(directory)
+            pending.extend(listing.subdirectories)
+            
+            for file_path in listing.files:
+                try:
+                    yield file_path, os.stat(file_path)
+                except OSError:
+                    # Removed since the listing; reported as deleted
+                    continue
+        
+        for directory in set(self._listings) - seen_directories:
+            del self._listings[directory]
+    
+    def _directory_listing(self, directory: Path) -> Optional[_DirectoryListing]:
+        """Listing of a directory, read again only when its mtime changed."""
+        try:
+            stat_result = os.stat(directory)
+        except OSError:
+            self._listings.pop(directory, None)
+            return None
+        
+        listing = self._listings.get(directory)
+        if listing is not None and listing.mtime_ns == stat_result.st_mtime_ns:
+            return listing
+        
+        files = []
+        subdirectories = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirectories.append(Path(entry.path))
+                        elif entry.is_file() and self._matches_patterns(entry.name):
+                            files.append(Path(entry.path))
+                    except OSError:
+                        continue
+        except OSError as e:
+            logger.warning(f"Failed to list {directory}: {e}")
+            self._listings.pop(directory, None)
+            return None
+        
+        mtime_ns = None if _is_racy(stat_result) else stat_result.st_mtime_ns
+        listing = _DirectoryListing(mtime_ns, files, subdirectories)
+        self._listings[directory] = listing
+        return listing
+    
+    def _matches_patterns(self, file_name: str) -> bool:
+        return any(fnmatchcase(file_name, pattern) for pattern in self.file_patterns)
+    
     def _calculate_checksum(self, file_path: Path) -> str:
         """Calculate file checksum for change detection."""
         try:
-            import hashlib
+            digest = hashlib.md5()
             with open(file_path, 'rb') as f:
-                return hashlib.md5(f.read()).hexdigest()
+                for chunk in iter(lambda: f.read(CHECKSUM_CHUNK_SIZE), b''):
+                    digest.update(chunk)
+            return digest.hexdigest()
         except Exception as e:
             logger.warning(f"Failed to calculate checksum for {file_path}: {e}")
             # Fallback to modification time
@@ -232,27 +359,32 @@ class UIFileWatcher:
             checksum=checksum
         )
         
-        # Add to pending events (overwrites previous event for same file)
-        self._pending_events[file_path] = event
-        
-        # Start or restart debounce timer
-        if self._debounce_timer and self._debounce_timer.is_alive():
-            # Timer is already running, event will be processed when it fires
-            return
-        
-        self._debounce_timer = Thread(target=self._debounce_callback, daemon=True)
-        self._debounce_timer.start()
+        with self._pending_condition:
+            # The first pending event starts the debounce window
+            if not self._pending_events:
+                self._debounce_deadline = time.monotonic() + self.debounce_delay
+            # Add to pending events (overwrites previous event for same file)
+            self._pending_events[file_path] = event
+            self._pending_condition.notify()
     
-    def _debounce_callback(self):
-        """Debounced callback that processes pending events."""
-        time.sleep(self.debounce_delay)
-        
-        # Process all pending events
-        events_to_process = list(self._pending_events.values())
-        self._pending_events.clear()
-        
-        for event in events_to_process:
-            self._trigger_callbacks(event)
+    def _debounce_loop(self):
+        """Debounce worker: delivers the pending events when their window closes."""
+        while True:
+            with self._pending_condition:
+                while True:
+                    stopping = self._stop_event.is_set()
+                    if self._pending_events and (stopping or time.monotonic() >= self._debounce_deadline):
+                        break
+                    if stopping:
+                        return
+                    timeout = self._debounce_deadline - time.monotonic() if self._pending_events else None
+                    self._pending_condition.wait(timeout)
+                
+                events_to_process = list(self._pending_events.values())
+                self._pending_events.clear()
+            
+            for event in events_to_process:
+                self._trigger_callbacks(event)
     
     def _trigger_callbacks(self, event: FileChangeEvent):
         """Trigger registered callbacks for an event."""
@@ -278,7 +410,7 @@ class UIFileWatcher:
     
     def get_watched_files(self) -> List[Path]:
         """Get list of currently watched files."""
-        return list(self._file_checksums.keys())
+        return list(self._files.keys())
 
 
 class UIFileHandler(FileSystemEventHandler):
@@ -289,21 +421,28 @@ class UIFileHandler(FileSystemEventHandler):
     
     def on_modified(self, event):
         if not event.is_directory and self._should_handle_file(event.src_path):
-            file_path = Path(event.src_path)
-            checksum = self.watcher._calculate_checksum(file_path)
-            self.watcher._handle_file_event(file_path, 'modified', checksum)
+            self._handle_change(Path(event.src_path))
     
     def on_created(self, event):
         if not event.is_directory and self._should_handle_file(event.src_path):
-            file_path = Path(event.src_path)
-            checksum = self.watcher._calculate_checksum(file_path)
-            self.watcher._handle_file_event(file_path, 'created', checksum)
+            self._handle_change(Path(event.src_path))
     
     def on_deleted(self, event):
         if not event.is_directory and self._should_handle_file(event.src_path):
             file_path = Path(event.src_path)
+            self.watcher._files.pop(file_path, None)
             self.watcher._handle_file_event(file_path, 'deleted')
     
+    def _handle_change(self, file_path: Path):
+        """Report a created or modified file unless only its metadata changed."""
+        try:
+            stat_result = os.stat(file_path)
+        except OSError:
+            return
+        change = self.watcher._update_file_state(file_path, stat_result)
+        if change:
+            self.watcher._handle_file_event(file_path, change, self.watcher._files[file_path].checksum)
+    
     def _should_handle_file(self, file_path: str) -> bool:
         """Check if file should be handled based on patterns."""
         path = Path(file_path)
@@ -311,7 +450,7 @@ class UIFileHandler(FileSystemEventHandler):
 
 
 # Convenience function for creating a standard UI watcher
-def create_ui_watcher(project_root: Path, 
+def create_ui_watcher(project_root: Path,
                      debounce_delay: float = 0.5) -> UIFileWatcher:
     """
     Create a standard UI file watcher for a CellSorter project.
@@ -319,7 +458,7 @@ def create_ui_watcher(project_root: Path,
     Args:
         project_root: Root directory of the project
         debounce_delay: Debounce delay in seconds
-        
+    
     Returns:
         Configured UIFileWatcher instance
     """
@@ -336,4 +475,4 @@ def create_ui_watcher(project_root: Path,
         watch_directories=existing_dirs,
         file_patterns=['*.yaml', '*.yml', '*.json', '*.py'],
         debounce_delay=debounce_delay
-    ) 
\ No newline at end of file
+    )
@@ -86,7 +86,7 @@ class UITestCase(unittest.TestCase):
             raise ValueError("UI definition has no widgets")
         
         # Find root widget (no parent)
-        root_widgets = [w for w in ui_def.widgets if w.parent is None]
+        root_widgets = ui_def.children_of(None)
         if not root_widgets:
             raise ValueError("No root widget found in UI definition")
         if len(root_widgets) > 1:
@@ -95,9 +95,9 @@ class UITestCase(unittest.TestCase):
         root_def = root_widgets[0]
         
         # Create widget tree
-        return self._create_widget_tree(root_def, ui_def.widgets)
+        return self._create_widget_tree(root_def, ui_def)
     
-    def _create_widget_tree(self, widget_def: Widget, all_widgets: List[Widget], parent: Optional[MockWidget] = None) -> MockWidget:
+    def _create_widget_tree(self, widget_def: Widget, ui_def: UI, parent: Optional[MockWidget] = None) -> MockWidget:
         """Recursively create widget tree."""
         widget = self.create_widget(widget_def.name, widget_def.type, parent)
         
@@ -114,9 +114,8 @@ class UITestCase(unittest.TestCase):
             widget.properties["tooltip"] = widget_def.tooltip
         
         # Create children
-        children = [w for w in all_widgets if w.parent == widget_def.name]
-        for child_def in children:
-            self._create_widget_tree(child_def, all_widgets, widget)
+        for child_def in ui_def.children_of(widget_def.name):
+            self._create_widget_tree(child_def, ui_def, widget)
         
         return widget
     
@@ -5,10 +5,10 @@ Provides compatibility classes for the UI renderer.
 These classes bridge the gap between the complete ui_model and simplified renderer expectations.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
 
-from .ui_model import Widget as BaseWidget, WidgetType, EventBinding, LayoutItem, Size, Geometry, SizePolicy
+from .ui_model import UIModel, Widget as BaseWidget, WidgetType, EventBinding, LayoutItem, Size, Geometry, SizePolicy
 
 
 @dataclass
@@ -69,6 +69,9 @@ class Widget:
         if base_widget.geometry:
             widget.geometry = base_widget.geometry
         
+        widget.size_policy = base_widget.size_policy
+        widget.minimum_size = base_widget.minimum_size
+        widget.maximum_size = base_widget.maximum_size
         widget.visible = base_widget.visible
         widget.enabled = base_widget.enabled
         widget.tooltip = base_widget.tooltip
@@ -77,13 +80,140 @@ class Widget:
         return widget
 
 
+def _remove_identical(widgets: List[Widget], widget: Widget) -> None:
+    """Remove this widget object (dataclass equality would match look-alikes)."""
+    del widgets[next(i for i, w in enumerate(widgets) if w is widget)]
+
+
 @dataclass 
 class UI:
-    """Simple UI definition for renderer compatibility."""
+    """
+    Simple UI definition for renderer compatibility.
+    
+    Widgets are a flat list linked by parent name. A name -> widget map and a
+    parent -> children index are built on first lookup and kept up to date by
+    add_widget, remove_widget and set_parent; replacing or resizing the
+    widgets list rebuilds them. Other direct edits (e.g. assigning
+    widget.parent) need invalidate_index().
+    """
     widgets: List[Widget] = field(default_factory=list)
     layouts: List[LayoutItem] = field(default_factory=list)
     events: List[EventBinding] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    _by_name: Optional[Dict[str, Widget]] = field(default=None, init=False, repr=False, compare=False)
+    _children: Optional[Dict[Optional[str], List[Widget]]] = field(default=None, init=False, repr=False, compare=False)
+    _index_key: Optional[Tuple[int, int]] = field(default=None, init=False, repr=False, compare=False)
+    
+    def get_widget(self, name: str) -> Optional[Widget]:
+        """Find a widget by name (the first one if names repeat)."""
+        widget = self._index()[0].get(name)
+        if widget is not None and widget.name != name:
+            # Renamed since indexing
+            self.invalidate_index()
+            widget = self._index()[0].get(name)
+        return widget
+    
+    def children_of(self, name: Optional[str]) -> List[Widget]:
+        """Widgets whose parent is name, in definition order (None gives the parentless widgets)."""
+        children = self._index()[1].get(name, [])
+        if any(child.parent != name for child in children):
+            # Reparented since indexing
+            self.invalidate_index()
+            children = self._index()[1].get(name, [])
+        return list(children)
+    
+    def add_widget(self, widget: Widget) -> None:
+        """Append a widget, updating the index."""
+        by_name, children = self._index()
+        self.widgets.append(widget)
+        by_name.setdefault(widget.name, widget)
+        children.setdefault(widget.parent, []).append(widget)
+        self._index_key = self._current_index_key()
+    
+    def remove_widget(self, name: str) -> Optional[Widget]:
+        """
+        Remove the first widget with a name (its children keep their parent name).
+        
+        Returns:
+            The removed widget, or None if there is none
+        """
+        widget = self.get_widget(name)
+        if widget is None:
+            return None
+        
+        _remove_identical(self.widgets, widget)
+        if self._by_name.get(name) is widget:
+            # A later widget with the same name takes its place
+            self._by_name.pop(name)
+            replacement = next((w for w in self.widgets if w.name == name), None)
+            if replacement is not None:
+                self._by_name[name] = replacement
+        _remove_identical(self._children[widget.parent], widget)
+        self._index_key = self._current_index_key()
+        return widget
+    
+    def set_parent(self, name: str, parent: Optional[str]) -> bool:
+        """
+        Move a widget under another parent, updating the index.
+        
+        Returns:
+            True if the widget exists
+        """
+        widget = self.get_widget(name)
+        if widget is None:
+            return False
+        
+        _remove_identical(self._children[widget.parent], widget)
+        widget.parent = parent
+        # Keep definition order among the new siblings
+        siblings = self._children.setdefault(parent, [])
+        siblings.append(widget)
+        if len(siblings) > 1:
+            position = {id(w): i for i, w in enumerate(self.widgets)}
+            siblings.sort(key=lambda w: position[id(w)])
+        return True
+    
+    def invalidate_index(self) -> None:
+        """Drop the lookup index after editing widgets directly."""
+        self._by_name = None
+        self._children = None
+        self._index_key = None
+    
+    def _current_index_key(self) -> Tuple[int, int]:
+        return (id(self.widgets), len(self.widgets))
+    
+    def _index(self) -> Tuple[Dict[str, Widget], Dict[Optional[str], List[Widget]]]:
+        """The name and parent indexes, built in one pass over the widgets when stale."""
+        if self._by_name is None or self._index_key != self._current_index_key():
+            by_name: Dict[str, Widget] = {}
+            children: Dict[Optional[str], List[Widget]] = {}
+            for widget in self.widgets:
+                by_name.setdefault(widget.name, widget)
+                children.setdefault(widget.parent, []).append(widget)
+            self._by_name, self._children = by_name, children
+            self._index_key = self._current_index_key()
+        return self._by_name, self._children
+    
+    @classmethod
+    def from_ui_model(cls, ui_model: UIModel) -> 'UI':
+        """Flatten a UI model's widget tree, parents before children."""
+        widgets = []
+        if ui_model.root_widget:
+            stack = [(ui_model.root_widget, None)]
+            while stack:
+                base_widget, parent_name = stack.pop()
+                widget = Widget.from_base_widget(base_widget)
+                if parent_name:
+                    widget.parent = parent_name
+                widgets.append(widget)
+                stack.extend((child, base_widget.name) for child in reversed(base_widget.children))
+        
+        return cls(
+            widgets=widgets,
+            layouts=[],
+            events=[],
+            metadata=ui_model.metadata.copy()
+        )
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
@@ -0,0 +1,178 @@
+"""
+UI Model Diff
+
+Structural comparison of two UI models, so a reload after an edit to the
+UI definition only touches the widgets and properties that changed
+instead of rebuilding the whole window.
+"""
+
+import logging
+from typing import Dict, List, Optional, Set, Tuple
+from dataclasses import dataclass, field
+
+from .ui_model import UIModel, Widget
+
+logger = logging.getLogger(__name__)
+
+# Widget fields compared one by one; 'properties' is compared per key
+WIDGET_FIELDS = (
+    'visible',
+    'enabled',
+    'tooltip',
+    'style_sheet',
+    'geometry',
+    'size_policy',
+    'minimum_size',
+    'maximum_size',
+    'events',
+    'layout',
+)
+
+_MISSING = object()
+
+
+@dataclass
+class UIModelDiff:
+    """
+    Differences between two UI models, keyed by widget name.
+    
+    Changed fields are widget field names, or 'properties.<key>' for a
+    single entry of the widget's properties. A widget whose type changed
+    is listed as removed and added.
+    """
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    moved: List[str] = field(default_factory=list)
+    changed: Dict[str, Set[str]] = field(default_factory=dict)
+    root_changed: bool = False
+    metadata_changed: bool = False
+    
+    @property
+    def is_empty(self) -> bool:
+        """Whether the rendered UI is unaffected."""
+        return not (self.added or self.removed or self.moved or self.changed or self.root_changed)
+    
+    @property
+    def requires_rebuild(self) -> bool:
+        """Whether the changes cannot be applied to the existing widgets."""
+        return self.root_changed or bool(self.moved)
+    
+    def changed_properties(self, name: str) -> Set[str]:
+        """Keys of the changed entries in a widget's properties."""
+        prefix = 'properties.'
+        return {f[len(prefix):] for f in self.changed.get(name, ()) if f.startswith(prefix)}
+    
+    def summary(self) -> str:
+        """Short human-readable description of the diff."""
+        if self.is_empty:
+            return "no widget changes"
+        
+        parts = []
+        if self.root_changed:
+            parts.append("root replaced")
+        for label, names in (('added', self.added), ('removed', self.removed), ('moved', self.moved)):
+            if names:
+                parts.append(f"{len(names)} {label}")
+        if self.changed:
+            parts.append(f"{len(self.changed)} changed")
+        return ", ".join(parts)
+
+
+def diff_ui_models(old: Optional[UIModel], new: UIModel) -> UIModelDiff:
+    """
+    Compare two UI models widget by widget.
+    
+    Runs in time linear in the number of widgets. Widgets are matched by
+    name; a widget counts as moved when its parent changed or its position
+    among the surviving siblings changed.
+    
+    Args:
+        old: Previously rendered model, None for a first render
+        new: Newly loaded model
+    
+    Returns:
+        Differences from old to new
+    """
+    diff = UIModelDiff()
+    old_widgets = _flatten(old.root_widget) if old and old.root_widget else {}
+    new_widgets = _flatten(new.root_widget) if new.root_widget else {}
+    
+    old_root = old.root_widget.name if old and old.root_widget else None
+    new_root = new.root_widget.name if new.root_widget else None
+    diff.root_changed = old_root != new_root or (
+        new_root is not None and old_widgets[old_root][0].type != new_widgets[new_root][0].type
+    )
+    diff.metadata_changed = old is None or old.metadata != new.metadata
+    
+    for name, (widget, _) in old_widgets.items():
+        entry = new_widgets.get(name)
+        if entry is None or entry[0].type != widget.type:
+            diff.removed.append(name)
+    
+    for name, (widget, parent) in new_widgets.items():
+        entry = old_widgets.get(name)
+        if entry is None or entry[0].type != widget.type:
+            diff.added.append(name)
+            continue
+        
+        if entry[1] != parent:
+            diff.moved.append(name)
+        
+        fields = _changed_fields(entry[0], widget)
+        if fields:
+            diff.changed[name] = fields
+    
+    _add_reordered_children(diff, old_widgets, new_widgets)
+    return diff
+
+
+def _flatten(root: Widget) -> Dict[str, Tuple[Widget, Optional[str]]]:
+    """Map each widget name to its widget and parent name, in preorder."""
+    widgets: Dict[str, Tuple[Widget, Optional[str]]] = {}
+    stack: List[Tuple[Widget, Optional[str]]] = [(root, None)]
+    while stack:
+        widget, parent = stack.pop()
+        if widget.name in widgets:
+            logger.warning(f"Duplicate widget name in diff: {widget.name}")
+            continue
+        widgets[widget.name] = (widget, parent)
+        stack.extend((child, widget.name) for child in reversed(widget.children))
+    return widgets
+
+
+def _changed_fields(old: Widget, new: Widget) -> Set[str]:
+    """Names of the fields that differ between two versions of a widget."""
+    fields = {name for name in WIDGET_FIELDS if getattr(old, name) != getattr(new, name)}
+    
+    if old.properties != new.properties:
+        for key in old.properties.keys() | new.properties.keys():
+            if old.properties.get(key, _MISSING) != new.properties.get(key, _MISSING):
+                fields.add(f'properties.{key}')
+    
+    return fields
+
+
+def _add_reordered_children(diff: UIModelDiff,
+                            old_widgets: Dict[str, Tuple[Widget, Optional[str]]],
+                            new_widgets: Dict[str, Tuple[Widget, Optional[str]]]) -> None:
+    """Mark widgets whose order among the siblings kept from the old model changed."""
+    moved = set(diff.moved)
+    replaced = set(diff.removed)
+    
+    for name, (widget, _) in new_widgets.items():
+        if name in replaced or name not in old_widgets:
+            continue
+        
+        old_children = [child.name for child in old_widgets[name][0].children]
+        new_children = [child.name for child in widget.children]
+        if old_children == new_children:
+            continue
+        
+        old_kept = set(old_children)
+        new_kept = set(new_children)
+        old_order = [child for child in old_children if child in new_kept and child not in replaced]
+        new_order = [child for child in new_children if child in old_kept and child not in replaced]
+        for before, after in zip(old_order, new_order):
+            if before != after and after not in moved:
+                moved.add(after)
+                diff.moved.append(after)
@@ -261,7 +261,13 @@ class Layout:
 
 @dataclass
 class Widget:
-    """Widget definition."""
+    """
+    Widget definition.
+    
+    Each widget indexes its descendants by name on the first recursive
+    find_child; add_child and remove_child drop the indexes of the widget
+    and its ancestors, so edit children through them.
+    """
     name: str
     type: WidgetType
     properties: Dict[str, Any] = field(default_factory=dict)
@@ -278,30 +284,70 @@ class Widget:
     minimum_size: Optional[Size] = None
     maximum_size: Optional[Size] = None
     
+    def __post_init__(self) -> None:
+        # Not dataclass fields: kept out of eq, repr and asdict
+        self._parent: Optional['Widget'] = None
+        self._descendants: Optional[Dict[str, 'Widget']] = None
+        for child in self.children:
+            child._parent = self
+    
     def add_child(self, child: 'Widget') -> None:
         """Add child widget."""
         child.parent_name = self.name
+        child._parent = self
         self.children.append(child)
+        self._invalidate_descendants()
     
     def remove_child(self, child_name: str) -> bool:
         """Remove child widget by name."""
         for i, child in enumerate(self.children):
             if child.name == child_name:
                 child.parent_name = None
+                child._parent = None
                 del self.children[i]
+                self._invalidate_descendants()
                 return True
         return False
     
     def find_child(self, name: str, recursive: bool = True) -> Optional['Widget']:
-        """Find child widget by name."""
-        for child in self.children:
-            if child.name == name:
-                return child
-            if recursive:
-                result = child.find_child(name, recursive)
-                if result:
-                    return result
-        return None
+        """Find child widget by name (depth-first order decides between duplicates)."""
+        if not recursive:
+            return next((child for child in self.children if child.name == name), None)
+        
+        widget = self._descendant_index().get(name)
+        if widget is not None and not self._indexed_entry_current(widget, name):
+            # Renamed or moved since indexing
+            self._descendants = None
+            widget = self._descendant_index().get(name)
+        return widget
+    
+    def _descendant_index(self) -> Dict[str, 'Widget']:
+        """Name -> widget for all descendants, built in one depth-first pass."""
+        if self._descendants is None:
+            index: Dict[str, Widget] = {}
+            stack = list(reversed(self.children))
+            while stack:
+                widget = stack.pop()
+                index.setdefault(widget.name, widget)
+                stack.extend(reversed(widget.children))
+            self._descendants = index
+        return self._descendants
+    
+    def _indexed_entry_current(self, widget: 'Widget', name: str) -> bool:
+        """Whether an index hit still has this name and is still below this widget."""
+        if widget.name != name:
+            return False
+        ancestor = widget._parent
+        while ancestor is not None and ancestor is not self:
+            ancestor = ancestor._parent
+        return ancestor is self
+    
+    def _invalidate_descendants(self) -> None:
+        """Drop the descendant indexes of this widget and its ancestors."""
+        widget: Optional[Widget] = self
+        while widget is not None:
+            widget._descendants = None
+            widget = widget._parent
     
     def add_event(self, signal: str, handler: str, connection_type: str = "Qt::AutoConnection") -> None:
         """Add event binding."""
@@ -396,9 +442,8 @@ class Widget:
         
         # Set children
         if 'children' in data:
-            widget.children = [cls.from_dict(child_data) for child_data in data['children']]
-            for child in widget.children:
-                child.parent_name = widget.name
+            for child_data in data['children']:
+                widget.add_child(cls.from_dict(child_data))
         
         return widget
 
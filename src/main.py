@@ -6,23 +6,37 @@ Main entry point for the CellSorter application with design system integration.
 """
 
 import sys
+import argparse
 from pathlib import Path
 import logging
-from config.settings import APP_NAME, APP_VERSION, APP_ORGANIZATION, LOG_LEVEL
-from utils.logging_config import setup_logging
-from services.theme_manager import ThemeManager
 
 # Add src to Python path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from PySide6.QtWidgets import QApplication
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QIcon, QFont
 
-from pages.main_window import MainWindow
+def parse_args(argv):
+    """Parse CellSorter options; anything else is passed on to Qt."""
+    parser = argparse.ArgumentParser(description='CellSorter - Cell Sorting and Analysis')
+    parser.add_argument('--profile-startup', action='store_true',
+                        help='Print an import-time breakdown once the main window is shown')
+    return parser.parse_known_args(argv[1:])
+
 
 def main() -> None:
     """Main application entry point."""
+    args, qt_args = parse_args(sys.argv)
+
+    profiler = None
+    if args.profile_startup:
+        from utils.startup_profiler import StartupProfiler
+        profiler = StartupProfiler().install()
+
+    # Heavy modules (dialogs, matplotlib, OpenCV) are imported on first use
+    from config.settings import APP_NAME, APP_VERSION, APP_ORGANIZATION, LOG_LEVEL
+    from utils.logging_config import setup_logging
+    from PySide6.QtWidgets import QApplication
+    from PySide6.QtCore import Qt, QTimer
+
     # Set up logging
     setup_logging(console_level=LOG_LEVEL)
     logger = logging.getLogger(__name__)
@@ -34,13 +48,16 @@ def main() -> None:
         QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
 
         # Create QApplication instance
-        app = QApplication(sys.argv)
+        app = QApplication(sys.argv[:1] + qt_args)
         app.setApplicationName(APP_NAME)
         app.setApplicationVersion(APP_VERSION)
         app.setOrganizationName(APP_ORGANIZATION)
         app.setApplicationDisplayName(f"{APP_NAME} - Cell Sorting and Analysis")
+        if profiler:
+            profiler.mark("QApplication created")
 
         # Initialize theme manager before creating main window
+        from services.theme_manager import ThemeManager
         theme_manager = ThemeManager(app)
         # macOS에서 항상 화이트 모드 강제
         import platform
@@ -48,12 +65,28 @@ def main() -> None:
             theme_manager.apply_theme("light")  # 내부에서 macOS 분기 처리
         else:
             theme_manager.apply_theme("light")
+        if profiler:
+            profiler.mark("Theme applied")
 
         # Create and show main window, injecting the theme manager
         from pages.main_window import MainWindow
+        if profiler:
+            profiler.mark("MainWindow imported")
         window = MainWindow(theme_manager=theme_manager)
+        if profiler:
+            profiler.mark("MainWindow created")
         window.show()
 
+        if profiler:
+            def report_startup():
+                # Runs after the first event loop pass, including deferred widgets
+                profiler.mark("Event loop started")
+                profiler.uninstall()
+                print(profiler.report(), file=sys.stderr)
+
+            profiler.mark("MainWindow shown")
+            QTimer.singleShot(0, report_startup)
+
         # Start event loop
         sys.exit(app.exec())
 
@@ -2,13 +2,23 @@
 CellSorter Models Package
 
 This package contains data models and business logic for the CellSorter application.
+
+The classes here are Qt adapters over the Qt-free core package. They are
+imported on first access, so importing a Qt-free module such as
+models.protocol_writer or models.grid_warp does not load PySide6.
 """
 
-from models.csv_parser import CSVParser
-from models.image_handler import ImageHandler
-from models.coordinate_transformer import CoordinateTransformer, CalibrationPoint, TransformationResult
-from models.selection_manager import SelectionManager, CellSelection, SelectionStatus
-from models.extractor import Extractor, BoundingBox, CropRegion, ExtractionPoint
+from utils.lazy_import import lazy_getattr, exports_by_module
+
+__getattr__ = lazy_getattr(__name__, globals(), exports_by_module({
+    '.csv_parser': ['CSVParser'],
+    '.image_handler': ['ImageHandler'],
+    '.coordinate_transformer': ['CoordinateTransformer', 'CalibrationPoint', 'TransformationResult'],
+    '.grid_warp': ['GridWarp'],
+    '.selection_manager': ['SelectionManager', 'CellSelection', 'SelectionStatus'],
+    '.extractor': ['Extractor', 'BoundingBox', 'CropRegion', 'ExtractionPoint'],
+}))
+
 
 __all__ = [
     'CSVParser',
@@ -16,6 +26,7 @@ __all__ = [
     'CoordinateTransformer',
     'CalibrationPoint',
     'TransformationResult',
+    'GridWarp',
     'SelectionManager',
     'CellSelection',
     'SelectionStatus',
@@ -23,4 +34,4 @@ __all__ = [
     'BoundingBox',
     'CropRegion',
     'ExtractionPoint'
-]
\ No newline at end of file
+]
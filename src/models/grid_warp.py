@@ -0,0 +1,158 @@
+"""
+CellSorter Grid Warp
+
+Piecewise correction of stage nonlinearity on top of a global calibration
+transform. A thin-plate spline or triangulated mesh is fitted to the
+residuals of the global fit and sampled once onto a regular lookup grid,
+so per-cell corrections are a constant-time bilinear interpolation.
+"""
+
+from typing import Optional, Tuple, Callable
+import numpy as np
+
+from utils.exceptions import CalibrationError
+
+
+# Supported warp methods and the minimum control points each requires
+WARP_METHODS = {
+    'tps': 3,   # thin-plate spline (smooth, extrapolates)
+    'mesh': 3,  # piecewise-linear over a Delaunay triangulation
+}
+
+
+def fit_residual_interpolator(method: str, pixel: np.ndarray, residual: np.ndarray,
+                              smoothing: float = 0.0) -> Callable[[np.ndarray], np.ndarray]:
+    """
+    Fit an exact (non-gridded) interpolator of residual corrections.
+
+    Args:
+        method: Warp method (see WARP_METHODS)
+        pixel: (N, 2) control point pixel coordinates
+        residual: (N, 2) stage residuals of the global transform
+        smoothing: Thin-plate spline smoothing (0 interpolates exactly)
+
+    Returns:
+        Callable mapping an (M, 2) pixel array to (M, 2) corrections
+    """
+    if method not in WARP_METHODS:
+        raise CalibrationError(f"Unknown warp method: {method}")
+
+    if len(pixel) < WARP_METHODS[method]:
+        raise CalibrationError(f"Need at least {WARP_METHODS[method]} points for {method} warp")
+
+    # scipy is only needed once a warp is actually requested
+    from scipy.interpolate import RBFInterpolator, LinearNDInterpolator, NearestNDInterpolator
+    from scipy.spatial import QhullError
+
+    try:
+        if method == 'tps':
+            return RBFInterpolator(pixel, residual, kernel='thin_plate_spline', smoothing=smoothing)
+
+        linear = LinearNDInterpolator(pixel, residual)
+        nearest = NearestNDInterpolator(pixel, residual)
+    except (np.linalg.LinAlgError, QhullError, ValueError) as e:
+        raise CalibrationError(f"Control points are degenerate for {method} warp: {e}")
+
+    def mesh(xy: np.ndarray) -> np.ndarray:
+        # Outside the convex hull, extend the nearest control point's correction
+        corrections = linear(xy)
+        outside = np.isnan(corrections[:, 0])
+        if outside.any():
+            corrections[outside] = nearest(xy[outside])
+        return corrections
+
+    return mesh
+
+
+class GridWarp:
+    """
+    Precomputed lookup grid of pixel-to-stage corrections.
+
+    Corrections are stored at nodes spaced ``spacing`` pixels apart and
+    bilinearly interpolated; points outside the grid use the nearest edge.
+    """
+
+    def __init__(self, method: str, pixel: np.ndarray, residual: np.ndarray,
+                 bounds: Optional[Tuple[float, float, float, float]] = None,
+                 spacing: float = 64.0, smoothing: float = 0.0):
+        """
+        Fit the warp and sample it onto the lookup grid.
+
+        Args:
+            method: Warp method (see WARP_METHODS)
+            pixel: (N, 2) control point pixel coordinates
+            residual: (N, 2) stage residuals of the global transform
+            bounds: Optional grid extent (min_x, min_y, max_x, max_y) in pixels;
+                defaults to the control points' extent padded by 10%
+            spacing: Grid node spacing in pixels
+            smoothing: Thin-plate spline smoothing (0 interpolates exactly)
+        """
+        pixel = np.asarray(pixel, dtype=np.float64)
+        residual = np.asarray(residual, dtype=np.float64)
+
+        self.method = method
+        self.spacing = float(spacing)
+        self.exact = fit_residual_interpolator(method, pixel, residual, smoothing)
+
+        if bounds is None:
+            low, high = pixel.min(axis=0), pixel.max(axis=0)
+            pad = (high - low) * 0.1
+            bounds = (*(low - pad), *(high + pad))
+
+        min_x, min_y, max_x, max_y = bounds
+        self.origin = np.array([min_x, min_y], dtype=np.float64)
+        self.shape = (
+            max(2, int(np.ceil((max_y - min_y) / self.spacing)) + 1),
+            max(2, int(np.ceil((max_x - min_x) / self.spacing)) + 1),
+        )
+
+        # Sample the exact interpolator once at every grid node
+        rows, cols = self.shape
+        node_x = self.origin[0] + np.arange(cols) * self.spacing
+        node_y = self.origin[1] + np.arange(rows) * self.spacing
+        nodes = np.stack(np.meshgrid(node_x, node_y), axis=-1).reshape(-1, 2)
+        self.grid = np.asarray(self.exact(nodes)).reshape(rows, cols, 2)
+
+    def __call__(self, xy: np.ndarray) -> np.ndarray:
+        """
+        Look up corrections by bilinear interpolation in the grid.
+
+        Args:
+            xy: (N, 2) pixel coordinates
+
+        Returns:
+            (N, 2) stage corrections in micrometers
+        """
+        points = np.asarray(xy, dtype=np.float64).reshape(-1, 2)
+        rows, cols = self.shape
+
+        position = (points - self.origin) / self.spacing
+        position[:, 0] = np.clip(position[:, 0], 0, cols - 1)
+        position[:, 1] = np.clip(position[:, 1], 0, rows - 1)
+
+        cell = np.minimum(position.astype(np.intp), [cols - 2, rows - 2])
+        frac = position - cell
+        col, row = cell[:, 0], cell[:, 1]
+        fx, fy = frac[:, 0:1], frac[:, 1:2]
+
+        top = self.grid[row, col] * (1 - fx) + self.grid[row, col + 1] * fx
+        bottom = self.grid[row + 1, col] * (1 - fx) + self.grid[row + 1, col + 1] * fx
+        return top * (1 - fy) + bottom * fy
+
+    def grid_error(self) -> float:
+        """
+        Estimate the lookup grid's interpolation error.
+
+        Compares grid lookups with the exact interpolator at cell centers,
+        where bilinear interpolation is least accurate.
+
+        Returns:
+            Maximum deviation in micrometers
+        """
+        rows, cols = self.shape
+        center_x = self.origin[0] + (np.arange(cols - 1) + 0.5) * self.spacing
+        center_y = self.origin[1] + (np.arange(rows - 1) + 0.5) * self.spacing
+        centers = np.stack(np.meshgrid(center_x, center_y), axis=-1).reshape(-1, 2)
+
+        deviation = np.linalg.norm(self(centers) - np.asarray(self.exact(centers)), axis=1)
+        return float(deviation.max()) if deviation.size else 0.0
@@ -0,0 +1,480 @@
+"""
+CellSorter Image Exporter
+
+Cell crop and overlay image export, independent of the GUI. Square crop
+boxes are computed for all cells at once and JPEG encoding runs in a
+bounded thread pool (PIL releases the GIL while encoding), so only a
+small window of crops is held in memory at any time.
+
+Crops can also be packed into a single container (ZIP archive, multi-page
+TIFF or montage sheet) written as one sequential stream, with an index
+mapping each cell to its entry.
+"""
+
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+import csv
+import io
+import math
+import os
+import struct
+import threading
+import zipfile
+import numpy as np
+from PIL import Image
+
+from models.overlay_renderer import overlay_layer, render_overlay
+from utils.exceptions import ExportError
+
+
+# Default JPEG quality for exported images
+JPEG_QUALITY = 95
+
+# Crops encoded per pool task; amortizes scheduling overhead for small crops
+CROPS_PER_TASK = 32
+
+# Tasks queued per worker thread; bounds memory held by pending crops
+PENDING_PER_WORKER = 2
+
+# Crop output layouts: one file per cell, or a single container
+CROP_CONTAINERS = {
+    'files': 'Individual files',
+    'zip': 'ZIP archive',
+    'tiff': 'Multi-page TIFF',
+    'montage': 'Montage sheet',
+}
+
+# Baseline TIFF pages: tag count and position of the next-IFD pointer within an IFD
+TIFF_IFD_ENTRIES = 10
+TIFF_NEXT_POINTER = 2 + TIFF_IFD_ENTRIES * 12
+
+# (position in cell_indices, cell index, square crop box)
+CropEntry = Tuple[int, int, Sequence[int]]
+
+# Index columns shared by every container
+INDEX_FIELDS = ['cell_index', 'entry', 'min_x', 'min_y', 'max_x', 'max_y']
+
+
+def square_crop_boxes(bounding_boxes: np.ndarray, image_shape: Tuple[int, ...]) -> np.ndarray:
+    """
+    Convert rectangular bounding boxes to squares, preserving centers.
+
+    The square side is the longer box side. Squares are shifted back inside
+    the image where possible and clipped otherwise.
+
+    Args:
+        bounding_boxes: (N, 4) integer boxes (min_x, min_y, max_x, max_y)
+        image_shape: Image array shape (height, width[, channels])
+
+    Returns:
+        (N, 4) integer square boxes
+    """
+    boxes = np.asarray(bounding_boxes, dtype=np.int64).reshape(-1, 4)
+    img_height, img_width = image_shape[:2]
+
+    size = np.maximum(boxes[:, 2] - boxes[:, 0], boxes[:, 3] - boxes[:, 1])
+    center_x = (boxes[:, 0] + boxes[:, 2]) // 2
+    center_y = (boxes[:, 1] + boxes[:, 3]) // 2
+
+    def place(center: np.ndarray, limit: int) -> Tuple[np.ndarray, np.ndarray]:
+        low = center - size // 2
+        high = low + size
+        # Shift toward the inside, then clip whatever still overflows
+        low, high = np.where(low < 0, 0, low), np.where(low < 0, size, high)
+        over = high > limit
+        low, high = np.where(over, limit - size, low), np.where(over, limit, high)
+        return np.maximum(low, 0), np.minimum(high, limit)
+
+    min_x, max_x = place(center_x, img_width)
+    min_y, max_y = place(center_y, img_height)
+    return np.column_stack([min_x, min_y, max_x, max_y])
+
+
+def encode_crop(image_data: np.ndarray, box: Sequence[int], file_path: Path,
+                quality: int = JPEG_QUALITY) -> bool:
+    """
+    Crop one cell and save it as JPEG.
+
+    Args:
+        image_data: Source image array
+        box: Square box (min_x, min_y, max_x, max_y)
+        file_path: Output file path
+        quality: JPEG quality
+
+    Returns:
+        True if a non-empty crop was written
+    """
+    min_x, min_y, max_x, max_y = box
+    cell_image = image_data[min_y:max_y, min_x:max_x]
+    if cell_image.size == 0:
+        return False
+
+    _crop_image(cell_image).save(file_path, 'JPEG', quality=quality)
+    return True
+
+
+def _crop_image(cell_image: np.ndarray) -> Image.Image:
+    """Convert a crop array to an 8-bit PIL image."""
+    mode = None if cell_image.ndim == 3 else 'L'
+    return Image.fromarray(cell_image.astype(np.uint8), mode=mode)
+
+
+def _encode_jpeg_batch(image_data: np.ndarray, boxes: List[Sequence[int]], quality: int) -> List[bytes]:
+    """Encode a batch of crops to in-memory JPEG bytes (empty bytes for empty crops)."""
+    encoded = []
+    for min_x, min_y, max_x, max_y in boxes:
+        cell_image = image_data[min_y:max_y, min_x:max_x]
+        if cell_image.size == 0:
+            encoded.append(b'')
+            continue
+        buffer = io.BytesIO()
+        _crop_image(cell_image).save(buffer, 'JPEG', quality=quality)
+        encoded.append(buffer.getvalue())
+    return encoded
+
+
+def _encode_crop_batch(image_data: np.ndarray, jobs: List[Tuple[Sequence[int], Path]],
+                       quality: int) -> int:
+    """Encode a batch of crops, returning how many were written."""
+    return sum(encode_crop(image_data, box, file_path, quality) for box, file_path in jobs)
+
+
+def export_cell_crops(image_data: np.ndarray, bounding_boxes: Sequence[Tuple[int, int, int, int]],
+                      cell_indices: Sequence[int], output_dir: Path, label: str,
+                      max_workers: Optional[int] = None, quality: int = JPEG_QUALITY,
+                      progress_callback: Optional[Callable[[int, int], None]] = None,
+                      cancel_event: Optional[threading.Event] = None) -> Dict[str, int]:
+    """
+    Export square crops of selected cells as '<label>_<nnn>.jpg' in parallel.
+
+    Files are numbered by position in cell_indices; indices without a
+    bounding box or with an empty crop are skipped.
+
+    Args:
+        image_data: Source image array
+        bounding_boxes: Bounding boxes of all cells (in pixels)
+        cell_indices: Cells to export
+        output_dir: Output directory
+        label: File name prefix
+        max_workers: Thread pool size (defaults to the CPU count, at most 8)
+        quality: JPEG quality
+        progress_callback: Called with (cells_done, cells_total)
+        cancel_event: Set to stop submitting further crops
+
+    Returns:
+        Dictionary with 'exported', 'skipped' and 'total' counts
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    total = len(cell_indices)
+    positions = [i for i, cell_index in enumerate(cell_indices) if 0 <= cell_index < len(bounding_boxes)]
+    if positions:
+        boxes = np.asarray(bounding_boxes)[[cell_indices[i] for i in positions]]
+        squares = square_crop_boxes(boxes, image_data.shape).tolist()
+    else:
+        squares = []
+
+    counts = {'exported': 0, 'skipped': total - len(positions), 'total': total}
+    done = counts['skipped']
+    workers = max_workers or min(8, os.cpu_count() or 1)
+    window = workers * PENDING_PER_WORKER
+
+    batches = (
+        [(box, output_dir / f"{label}_{position + 1:03d}.jpg")
+         for position, box in zip(positions[start:start + CROPS_PER_TASK],
+                                  squares[start:start + CROPS_PER_TASK])]
+        for start in range(0, len(positions), CROPS_PER_TASK)
+    )
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = {}
+
+        while True:
+            # Keep a bounded number of batches in flight
+            while len(pending) < window and not (cancel_event is not None and cancel_event.is_set()):
+                batch = next(batches, None)
+                if batch is None:
+                    break
+                pending[executor.submit(_encode_crop_batch, image_data, batch, quality)] = len(batch)
+
+            if not pending:
+                break
+
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                size = pending.pop(future)
+                exported = future.result()
+                counts['exported'] += exported
+                counts['skipped'] += size - exported
+                done += size
+
+            if progress_callback is not None:
+                progress_callback(done, total)
+
+    return counts
+
+
+def _iter_encoded_jpegs(image_data: np.ndarray, squares: List[Sequence[int]], quality: int,
+                        workers: int, cancel_event: Optional[threading.Event]) -> Iterator[bytes]:
+    """Encode crops in the pool and yield them in order, with a bounded window."""
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        batches = (squares[start:start + CROPS_PER_TASK]
+                   for start in range(0, len(squares), CROPS_PER_TASK))
+
+        while True:
+            while len(pending) < workers * PENDING_PER_WORKER and not (
+                    cancel_event is not None and cancel_event.is_set()):
+                batch = next(batches, None)
+                if batch is None:
+                    break
+                pending.append(executor.submit(_encode_jpeg_batch, image_data, batch, quality))
+
+            if not pending:
+                return
+            yield from pending.popleft().result()
+
+
+def export_crop_container(image_data: np.ndarray, bounding_boxes: Sequence[Tuple[int, int, int, int]],
+                          cell_indices: Sequence[int], output_dir: Path, label: str,
+                          container: str = 'zip', max_workers: Optional[int] = None,
+                          quality: int = JPEG_QUALITY,
+                          progress_callback: Optional[Callable[[int, int], None]] = None,
+                          cancel_event: Optional[threading.Event] = None) -> Dict[str, Any]:
+    """
+    Pack square crops of selected cells into a single container file.
+
+    - 'zip': stored (uncompressed) JPEG members '<label>_<nnn>.jpg' plus an
+      'index.csv' member with each member's byte offset and length.
+    - 'tiff': '<label>.tif', one uncompressed page per cell.
+    - 'montage': '<label>_montage.jpg', cells on a grid of equal tiles.
+
+    TIFF and montage exports write '<label>_index.csv' next to the container.
+    Every index maps cell_index to its entry and crop box in image pixels.
+
+    Args:
+        image_data: Source image array
+        bounding_boxes: Bounding boxes of all cells (in pixels)
+        cell_indices: Cells to export
+        output_dir: Output directory
+        label: File name prefix
+        container: 'zip', 'tiff' or 'montage'
+        max_workers: Thread pool size for JPEG encoding
+        quality: JPEG quality
+        progress_callback: Called with (cells_done, cells_total)
+        cancel_event: Set to stop before the remaining cells
+
+    Returns:
+        Dictionary with 'exported', 'skipped', 'total' counts and the container 'path'
+    """
+    writers = {'zip': _write_zip_container, 'tiff': _write_tiff_container,
+               'montage': _write_montage_container}
+    if container not in writers:
+        raise ExportError(f"Unknown crop container: {container}")
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    total = len(cell_indices)
+    positions = [i for i, cell_index in enumerate(cell_indices) if 0 <= cell_index < len(bounding_boxes)]
+    if positions:
+        boxes = np.asarray(bounding_boxes)[[cell_indices[i] for i in positions]]
+        squares = square_crop_boxes(boxes, image_data.shape).tolist()
+    else:
+        squares = []
+
+    entries = [(position, cell_indices[position], box) for position, box in zip(positions, squares)]
+    counts = {'exported': 0, 'skipped': total - len(entries), 'total': total}
+
+    def advance(exported: bool) -> bool:
+        counts['exported' if exported else 'skipped'] += 1
+        done = counts['exported'] + counts['skipped']
+        if progress_callback is not None and (done % CROPS_PER_TASK == 0 or done == total):
+            progress_callback(done, total)
+        return cancel_event is None or not cancel_event.is_set()
+
+    workers = max_workers or min(8, os.cpu_count() or 1)
+    counts['path'] = writers[container](
+        image_data, entries, output_dir, label, quality, workers, advance, cancel_event
+    )
+    return counts
+
+
+def _index_row(cell_index: int, entry: Any, box: Sequence[int], **extra: Any) -> Dict[str, Any]:
+    """One index row for a packed crop."""
+    min_x, min_y, max_x, max_y = box
+    return dict(cell_index=cell_index, entry=entry, min_x=min_x, min_y=min_y,
+                max_x=max_x, max_y=max_y, **extra)
+
+
+def _write_index(stream: io.TextIOBase, rows: List[Dict[str, Any]], extra_fields: List[str]) -> None:
+    """Write index rows as CSV."""
+    writer = csv.DictWriter(stream, fieldnames=INDEX_FIELDS + extra_fields, lineterminator='\n')
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def _write_zip_container(image_data: np.ndarray, entries: List[CropEntry], output_dir: Path,
+                         label: str, quality: int, workers: int, advance: Callable[[bool], bool],
+                         cancel_event: Optional[threading.Event]) -> Path:
+    """Stream crops into a stored ZIP archive with an embedded index."""
+    path = output_dir / f"{label}_crops.zip"
+    rows = []
+    encoded = _iter_encoded_jpegs(image_data, [box for _, _, box in entries], quality,
+                                  workers, cancel_event)
+
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_STORED) as archive:
+        for (position, cell_index, box), data in zip(entries, encoded):
+            if data:
+                name = f"{label}_{position + 1:03d}.jpg"
+                archive.writestr(name, data)
+                info = archive.getinfo(name)
+                # Local header is 30 bytes plus name and extra field
+                offset = info.header_offset + 30 + len(info.filename.encode('utf-8')) + len(info.extra)
+                rows.append(_index_row(cell_index, name, box, offset=offset, length=len(data)))
+            if not advance(bool(data)):
+                break
+        encoded.close()
+
+        index = io.StringIO()
+        _write_index(index, rows, ['offset', 'length'])
+        archive.writestr('index.csv', index.getvalue())
+
+    return path
+
+
+def _tiff_page(cell_image: np.ndarray, ifd_offset: int) -> Tuple[bytes, int]:
+    """
+    Encode one uncompressed baseline TIFF page laid out as [IFD][extra][pixels].
+
+    Returns:
+        Page bytes (next-IFD pointer already aimed past this page) and pixel data offset
+    """
+    pixels = np.ascontiguousarray(cell_image.astype(np.uint8))
+    if pixels.ndim == 3 and pixels.shape[2] != 3:
+        pixels = np.asarray(_crop_image(pixels).convert('RGB'))
+    height, width = pixels.shape[:2]
+    samples = 3 if pixels.ndim == 3 else 1
+
+    ifd_size = TIFF_NEXT_POINTER + 4
+    extra = struct.pack('<3H', 8, 8, 8) if samples == 3 else b''
+    data_offset = ifd_offset + ifd_size + len(extra)
+    data = pixels.tobytes()
+
+    def entry(tag: int, field_type: int, count: int, value: int) -> bytes:
+        # SHORT values are left-justified in the 4-byte value field
+        if field_type == 3 and count == 1:
+            return struct.pack('<HHIHH', tag, field_type, count, value, 0)
+        return struct.pack('<HHII', tag, field_type, count, value)
+
+    bits = entry(258, 3, 3, ifd_offset + ifd_size) if samples == 3 else entry(258, 3, 1, 8)
+    ifd = b''.join([
+        struct.pack('<H', TIFF_IFD_ENTRIES),
+        entry(256, 4, 1, width),                 # ImageWidth
+        entry(257, 4, 1, height),                # ImageLength
+        bits,                                    # BitsPerSample
+        entry(259, 3, 1, 1),                     # Compression: none
+        entry(262, 3, 1, 2 if samples == 3 else 1),  # Photometric: RGB / BlackIsZero
+        entry(273, 4, 1, data_offset),           # StripOffsets
+        entry(277, 3, 1, samples),               # SamplesPerPixel
+        entry(278, 4, 1, height),                # RowsPerStrip
+        entry(279, 4, 1, len(data)),             # StripByteCounts
+        entry(284, 3, 1, 1),                     # PlanarConfiguration: chunky
+        struct.pack('<I', data_offset + len(data)),  # Next IFD follows this page
+    ])
+    return ifd + extra + data, data_offset
+
+
+def _write_tiff_container(image_data: np.ndarray, entries: List[CropEntry], output_dir: Path,
+                          label: str, quality: int, workers: int, advance: Callable[[bool], bool],
+                          cancel_event: Optional[threading.Event]) -> Path:
+    """Stream one uncompressed TIFF page per crop."""
+    path = output_dir / f"{label}.tif"
+    rows = []
+    last_next_pointer = None
+
+    with open(path, 'wb') as stream:
+        stream.write(b'II*\x00' + struct.pack('<I', 8))
+        offset = 8
+
+        for _, cell_index, box in entries:
+            min_x, min_y, max_x, max_y = box
+            cell_image = image_data[min_y:max_y, min_x:max_x]
+            if cell_image.size:
+                page, data_offset = _tiff_page(cell_image, offset)
+                stream.write(page)
+                rows.append(_index_row(cell_index, len(rows), box, offset=data_offset,
+                                       length=offset + len(page) - data_offset))
+                last_next_pointer = offset + TIFF_NEXT_POINTER
+                offset += len(page)
+            if not advance(bool(cell_image.size)):
+                break
+
+        if last_next_pointer is None:
+            raise ExportError("No cell crops to write")
+
+        # Terminate the IFD chain at the last page written
+        stream.seek(last_next_pointer)
+        stream.write(struct.pack('<I', 0))
+
+    with open(output_dir / f"{label}_index.csv", 'w', newline='', encoding='utf-8') as index:
+        _write_index(index, rows, ['offset', 'length'])
+    return path
+
+
+def _write_montage_container(image_data: np.ndarray, entries: List[CropEntry], output_dir: Path,
+                             label: str, quality: int, workers: int, advance: Callable[[bool], bool],
+                             cancel_event: Optional[threading.Event]) -> Path:
+    """Paste crops onto a grid of equal tiles and save a single sheet."""
+    path = output_dir / f"{label}_montage.jpg"
+    tile = max([max(box[2] - box[0], box[3] - box[1]) for _, _, box in entries] or [1])
+    columns = max(1, math.ceil(math.sqrt(len(entries))))
+    rows_count = max(1, math.ceil(len(entries) / columns))
+
+    channels = image_data.shape[2:] if image_data.ndim == 3 else ()
+    sheet = np.zeros((rows_count * tile, columns * tile) + channels, dtype=np.uint8)
+    rows = []
+
+    for _, cell_index, box in entries:
+        min_x, min_y, max_x, max_y = box
+        cell_image = image_data[min_y:max_y, min_x:max_x]
+        if cell_image.size:
+            tile_x, tile_y = (len(rows) % columns) * tile, (len(rows) // columns) * tile
+            sheet[tile_y:tile_y + cell_image.shape[0], tile_x:tile_x + cell_image.shape[1]] = cell_image
+            rows.append(_index_row(cell_index, len(rows), box, tile_x=tile_x, tile_y=tile_y,
+                                   width=cell_image.shape[1], height=cell_image.shape[0]))
+        if not advance(bool(cell_image.size)):
+            break
+
+    _crop_image(sheet).save(path, 'JPEG', quality=quality)
+
+    with open(output_dir / f"{label}_index.csv", 'w', newline='', encoding='utf-8') as index:
+        _write_index(index, rows, ['tile_x', 'tile_y', 'width', 'height'])
+    return path
+
+
+def create_overlay_image(image_data: np.ndarray, bounding_boxes: Sequence[Tuple[int, int, int, int]],
+                         cell_indices: Sequence[int], color: str, file_path: Path,
+                         quality: int = JPEG_QUALITY, downsample: int = 1) -> None:
+    """
+    Save the image with the selected cells' bounding boxes outlined.
+
+    Rendering is done strip by strip by the overlay renderer; the format
+    follows the file suffix (.tif/.tiff streams a tiled TIFF, .png, else JPEG).
+
+    Args:
+        image_data: Source image array
+        bounding_boxes: Bounding boxes of all cells (in pixels)
+        cell_indices: Cells to outline
+        color: Outline color as '#RRGGBB'
+        file_path: Output file path
+        quality: JPEG quality
+        downsample: Integer reduction factor for a preview rendering
+    """
+    suffix = Path(file_path).suffix.lower().lstrip('.')
+    image_format = suffix if suffix in ('tif', 'tiff', 'png') else 'jpeg'
+    render_overlay(image_data, [overlay_layer(bounding_boxes, cell_indices, color)], file_path,
+                   image_format, downsample=downsample, quality=quality)
@@ -3,15 +3,14 @@ CellSorter Image Handler
 
 This module handles loading, processing, and displaying microscopy images
 with support for multiple formats (TIFF, JPG, JPEG, PNG) and large files.
+Decoding lives in core.image_loader so it can run without Qt.
 """
 
 import time
 from typing import Optional, Tuple, List, Dict, Any
 from pathlib import Path
 
-import cv2
 import numpy as np
-from PIL import Image, ImageFile
 from PySide6.QtWidgets import QWidget, QLabel, QVBoxLayout, QProgressBar, QSizePolicy
 from PySide6.QtCore import Qt, Signal, QThread, QObject, QTimer, QPoint, QSize, QRect
 from PySide6.QtGui import QPixmap, QImage, QPainter, QPen, QBrush
@@ -19,13 +18,11 @@ from PySide6.QtGui import QPixmap, QImage, QPainter, QPen, QBrush
 from config.settings import (
     SUPPORTED_IMAGE_FORMATS, MAX_IMAGE_SIZE_MB, COORDINATE_ACCURACY_MICROMETERS
 )
+from core.image_loader import load_image_file
 from utils.exceptions import ImageLoadError, MemoryError, PerformanceError
 from utils.error_handler import error_handler
 from utils.logging_config import LoggerMixin
 
-# Enable loading of large images
-ImageFile.LOAD_TRUNCATED_IMAGES = True
-
 
 class ImageLoadWorker(QObject, LoggerMixin):
     """
@@ -50,159 +47,16 @@ class ImageLoadWorker(QObject, LoggerMixin):
     def load_image(self) -> None:
         """Load image in worker thread."""
         try:
-            start_time = time.time()
-            file_path = Path(self.file_path)
-            
-            # Validate file
-            if not file_path.exists():
-                raise ImageLoadError(f"File not found: {file_path}")
-            
-            if file_path.suffix.lower() not in SUPPORTED_IMAGE_FORMATS:
-                raise ImageLoadError(f"Unsupported format: {file_path.suffix}")
-            
-            # Check file size
-            file_size_mb = file_path.stat().st_size / (1024 * 1024)
-            if file_size_mb > MAX_IMAGE_SIZE_MB:
-                raise ImageLoadError(f"File too large: {file_size_mb:.1f}MB > {MAX_IMAGE_SIZE_MB}MB")
-            
-            self.progress_updated.emit(10)
-            
-            if self.is_cancelled:
-                return
-            
-            # Load image based on format
-            if file_path.suffix.lower() in ['.tiff', '.tif']:
-                image_data, metadata = self._load_tiff(file_path)
-            else:
-                image_data, metadata = self._load_standard_format(file_path)
-            
-            self.progress_updated.emit(90)
-            
-            if self.is_cancelled:
+            result = load_image_file(self.file_path, self.progress_updated.emit,
+                                     lambda: self.is_cancelled)
+            if result is None:
                 return
             
-            # Validate loading performance
-            load_time = time.time() - start_time
-            target_time = 5.0  # 5 seconds for 500MB
-            adjusted_target = target_time * (file_size_mb / 500)
-            
-            if load_time > adjusted_target:
-                self.log_warning(f"Image loading took {load_time:.2f}s, target was {adjusted_target:.2f}s")
-            
-            # Add timing metadata
-            metadata.update({
-                'load_time_seconds': load_time,
-                'file_size_mb': file_size_mb,
-                'performance_target_met': load_time <= adjusted_target
-            })
-            
-            self.progress_updated.emit(100)
-            self.loading_finished.emit(image_data, metadata)
-            
-            self.log_info(f"Image loaded successfully: {file_path.name} "
-                         f"({file_size_mb:.1f}MB, {load_time:.2f}s)")
+            self.loading_finished.emit(*result)
             
         except Exception as e:
             self.log_error(f"Failed to load image {self.file_path}: {e}")
             self.loading_failed.emit(str(e))
-    
-    def _load_tiff(self, file_path: Path) -> Tuple[np.ndarray, Dict[str, Any]]:
-        """
-        Load TIFF image with support for multi-channel and large files.
-        
-        Args:
-            file_path: Path to TIFF file
-        
-        Returns:
-            Tuple of (image_data, metadata)
-        """
-        try:
-            # Try OpenCV first for standard TIFF files
-            image = cv2.imread(str(file_path), cv2.IMREAD_UNCHANGED)
-            
-            if image is not None:
-                self.progress_updated.emit(50)
-                
-                # Convert BGR to RGB if color image
-                if len(image.shape) == 3 and image.shape[2] == 3:
-                    image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-                
-                metadata = {
-                    'format': 'TIFF',
-                    'shape': image.shape,
-                    'dtype': str(image.dtype),
-                    'channels': 1 if len(image.shape) == 2 else image.shape[2],
-                    'bit_depth': image.dtype.itemsize * 8,
-                    'loader': 'opencv'
-                }
-                
-                return image, metadata
-            
-            # Fallback to PIL for complex TIFF files
-            self.progress_updated.emit(30)
-            
-            with Image.open(file_path) as pil_image:
-                # Handle multi-frame TIFF (take first frame)
-                if hasattr(pil_image, 'n_frames') and pil_image.n_frames > 1:
-                    self.log_info(f"Multi-frame TIFF detected: {pil_image.n_frames} frames, using first frame")
-                    pil_image.seek(0)
-                
-                self.progress_updated.emit(60)
-                
-                # Convert to numpy array
-                image = np.array(pil_image)
-                
-                metadata = {
-                    'format': 'TIFF',
-                    'shape': image.shape,
-                    'dtype': str(image.dtype),
-                    'channels': 1 if len(image.shape) == 2 else image.shape[2],
-                    'mode': pil_image.mode,
-                    'frames': getattr(pil_image, 'n_frames', 1),
-                    'loader': 'pillow'
-                }
-                
-                return image, metadata
-                
-        except Exception as e:
-            raise ImageLoadError(f"Failed to load TIFF file: {e}")
-    
-    def _load_standard_format(self, file_path: Path) -> Tuple[np.ndarray, Dict[str, Any]]:
-        """
-        Load standard format images (JPG, JPEG, PNG).
-        
-        Args:
-            file_path: Path to image file
-        
-        Returns:
-            Tuple of (image_data, metadata)
-        """
-        try:
-            # Use OpenCV for standard formats
-            image = cv2.imread(str(file_path), cv2.IMREAD_UNCHANGED)
-            
-            if image is None:
-                raise ImageLoadError(f"Failed to load image: {file_path}")
-            
-            self.progress_updated.emit(50)
-            
-            # Convert BGR to RGB for color images
-            if len(image.shape) == 3 and image.shape[2] == 3:
-                image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-            
-            metadata = {
-                'format': file_path.suffix.upper().lstrip('.'),
-                'shape': image.shape,
-                'dtype': str(image.dtype),
-                'channels': 1 if len(image.shape) == 2 else image.shape[2],
-                'bit_depth': image.dtype.itemsize * 8,
-                'loader': 'opencv'
-            }
-            
-            return image, metadata
-            
-        except Exception as e:
-            raise ImageLoadError(f"Failed to load {file_path.suffix} file: {e}")
 
 
 class ImageHandler(QWidget, LoggerMixin):
@@ -752,7 +606,7 @@ class ImageHandler(QWidget, LoggerMixin):
         
         self._update_display()
         self.viewport_changed.emit()
-        self.log_info(f"Navigated to position: ({norm_x:.2f}, {norm_y:.2f})")
+        self.log_throttled("navigate", f"Navigated to position: ({norm_x:.2f}, {norm_y:.2f})")
     
     def add_overlay(self, overlay_type: str, x: float, y: float, 
                    width: float, height: float, color: str = '#FF0000', 
@@ -865,7 +719,7 @@ class ImageHandler(QWidget, LoggerMixin):
         self.cell_overlays[selection_id] = overlays
         self._update_display()
         
-        self.log_info(f"Highlighted {len(overlays)} cells for selection {selection_id}")
+        self.log_throttled("highlight", f"Highlighted {len(overlays)} cells for selection {selection_id}")
     
     def remove_cell_highlights(self, selection_id: str) -> None:
         """
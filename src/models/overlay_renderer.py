@@ -0,0 +1,387 @@
+"""
+CellSorter Overlay Renderer
+
+Draws cell bounding box outlines (and optional translucent fills) onto an
+image without building a full-size PIL copy. The output is produced one
+horizontal strip at a time: each strip is copied from the source (or
+block-averaged from it for a downsampled preview), the rectangles crossing
+it are drawn with vectorized array writes, and the strip is handed to the
+writer. TIFF output is streamed as an uncompressed tiled TIFF, switching to
+BigTIFF when the file would exceed 4 GB, so peak memory stays at a few
+strips regardless of slide size.
+"""
+
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+from dataclasses import dataclass
+from pathlib import Path
+import os
+import struct
+import threading
+import numpy as np
+from PIL import Image
+
+from utils.exceptions import ExportError
+
+
+# Output rows rendered per strip; also the TIFF tile edge length
+OVERLAY_STRIP_ROWS = 256
+
+# Default JPEG quality for overlay images
+OVERLAY_JPEG_QUALITY = 95
+
+# Downsample factors offered for quick-sharing previews
+PREVIEW_SCALES = {
+    1: 'Full resolution',
+    2: '1/2',
+    4: '1/4',
+    8: '1/8',
+}
+
+# Largest file written as classic TIFF (32-bit offsets); larger files use BigTIFF
+CLASSIC_TIFF_LIMIT = 2 ** 32 - 2 ** 20
+
+# TIFF field types: SHORT, LONG, LONG8
+TIFF_FIELD_TYPES = {3: '<u2', 4: '<u4', 16: '<u8'}
+
+
+@dataclass(frozen=True)
+class OverlayLayer:
+    """Rectangles drawn in one color; later layers are drawn on top."""
+    boxes: np.ndarray                 # (N, 4) int64 (min_x, min_y, max_x, max_y), inclusive
+    color: Tuple[int, int, int]
+    fill_alpha: float = 0.0           # 0 draws outlines only
+
+
+def parse_color(color: str, default: Tuple[int, int, int] = (255, 0, 0)) -> Tuple[int, int, int]:
+    """Convert '#RRGGBB' to an RGB tuple, falling back to default."""
+    if isinstance(color, str) and color.startswith('#') and len(color) == 7:
+        try:
+            return tuple(int(color[i:i+2], 16) for i in (1, 3, 5))
+        except ValueError:
+            pass
+    return default
+
+
+def overlay_layer(bounding_boxes: Sequence[Tuple[int, int, int, int]], cell_indices: Sequence[int],
+                  color: str, fill_alpha: float = 0.0) -> OverlayLayer:
+    """
+    Build a layer for the given cells; indices without a bounding box are ignored.
+
+    Args:
+        bounding_boxes: Bounding boxes of all cells (list or (N, 4) array)
+        cell_indices: Cells to draw
+        color: Color as '#RRGGBB'
+        fill_alpha: Opacity of the rectangle fill, 0 for outlines only
+    """
+    boxes = np.asarray(bounding_boxes, dtype=np.int64).reshape(-1, 4)
+    indices = np.asarray(cell_indices, dtype=np.int64).reshape(-1)
+    indices = indices[(indices >= 0) & (indices < len(boxes))]
+    selected = boxes[indices]
+    # Degenerate boxes cannot be drawn
+    selected = selected[(selected[:, 2] >= selected[:, 0]) & (selected[:, 3] >= selected[:, 1])]
+    return OverlayLayer(selected, parse_color(color), fill_alpha)
+
+
+def _strided_runs(starts: np.ndarray, lengths: np.ndarray, stride: int) -> np.ndarray:
+    """Concatenate start, start + stride, ... (length items) for every run."""
+    lengths = np.maximum(lengths, 0)
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    run_offsets = np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return np.repeat(starts, lengths) + (np.arange(total) - run_offsets) * stride
+
+
+def _outline_pixels(boxes: np.ndarray, top: int, height: int, width: int) -> np.ndarray:
+    """Flat pixel indices of box outlines within rows [top, top + height) of a strip."""
+    bottom = top + height
+    min_x, min_y, max_x, max_y = boxes.T
+    pixels = []
+
+    # Horizontal edges: one run along the row for each edge inside the strip
+    left = np.maximum(min_x, 0)
+    right = np.minimum(max_x, width - 1)
+    for row in (min_y, max_y):
+        inside = (row >= top) & (row < bottom) & (right >= left)
+        pixels.append(_strided_runs((row[inside] - top) * width + left[inside],
+                                    right[inside] - left[inside] + 1, 1))
+
+    # Vertical edges: one run down the column, clipped to the strip
+    first = np.maximum(min_y, top)
+    last = np.minimum(max_y, bottom - 1)
+    for column in (min_x, max_x):
+        inside = (column >= 0) & (column < width) & (last >= first)
+        pixels.append(_strided_runs((first[inside] - top) * width + column[inside],
+                                    last[inside] - first[inside] + 1, width))
+
+    return np.concatenate(pixels)
+
+
+def _fill_pixels(boxes: np.ndarray, top: int, height: int, width: int) -> np.ndarray:
+    """Flat pixel indices of box interiors within rows [top, top + height) of a strip."""
+    left = np.maximum(boxes[:, 0], 0)
+    right = np.minimum(boxes[:, 2], width - 1)
+    first = np.maximum(boxes[:, 1], top)
+    last = np.minimum(boxes[:, 3], top + height - 1)
+    inside = (right >= left) & (last >= first)
+    left, right, first, last = (a[inside] for a in (left, right, first, last))
+
+    # One run per box row: start of every row run, then the pixels along each run
+    row_counts = last - first + 1
+    run_starts = _strided_runs((first - top) * width + left, row_counts, width)
+    return _strided_runs(run_starts, np.repeat(right - left + 1, row_counts), 1)
+
+
+def _draw_layers(strip: np.ndarray, top: int, layers: Sequence[OverlayLayer]) -> None:
+    """
+    Draw the rectangles crossing this strip in place.
+
+    Fills blend with the source pixels (a later layer's fill replaces an
+    earlier one rather than compounding), then outlines of all layers are
+    drawn on top in layer order.
+    """
+    height, width = strip.shape[:2]
+    visible = []
+    for layer in layers:
+        boxes = layer.boxes
+        boxes = boxes[(boxes[:, 3] >= top) & (boxes[:, 1] < top + height)]
+        if len(boxes):
+            visible.append((layer, boxes))
+
+    pixels = strip.reshape(-1, 3)
+    source = None
+    for layer, boxes in visible:
+        if layer.fill_alpha > 0:
+            if source is None:
+                source = pixels.copy()
+            # 8-bit fixed point blend of the source pixels under the fill
+            alpha = int(round(layer.fill_alpha * 256))
+            filled = _fill_pixels(boxes, top, height, width)
+            blended = source[filled].astype(np.uint16) * (256 - alpha)
+            blended += np.asarray(layer.color, dtype=np.uint16) * alpha + 128
+            pixels[filled] = blended >> 8
+
+    for layer, boxes in visible:
+        pixels[_outline_pixels(boxes, top, height, width)] = layer.color
+
+
+def _source_strip(image_data: np.ndarray, top: int, height: int, width: int, factor: int) -> np.ndarray:
+    """Copy (or block-average) output rows [top, top + height) as an RGB uint8 array."""
+    rows = image_data[top * factor:(top + height) * factor, :width * factor]
+    if rows.ndim == 3:
+        rows = rows[:, :, :3]
+    if factor > 1:
+        # Sum row blocks, then column blocks, with one contiguous add per offset
+        row_blocks = rows.reshape(height, factor, -1)
+        totals = row_blocks[:, 0].astype(np.uint32)
+        for offset in range(1, factor):
+            totals += row_blocks[:, offset]
+        column_blocks = totals.reshape(height, width, factor, -1)
+        sums = column_blocks[:, :, 0].copy()
+        for offset in range(1, factor):
+            sums += column_blocks[:, :, offset]
+        area = factor * factor
+        rows = ((sums + area // 2) // area).reshape(height, width, *rows.shape[2:])
+
+    # Always a copy: strips are drawn on in place
+    if rows.ndim == 2:
+        # Grayscale - expand to RGB only for this strip
+        return np.repeat(rows.astype(np.uint8)[:, :, None], 3, axis=2)
+    return rows.astype(np.uint8)
+
+
+def overlay_size(image_shape: Tuple[int, ...], downsample: int = 1) -> Tuple[int, int, int]:
+    """
+    Output (width, height, factor) for an image rendered at 1/downsample.
+
+    The factor is clamped so that the preview is at least one pixel.
+    """
+    height, width = image_shape[:2]
+    factor = max(1, min(int(downsample), height, width))
+    return width // factor, height // factor, factor
+
+
+def iter_overlay_strips(image_data: np.ndarray, layers: Sequence[OverlayLayer], downsample: int = 1,
+                        strip_rows: int = OVERLAY_STRIP_ROWS) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Render the overlay strip by strip.
+
+    Args:
+        image_data: Source image array (grayscale or RGB)
+        layers: Layers drawn in order
+        downsample: Integer reduction factor for previews; boxes are scaled to match
+        strip_rows: Output rows per strip
+
+    Yields:
+        (first output row, (rows, width, 3) uint8 strip)
+    """
+    width, height, factor = overlay_size(image_data.shape, downsample)
+    if factor > 1:
+        layers = [OverlayLayer(layer.boxes // factor, layer.color, layer.fill_alpha) for layer in layers]
+
+    for top in range(0, height, strip_rows):
+        rows = min(strip_rows, height - top)
+        strip = _source_strip(image_data, top, rows, width, factor)
+        _draw_layers(strip, top, layers)
+        yield top, strip
+
+
+def _tiff_directory(entries: List[Tuple[int, int, Sequence[int]]], offset: int, bigtiff: bool) -> bytes:
+    """
+    Lay out an IFD at offset, followed by the values that do not fit inline.
+
+    Args:
+        entries: (tag, field type, values) tuples
+        offset: File offset of the IFD (word aligned)
+        bigtiff: Use BigTIFF (64-bit) entries
+    """
+    count_format, entry_format, value_size = ('<Q', '<HHQ', 8) if bigtiff else ('<H', '<HHI', 4)
+    offset_format = '<Q' if bigtiff else '<I'
+    ifd_size = (struct.calcsize(count_format) + value_size
+                + len(entries) * (struct.calcsize(entry_format) + value_size))
+
+    ifd = [struct.pack(count_format, len(entries))]
+    extra = []
+    extra_offset = offset + ifd_size
+    for tag, field_type, values in sorted(entries, key=lambda entry: entry[0]):
+        data = np.asarray(values, dtype=TIFF_FIELD_TYPES[field_type]).tobytes()
+        if len(data) <= value_size:
+            value = data.ljust(value_size, b'\0')
+        else:
+            value = struct.pack(offset_format, extra_offset)
+            data += b'\0' * (len(data) % 2)
+            extra.append(data)
+            extra_offset += len(data)
+        ifd.append(struct.pack(entry_format, tag, field_type, len(values)) + value)
+    ifd.append(b'\0' * value_size)  # No next IFD
+    return b''.join(ifd + extra)
+
+
+def _write_tiled_tiff(file_path: Path, strips: Iterator[Tuple[int, np.ndarray]], width: int,
+                      height: int, bigtiff: Optional[bool]) -> bool:
+    """
+    Stream strips of OVERLAY_STRIP_ROWS rows as one row of tiles each.
+
+    Returns:
+        False when the strip iterator stopped early (cancelled)
+    """
+    tile = OVERLAY_STRIP_ROWS
+    tiles_across = -(-width // tile)
+    tiles_down = -(-height // tile)
+    tile_bytes = tile * tile * 3
+    if bigtiff is None:
+        bigtiff = tiles_across * tiles_down * tile_bytes > CLASSIC_TIFF_LIMIT
+
+    header_size = 16 if bigtiff else 8
+    rows_written = 0
+    with open(file_path, 'wb') as stream:
+        stream.write(b'\0' * header_size)  # Patched once the IFD offset is known
+
+        for top, strip in strips:
+            padded = np.zeros((tile, tiles_across * tile, 3), dtype=np.uint8)
+            padded[:strip.shape[0], :strip.shape[1]] = strip
+            # (row, tile, column, rgb) -> (tile, row, column, rgb): tiles become contiguous
+            stream.write(padded.reshape(tile, tiles_across, tile, 3).swapaxes(0, 1).tobytes())
+            rows_written = top + strip.shape[0]
+
+        if rows_written < height:
+            return False
+
+        tile_count = tiles_across * tiles_down
+        offsets = header_size + np.arange(tile_count, dtype=np.uint64) * tile_bytes
+        offset_type = 16 if bigtiff else 4
+        ifd_offset = header_size + tile_count * tile_bytes
+        stream.write(_tiff_directory([
+            (256, 4, [width]),                         # ImageWidth
+            (257, 4, [height]),                        # ImageLength
+            (258, 3, [8, 8, 8]),                       # BitsPerSample
+            (259, 3, [1]),                             # Compression: none
+            (262, 3, [2]),                             # Photometric: RGB
+            (277, 3, [3]),                             # SamplesPerPixel
+            (284, 3, [1]),                             # PlanarConfiguration: chunky
+            (322, 4, [tile]),                          # TileWidth
+            (323, 4, [tile]),                          # TileLength
+            (324, offset_type, offsets),               # TileOffsets
+            (325, offset_type, [tile_bytes] * tile_count),  # TileByteCounts
+        ], ifd_offset, bigtiff))
+
+        stream.seek(0)
+        if bigtiff:
+            stream.write(b'II+\x00' + struct.pack('<HHQ', 8, 0, ifd_offset))
+        else:
+            stream.write(b'II*\x00' + struct.pack('<I', ifd_offset))
+    return True
+
+
+def render_overlay(image_data: np.ndarray, layers: Sequence[OverlayLayer], file_path: Path,
+                   image_format: str = 'tiff', downsample: int = 1,
+                   quality: int = OVERLAY_JPEG_QUALITY, bigtiff: Optional[bool] = None,
+                   progress_callback: Optional[Callable[[int, int], None]] = None,
+                   cancel_event: Optional[threading.Event] = None) -> Optional[Path]:
+    """
+    Render an overlay image to disk.
+
+    TIFF output is streamed tile row by tile row; PNG and JPEG are assembled
+    into a single RGB output array (one output-sized buffer) and saved with PIL.
+
+    Args:
+        image_data: Source image array (grayscale or RGB)
+        layers: Layers drawn in order
+        file_path: Output file path
+        image_format: 'tiff', 'png' or 'jpeg'
+        downsample: Integer reduction factor for a preview rendering
+        quality: JPEG quality
+        bigtiff: Force (True) or forbid (False) BigTIFF; chosen by size when None
+        progress_callback: Called with (rows done, total rows) after each strip
+        cancel_event: Stops rendering when set; no file is left behind
+
+    Returns:
+        Output path, or None if cancelled
+    """
+    image_format = image_format.lower()
+    if image_format not in ('tiff', 'tif', 'png', 'jpeg', 'jpg'):
+        raise ExportError(f"Unsupported overlay format: {image_format}")
+
+    file_path = Path(file_path)
+    width, height, _ = overlay_size(image_data.shape, downsample)
+
+    def strips() -> Iterator[Tuple[int, np.ndarray]]:
+        for top, strip in iter_overlay_strips(image_data, layers, downsample):
+            if cancel_event is not None and cancel_event.is_set():
+                return
+            yield top, strip
+            if progress_callback:
+                progress_callback(top + strip.shape[0], height)
+
+    if image_format in ('tiff', 'tif'):
+        try:
+            completed = _write_tiled_tiff(file_path, strips(), width, height, bigtiff)
+        except BaseException:
+            _remove(file_path)
+            raise
+        if not completed:
+            _remove(file_path)
+            return None
+        return file_path
+
+    output = np.empty((height, width, 3), dtype=np.uint8)
+    rows_done = 0
+    for top, strip in strips():
+        output[top:top + strip.shape[0]] = strip
+        rows_done = top + strip.shape[0]
+    if rows_done < height:
+        return None
+
+    if image_format == 'png':
+        Image.fromarray(output).save(file_path, 'PNG')
+    else:
+        Image.fromarray(output).save(file_path, 'JPEG', quality=quality)
+    return file_path
+
+
+def _remove(file_path: Path) -> None:
+    """Delete a partially written output, ignoring errors."""
+    try:
+        os.remove(file_path)
+    except OSError:
+        pass
@@ -0,0 +1,375 @@
+"""
+CellSorter Protocol Writer
+
+Streaming .cxprotocol writer for CosmoSort hardware. Point entries are
+formatted from coordinate arrays in chunks and written straight to a
+temporary file, which is atomically renamed over the output. Backups are
+hard links (or plain copies) of the finished file rather than a second
+serialization.
+
+Every protocol export path renders through this module; the text layout is
+selected with a ProtocolFormat.
+"""
+
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Union
+from dataclasses import dataclass, field
+from pathlib import Path
+import os
+import shutil
+import uuid
+import numpy as np
+
+from utils.exceptions import ProtocolFormatError
+
+
+# Number of point entries formatted per write call
+PROTOCOL_CHUNK_SIZE = 10000
+
+# Point entry format: "min_x; min_y; max_x; max_y; color; well; label;"
+POINT_TEMPLATE = "P_{} = {:.4f}; {:.4f}; {:.4f}; {:.4f}; {}; {}; {};\n"
+
+# Color names used by the CosmoSort example protocols
+COLOR_NAMES = {
+    'FF0000': 'red',
+    '00FF00': 'green',
+    '0000FF': 'blue',
+    'FFFF00': 'yellow',
+    'FF00FF': 'magenta',
+    '00FFFF': 'cyan',
+    'C0C0C0': 'lightgray',
+    '800000': 'darkred',
+    '008000': 'darkgreen',
+    '000080': 'darkblue',
+    '808000': 'darkyellow',
+    '800080': 'darkmagenta',
+    '008080': 'darkcyan',
+    '808080': 'darkgray',
+    'FFFFFF': 'white',
+    '000000': 'black',
+}
+
+# Image file extensions mapped to protocol FORMAT values
+IMAGE_FORMATS = {'.tiff': 'TIF', '.tif': 'TIF', '.jpg': 'JPG', '.jpeg': 'JPG', '.png': 'PNG'}
+
+
+@dataclass(frozen=True)
+class ProtocolFormat:
+    """Text layout of a .cxprotocol file."""
+    name: str
+    point_template: str = POINT_TEMPLATE
+    quoted_fields: FrozenSet[str] = frozenset()
+    color_names: bool = False
+
+    def format_color(self, color: str) -> str:
+        """Normalize a '#RRGGBB' color for point entries."""
+        code = color.lstrip('#')
+        if self.color_names:
+            return COLOR_NAMES.get(code.upper(), code.lower())
+        return code.lower()
+
+    def format_fields(self, fields: Dict[str, object]) -> Dict[str, object]:
+        """Quote the section values this format writes as strings."""
+        return {
+            key: f'"{value}"' if key in self.quoted_fields else value
+            for key, value in fields.items()
+        }
+
+
+PROTOCOL_FORMATS = {
+    # ConfigParser-style layout parsed by Extractor.validate_protocol_file
+    'ini': ProtocolFormat('ini'),
+    # Quoted layout of docs/examples/example.cxprotocol
+    'cosmosort': ProtocolFormat(
+        'cosmosort',
+        point_template='P_{} = "{:.4f}; {:.4f}; {:.4f}; {:.4f};{};{};{}"\n',
+        quoted_fields=frozenset({'FILE', 'FORMAT', 'AfterBefore'}),
+        color_names=True,
+    ),
+}
+
+DEFAULT_PROTOCOL_FORMAT = 'ini'
+
+
+def get_protocol_format(protocol_format: Union[str, ProtocolFormat, None] = None) -> ProtocolFormat:
+    """
+    Resolve a protocol format by name.
+
+    Args:
+        protocol_format: Format name, ProtocolFormat instance or None for the default
+
+    Returns:
+        ProtocolFormat instance
+    """
+    if isinstance(protocol_format, ProtocolFormat):
+        return protocol_format
+
+    name = protocol_format or DEFAULT_PROTOCOL_FORMAT
+    if name not in PROTOCOL_FORMATS:
+        raise ProtocolFormatError(f"Unknown protocol format: {name}")
+    return PROTOCOL_FORMATS[name]
+
+
+@dataclass
+class ProtocolPoints:
+    """Column arrays of protocol point entries."""
+    centers: np.ndarray  # (N, 2) crop centers
+    sizes: np.ndarray    # (N,) crop edge lengths
+    colors: List[str] = field(default_factory=list)
+    wells: List[str] = field(default_factory=list)
+    labels: List[str] = field(default_factory=list)
+    selection_ids: List[str] = field(default_factory=list)
+    cell_indices: List[int] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.sizes)
+
+    @property
+    def boxes(self) -> np.ndarray:
+        """(N, 4) square crop boxes (min_x, min_y, max_x, max_y)."""
+        half = self.sizes[:, None] / 2
+        return np.hstack([self.centers - half, self.centers + half])
+
+    def take(self, indices: Sequence[int]) -> 'ProtocolPoints':
+        """Return the points at the given positions, in that order."""
+        indices = np.asarray(indices, dtype=np.intp)
+        positions = indices.tolist()
+
+        def pick(values: List[Any]) -> List[Any]:
+            return [values[i] for i in positions] if values else []
+
+        return ProtocolPoints(
+            centers=self.centers[indices], sizes=self.sizes[indices],
+            colors=pick(self.colors), wells=pick(self.wells), labels=pick(self.labels),
+            selection_ids=pick(self.selection_ids), cell_indices=pick(self.cell_indices),
+        )
+
+    def group_by_selection(self) -> Dict[str, List[int]]:
+        """Point positions per selection id, in order of first appearance."""
+        groups: Dict[str, List[int]] = {}
+        for position, selection_id in enumerate(self.selection_ids):
+            groups.setdefault(selection_id, []).append(position)
+        return groups
+
+
+def selection_value(selection: Any, key: str, default: Any = None) -> Any:
+    """Read a field from a selection dictionary or Selection object."""
+    if isinstance(selection, dict):
+        return selection.get(key, default)
+    return getattr(selection, key, default)
+
+
+def protocol_image_fields(image_info: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Build the IMAGE section from image metadata.
+
+    Accepts either 'shape' or 'width'/'height', and 'file_path' or 'filename'.
+
+    Args:
+        image_info: Image metadata dictionary
+
+    Returns:
+        Ordered FILE, WIDTH, HEIGHT and FORMAT values
+    """
+    file_path = image_info.get('file_path') or ''
+    name = Path(file_path).stem if file_path else image_info.get('filename', 'unknown')
+
+    if 'shape' in image_info:
+        height, width = image_info['shape'][:2]
+    else:
+        width, height = image_info.get('width', 0), image_info.get('height', 0)
+
+    if file_path:
+        img_format = IMAGE_FORMATS.get(Path(file_path).suffix.lower(), 'TIF')
+    else:
+        img_format = IMAGE_FORMATS.get(f".{str(image_info.get('format', 'TIF')).lower()}", 'TIF')
+
+    return {'FILE': name, 'WIDTH': str(width), 'HEIGHT': str(height), 'FORMAT': img_format}
+
+
+def format_section(name: str, fields: Dict[str, object]) -> str:
+    """
+    Format an INI section the way ConfigParser.write does.
+
+    Args:
+        name: Section name
+        fields: Ordered key/value pairs
+
+    Returns:
+        Section text including the trailing blank line
+    """
+    lines = [f"[{name}]\n"]
+    lines.extend(f"{key} = {value}\n" for key, value in fields.items())
+    lines.append("\n")
+    return "".join(lines)
+
+
+def iter_point_chunks(boxes: np.ndarray, colors: Sequence[str], wells: Sequence[str],
+                      labels: Sequence[str], start_index: int = 1,
+                      chunk_size: int = PROTOCOL_CHUNK_SIZE,
+                      template: str = POINT_TEMPLATE) -> Iterator[str]:
+    """
+    Format point entries in chunks.
+
+    Args:
+        boxes: Array of shape (N, 4) with (min_x, min_y, max_x, max_y)
+        colors: N color strings (already normalized)
+        wells: N well positions
+        labels: N point labels
+        start_index: Number of the first point entry
+        chunk_size: Points per yielded chunk
+        template: Point entry format string
+
+    Yields:
+        Text blocks of up to chunk_size point entries
+    """
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+
+    for start in range(0, len(boxes), chunk_size):
+        stop = min(start + chunk_size, len(boxes))
+        rows = zip(
+            range(start_index + start, start_index + stop),
+            *boxes[start:stop].T.tolist(),
+            colors[start:stop], wells[start:stop], labels[start:stop]
+        )
+        yield "".join(template.format(*row) for row in rows)
+
+
+def write_atomic(output_path: Path, chunks: Iterable[str]) -> None:
+    """
+    Stream text chunks to a temporary file and rename it over the output.
+
+    Readers never observe a partially written protocol, and a failed write
+    leaves any previous file untouched.
+
+    Args:
+        output_path: Final file path
+        chunks: Text chunks to write in order
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Unique sibling name keeps the rename on one filesystem and default permissions
+    temp_path = output_path.with_name(f".{output_path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(temp_path, 'x', encoding='utf-8') as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(temp_path, output_path)
+    except BaseException:
+        try:
+            temp_path.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def create_backup(source_path: Path, backup_path: Path) -> Path:
+    """
+    Back up a finished file by hard link, falling back to a copy.
+
+    A hard link is safe because protocols are only ever replaced by
+    rename, never modified in place.
+
+    Args:
+        source_path: File to back up
+        backup_path: Backup file path
+
+    Returns:
+        The backup path
+    """
+    backup_path = Path(backup_path)
+    if backup_path.exists():
+        backup_path.unlink()
+
+    try:
+        os.link(source_path, backup_path)
+    except OSError:
+        # Cross-device, unsupported filesystem or permissions
+        shutil.copyfile(source_path, backup_path)
+
+    return backup_path
+
+
+def iter_protocol_chunks(image_fields: Dict[str, object], boxes: np.ndarray,
+                         colors: Sequence[str], wells: Sequence[str], labels: Sequence[str],
+                         protocol_format: Union[str, ProtocolFormat, None] = None,
+                         chunk_size: int = PROTOCOL_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Render a complete .cxprotocol file as text chunks.
+
+    Args:
+        image_fields: IMAGE section key/value pairs
+        boxes: Array of shape (N, 4) with stage (min_x, min_y, max_x, max_y)
+        colors: N '#RRGGBB' color strings
+        wells: N well positions
+        labels: N point labels
+        protocol_format: Output layout (see PROTOCOL_FORMATS)
+        chunk_size: Points formatted per chunk
+
+    Yields:
+        Text chunks in file order
+    """
+    layout = get_protocol_format(protocol_format)
+    layout_fields = {
+        'PositionOnly': '1',
+        'AfterBefore': '01',
+        'Points': str(len(boxes)),
+    }
+    colors = [layout.format_color(color) for color in colors]
+
+    yield format_section('IMAGE', layout.format_fields(image_fields))
+    # Points follow in the layout section
+    yield format_section('IMAGING_LAYOUT', layout.format_fields(layout_fields))[:-1]
+    yield from iter_point_chunks(boxes, colors, wells, labels,
+                                 chunk_size=chunk_size, template=layout.point_template)
+    yield "\n"
+
+
+def render_protocol(image_fields: Dict[str, object], points: ProtocolPoints,
+                    protocol_format: Union[str, ProtocolFormat, None] = None) -> str:
+    """
+    Render protocol points to .cxprotocol text.
+
+    Args:
+        image_fields: IMAGE section key/value pairs
+        points: Protocol point columns
+        protocol_format: Output layout (see PROTOCOL_FORMATS)
+
+    Returns:
+        Complete file content
+    """
+    return "".join(iter_protocol_chunks(
+        image_fields, points.boxes, points.colors, points.wells, points.labels, protocol_format
+    ))
+
+
+def write_protocol(output_path: Path, image_fields: Dict[str, object],
+                   boxes: np.ndarray, colors: Sequence[str], wells: Sequence[str],
+                   labels: Sequence[str], backup_path: Optional[Path] = None,
+                   chunk_size: int = PROTOCOL_CHUNK_SIZE,
+                   protocol_format: Union[str, ProtocolFormat, None] = None) -> Optional[Path]:
+    """
+    Write a complete .cxprotocol file.
+
+    Args:
+        output_path: Output file path
+        image_fields: IMAGE section key/value pairs
+        boxes: Array of shape (N, 4) with stage (min_x, min_y, max_x, max_y)
+        colors: N '#RRGGBB' color strings
+        wells: N well positions
+        labels: N point labels
+        backup_path: Optional backup file path
+        chunk_size: Points formatted per write call
+        protocol_format: Output layout (see PROTOCOL_FORMATS)
+
+    Returns:
+        Backup path if a backup was created, otherwise None
+    """
+    write_atomic(output_path, iter_protocol_chunks(
+        image_fields, boxes, colors, wells, labels, protocol_format, chunk_size
+    ))
+
+    if backup_path is not None:
+        return create_backup(output_path, backup_path)
+
+    return None
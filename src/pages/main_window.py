@@ -7,7 +7,7 @@ status bar, and dockable panels for the CellSorter application.
 Supports both traditional GUI mode and headless development mode.
 """
 
-from typing import Optional, Dict, Any, Union, List
+from typing import TYPE_CHECKING, Optional, Dict, Any, Union, List
 from pathlib import Path
 from datetime import datetime
 import platform
@@ -40,6 +40,7 @@ from config.settings import (
 from utils.error_handler import ErrorHandler, error_handler
 from utils.logging_config import LoggerMixin
 from services.theme_manager import ThemeManager
+from services.thumbnail_service import ThumbnailService
 from models.image_handler import ImageHandler
 from models.csv_parser import CSVParser
 from models.coordinate_transformer import CoordinateTransformer
@@ -48,11 +49,22 @@ from models.extractor import Extractor
 from components.widgets.scatter_plot import ScatterPlotWidget
 from components.widgets.selection_panel import SelectionPanel
 from components.widgets.minimap import MinimapWidget
-from components.dialogs.calibration_dialog import CalibrationDialog
-from components.dialogs.export_dialog import ExportDialog
-from components.dialogs.image_export_dialog import ImageExportDialog
-from components.dialogs.protocol_export_dialog import ProtocolExportDialog
-from components.dialogs.roi_management_dialog import ROIManagementDialog, CellRowData
+from utils.lazy_import import lazy_getattr
+
+if TYPE_CHECKING:
+    from components.dialogs.calibration_dialog import CalibrationDialog
+    from components.dialogs.roi_management_dialog import ROIManagementDialog, CellRowData
+
+# Dialogs are imported when first opened, so they do not delay the main window
+__getattr__ = lazy_getattr(__name__, globals(), {
+    'CalibrationDialog': 'components.dialogs.calibration_dialog',
+    'ExportDialog': 'components.dialogs.export_dialog',
+    'ImageExportDialog': 'components.dialogs.image_export_dialog',
+    'ProtocolExportDialog': 'components.dialogs.protocol_export_dialog',
+    'ROIManagementDialog': 'components.dialogs.roi_management_dialog',
+    'CellRowData': 'components.dialogs.roi_management_dialog',
+    'CellMetadataView': 'components.widgets.row_cell_manager',
+})
 
 
 class MainWindow(QMainWindow, LoggerMixin):
@@ -102,8 +114,11 @@ class MainWindow(QMainWindow, LoggerMixin):
         # Initialize minimap widget
         self.minimap_widget = MinimapWidget(self)
         
+        # Shared cell thumbnail generation and cache
+        self.thumbnail_service = ThumbnailService(parent=self)
+        
         # ROI Management Dialog
-        self.roi_management_dialog: Optional[ROIManagementDialog] = None
+        self.roi_management_dialog: Optional['ROIManagementDialog'] = None
         
         # UI setup
         self.setup_ui()
@@ -513,6 +528,7 @@ class MainWindow(QMainWindow, LoggerMixin):
             return
         
         # Show export dialog
+        ExportDialog = __getattr__('ExportDialog')
         export_dialog = ExportDialog(self)
         if export_dialog.exec() == QDialog.Accepted:
             self.export_requested.emit()
@@ -598,6 +614,7 @@ class MainWindow(QMainWindow, LoggerMixin):
             image_info['filename'] = "Unknown"
         
         # Create and show dialog
+        ProtocolExportDialog = __getattr__('ProtocolExportDialog')
         dialog = ProtocolExportDialog(
             selections_dict,
             self.image_handler.image_data,
@@ -651,6 +668,7 @@ class MainWindow(QMainWindow, LoggerMixin):
                     bounding_boxes.append(bbox)
         
         # Create and show dialog
+        ImageExportDialog = __getattr__('ImageExportDialog')
         dialog = ImageExportDialog(
             selections_dict,
             self.image_handler.image_data,
@@ -852,6 +870,9 @@ class MainWindow(QMainWindow, LoggerMixin):
         # Save settings
         self.save_settings()
         
+        # Stop background thumbnail generation
+        self.thumbnail_service.shutdown()
+        
         # Accept close event
         self.log_info("CellSorter application closing")
         event.accept()
@@ -864,6 +885,9 @@ class MainWindow(QMainWindow, LoggerMixin):
         self.enable_image_actions()
         self.log_info(f"Image successfully loaded: {file_path}")
         
+        # New source for cell thumbnails
+        self.thumbnail_service.set_image(self.image_handler.image_data, file_path)
+        
         # Update minimap with loaded image
         if self.image_handler.image_data is not None:
             # Use the shared method from ImageHandler
@@ -919,7 +943,7 @@ class MainWindow(QMainWindow, LoggerMixin):
         """Handle cell selection from scatter plot."""
         # Skip creating new selections for programmatic highlights (avoid infinite loops)
         if method == "programmatic_selection":
-            self.log_info(f"Skipping selection creation for programmatic highlight: {len(indices)} cells")
+            self.log_debug(f"Skipping selection creation for programmatic highlight: {len(indices)} cells")
             return
             
         if indices:
@@ -1160,6 +1184,7 @@ class MainWindow(QMainWindow, LoggerMixin):
                 self._current_calibration_dialog = None
         
         # Show NON-MODAL dialog to enter stage coordinates for FIRST point only
+        CalibrationDialog = __getattr__('CalibrationDialog')
         dialog = CalibrationDialog(image_x, image_y, point_label, self, self.coordinate_transformer)
         
         # Store dialog reference to prevent garbage collection
@@ -1174,7 +1199,7 @@ class MainWindow(QMainWindow, LoggerMixin):
         
         self.update_status(f"First calibration point set at ({image_x}, {image_y}). Click a second point on the image.")
 
-    def _on_calibration_dialog_accepted(self, dialog: CalibrationDialog, image_x: int, image_y: int, point_label: str) -> None:
+    def _on_calibration_dialog_accepted(self, dialog: 'CalibrationDialog', image_x: int, image_y: int, point_label: str) -> None:
         """Handle calibration dialog accepted (non-modal)."""
         # Get calibration data from the dialog (which may have both points)
         calibration_data = dialog.get_calibration_data()
@@ -1216,7 +1241,7 @@ class MainWindow(QMainWindow, LoggerMixin):
         self._current_calibration_dialog = None
         dialog.deleteLater()
 
-    def _on_calibration_dialog_rejected(self, dialog: CalibrationDialog) -> None:
+    def _on_calibration_dialog_rejected(self, dialog: 'CalibrationDialog') -> None:
         """Handle calibration dialog rejected (non-modal)."""
         # Remove the point from image handler if dialog was cancelled
         if hasattr(self.image_handler, 'calibration_points'):
@@ -1271,16 +1296,17 @@ class MainWindow(QMainWindow, LoggerMixin):
                 return
 
             # Create CellRowData for the dialog
-            from components.widgets.row_cell_manager import CellRowData
             row_data = self._create_cell_row_data(selection_id, selection_data)
 
             # Create a new ROI management dialog
+            ROIManagementDialog = __getattr__('ROIManagementDialog')
             self.roi_management_dialog = ROIManagementDialog(
                 parent=self,
                 row_data=row_data,
                 image_handler=self.image_handler,
                 csv_parser=self.csv_parser,
-                coordinate_transformer=self.coordinate_transformer
+                coordinate_transformer=self.coordinate_transformer,
+                thumbnail_service=self.thumbnail_service
             )
 
             # Connect signals
@@ -1337,19 +1363,17 @@ class MainWindow(QMainWindow, LoggerMixin):
         self.image_handler.center_on(image_x, image_y)
         self.log_info(f"Navigated to cell {cell_index} at image coordinates ({image_x}, {image_y})")
 
-    def _create_cell_row_data(self, selection_id: str, selection_data: Dict[str, Any]) -> CellRowData:
+    def _create_cell_row_data(self, selection_id: str, selection_data: Dict[str, Any]) -> 'CellRowData':
         """Helper to create CellRowData for the ROI dialog."""
         cell_indices = selection_data.cell_indices
         all_data = self.csv_parser.data
         
-        # Extract metadata for the selected cells
+        # Metadata rows are read from the table only when the dialog displays them
         cell_metadata = {}
-        if not all_data.empty:
-            row_metadata = all_data.loc[cell_indices]
-            # Convert to a dictionary of dictionaries
-            cell_metadata = {index: data.to_dict() for index, data in row_metadata.iterrows()}
+        if all_data is not None and not all_data.empty:
+            cell_metadata = __getattr__('CellMetadataView').from_table(all_data, cell_indices)
 
-        return CellRowData(
+        return __getattr__('CellRowData')(
             selection_id=selection_id,
             selection_label=selection_data.label,
             selection_color=selection_data.color,
@@ -2,8 +2,18 @@
 Services module for CellSorter application.
 
 Contains business logic and service layer components.
+
+The Qt-based services are imported on first access, so the headless
+batch processor can run in worker processes without loading PySide6.
 """
 
-from .theme_manager import ThemeManager
+from utils.lazy_import import lazy_getattr
+
+__getattr__ = lazy_getattr(__name__, globals(), {
+    'StyleRegistry': '.style_registry',
+    'ThemeManager': '.theme_manager',
+    'ThumbnailService': '.thumbnail_service',
+})
+
 
-__all__ = ['ThemeManager']
\ No newline at end of file
+__all__ = ['StyleRegistry', 'ThemeManager', 'ThumbnailService']
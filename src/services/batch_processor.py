@@ -0,0 +1,662 @@
+"""
+Batch Processor for CellSorter Application
+
+Headless protocol generation for many slides. A manifest lists slides
+(image, CellProfiler CSV, calibration and selection rules); each slide runs
+parse -> filter -> select -> crop/transform -> .cxprotocol, optionally
+followed by a crop export, in a worker process. Workers only use the
+Qt-free core package, so PySide6 is never imported and no event loop is
+needed; every stage is timed for the batch report.
+
+Manifest layout (JSON or YAML; paths are relative to the manifest):
+
+    output_dir: results
+    defaults:
+      calibration: calibration.json
+      filter: "AreaShape_Area > 50"
+      selections:
+        - {label: Large, expression: "AreaShape_Area > 500", well: A01}
+      crops: zip
+    slides:
+      - {image: slide01.tif, csv: slide01.csv}
+      - {name: slide02, image: slide02.tif, csv: slide02.csv, crops: null}
+"""
+
+import ast
+import csv
+import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from PIL import Image
+
+from config.settings import REQUIRED_CSV_COLUMNS
+from core.calibration import CalibrationModel, CalibrationPoint
+from core.extraction import ExtractionModel
+from core.image_loader import load_image_file
+from core.selections import SelectionModel
+from models.image_exporter import export_cell_crops, export_crop_container
+from utils.exceptions import CalibrationError, CSVParseError, ConfigurationError, SelectionError
+from utils.expression_parser import ExpressionParser
+from utils.logging_config import get_logger
+
+
+logger = get_logger(__name__)
+
+# Bounding box columns in (min_x, min_y, max_x, max_y) order
+BOUNDING_BOX_COLUMNS = [
+    'AreaShape_BoundingBoxMinimum_X',
+    'AreaShape_BoundingBoxMinimum_Y',
+    'AreaShape_BoundingBoxMaximum_X',
+    'AreaShape_BoundingBoxMaximum_Y',
+]
+
+# Stages timed for every slide, in pipeline order
+BATCH_STAGES = ('parse', 'filter', 'select', 'calibrate', 'points', 'protocol', 'crops')
+
+# Worker processes are replaced after this many slides, returning the memory
+# held by large slide images to the system
+SLIDES_PER_WORKER = 25
+
+# Crop export layouts: one JPEG per cell or one of the image_exporter containers
+CROP_LAYOUTS = ('files', 'zip', 'tiff', 'montage')
+
+# Report file names written to the batch output directory
+REPORT_JSON = 'batch_report.json'
+REPORT_CSV = 'batch_report.csv'
+
+
+@dataclass
+class SelectionRule:
+    """Gating rule producing one selection (one protocol well) per slide."""
+    label: str
+    expression: str = ''  # Evaluated on the filtered table; empty selects every filtered cell
+    cell_indices: Optional[List[int]] = None  # Explicit cells instead of an expression
+    color: str = ''
+    well_position: str = ''
+    max_cells: Optional[int] = None  # Keep only the first N matching cells
+
+
+@dataclass
+class SlideJob:
+    """One slide of a batch, with every path resolved."""
+    name: str
+    image_path: str
+    csv_path: str
+    output_dir: str
+    calibration: Dict[str, Any]
+    selections: List[SelectionRule]
+    filter: str = ''
+    protocol_format: Optional[str] = None
+    combined: bool = False
+    crops: Optional[str] = None  # One of CROP_LAYOUTS, or None for no crop export
+    crop_quality: int = 95
+    threads: int = 1  # Writer/encoder threads inside the slide's process
+
+
+@dataclass
+class BatchManifest:
+    """Slides of a batch and the directory receiving their outputs and the report."""
+    output_dir: str
+    slides: List[SlideJob]
+
+
+@dataclass
+class SlideResult:
+    """Outcome and stage timings of one slide."""
+    name: str
+    status: str = 'ok'  # 'ok', 'failed' or 'cancelled'
+    error: str = ''
+    cells: int = 0
+    filtered_cells: int = 0
+    selected_cells: int = 0
+    points: int = 0
+    protocols: List[str] = field(default_factory=list)
+    crops_exported: int = 0
+    timings: Dict[str, float] = field(default_factory=dict)
+    total_seconds: float = 0.0
+    worker_pid: int = 0
+
+    @property
+    def succeeded(self) -> bool:
+        """Whether the slide finished without errors."""
+        return self.status == 'ok'
+
+    def to_row(self) -> Dict[str, Any]:
+        """Flat report row with one column per stage."""
+        row = {
+            'name': self.name,
+            'status': self.status,
+            'cells': self.cells,
+            'filtered_cells': self.filtered_cells,
+            'selected_cells': self.selected_cells,
+            'points': self.points,
+            'protocols': len(self.protocols),
+            'crops_exported': self.crops_exported,
+        }
+        row.update({f'{stage}_seconds': round(self.timings.get(stage, 0.0), 4) for stage in BATCH_STAGES})
+        row.update({
+            'total_seconds': round(self.total_seconds, 4),
+            'worker_pid': self.worker_pid,
+            'error': self.error,
+        })
+        return row
+
+
+@dataclass
+class BatchReport:
+    """Results of a batch run in manifest order."""
+    slides: List[SlideResult]
+    wall_seconds: float
+    workers: int
+
+    @property
+    def succeeded(self) -> List[SlideResult]:
+        return [slide for slide in self.slides if slide.succeeded]
+
+    @property
+    def failed(self) -> List[SlideResult]:
+        return [slide for slide in self.slides if slide.status == 'failed']
+
+    def summary(self) -> Dict[str, Any]:
+        """Totals and per-stage time summed over all slides."""
+        finished = [slide for slide in self.slides if slide.status != 'cancelled']
+        return {
+            'slides': len(self.slides),
+            'succeeded': len(self.succeeded),
+            'failed': len(self.failed),
+            'cancelled': len(self.slides) - len(finished),
+            'workers': self.workers,
+            'wall_seconds': round(self.wall_seconds, 3),
+            'slide_seconds': round(sum(slide.total_seconds for slide in finished), 3),
+            'slides_per_minute': round(len(finished) / self.wall_seconds * 60, 2) if self.wall_seconds else 0.0,
+            'points': sum(slide.points for slide in self.slides),
+            'stage_seconds': {
+                stage: round(sum(slide.timings.get(stage, 0.0) for slide in finished), 3)
+                for stage in BATCH_STAGES
+            },
+        }
+
+    def write(self, output_dir: Union[str, Path]) -> Tuple[Path, Path]:
+        """
+        Write the timing report as JSON (summary and slides) and CSV (one row per slide).
+
+        Args:
+            output_dir: Directory receiving the report files
+
+        Returns:
+            Paths of the JSON and CSV reports
+        """
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        json_path, csv_path = output_dir / REPORT_JSON, output_dir / REPORT_CSV
+
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump({'summary': self.summary(), 'slides': [asdict(slide) for slide in self.slides]},
+                      f, indent=2)
+
+        rows = [slide.to_row() for slide in self.slides]
+        with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(SlideResult(name='').to_row()))
+            writer.writeheader()
+            writer.writerows(rows)
+
+        return json_path, csv_path
+
+
+def load_manifest(manifest_path: Union[str, Path],
+                  output_dir: Optional[Union[str, Path]] = None) -> BatchManifest:
+    """
+    Read a batch manifest from a JSON or YAML file.
+
+    Args:
+        manifest_path: Manifest file
+        output_dir: Overrides the manifest's output_dir
+
+    Returns:
+        Parsed manifest
+    """
+    manifest_path = Path(manifest_path)
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            if manifest_path.suffix.lower() in ('.yaml', '.yml'):
+                import yaml
+                data = yaml.safe_load(f)
+            else:
+                data = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ConfigurationError(f"Failed to read batch manifest {manifest_path}: {e}")
+
+    return parse_manifest(data, manifest_path.parent, output_dir)
+
+
+def parse_manifest(data: Dict[str, Any], base_dir: Union[str, Path] = '.',
+                   output_dir: Optional[Union[str, Path]] = None) -> BatchManifest:
+    """
+    Build slide jobs from manifest data.
+
+    Each slide inherits every key of 'defaults' it does not set itself.
+    Calibration may be given inline or as a path to a JSON file saved by
+    CalibrationModel.export_calibration.
+
+    Args:
+        data: Manifest dictionary with 'slides' and optional 'defaults'/'output_dir'
+        base_dir: Directory that relative paths are resolved against
+        output_dir: Overrides the manifest's output_dir
+
+    Returns:
+        Parsed manifest with slides in manifest order
+    """
+    if not isinstance(data, dict) or not isinstance(data.get('slides'), list):
+        raise ConfigurationError("Batch manifest needs a 'slides' list")
+
+    base_dir = Path(base_dir)
+    defaults = data.get('defaults') or {}
+    output_root = Path(output_dir) if output_dir is not None else base_dir / data.get('output_dir', 'batch_output')
+    calibration_files: Dict[Path, Dict[str, Any]] = {}
+    jobs, names = [], set()
+
+    for position, slide in enumerate(data['slides'], 1):
+        spec = {**defaults, **slide}
+        for key in ('image', 'csv'):
+            if not spec.get(key):
+                raise ConfigurationError(f"Slide {position} has no '{key}'")
+
+        name = str(spec.get('name') or Path(spec['image']).stem)
+        if name in names:
+            raise ConfigurationError(f"Duplicate slide name: {name}")
+        names.add(name)
+
+        calibration = spec.get('calibration')
+        if isinstance(calibration, str):
+            calibration_path = base_dir / calibration
+            if calibration_path not in calibration_files:
+                try:
+                    with open(calibration_path, 'r', encoding='utf-8') as f:
+                        calibration_files[calibration_path] = json.load(f)
+                except (OSError, ValueError) as e:
+                    raise ConfigurationError(f"Failed to read calibration {calibration_path}: {e}")
+            calibration = calibration_files[calibration_path]
+        if not isinstance(calibration, dict):
+            raise ConfigurationError(f"Slide {name} has no calibration")
+
+        selections = [_selection_rule(rule, index) for index, rule in enumerate(spec.get('selections') or [], 1)]
+        if not selections:
+            raise ConfigurationError(f"Slide {name} has no selections")
+
+        crops = spec.get('crops')
+        if crops is not None and crops not in CROP_LAYOUTS:
+            raise ConfigurationError(f"Unknown crop layout for slide {name}: {crops}")
+
+        jobs.append(SlideJob(
+            name=name,
+            image_path=str(base_dir / spec['image']),
+            csv_path=str(base_dir / spec['csv']),
+            output_dir=str(output_root / name),
+            calibration=calibration,
+            selections=selections,
+            filter=spec.get('filter') or '',
+            protocol_format=spec.get('protocol_format'),
+            combined=bool(spec.get('combined', False)),
+            crops=crops,
+            crop_quality=int(spec.get('crop_quality', 95)),
+            threads=int(spec.get('threads', 1)),
+        ))
+
+    return BatchManifest(output_dir=str(output_root), slides=jobs)
+
+
+def _selection_rule(rule: Dict[str, Any], index: int) -> SelectionRule:
+    """Convert a manifest selection entry to a SelectionRule."""
+    if not isinstance(rule, dict):
+        raise ConfigurationError(f"Selection {index} must be a mapping")
+    return SelectionRule(
+        label=str(rule.get('label') or f"Selection_{index}"),
+        expression=rule.get('expression') or '',
+        cell_indices=[int(i) for i in rule['cell_indices']] if rule.get('cell_indices') is not None else None,
+        color=rule.get('color') or '',
+        well_position=rule.get('well') or rule.get('well_position') or '',
+        max_cells=rule.get('max_cells'),
+    )
+
+
+def expression_columns(expressions: Iterable[str], columns: Iterable[str]) -> Set[str]:
+    """
+    Table columns referenced by gating expressions.
+
+    Args:
+        expressions: Filter and selection expressions
+        columns: Available column names
+
+    Returns:
+        Referenced column names
+    """
+    columns = list(columns)
+    available = set(columns)
+    parser = ExpressionParser()
+    used = set()
+    for expression in expressions:
+        if expression:
+            tree = parser.parse_expression(expression, columns)
+            used.update(node.id for node in ast.walk(tree)
+                        if isinstance(node, ast.Name) and node.id in available)
+    return used
+
+
+def read_cell_table(csv_path: Union[str, Path], expressions: Iterable[str] = ()) -> pd.DataFrame:
+    """
+    Read the columns of a CellProfiler CSV that a slide needs.
+
+    Only bounding box columns and columns referenced by the expressions are
+    parsed; CellProfiler exports often have hundreds of measurement columns.
+    Row positions are the cell indices, as in the GUI.
+
+    Args:
+        csv_path: CSV file
+        expressions: Filter and selection expressions
+
+    Returns:
+        Cell table
+    """
+    csv_path = Path(csv_path)
+    if not csv_path.exists():
+        raise CSVParseError(f"File not found: {csv_path}")
+
+    try:
+        header = pd.read_csv(csv_path, nrows=0).columns
+        missing = [column for column in REQUIRED_CSV_COLUMNS if column not in header]
+        if missing:
+            raise CSVParseError(f"Missing required columns in {csv_path.name}: {missing}")
+
+        used = set(BOUNDING_BOX_COLUMNS) | expression_columns(expressions, header)
+        return pd.read_csv(csv_path, usecols=[column for column in header if column in used],
+                           low_memory=False)
+    except UnicodeDecodeError:
+        return pd.read_csv(csv_path, encoding='latin-1', low_memory=False)
+    except (pd.errors.ParserError, pd.errors.EmptyDataError) as e:
+        raise CSVParseError(f"Failed to parse {csv_path.name}: {e}")
+
+
+def evaluate_mask(parser: ExpressionParser, expression: str, table: pd.DataFrame) -> np.ndarray:
+    """Evaluate a gating expression to one boolean per cell."""
+    result = parser.evaluate_expression(expression, table)
+    if result.error_message:
+        raise SelectionError(f"{expression!r}: {result.error_message}")
+    mask = np.asarray(result.value)
+    if mask.dtype != np.bool_:
+        raise SelectionError(f"{expression!r} does not evaluate to a condition")
+    return np.broadcast_to(mask, (len(table),))
+
+
+def filter_cells(table: pd.DataFrame, expression: str = '',
+                 parser: Optional[ExpressionParser] = None) -> np.ndarray:
+    """
+    Evaluate the slide filter.
+
+    Args:
+        table: Cell table
+        expression: Condition every selected cell must meet; empty keeps all cells
+        parser: Expression parser to reuse
+
+    Returns:
+        Boolean mask of cells passing the filter
+    """
+    if not expression:
+        return np.ones(len(table), dtype=bool)
+    return evaluate_mask(parser or ExpressionParser(), expression, table)
+
+
+def select_cells(table: pd.DataFrame, rules: List[SelectionRule], keep: Optional[np.ndarray] = None,
+                 parser: Optional[ExpressionParser] = None) -> List[Dict[str, Any]]:
+    """
+    Apply gating rules to the filtered cells of a table.
+
+    Colors and wells not given by a rule are assigned in SelectionModel
+    order, skipping wells claimed explicitly by other rules.
+
+    Args:
+        table: Cell table
+        rules: Gating rules, one per selection
+        keep: Filter mask from filter_cells; None keeps all cells
+        parser: Expression parser to reuse
+
+    Returns:
+        Selection dictionaries accepted by ExtractionModel
+    """
+    parser = parser or ExpressionParser()
+    if keep is None:
+        keep = np.ones(len(table), dtype=bool)
+
+    claimed = {rule.well_position for rule in rules if rule.well_position}
+    free_wells = (well for well in SelectionModel.WELL_LAYOUT if well not in claimed)
+    palette = SelectionModel.COLOR_PALETTE
+
+    selections = []
+    for index, rule in enumerate(rules):
+        if rule.cell_indices is not None:
+            indices = np.asarray(rule.cell_indices, dtype=np.int64)
+            indices = indices[(indices >= 0) & (indices < len(table))]
+            indices = indices[keep[indices]]
+        else:
+            mask = keep & evaluate_mask(parser, rule.expression, table) if rule.expression else keep
+            indices = np.flatnonzero(mask)
+        if rule.max_cells is not None:
+            indices = indices[:rule.max_cells]
+
+        selections.append({
+            'id': f"selection_{index + 1}",
+            'label': rule.label,
+            'color': rule.color or palette[index % len(palette)],
+            'well_position': rule.well_position or next(free_wells, ''),
+            'cell_indices': indices.tolist(),
+        })
+
+    return selections
+
+
+def load_calibration(calibration: Dict[str, Any]):
+    """
+    Create a calibrated CalibrationModel from calibration data.
+
+    Accepts the dictionary written by CalibrationModel.export_calibration
+    or a plain 'calibration_points' list with an optional
+    'transformation_model' to fit.
+
+    Args:
+        calibration: Calibration data
+
+    Returns:
+        Calibrated CalibrationModel
+    """
+    transformer = CalibrationModel()
+    if calibration.get('transform_matrix'):
+        calibrated = transformer.import_calibration(calibration)
+    else:
+        transformer.max_calibration_points = None
+        transformer.warp_method = calibration.get('warp_method')
+        points = [
+            CalibrationPoint(p['pixel_x'], p['pixel_y'], p['stage_x'], p['stage_y'], p.get('label', ''))
+            for p in calibration.get('calibration_points', [])
+        ]
+        calibrated = transformer.set_calibration_points(points, calibration.get('transformation_model'))
+
+    if not calibrated or not transformer.is_calibrated():
+        raise CalibrationError("Calibration could not be applied")
+    return transformer
+
+
+def image_size(image_path: Union[str, Path]) -> Tuple[int, int]:
+    """Image (width, height), read from the file header without decoding pixels."""
+    with Image.open(image_path) as image:
+        return image.size
+
+
+def read_image(image_path: Union[str, Path]) -> np.ndarray:
+    """Decode an image to an RGB or grayscale array with the GUI's loader."""
+    image, _ = load_image_file(str(image_path))
+    return image
+
+
+def process_slide(job: SlideJob) -> SlideResult:
+    """
+    Run the full pipeline for one slide.
+
+    Errors are recorded in the result instead of raised, so one bad slide
+    does not stop the batch.
+
+    Args:
+        job: Slide job
+
+    Returns:
+        Slide result with stage timings
+    """
+    result = SlideResult(name=job.name, worker_pid=os.getpid())
+    started = time.perf_counter()
+    stage_started = started
+
+    def finish_stage(stage: str) -> None:
+        nonlocal stage_started
+        now = time.perf_counter()
+        result.timings[stage] = now - stage_started
+        stage_started = now
+
+    try:
+        parser = ExpressionParser()
+        expressions = [job.filter] + [rule.expression for rule in job.selections]
+        table = read_cell_table(job.csv_path, expressions)
+        bounding_boxes = np.trunc(table[BOUNDING_BOX_COLUMNS].to_numpy(dtype=np.float64))
+        width, height = image_size(job.image_path)
+        result.cells = len(table)
+        finish_stage('parse')
+
+        keep = filter_cells(table, job.filter, parser)
+        result.filtered_cells = int(keep.sum())
+        finish_stage('filter')
+
+        selections = select_cells(table, job.selections, keep, parser)
+        selections = [selection for selection in selections if selection['cell_indices']]
+        result.selected_cells = sum(len(selection['cell_indices']) for selection in selections)
+        finish_stage('select')
+        if not selections:
+            raise SelectionError("No cells matched any selection")
+
+        transformer = load_calibration(job.calibration)
+        finish_stage('calibrate')
+
+        extractor = ExtractionModel()
+        points = extractor.compute_protocol_points(selections, bounding_boxes, transformer, (width, height))
+        if points is None:
+            raise CalibrationError("Failed to convert cell coordinates to stage coordinates")
+        result.points = len(points)
+        finish_stage('points')
+
+        image_info = {'file_path': job.image_path, 'width': width, 'height': height}
+        paths = extractor.export_protocol_batch(
+            selections, bounding_boxes, transformer, job.output_dir, image_info,
+            image_bounds=(width, height), combined=job.combined,
+            protocol_format=job.protocol_format, max_workers=job.threads
+        )
+        result.protocols = [str(path) for path in paths]
+        finish_stage('protocol')
+
+        if job.crops:
+            image_data = read_image(job.image_path)
+            crops_dir = Path(job.output_dir) / 'crops'
+            for selection in selections:
+                label = re.sub(r'[^\w\-]+', '_', f"{selection['well_position']}_{selection['label']}").strip('_')
+                if job.crops == 'files':
+                    counts = export_cell_crops(image_data, bounding_boxes, selection['cell_indices'],
+                                               crops_dir / label, label, max_workers=job.threads,
+                                               quality=job.crop_quality)
+                else:
+                    counts = export_crop_container(image_data, bounding_boxes, selection['cell_indices'],
+                                                   crops_dir, label, container=job.crops,
+                                                   max_workers=job.threads, quality=job.crop_quality)
+                result.crops_exported += counts['exported']
+            finish_stage('crops')
+
+    except Exception as e:
+        result.status = 'failed'
+        result.error = f"{type(e).__name__}: {e}"
+        logger.error(f"Batch slide {job.name} failed: {result.error}")
+
+    result.total_seconds = time.perf_counter() - started
+    return result
+
+
+def run_batch(jobs: List[SlideJob], workers: Optional[int] = None,
+              progress_callback: Optional[Callable[[int, int, SlideResult], None]] = None,
+              cancel_event: Optional[threading.Event] = None) -> BatchReport:
+    """
+    Process slides in a pool of worker processes.
+
+    With workers=1 slides run in the calling process, which is convenient
+    for debugging and profiling.
+
+    Args:
+        jobs: Slide jobs
+        workers: Worker process count (defaults to the CPU count)
+        progress_callback: Called with (slides_done, slides_total, result) as slides finish
+        cancel_event: Set to skip slides that have not started yet
+
+    Returns:
+        Batch report in job order; skipped slides have status 'cancelled'
+    """
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs) or 1))
+    results: List[Optional[SlideResult]] = [None] * len(jobs)
+    started = time.perf_counter()
+    logger.info(f"Batch started: {len(jobs)} slides, {workers} workers")
+
+    def record(position: int, result: SlideResult) -> None:
+        results[position] = result
+        if progress_callback is not None:
+            progress_callback(sum(r is not None for r in results), len(jobs), result)
+
+    if workers == 1:
+        for position, job in enumerate(jobs):
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            record(position, process_slide(job))
+    else:
+        # Recycling workers needs Python 3.11; earlier versions keep them for the whole batch
+        options = {'max_tasks_per_child': SLIDES_PER_WORKER} if sys.version_info >= (3, 11) else {}
+        with ProcessPoolExecutor(max_workers=workers, **options) as executor:
+            futures = {executor.submit(process_slide, job): position for position, job in enumerate(jobs)}
+            try:
+                for future in as_completed(futures):
+                    position = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        # The worker process died (e.g. out of memory)
+                        result = SlideResult(name=jobs[position].name, status='failed',
+                                             error=f"{type(e).__name__}: {e}")
+                    record(position, result)
+                    if cancel_event is not None and cancel_event.is_set():
+                        break
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
+            # Slides already running when cancelled still finish
+            for future, position in futures.items():
+                if results[position] is None and future.done() and not future.cancelled() \
+                        and future.exception() is None:
+                    results[position] = future.result()
+
+    report = BatchReport(
+        slides=[result or SlideResult(name=job.name, status='cancelled') for job, result in zip(jobs, results)],
+        wall_seconds=time.perf_counter() - started,
+        workers=workers,
+    )
+    summary = report.summary()
+    logger.info(f"Batch finished: {summary['succeeded']} succeeded, {summary['failed']} failed, "
+                f"{summary['cancelled']} cancelled in {summary['wall_seconds']:.1f}s")
+    return report
@@ -0,0 +1,144 @@
+"""
+CellSorter Style Registry
+
+Application-level stylesheet rules shared by many widgets of the same kind.
+Calling setStyleSheet on every table row or well button makes Qt parse and
+polish a stylesheet per widget. Instead, a component module registers its
+rules at import, keyed by object name and dynamic properties, and the
+widgets only carry an object name or property. State changes flip a
+property with set_style_property instead of replacing the stylesheet:
+
+    register_style('well-button', '''
+        QPushButton[role="well"] { border-radius: 16px; }
+        QPushButton[role="well"][state="assigned"] { background-color: var(--primary); }
+    ''')
+
+    class WellPlate(QWidget):
+        def __init__(self):
+            ...
+            style_registry().ensure_applied()
+            button.setProperty("role", "well")
+            set_style_property(button, "state", "assigned")
+
+Changing the application stylesheet repolishes every existing widget, so
+rules should be registered at import, before the widgets using them exist.
+"""
+
+from typing import Any, Dict, Optional
+
+from PySide6.QtWidgets import QApplication, QWidget
+
+from utils.logging_config import LoggerMixin
+from utils.style_converter import convert_css_to_qt
+
+
+class StyleRegistry(LoggerMixin):
+    """
+    Composes the application stylesheet from the theme and registered rules.
+
+    The theme stylesheet comes first, so registered rules of equal
+    specificity take precedence over it.
+    """
+
+    def __init__(self):
+        self._rules: Dict[str, str] = {}  # key -> CSS, compiled when applied
+        self._theme_stylesheet: Optional[str] = None
+        self._app: Optional[QApplication] = None
+        self._dirty = False
+
+    def register(self, key: str, css: str) -> bool:
+        """
+        Register application-level rules once.
+
+        The application stylesheet is updated right away if an application
+        exists, otherwise by the theme or the next ensure_applied().
+
+        Args:
+            key: Unique name of the rule group, usually the component's
+            css: Stylesheet rules, may use var(--name) color variables
+
+        Returns:
+            True if the rules were new
+        """
+        if key in self._rules:
+            return False
+
+        self._rules[key] = css
+        self._dirty = True
+        self._apply()
+        return True
+
+    def ensure_applied(self) -> None:
+        """Apply rules registered before the application existed (cheap when up to date)."""
+        if self._dirty:
+            self._apply()
+
+    def is_registered(self, key: str) -> bool:
+        """Check whether a rule group has been registered."""
+        return key in self._rules
+
+    def set_theme_stylesheet(self, stylesheet: str, app: Optional[QApplication] = None) -> None:
+        """
+        Replace the theme part of the application stylesheet (ThemeManager).
+
+        Args:
+            stylesheet: Theme stylesheet
+            app: Application to style, defaults to QApplication.instance()
+        """
+        self._theme_stylesheet = stylesheet
+        if app is not None:
+            self._app = app
+        self._apply()
+
+    def stylesheet(self) -> str:
+        """The composed application stylesheet, with the rules compiled for the current theme."""
+        parts = [self._theme_stylesheet or ''] + [convert_css_to_qt(css) for css in self._rules.values()]
+        return "\n".join(part for part in parts if part)
+
+    def _apply(self) -> None:
+        app = self._app or QApplication.instance()
+        if app is None:
+            return
+
+        if self._theme_stylesheet is None:
+            # No ThemeManager yet: keep whatever the application already has
+            self._theme_stylesheet = app.styleSheet()
+
+        app.setStyleSheet(self.stylesheet())
+        self._dirty = False
+        self.log_debug(f"Application stylesheet updated ({len(self._rules)} registered rule groups)")
+
+
+_registry = StyleRegistry()
+
+
+def style_registry() -> StyleRegistry:
+    """Get the application style registry."""
+    return _registry
+
+
+def register_style(key: str, css: str) -> bool:
+    """Register application-level rules once; see StyleRegistry.register."""
+    return _registry.register(key, css)
+
+
+def set_style_property(widget: QWidget, name: str, value: Any) -> bool:
+    """
+    Set a dynamic property used by stylesheet selectors and repolish the widget.
+
+    Args:
+        widget: Widget to update
+        name: Property name, e.g. "state"
+        value: New property value
+
+    Returns:
+        True if the value changed (the widget was repolished)
+    """
+    if widget.property(name) == value:
+        return False
+
+    widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    return True
@@ -23,7 +23,10 @@ except ImportError:
     QColor = object
 
 from utils.logging_config import LoggerMixin
-from utils.style_converter import convert_css_to_qt, get_shadcn_color_variables, hsl_string_to_rgb
+from services.style_registry import style_registry
+from utils.style_converter import (
+    convert_css_to_qt, get_shadcn_color_variables, hsl_string_to_rgb, invalidate_stylesheet_cache
+)
 
 
 class ThemeManager(QObject, LoggerMixin):
@@ -76,6 +79,8 @@ class ThemeManager(QObject, LoggerMixin):
         # Single light theme only
         self.current_theme = "light"
         self.settings.setValue("theme", "light")
+        # Hex values of COLORS_LIGHT and MEDICAL_COLORS, resolved on first lookup
+        self._resolved_colors: Dict[str, str] = {}
         
         # Apply light theme immediately
         self.apply_theme("light")
@@ -95,6 +100,7 @@ class ThemeManager(QObject, LoggerMixin):
         else:
             theme_name = "light"
             self.apply_custom_theme(theme_name)
+        self._invalidate_compiled_styles()
         self.current_theme = theme_name
         self.settings.setValue("theme", theme_name)
         self.theme_changed.emit(theme_name)
@@ -113,7 +119,7 @@ class ThemeManager(QObject, LoggerMixin):
                         colors[k] = 'hsl(0, 0%, 0%)'    # 검정
             stylesheet = self._generate_stylesheet(colors)
             self.log_info(f"Generated stylesheet length: {len(stylesheet)} characters")
-            self.app.setStyleSheet(stylesheet)
+            style_registry().set_theme_stylesheet(stylesheet, self.app)
             self.log_info(f"Successfully applied custom light theme (macOS 화이트 모드: {force_white_mode})")
         except Exception as e:
             self.log_error(f"Failed to apply custom light theme: {e}")
@@ -130,11 +136,19 @@ class ThemeManager(QObject, LoggerMixin):
                     qcolor = self._hsl_to_qcolor(hsl)
                     hex_colors[key] = qcolor.name()
                 fallback_stylesheet = self._generate_fallback_stylesheet(hex_colors, force_white_mode)
-                self.app.setStyleSheet(fallback_stylesheet)
+                style_registry().set_theme_stylesheet(fallback_stylesheet, self.app)
                 self.log_info(f"Applied fallback stylesheet for light theme (macOS 화이트 모드: {force_white_mode})")
             except Exception as fallback_error:
                 self.log_error(f"Even fallback failed: {fallback_error}")
-                self.app.setStyleSheet("")
+                style_registry().set_theme_stylesheet("", self.app)
+    
+    def _invalidate_compiled_styles(self) -> None:
+        """Drop resolved colors and compiled component stylesheets of the previous theme."""
+        self._resolved_colors = {}
+        stats = invalidate_stylesheet_cache()
+        if stats['compiles'] or stats['hits']:
+            self.log_info(f"Stylesheet cache invalidated: {stats['compiles']} compiled, "
+                          f"{stats['hits']} reused")
     
     def get_current_theme(self) -> str:
         """Get the current theme name (always light)."""
@@ -355,14 +369,20 @@ QWidget, QFrame, QGroupBox, QMenuBar, QToolBar, QTableWidget, QStatusBar {
         Returns:
             Color value as hex string
         """
+        resolved = self._resolved_colors.get(color_name)
+        if resolved is not None:
+            return resolved
+        
         colors = self.COLORS_LIGHT
         
         if color_name in colors:
-            return self._hsl_to_qcolor(colors[color_name]).name()
+            resolved = self._hsl_to_qcolor(colors[color_name]).name()
         elif color_name in self.MEDICAL_COLORS:
-            return self._hsl_to_qcolor(self.MEDICAL_COLORS[color_name]).name()
+            resolved = self._hsl_to_qcolor(self.MEDICAL_COLORS[color_name]).name()
         else:
             return "#000000"  # Default to black
+        self._resolved_colors[color_name] = resolved
+        return resolved
     
     def get_medical_color(self, tissue_type: str) -> str:
         """Get color for specific tissue type."""
@@ -0,0 +1,261 @@
+"""
+Thumbnail Service for CellSorter Application
+
+Crops and downsamples cell regions from the loaded image in a background
+thread pool and keeps the results in an LRU cache keyed by
+(image, cell_index, size). Thumbnails are delivered asynchronously through
+the thumbnail_ready signal, so widgets can show placeholders immediately and
+fill them in as crops become ready.
+"""
+
+import math
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Hashable, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from PySide6.QtCore import QObject, Signal, Qt
+    from PySide6.QtGui import QImage
+except ImportError:
+    # Fallback for development environment
+    QObject = object
+    Signal = lambda *args: lambda: None
+    Qt = object
+    QImage = object
+
+from models.image_exporter import square_crop_boxes
+from utils.logging_config import LoggerMixin
+
+
+# Memory budget for cached thumbnails
+THUMBNAIL_CACHE_BYTES = 64 * 1024 * 1024
+
+# Upper bound on pool threads; cropping is memory bound
+THUMBNAIL_MAX_WORKERS = 4
+
+# (image key, cell index, size)
+ThumbnailKey = Tuple[Hashable, int, int]
+
+
+def make_thumbnail(image_data: np.ndarray, region: Sequence[int], size: int) -> Optional[np.ndarray]:
+    """
+    Crop a square around a region and downsample it to at most size x size.
+
+    The square keeps the region's center and longer side and is shifted back
+    inside the image. Downsampling averages integer pixel blocks; regions
+    smaller than size are returned at their original resolution.
+
+    Args:
+        image_data: Source image array (grayscale, RGB or RGBA; any dtype)
+        region: (min_x, min_y, max_x, max_y) in image pixels
+        size: Maximum thumbnail edge length
+
+    Returns:
+        C-contiguous uint8 array (H, W) or (H, W, 3), or None if the region is empty
+    """
+    min_x, min_y, max_x, max_y = square_crop_boxes(np.asarray([region]), image_data.shape)[0]
+    crop = image_data[min_y:max_y, min_x:max_x]
+    if crop.ndim == 3:
+        crop = crop[:, :, :3]
+    if crop.size == 0:
+        return None
+
+    factor = max(1, math.ceil(max(crop.shape[:2]) / size))
+    if factor > 1:
+        height, width = crop.shape[0] // factor, crop.shape[1] // factor
+        blocks = crop[:height * factor, :width * factor].reshape(
+            height, factor, width, factor, *crop.shape[2:])
+        crop = blocks.mean(axis=(1, 3))
+
+    if image_data.dtype != np.uint8:
+        # Normalize other dtypes (e.g. 16-bit or float) per crop
+        peak = float(np.max(crop))
+        crop = crop / peak * 255 if peak > 0 else np.zeros(crop.shape)
+    return np.ascontiguousarray(np.round(crop), dtype=np.uint8)
+
+
+def thumbnail_to_qimage(thumbnail: np.ndarray) -> QImage:
+    """Wrap a uint8 thumbnail array in a QImage that owns its pixels."""
+    height, width = thumbnail.shape[:2]
+    if thumbnail.ndim == 2:
+        image = QImage(thumbnail.data, width, height, width, QImage.Format_Grayscale8)
+    else:
+        image = QImage(thumbnail.data, width, height, width * 3, QImage.Format_RGB888)
+    return image.copy()
+
+
+class ThumbnailService(QObject, LoggerMixin):
+    """
+    Background thumbnail generation with an LRU cache.
+
+    All cache bookkeeping happens on the thread the service lives on (the
+    GUI thread); pool threads only crop and encode, then hand results back
+    through a queued signal.
+    """
+
+    # Signals
+    thumbnail_ready = Signal(int, int, QImage)  # cell_index, size, thumbnail
+    _thumbnail_finished = Signal(object)  # (key, generation, QImage or None), from pool threads
+
+    def __init__(self, max_workers: Optional[int] = None,
+                 cache_bytes: int = THUMBNAIL_CACHE_BYTES,
+                 parent: Optional[QObject] = None):
+        super().__init__(parent)
+
+        self.max_workers = max_workers or min(THUMBNAIL_MAX_WORKERS, os.cpu_count() or 1)
+        self.cache_bytes = cache_bytes
+
+        self._cache: "OrderedDict[ThumbnailKey, QImage]" = OrderedDict()
+        self._cache_used = 0
+        self._pending: set = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._image_data: Optional[np.ndarray] = None
+        self._image_key: Optional[Hashable] = None
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+        self._thumbnail_finished.connect(self._on_thumbnail_finished, Qt.QueuedConnection)
+
+    @property
+    def image_key(self) -> Optional[Hashable]:
+        """Key of the current source image."""
+        return self._image_key
+
+    def set_image(self, image_data: Optional[np.ndarray], image_key: Optional[Hashable] = None) -> None:
+        """
+        Set the source image for new requests.
+
+        Requests still pending for the previous image are dropped. Cached
+        thumbnails of other images stay in the cache until evicted.
+
+        Args:
+            image_data: Loaded image array, or None to stop generating
+            image_key: Stable identifier of the image (e.g. its file path);
+                defaults to the array's identity
+        """
+        if image_key is None and image_data is not None:
+            image_key = id(image_data)
+        if image_data is self._image_data and image_key == self._image_key:
+            return
+
+        self._image_data = image_data
+        self._image_key = image_key
+        self._generation += 1
+        self._pending.clear()
+
+    def get(self, cell_index: int, size: int) -> Optional[QImage]:
+        """Return a cached thumbnail of the current image, marking it recently used."""
+        key = (self._image_key, cell_index, size)
+        image = self._cache.get(key)
+        if image is None:
+            self.misses += 1
+            return None
+        self._cache.move_to_end(key)
+        self.hits += 1
+        return image
+
+    def request(self, cell_index: int, region: Sequence[int], size: int) -> Optional[QImage]:
+        """
+        Get a thumbnail, generating it in the background on a cache miss.
+
+        Args:
+            cell_index: Cell index (cache key)
+            region: (min_x, min_y, max_x, max_y) around the cell
+            size: Maximum thumbnail edge length
+
+        Returns:
+            The cached thumbnail, or None if it will arrive via thumbnail_ready
+        """
+        cached = self.get(cell_index, size)
+        if cached is not None or self._image_data is None:
+            return cached
+
+        key = (self._image_key, cell_index, size)
+        if key not in self._pending:
+            self._pending.add(key)
+            self._ensure_executor().submit(
+                self._render, key, self._generation, self._image_data, tuple(region), size
+            )
+        return None
+
+    def prefetch(self, regions: Iterable[Tuple[int, Sequence[int]]], size: int) -> None:
+        """Queue thumbnails for (cell_index, region) pairs not cached yet."""
+        for cell_index, region in regions:
+            key = (self._image_key, cell_index, size)
+            if key not in self._cache:
+                self.request(cell_index, region, size)
+
+    def pending_count(self) -> int:
+        """Number of thumbnails queued or being generated."""
+        return len(self._pending)
+
+    def cache_info(self) -> Dict[str, Any]:
+        """Cache statistics."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(self._cache),
+            'bytes': self._cache_used,
+            'max_bytes': self.cache_bytes,
+        }
+
+    def clear_cache(self) -> None:
+        """Drop all cached thumbnails."""
+        self._cache.clear()
+        self._cache_used = 0
+
+    def shutdown(self) -> None:
+        """Cancel queued work and stop the pool; results still in flight are ignored."""
+        self._generation += 1
+        self._pending.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _ensure_executor(self) -> ThreadPoolExecutor:
+        """Create the pool on first use."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix="thumbnail")
+        return self._executor
+
+    def _render(self, key: ThumbnailKey, generation: int, image_data: np.ndarray,
+                region: Tuple[int, ...], size: int) -> None:
+        """Generate one thumbnail (pool thread)."""
+        if generation != self._generation:
+            return  # Image changed while queued
+        try:
+            thumbnail = make_thumbnail(image_data, region, size)
+            image = thumbnail_to_qimage(thumbnail) if thumbnail is not None else None
+        except Exception as e:
+            self.log_error(f"Thumbnail generation failed for cell {key[1]}: {e}")
+            image = None
+        self._thumbnail_finished.emit((key, generation, image))
+
+    def _on_thumbnail_finished(self, result: Tuple[ThumbnailKey, int, Optional[QImage]]) -> None:
+        """Cache a finished thumbnail and deliver it (service thread)."""
+        key, generation, image = result
+        if generation != self._generation:
+            return
+        self._pending.discard(key)
+        if image is None:
+            return
+
+        self._store(key, image)
+        self.thumbnail_ready.emit(key[1], key[2], image)
+
+    def _store(self, key: ThumbnailKey, image: QImage) -> None:
+        """Insert into the cache, evicting least recently used entries over budget."""
+        previous = self._cache.pop(key, None)
+        if previous is not None:
+            self._cache_used -= previous.sizeInBytes()
+        self._cache[key] = image
+        self._cache_used += image.sizeInBytes()
+
+        while self._cache_used > self.cache_bytes and len(self._cache) > 1:
+            _, evicted = self._cache.popitem(last=False)
+            self._cache_used -= evicted.sizeInBytes()
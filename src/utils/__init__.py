@@ -2,26 +2,36 @@
 Utilities Module
 
 Common utilities and helpers for the CellSorter application.
+
+Names are imported from their submodules on first access, so importing
+one Qt-free helper (exceptions, logging, error_handler) does not load
+the Qt-based accessibility and styling helpers.
 """
 
-from .error_handler import ErrorHandler, error_handler
-from .logging_config import setup_logging, LoggerMixin
-from .exceptions import CellSorterError, ImageLoadError, CSVParseError, CalibrationError, DataValidationError
-from .design_tokens import DesignTokens
-from .style_converter import convert_css_to_qt
-from .accessibility import (
-    AccessibilityRole, 
-    AccessibilityState,
-    set_accessibility_properties,
-    update_loading_state,
-    set_focus_properties,
-    set_error_state,
-    announce_to_screen_reader,
-    create_keyboard_shortcut_text,
-    get_accessibility_summary,
-    setup_button_accessibility,
-    setup_input_accessibility
-)
+from .lazy_import import lazy_getattr, exports_by_module
+
+__getattr__ = lazy_getattr(__name__, globals(), exports_by_module({
+    '.error_handler': ['ErrorHandler', 'error_handler'],
+    '.logging_config': ['setup_logging', 'LoggerMixin'],
+    '.exceptions': ['CellSorterError', 'ImageLoadError', 'CSVParseError', 'CalibrationError',
+                    'DataValidationError'],
+    '.design_tokens': ['DesignTokens'],
+    '.style_converter': ['convert_css_to_qt'],
+    '.accessibility': [
+        'AccessibilityRole',
+        'AccessibilityState',
+        'set_accessibility_properties',
+        'update_loading_state',
+        'set_focus_properties',
+        'set_error_state',
+        'announce_to_screen_reader',
+        'create_keyboard_shortcut_text',
+        'get_accessibility_summary',
+        'setup_button_accessibility',
+        'setup_input_accessibility',
+    ],
+}))
+
 
 __all__ = [
     'ErrorHandler',
@@ -47,4 +57,4 @@ __all__ = [
     'get_accessibility_summary',
     'setup_button_accessibility',
     'setup_input_accessibility',
-]
\ No newline at end of file
+]
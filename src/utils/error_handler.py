@@ -5,24 +5,33 @@ This module provides centralized error handling and user feedback mechanisms.
 """
 
 import traceback
-from typing import Optional, Callable, Any
+from typing import Optional, Callable, Any, TYPE_CHECKING
 from functools import wraps
 
-from PySide6.QtWidgets import QMessageBox, QWidget
-from PySide6.QtCore import QTimer
-
 from utils.exceptions import CellSorterError, ERROR_CODES
+from utils.lazy_import import lazy_getattr
 from utils.logging_config import get_logger
 
+if TYPE_CHECKING:
+    from PySide6.QtWidgets import QWidget
+
 logger = get_logger(__name__)
 
 
+# Qt dialog classes are imported on first use: the error_handler decorator
+# is used throughout the Qt-free core, which must not pull in PySide6.
+__getattr__ = lazy_getattr(__name__, globals(), {
+    'QMessageBox': 'PySide6.QtWidgets',
+    'QWidget': 'PySide6.QtWidgets',
+})
+
+
 class ErrorHandler:
     """
     Centralized error handling for the CellSorter application.
     """
     
-    def __init__(self, parent_widget: Optional[QWidget] = None):
+    def __init__(self, parent_widget: Optional['QWidget'] = None):
         self.parent_widget = parent_widget
         self.error_count = 0
         self.last_error_time = None
@@ -64,6 +73,7 @@ class ErrorHandler:
             details = {}
         
         # Create error dialog
+        QMessageBox = __getattr__('QMessageBox')
         msg_box = QMessageBox(self.parent_widget)
         msg_box.setIcon(QMessageBox.Critical)
         msg_box.setWindowTitle(title)
@@ -108,6 +118,7 @@ class ErrorHandler:
             error_code: Error code if available
         """
         # TODO: Implement context-specific help
+        QMessageBox = __getattr__('QMessageBox')
         help_msg = QMessageBox(self.parent_widget)
         help_msg.setIcon(QMessageBox.Information)
         help_msg.setWindowTitle("Error Help")
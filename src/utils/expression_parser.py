@@ -12,9 +12,11 @@ Examples:
 """
 
 import ast
+import io
 import operator
-import re
-from typing import Dict, Any, List, Union, Optional, Callable
+import tokenize
+from functools import lru_cache
+from typing import Dict, Any, List, Union, Optional, Callable, FrozenSet, Iterable
 from dataclasses import dataclass
 from enum import Enum
 
@@ -131,6 +133,46 @@ class StatisticalFunctions:
         """Calculate base-10 logarithm of data array."""
         return np.log10(np.maximum(data, 1e-10))  # Avoid log10(0)
 
+
+# Logical keywords accepted in any case and rewritten to Python syntax
+LOGICAL_KEYWORDS = {'AND': 'and', 'OR': 'or', 'NOT': 'not'}
+
+
+@lru_cache(maxsize=512)
+def _tokenize_expression(expression: str, keyword_columns: FrozenSet[str] = frozenset()) -> str:
+    """
+    Rewrite standalone logical keywords using the Python tokenizer.
+    
+    Only whole NAME tokens are touched, so identifiers that merely contain
+    a keyword (e.g. ``Intensity_MeanIntensity_ORIGINAL``) are left intact.
+    Results are cached per (expression, keyword_columns).
+    
+    Args:
+        expression: Whitespace-normalized expression string
+        keyword_columns: Column names that collide with a logical keyword
+            and must therefore be kept as variables
+        
+    Returns:
+        Expression with logical keywords in Python syntax
+    """
+    replacements = []
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(expression).readline):
+            if token.type != tokenize.NAME or token.string in keyword_columns:
+                continue
+            keyword = LOGICAL_KEYWORDS.get(token.string.upper())
+            if keyword is not None and token.string != keyword:
+                replacements.append((token.start[1], token.end[1], keyword))
+    except (tokenize.TokenError, SyntaxError):
+        # Leave malformed input untouched; ast.parse reports the real error
+        return expression
+    
+    for start, end, keyword in reversed(replacements):
+        expression = expression[:start] + keyword + expression[end:]
+    
+    return expression
+
+
 class ExpressionParser(LoggerMixin):
     """
     Safe mathematical expression parser using AST.
@@ -189,12 +231,13 @@ class ExpressionParser(LoggerMixin):
         self.variables: Dict[str, np.ndarray] = {}
         self.column_dependencies: List[str] = []
         
-    def parse_expression(self, expression: str) -> ast.AST:
+    def parse_expression(self, expression: str, columns: Optional[Iterable[str]] = None) -> ast.AST:
         """
         Parse expression string into AST.
         
         Args:
             expression: Mathematical expression string
+            columns: Column names of the loaded table (optional)
             
         Returns:
             Parsed AST tree
@@ -204,7 +247,7 @@ class ExpressionParser(LoggerMixin):
         """
         try:
             # Clean and normalize expression
-            expression = self._normalize_expression(expression)
+            expression = self._normalize_expression(expression, columns)
             
             # Parse into AST
             tree = ast.parse(expression, mode='eval')
@@ -239,7 +282,7 @@ class ExpressionParser(LoggerMixin):
             self.column_dependencies = []
             
             # Parse expression
-            tree = self.parse_expression(expression)
+            tree = self.parse_expression(expression, data.columns)
             
             # Set up variables from DataFrame columns
             numeric_columns = data.select_dtypes(include=[np.number]).columns
@@ -284,25 +327,29 @@ class ExpressionParser(LoggerMixin):
                 error_message=error_msg
             )
 
-    def _normalize_expression(self, expression: str) -> str:
+    def _normalize_expression(self, expression: str, columns: Optional[Iterable[str]] = None) -> str:
         """
         Normalize expression string for parsing.
         
         Args:
             expression: Raw expression string
+            columns: Column names of the loaded table (optional)
             
         Returns:
             Normalized expression string
         """
-        # Convert logical operators to Python syntax
-        expression = re.sub(r'AND', ' and ', expression, flags=re.IGNORECASE)
-        expression = re.sub(r'OR', ' or ', expression, flags=re.IGNORECASE)
-        expression = re.sub(r'NOT', ' not ', expression, flags=re.IGNORECASE)
-        
         # Remove extra whitespace
         expression = ' '.join(expression.split())
         
-        return expression
+        # Only columns spelled like a keyword affect tokenization; keeping the
+        # cache key small avoids hashing hundreds of column names per call
+        keyword_columns = frozenset(
+            str(column) for column in (columns if columns is not None else ())
+            if str(column).upper() in LOGICAL_KEYWORDS
+        )
+        
+        # Convert standalone logical operators to Python syntax
+        return _tokenize_expression(expression, keyword_columns)
     
     def _validate_ast(self, tree: ast.AST) -> None:
         """
@@ -459,14 +506,19 @@ class ExpressionParser(LoggerMixin):
         """
         try:
             # Parse expression
-            tree = self.parse_expression(expression)
+            tree = self.parse_expression(expression, columns)
             
             # Check column dependencies
             referenced_columns = []
             unknown_columns = []
             
+            function_names = {
+                id(node.func) for node in ast.walk(tree)
+                if isinstance(node, ast.Call)
+            }
+            
             for node in ast.walk(tree):
-                if isinstance(node, ast.Name):
+                if isinstance(node, ast.Name) and id(node) not in function_names:
                     var_name = node.id
                     if var_name not in ['and', 'or', 'not']:  # Skip logical operators
                         referenced_columns.append(var_name)
@@ -0,0 +1,53 @@
+"""
+CellSorter Lazy Imports
+
+Module-level __getattr__ (PEP 562) that imports names from their defining
+module on first access. Package __init__ files use it to re-export their
+public names without loading every submodule (and Qt, matplotlib or
+OpenCV with them) at import time:
+
+    __getattr__ = lazy_getattr(__name__, globals(), {
+        'ScatterPlotWidget': '.scatter_plot',
+        'SelectionPanel': '.selection_panel',
+    })
+
+Modules can also resolve their own deferred names through the returned
+function, e.g. ``__getattr__('CalibrationDialog')``. A resolved name is
+stored in the module globals, so it can still be patched in tests.
+"""
+
+import importlib
+from typing import Any, Callable, Dict, Iterable, MutableMapping
+
+
+def lazy_getattr(package: str, namespace: MutableMapping[str, Any],
+                 exports: Dict[str, str]) -> Callable[[str], Any]:
+    """
+    Create a module __getattr__ for deferred imports.
+
+    Args:
+        package: Name of the importing module, used for relative module names
+        namespace: The importing module's globals()
+        exports: Mapping of attribute name to the module defining it
+
+    Returns:
+        Function resolving an attribute name, suitable as module __getattr__
+    """
+    def __getattr__(name: str) -> Any:
+        if name in namespace:
+            return namespace[name]
+
+        module_name = exports.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+        value = getattr(importlib.import_module(module_name, package), name)
+        namespace[name] = value
+        return value
+
+    return __getattr__
+
+
+def exports_by_module(modules: Dict[str, Iterable[str]]) -> Dict[str, str]:
+    """Invert a module -> names mapping into the name -> module form of lazy_getattr."""
+    return {name: module for module, names in modules.items() for name in names}
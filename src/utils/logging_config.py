@@ -2,23 +2,41 @@
 CellSorter Logging Configuration
 
 This module sets up application-wide logging configuration.
+
+Records are handed to a queue and written to the log file and console by a
+listener thread, so logging never blocks the GUI on file I/O. Code that
+logs per item or per mouse move uses LogThrottle (LoggerMixin.log_throttled)
+or aggregated_log to keep the volume down.
 """
 
+import atexit
 import logging
 import logging.handlers
+import queue
 import sys
+import threading
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Hashable, Optional, Tuple
 
 from config.settings import (
     LOG_LEVEL, LOG_FORMAT, LOG_MAX_BYTES, LOG_BACKUP_COUNT, BASE_DIR
 )
 
+# Default minimum seconds between two throttled messages with the same key
+LOG_THROTTLE_INTERVAL = 1.0
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_class_loggers: Dict[type, logging.Logger] = {}
+
 
 def setup_logging(log_file: Optional[str] = None, console_level: str = "INFO") -> logging.Logger:
     """
     Set up application logging with file and console handlers.
     
+    The handlers run on a QueueListener thread; the logger itself only has a
+    QueueHandler. Calling this again replaces the previous listener.
+    
     Args:
         log_file: Optional custom log file path
         console_level: Console logging level (default: INFO)
@@ -39,6 +57,7 @@ def setup_logging(log_file: Optional[str] = None, console_level: str = "INFO") -
     logger.setLevel(logging.DEBUG)  # Capture all levels
     
     # Clear any existing handlers
+    shutdown_logging()
     logger.handlers.clear()
     
     # Create formatter
@@ -53,17 +72,41 @@ def setup_logging(log_file: Optional[str] = None, console_level: str = "INFO") -
     )
     file_handler.setLevel(getattr(logging, LOG_LEVEL.upper()))
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
     
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(getattr(logging, console_level.upper()))
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    
+    # Write from a listener thread
+    global _listener
+    log_queue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    _listener.start()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.listener = _listener  # As logging.config sets it on Python 3.12+
+    logger.addHandler(queue_handler)
     
     return logger
 
 
+def shutdown_logging() -> None:
+    """Write out queued records and close the handlers set up by setup_logging."""
+    global _listener
+    listener, _listener = _listener, None
+    if listener is None:
+        return
+    
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+
+atexit.register(shutdown_logging)
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get a logger instance for a specific module.
@@ -77,6 +120,105 @@ def get_logger(name: str) -> logging.Logger:
     return logging.getLogger(f"cellsorter.{name}")
 
 
+class LogThrottle:
+    """
+    Let a repeated message through at most once per interval and key.
+    
+    Suppressed messages are counted and reported with the next message
+    that gets through:
+    
+        _throttle = LogThrottle()
+        
+        def on_drag(self, x, y):
+            _throttle.log(logger, logging.INFO, 'drag', f"Dragged to ({x}, {y})")
+    """
+    
+    def __init__(self, interval: float = LOG_THROTTLE_INTERVAL):
+        self.interval = interval
+        self._last: Dict[Hashable, Tuple[float, int]] = {}  # key -> (last emit time, suppressed count)
+        self._lock = threading.Lock()
+    
+    def log(self, logger: logging.Logger, level: int, key: Hashable, message: str,
+            interval: Optional[float] = None) -> bool:
+        """
+        Log a message unless one with the same key was logged within the interval.
+        
+        Args:
+            logger: Logger to write to
+            level: Logging level
+            key: Identifies the repeated message, e.g. its call site
+            message: Message to log
+            interval: Overrides the throttle's interval
+        
+        Returns:
+            True if the message was logged
+        """
+        if not logger.isEnabledFor(level):
+            return False
+        
+        interval = self.interval if interval is None else interval
+        now = time.monotonic()
+        with self._lock:
+            last, suppressed = self._last.get(key, (None, 0))
+            if last is not None and now - last < interval:
+                self._last[key] = (last, suppressed + 1)
+                return False
+            self._last[key] = (now, 0)
+        
+        if suppressed:
+            message = f"{message} (+{suppressed} similar messages)"
+        logger.log(level, message)
+        return True
+
+
+class LogAggregate:
+    """Counts per-item events and logs one summary line; see aggregated_log."""
+    
+    def __init__(self, logger: logging.Logger, message: str, level: int = logging.INFO):
+        self.logger = logger
+        self.message = message
+        self.level = level
+        self.count = 0
+        self._start = 0.0
+    
+    def add(self, count: int = 1) -> None:
+        """Count items instead of logging each of them."""
+        self.count += count
+    
+    def __enter__(self) -> 'LogAggregate':
+        self._start = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self.count:
+            elapsed = time.perf_counter() - self._start
+            self.logger.log(self.level, f"{self.message}: {self.count} in {elapsed:.2f}s")
+
+
+def aggregated_log(logger: logging.Logger, message: str, level: int = logging.INFO) -> LogAggregate:
+    """
+    Log one summary for a loop instead of one line per item.
+    
+        with aggregated_log(logger, "Exported cell images") as exported:
+            for crop in crops:
+                write(crop)
+                exported.add()
+        # -> "Exported cell images: 120 in 0.53s"
+    
+    Args:
+        logger: Logger to write to
+        message: Summary text, followed by the count and duration
+        level: Logging level
+    
+    Returns:
+        Context manager counting items through add()
+    """
+    return LogAggregate(logger, message, level)
+
+
+_throttle = LogThrottle()
+
+
 class LoggerMixin:
     """
     Mixin class to add logging capability to any class.
@@ -84,8 +226,12 @@ class LoggerMixin:
     
     @property
     def logger(self) -> logging.Logger:
-        """Get logger instance for this class."""
-        return get_logger(self.__class__.__module__)
+        """Get logger instance for this class (looked up once per class)."""
+        cls = type(self)
+        logger = _class_loggers.get(cls)
+        if logger is None:
+            logger = _class_loggers[cls] = get_logger(cls.__module__)
+        return logger
     
     def log_info(self, message: str, **kwargs) -> None:
         """Log info message with optional context."""
@@ -101,4 +247,21 @@ class LoggerMixin:
     
     def log_debug(self, message: str, **kwargs) -> None:
         """Log debug message with optional context."""
-        self.logger.debug(message, extra=kwargs)
\ No newline at end of file
+        self.logger.debug(message, extra=kwargs)
+    
+    def log_throttled(self, key: str, message: str, level: int = logging.INFO,
+                      interval: float = LOG_THROTTLE_INTERVAL) -> bool:
+        """
+        Log a message from a hot path at most once per interval.
+        
+        Args:
+            key: Identifies the repeated message within this class's logger
+            message: Message to log
+            level: Logging level
+            interval: Minimum seconds between messages with this key
+        
+        Returns:
+            True if the message was logged
+        """
+        logger = self.logger
+        return _throttle.log(logger, level, (logger.name, key), message, interval)
\ No newline at end of file
@@ -0,0 +1,131 @@
+"""
+CellSorter Startup Profiler
+
+Import-time breakdown for ``--profile-startup``. While installed, every
+module import is timed through a meta path finder (the same numbers as
+``python -X importtime``), and the caller marks start-up phases. The
+report lists the phases, the slowest imports and the time per top-level
+package.
+"""
+
+import sys
+import time
+from collections import defaultdict
+from importlib.abc import Loader, MetaPathFinder
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class _TimedLoader(Loader):
+    """Loader wrapper that times exec_module for one module."""
+
+    def __init__(self, loader: Loader, profiler: 'StartupProfiler'):
+        self.loader = loader
+        self.profiler = profiler
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module) -> None:
+        self.profiler._enter()
+        start = time.perf_counter()
+        try:
+            self.loader.exec_module(module)
+        finally:
+            self.profiler._exit(module.__name__, time.perf_counter() - start)
+
+    def __getattr__(self, name: str) -> Any:
+        # get_resource_reader, is_package and friends
+        return getattr(self.loader, name)
+
+
+class _TimingFinder(MetaPathFinder):
+    """Meta path finder that wraps the loaders found by the others."""
+
+    def __init__(self, profiler: 'StartupProfiler'):
+        self.profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                    spec.loader = _TimedLoader(spec.loader, self.profiler)
+                return spec
+        return None
+
+
+class StartupProfiler:
+    """
+    Records module import times and named start-up phases.
+
+    Usage:
+        profiler = StartupProfiler().install()
+        ...  # imports
+        profiler.mark("QApplication created")
+        ...
+        print(profiler.report())
+    """
+
+    def __init__(self):
+        self.start_time = time.perf_counter()
+        # name -> (self seconds, cumulative seconds)
+        self.imports: Dict[str, Tuple[float, float]] = {}
+        self.phases: List[Tuple[str, float]] = []
+        self._child_time: List[float] = []
+        self._finder: Optional[_TimingFinder] = None
+
+    def install(self) -> 'StartupProfiler':
+        """Start timing imports."""
+        if self._finder is None:
+            self._finder = _TimingFinder(self)
+            sys.meta_path.insert(0, self._finder)
+        return self
+
+    def uninstall(self) -> None:
+        """Stop timing imports."""
+        if self._finder is not None:
+            sys.meta_path.remove(self._finder)
+            self._finder = None
+
+    def mark(self, phase: str) -> None:
+        """Record the end of a start-up phase."""
+        self.phases.append((phase, time.perf_counter() - self.start_time))
+
+    def _enter(self) -> None:
+        self._child_time.append(0.0)
+
+    def _exit(self, name: str, elapsed: float) -> None:
+        children = self._child_time.pop()
+        self.imports[name] = (elapsed - children, elapsed)
+        if self._child_time:
+            self._child_time[-1] += elapsed
+
+    def package_totals(self) -> Dict[str, float]:
+        """Self time of all imported modules, summed per top-level package."""
+        totals: Dict[str, float] = defaultdict(float)
+        for name, (self_time, _) in self.imports.items():
+            totals[name.partition('.')[0]] += self_time
+        return dict(totals)
+
+    def report(self, top: int = 20) -> str:
+        """Format phases, the slowest imports and per-package totals."""
+        lines = ["Startup profile", "", "Phases (seconds since start):"]
+        previous = 0.0
+        for phase, at in self.phases:
+            lines.append(f"  {at:8.3f}  (+{at - previous:.3f})  {phase}")
+            previous = at
+
+        total_import = sum(self_time for self_time, _ in self.imports.values())
+        lines += ["", f"Imports: {len(self.imports)} modules, {total_import:.3f}s",
+                  "", f"Slowest imports (cumulative, top {top}):"]
+        slowest = sorted(self.imports.items(), key=lambda item: item[1][1], reverse=True)[:top]
+        for name, (self_time, cumulative) in slowest:
+            lines.append(f"  {cumulative:8.3f}  {self_time:8.3f}  {name}")
+
+        lines += ["", f"By package (self time, top {top}):"]
+        packages = sorted(self.package_totals().items(), key=lambda item: item[1], reverse=True)[:top]
+        for package, seconds in packages:
+            lines.append(f"  {seconds:8.3f}  {package}")
+        return "\n".join(lines)
@@ -6,6 +6,7 @@ Handles shadcn/ui CSS variables and HSL color conversion.
 """
 
 import re
+from functools import lru_cache
 from typing import Dict, Any, Optional, Tuple
 from pathlib import Path
 
@@ -175,10 +176,68 @@ def get_shadcn_dark_color_variables() -> Dict[str, str]:
     }
 
 
+# Patterns compiled once at import; convert_css_to_qt runs for every styled widget
+_HSL_VALUE_PATTERN = re.compile(r'^\d+\.?\d*\s+\d+\.?\d*%\s+\d+\.?\d*%$')
+_VAR_PATTERN = re.compile(r'var\((--[\w-]+)(?:,\s*([^)]+))?\)')
+
+# Modern CSS properties Qt does not support, removed from the output
+_UNSUPPORTED_PROPERTIES = (
+    'backdrop-filter', 'mask', 'clip-path', 'filter', 'transform', 'transition',
+    'animation', 'box-shadow', 'text-shadow', 'z-index',
+)
+_UNSUPPORTED_PROPERTY_PATTERN = re.compile(
+    rf"(?:{'|'.join(_UNSUPPORTED_PROPERTIES)})\s*:[^;]*;?", re.IGNORECASE)
+# Qt handles opacity differently
+_OPACITY_PATTERN = re.compile(r'opacity(\s*:\s*[^;]*;?)', re.IGNORECASE)
+
+# Text overflow rules are handled by the Qt widgets themselves
+_TEXT_OVERFLOW_CONVERSIONS = {
+    'text-overflow: ellipsis': '/* text-overflow: ellipsis handled by Qt widget */',
+    'white-space: nowrap': '/* white-space: nowrap handled by Qt widget */',
+    'overflow: hidden': '/* overflow: hidden handled by Qt widget */',
+    'word-wrap: break-word': '/* word-wrap handled by Qt widget */',
+    'word-break: break-all': '/* word-break handled by Qt widget */',
+    'line-clamp': '/* line-clamp handled by Qt widget */',
+    '-webkit-line-clamp': '/* webkit-line-clamp handled by Qt widget */',
+    '-webkit-box-orient': '/* webkit-box-orient handled by Qt widget */',
+    'display: -webkit-box': '/* display: -webkit-box handled by Qt widget */',
+}
+
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+_EMPTY_RULE_PATTERN = re.compile(r'{\s*}')
+_DUPLICATE_SEMICOLON_PATTERN = re.compile(r';\s*;')
+
+# Common fallbacks for variables missing from the color table
+_FALLBACK_COLORS = {
+    False: {
+        'background': '#ffffff',
+        'foreground': '#0f172a',
+        'primary': '#0f172a',
+        'secondary': '#f1f5f9',
+        'muted': '#f1f5f9',
+        'border': '#e2e8f0',
+    },
+    True: {
+        'background': '#0f172a',
+        'foreground': '#f8fafc',
+        'primary': '#f8fafc',
+        'secondary': '#1e293b',
+        'muted': '#1e293b',
+        'border': '#1e293b',
+    },
+}
+
+# Compiled stylesheets are kept per (css text, color table, dark theme)
+MAX_CACHED_STYLESHEETS = 512
+
+
 def convert_css_to_qt(css_string: str, color_vars: Optional[Dict[str, str]] = None, is_dark_theme: bool = False) -> str:
     """
     Convert CSS with variables to Qt stylesheet with comprehensive compatibility.
     
+    Results are memoized per stylesheet and theme colors; see
+    invalidate_stylesheet_cache().
+    
     Args:
         css_string: CSS string with var() references
         color_vars: Dictionary mapping variable names to color values (optional)
@@ -187,28 +246,55 @@ def convert_css_to_qt(css_string: str, color_vars: Optional[Dict[str, str]] = No
     Returns:
         Qt-compatible stylesheet
     """
-    # Use default shadcn/ui colors if not provided
     if color_vars is None:
+        theme = None
+    else:
+        try:
+            theme = tuple(sorted(color_vars.items()))
+            hash(theme)
+        except TypeError:
+            # Unhashable values cannot be cached
+            return _compile_stylesheet(css_string, _resolve_colors(color_vars), is_dark_theme)
+    return _compile_cached(css_string, theme, is_dark_theme)
+
+
+@lru_cache(maxsize=MAX_CACHED_STYLESHEETS)
+def _compile_cached(css_string: str, theme: Optional[Tuple[Tuple[str, Any], ...]], is_dark_theme: bool) -> str:
+    """Compile a stylesheet for a hashable theme key."""
+    return _compile_stylesheet(css_string, _resolve_color_table(theme, is_dark_theme), is_dark_theme)
+
+
+@lru_cache(maxsize=32)
+def _resolve_color_table(theme: Optional[Tuple[Tuple[str, Any], ...]], is_dark_theme: bool) -> Dict[str, str]:
+    """Resolve a theme's color variables to hex once (the table is shared; do not modify)."""
+    if theme is None:
+        # Use default shadcn/ui colors if not provided
         color_vars = get_shadcn_dark_color_variables() if is_dark_theme else get_shadcn_color_variables()
-    
-    # Convert HSL color variables to hex
+    else:
+        color_vars = dict(theme)
+    return _resolve_colors(color_vars)
+
+
+def _resolve_colors(color_vars: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert HSL color variables to hex."""
     hex_color_vars = {}
     for var_name, hsl_value in color_vars.items():
         if isinstance(hsl_value, str) and (
-            hsl_value.startswith('hsl(') or 
-            re.match(r'^\d+\.?\d*\s+\d+\.?\d*%\s+\d+\.?\d*%$', hsl_value.strip())
+            hsl_value.startswith('hsl(') or
+            _HSL_VALUE_PATTERN.match(hsl_value.strip())
         ):
             hex_color_vars[var_name] = hsl_string_to_rgb(hsl_value)
         else:
             # Already hex or other format
             hex_color_vars[var_name] = hsl_value
-    
-    # Replace CSS variables with actual values
-    qt_style = css_string
-    
+    return hex_color_vars
+
+
+def _compile_stylesheet(css_string: str, hex_color_vars: Dict[str, Any], is_dark_theme: bool) -> str:
+    """Substitute variables and translate CSS into a Qt stylesheet."""
+    fallback_colors = _FALLBACK_COLORS[bool(is_dark_theme)]
+
     # Handle var() references with fallbacks
-    var_pattern = r'var\((--[\w-]+)(?:,\s*([^)]+))?\)'
-    
     def replace_var(match):
         var_name = match.group(1)[2:]  # Remove --
         fallback = match.group(2) if match.group(2) else None
@@ -221,68 +307,49 @@ def convert_css_to_qt(css_string: str, color_vars: Optional[Dict[str, str]] = No
         elif fallback:
             return fallback.strip()
         else:
-            # Try common fallbacks
-            fallback_colors = {
-                'background': '#ffffff' if not is_dark_theme else '#0f172a',
-                'foreground': '#0f172a' if not is_dark_theme else '#f8fafc',
-                'primary': '#0f172a' if not is_dark_theme else '#f8fafc',
-                'secondary': '#f1f5f9' if not is_dark_theme else '#1e293b',
-                'muted': '#f1f5f9' if not is_dark_theme else '#1e293b',
-                'border': '#e2e8f0' if not is_dark_theme else '#1e293b',
-            }
             return fallback_colors.get(var_name, '#000000')
     
-    qt_style = re.sub(var_pattern, replace_var, qt_style)
+    qt_style = _VAR_PATTERN.sub(replace_var, css_string)
     
     # Convert modern CSS properties to Qt equivalents
-    property_conversions = {
-        'backdrop-filter': '',  # Remove - not supported
-        'mask': '',  # Remove - not supported
-        'clip-path': '',  # Remove - not supported
-        'filter': '',  # Remove - limited support
-        'transform': '',  # Remove - limited support
-        'transition': '',  # Remove - use QPropertyAnimation instead
-        'animation': '',  # Remove - use QPropertyAnimation instead
-        'box-shadow': '',  # Convert to Qt shadow (limited)
-        'text-shadow': '',  # Remove - not supported
-        'opacity': 'background-color',  # Qt handles opacity differently
-        'z-index': '',  # Remove - use widget stacking
-    }
-    
-    for css_prop, qt_replacement in property_conversions.items():
-        if qt_replacement == '':
-            # Remove the property entirely
-            pattern = rf'{css_prop}\s*:[^;]*;?'
-            qt_style = re.sub(pattern, '', qt_style, flags=re.IGNORECASE)
-        else:
-            # Replace with Qt equivalent
-            pattern = rf'{css_prop}(\s*:\s*[^;]*;?)'
-            qt_style = re.sub(pattern, rf'{qt_replacement}\1', qt_style, flags=re.IGNORECASE)
-    
-    # Handle text overflow properties specifically for Qt
-    text_overflow_conversions = {
-        'text-overflow: ellipsis': '/* text-overflow: ellipsis handled by Qt widget */',
-        'white-space: nowrap': '/* white-space: nowrap handled by Qt widget */',
-        'overflow: hidden': '/* overflow: hidden handled by Qt widget */',
-        'word-wrap: break-word': '/* word-wrap handled by Qt widget */',
-        'word-break: break-all': '/* word-break handled by Qt widget */',
-        'line-clamp': '/* line-clamp handled by Qt widget */',
-        '-webkit-line-clamp': '/* webkit-line-clamp handled by Qt widget */',
-        '-webkit-box-orient': '/* webkit-box-orient handled by Qt widget */',
-        'display: -webkit-box': '/* display: -webkit-box handled by Qt widget */',
-    }
+    qt_style = _UNSUPPORTED_PROPERTY_PATTERN.sub('', qt_style)
+    qt_style = _OPACITY_PATTERN.sub(r'background-color\1', qt_style)
     
-    for css_rule, qt_comment in text_overflow_conversions.items():
+    for css_rule, qt_comment in _TEXT_OVERFLOW_CONVERSIONS.items():
         qt_style = qt_style.replace(css_rule, qt_comment)
     
     # Clean up multiple whitespace and empty rules
-    qt_style = re.sub(r'\s+', ' ', qt_style)
-    qt_style = re.sub(r'{\s*}', '', qt_style)  # Remove empty rules
-    qt_style = re.sub(r';\s*;', ';', qt_style)  # Remove duplicate semicolons
+    qt_style = _WHITESPACE_PATTERN.sub(' ', qt_style)
+    qt_style = _EMPTY_RULE_PATTERN.sub('', qt_style)  # Remove empty rules
+    qt_style = _DUPLICATE_SEMICOLON_PATTERN.sub(';', qt_style)  # Remove duplicate semicolons
     
     return qt_style.strip()
 
 
+def stylesheet_cache_info() -> Dict[str, int]:
+    """
+    Statistics of the stylesheet cache since it was last invalidated.
+    
+    Returns:
+        Dictionary with 'compiles' (cache misses), 'hits' and 'entries'
+    """
+    info = _compile_cached.cache_info()
+    return {'compiles': info.misses, 'hits': info.hits, 'entries': info.currsize}
+
+
+def invalidate_stylesheet_cache() -> Dict[str, int]:
+    """
+    Drop all compiled stylesheets and resolved color tables, e.g. on a theme switch.
+    
+    Returns:
+        The statistics of the cache before it was cleared
+    """
+    info = stylesheet_cache_info()
+    _compile_cached.cache_clear()
+    _resolve_color_table.cache_clear()
+    return info
+
+
 def apply_text_truncation_to_qt_widget(widget, max_width: Optional[int] = None, enable_ellipsis: bool = True):
     """
     Apply text truncation settings to a Qt widget.
@@ -0,0 +1,190 @@
+"""
+DEV Mode Tests for Headless Batch Processing
+
+Tests the manifest loader, the per-slide pipeline against the GUI export
+path, the process pool runner with its timing report and the CLI command.
+"""
+
+import json
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from PIL import Image
+
+sys.path.insert(0, 'src')
+
+from services.batch_processor import (
+    BATCH_STAGES, SelectionRule, filter_cells, load_calibration, load_manifest,
+    process_slide, read_cell_table, run_batch, select_cells
+)
+from models.coordinate_transformer import CoordinateTransformer
+from models.extractor import Extractor
+from headless.cli.cli_commands import HeadlessCLI
+
+
+def make_slide(directory: Path, name: str, cells: int = 200, seed: int = 0) -> None:
+    """Write a PNG slide and a CellProfiler-style CSV with extra measurement columns."""
+    rng = np.random.default_rng(seed)
+    Image.fromarray(rng.integers(0, 255, (400, 600, 3), dtype=np.uint8)).save(directory / f"{name}.png")
+
+    min_x = rng.integers(0, 560, cells)
+    min_y = rng.integers(0, 360, cells)
+    size = rng.integers(5, 40, cells)
+    table = pd.DataFrame({
+        'ImageNumber': 1,
+        'AreaShape_BoundingBoxMinimum_X': min_x,
+        'AreaShape_BoundingBoxMinimum_Y': min_y,
+        'AreaShape_BoundingBoxMaximum_X': min_x + size,
+        'AreaShape_BoundingBoxMaximum_Y': min_y + size,
+        'AreaShape_Area': size * size,
+        'Intensity_MeanIntensity': rng.random(cells),
+    })
+    for extra in range(20):
+        table[f'Texture_Unused_{extra}'] = rng.random(cells)
+    table.to_csv(directory / f"{name}.csv", index=False)
+
+
+@pytest.fixture
+def batch_dir():
+    """Directory with three slides, a calibration file and a manifest."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        directory = Path(temp_dir)
+        for seed, name in enumerate(['slide01', 'slide02', 'slide03']):
+            make_slide(directory, name, seed=seed)
+
+        transformer = CoordinateTransformer()
+        transformer.add_calibration_point(50, 50, 1000.0, 2000.0)
+        transformer.add_calibration_point(550, 350, 1250.0, 2150.0)
+        (directory / 'calibration.json').write_text(json.dumps(transformer.export_calibration()))
+
+        manifest = {
+            'output_dir': 'results',
+            'defaults': {
+                'calibration': 'calibration.json',
+                'filter': 'AreaShape_Area > 100',
+                'selections': [
+                    {'label': 'Large', 'expression': 'AreaShape_Area > 900', 'well': 'B02'},
+                    {'label': 'Bright', 'expression': 'Intensity_MeanIntensity > 0.5', 'max_cells': 10},
+                ],
+            },
+            'slides': [
+                {'image': 'slide01.png', 'csv': 'slide01.csv', 'crops': 'zip'},
+                {'image': 'slide02.png', 'csv': 'slide02.csv'},
+                {'name': 'broken', 'image': 'slide03.png', 'csv': 'missing.csv'},
+            ],
+        }
+        (directory / 'manifest.json').write_text(json.dumps(manifest))
+        yield directory
+
+
+def test_manifest_defaults_and_paths(batch_dir):
+    """Slides inherit defaults; paths and calibration files resolve against the manifest."""
+    manifest = load_manifest(batch_dir / 'manifest.json')
+
+    assert manifest.output_dir == str(batch_dir / 'results')
+    assert [job.name for job in manifest.slides] == ['slide01', 'slide02', 'broken']
+    first = manifest.slides[0]
+    assert first.csv_path == str(batch_dir / 'slide01.csv')
+    assert first.output_dir == str(batch_dir / 'results' / 'slide01')
+    assert first.crops == 'zip' and manifest.slides[1].crops is None
+    assert first.selections[0] == SelectionRule(label='Large', expression='AreaShape_Area > 900',
+                                                well_position='B02')
+    assert first.calibration['transform_matrix'] is not None
+
+
+def test_table_reads_only_needed_columns(batch_dir):
+    """Unreferenced measurement columns are not parsed."""
+    table = read_cell_table(batch_dir / 'slide01.csv', ['AreaShape_Area > 100'])
+    assert sorted(table.columns) == sorted([
+        'AreaShape_BoundingBoxMinimum_X', 'AreaShape_BoundingBoxMinimum_Y',
+        'AreaShape_BoundingBoxMaximum_X', 'AreaShape_BoundingBoxMaximum_Y', 'AreaShape_Area',
+    ])
+    assert len(table) == 200
+
+
+def test_gating_rules(batch_dir):
+    """Rules apply on top of the filter; wells and colors are assigned around explicit ones."""
+    table = pd.read_csv(batch_dir / 'slide01.csv')
+    keep = filter_cells(table, 'AreaShape_Area > 100')
+    rules = [SelectionRule('Large', 'AreaShape_Area > 900'),
+             SelectionRule('Listed', cell_indices=[0, 1, 2, 3, 999], well_position='A01'),
+             SelectionRule('Rest', max_cells=5)]
+
+    large, listed, rest = select_cells(table, rules, keep)
+
+    area = table['AreaShape_Area'].to_numpy()
+    assert large['cell_indices'] == np.flatnonzero((area > 100) & (area > 900)).tolist()
+    assert listed['cell_indices'] == [i for i in range(4) if area[i] > 100]
+    assert rest['cell_indices'] == np.flatnonzero(area > 100)[:5].tolist()
+    assert [s['well_position'] for s in (large, listed, rest)] == ['B01', 'A01', 'C01']
+    assert large['color'] != rest['color']
+
+
+def test_slide_matches_gui_export(batch_dir):
+    """A batch slide writes the same protocols as the extractor export used by the GUI."""
+    job = load_manifest(batch_dir / 'manifest.json').slides[0]
+    result = process_slide(job)
+
+    assert result.succeeded, result.error
+    assert set(result.timings) == set(BATCH_STAGES)
+    assert result.cells == 200 and result.points == result.selected_cells > 0
+
+    # Reference: the same selections through the extractor with a GUI-style transformer
+    table = pd.read_csv(job.csv_path)
+    selections = select_cells(table, job.selections, filter_cells(table, job.filter))
+    boxes = [tuple(int(v) for v in row) for row in table[[
+        'AreaShape_BoundingBoxMinimum_X', 'AreaShape_BoundingBoxMinimum_Y',
+        'AreaShape_BoundingBoxMaximum_X', 'AreaShape_BoundingBoxMaximum_Y']].to_numpy()]
+    with tempfile.TemporaryDirectory() as reference_dir:
+        reference = Extractor().export_protocol_batch(
+            selections, boxes, load_calibration(job.calibration), reference_dir,
+            {'file_path': job.image_path, 'width': 600, 'height': 400}, image_bounds=(600, 400))
+        expected = {path.name: path.read_text() for path in reference}
+
+    assert {Path(path).name: Path(path).read_text() for path in result.protocols} == expected
+
+    # One ZIP of crops per selection
+    with zipfile.ZipFile(Path(job.output_dir) / 'crops' / 'B02_Large_crops.zip') as archive:
+        crops = [name for name in archive.namelist() if name.endswith('.jpg')]
+    assert len(crops) == len(selections[0]['cell_indices'])
+    assert result.crops_exported == result.selected_cells
+
+
+def test_process_pool_report(batch_dir):
+    """Slides run in worker processes; failures are reported per slide."""
+    manifest = load_manifest(batch_dir / 'manifest.json')
+    progress = []
+
+    report = run_batch(manifest.slides, workers=2,
+                       progress_callback=lambda done, total, result: progress.append((done, total)))
+
+    assert [slide.status for slide in report.slides] == ['ok', 'ok', 'failed']
+    assert 'missing.csv' in report.slides[2].error
+    assert sorted(progress) == [(1, 3), (2, 3), (3, 3)]
+
+    json_path, csv_path = report.write(manifest.output_dir)
+    summary = json.loads(json_path.read_text())['summary']
+    assert summary['succeeded'] == 2 and summary['failed'] == 1
+    rows = pd.read_csv(csv_path)
+    assert list(rows['name']) == ['slide01', 'slide02', 'broken']
+    assert (rows.loc[:1, 'protocol_seconds'] > 0).all()
+
+
+def test_cli_batch_command(batch_dir, capsys):
+    """The headless CLI runs a manifest and writes the report to the output directory."""
+    manifest = json.loads((batch_dir / 'manifest.json').read_text())
+    manifest['slides'] = manifest['slides'][1:2]
+    (batch_dir / 'manifest.json').write_text(json.dumps(manifest))
+
+    exit_code = HeadlessCLI().run(['batch', str(batch_dir / 'manifest.json'),
+                                   '--output', str(batch_dir / 'cli'), '--workers', '1'])
+
+    assert exit_code == 0
+    assert '[1/1] slide02' in capsys.readouterr().out
+    assert (batch_dir / 'cli' / 'batch_report.csv').exists()
+    assert list((batch_dir / 'cli' / 'slide02').glob('*.cxprotocol'))
@@ -0,0 +1,179 @@
+"""
+DEV Mode Tests for Cell Image Export
+
+Tests parallel crop encoding, cancellation and the background export
+worker used by ImageExportDialog.
+"""
+
+import csv
+import io
+import sys
+import threading
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from PIL import Image
+from PySide6.QtWidgets import QApplication
+
+sys.path.insert(0, 'src')
+
+from models.image_exporter import square_crop_boxes, export_cell_crops, export_crop_container
+from utils.exceptions import ExportError
+from components.dialogs.image_export_dialog import ImageExportDialog
+
+
+@pytest.fixture
+def app():
+    """Create QApplication instance for testing."""
+    yield QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def plate_image():
+    """Random RGB image with a grid of 20x30 pixel cells."""
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 255, (1000, 1000, 3), dtype=np.uint8)
+    boxes = [(x, y, x + 20, y + 30) for y in range(0, 960, 40) for x in range(0, 980, 25)]
+    return image, boxes
+
+
+def test_square_crop_boxes_stay_inside_image():
+    """Squares keep the longer side and are shifted back inside the image."""
+    squares = square_crop_boxes(np.array([
+        (100, 100, 120, 130),  # interior: 30x30 around the center
+        (-5, 10, 15, 20),      # left edge: shifted right
+        (590, 390, 610, 400),  # bottom-right corner: shifted up/left
+    ]), (400, 600))
+
+    assert squares.tolist() == [
+        [95, 100, 125, 130],
+        [0, 5, 20, 25],
+        [580, 380, 600, 400],
+    ]
+
+
+def test_parallel_crop_export(plate_image):
+    """Crops are written in parallel with the dialog's file naming."""
+    image, boxes = plate_image
+    cell_indices = list(range(len(boxes))) + [len(boxes) + 5]  # last index has no box
+    progress = []
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        start = time.perf_counter()
+        counts = export_cell_crops(
+            image, boxes, cell_indices, Path(temp_dir), 'Cells', max_workers=4,
+            progress_callback=lambda done, total: progress.append((done, total))
+        )
+        elapsed = time.perf_counter() - start
+        print(f"\n{counts['exported']} crops in {elapsed:.2f}s "
+              f"({counts['exported'] / elapsed:,.0f} crops/s)")
+
+        assert counts == {'exported': len(boxes), 'skipped': 1, 'total': len(boxes) + 1}
+        assert progress[-1] == (len(cell_indices), len(cell_indices))
+
+        files = sorted(Path(temp_dir).glob('*.jpg'))
+        assert len(files) == len(boxes)
+        assert files[0].name == 'Cells_001.jpg'
+
+        with Image.open(files[0]) as first:
+            assert first.size == (30, 30), "Crops should be square"
+
+
+def test_crop_export_cancellation(plate_image):
+    """Setting the cancel event stops submitting new crops."""
+    image, boxes = plate_image
+    cancel_event = threading.Event()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        counts = export_cell_crops(
+            image, boxes, list(range(len(boxes))), Path(temp_dir), 'Cells', max_workers=1,
+            progress_callback=lambda done, total: cancel_event.set(), cancel_event=cancel_event
+        )
+
+        written = len(list(Path(temp_dir).glob('*.jpg')))
+        assert 1 <= counts['exported'] < len(boxes)
+        assert written == counts['exported']
+
+
+def test_dialog_exports_in_background(app, plate_image):
+    """The dialog runs the export in a worker and reports throughput."""
+    image, boxes = plate_image
+    selections = {
+        'sel_1': {'id': 'sel_1', 'label': 'Positive', 'color': '#FF0000',
+                  'well_position': 'A01', 'cell_indices': list(range(200))}
+    }
+    dialog = ImageExportDialog(selections, image, boxes)
+
+    with tempfile.TemporaryDirectory() as temp_dir, \
+            patch('components.dialogs.image_export_dialog.QMessageBox') as message_box:
+        worker = dialog.start_export(selections['sel_1'], temp_dir)
+        assert worker.wait(30000), "Export should finish"
+        app.processEvents()
+
+        assert len(list(Path(temp_dir).glob('Positive_*.jpg'))) == 200
+        assert (Path(temp_dir) / 'Positive.jpg').exists(), "Overlay image should be written"
+        assert worker.crops_per_second > 0
+        assert 'crops/s' in dialog.progress_status.text()
+        assert dialog.progress_bar.value() == 100
+        message_box.information.assert_called_once()
+
+    dialog.deleteLater()
+
+
+@pytest.mark.parametrize('container', ['zip', 'tiff', 'montage'])
+def test_crop_container_index(plate_image, container):
+    """Every container is written as one file with an index locating each crop."""
+    image, boxes = plate_image
+    cell_indices = list(range(len(boxes)))
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        counts = export_crop_container(image, boxes, cell_indices, Path(temp_dir), 'Cells',
+                                       container=container)
+        path = counts['path']
+        assert counts['exported'] == len(boxes)
+        assert [p.name for p in Path(temp_dir).iterdir() if p != path] == \
+            ([] if container == 'zip' else ['Cells_index.csv'])
+
+        if container == 'zip':
+            with zipfile.ZipFile(path) as archive:
+                assert len(archive.namelist()) == len(boxes) + 1
+                rows = list(csv.DictReader(io.StringIO(archive.read('index.csv').decode())))
+        else:
+            with open(Path(temp_dir) / 'Cells_index.csv', newline='') as index_file:
+                rows = list(csv.DictReader(index_file))
+        assert len(rows) == len(boxes)
+        row = rows[7]
+        box = [int(row[key]) for key in ('min_x', 'min_y', 'max_x', 'max_y')]
+
+        if container == 'zip':
+            # Stored members can be read straight from the recorded byte range
+            raw = path.read_bytes()
+            data = raw[int(row['offset']):int(row['offset']) + int(row['length'])]
+            with Image.open(io.BytesIO(data)) as crop:
+                assert crop.size == (box[2] - box[0], box[3] - box[1])
+        elif container == 'tiff':
+            with Image.open(path) as stack:
+                assert stack.n_frames == len(boxes)
+                stack.seek(int(row['entry']))
+                np.testing.assert_array_equal(np.asarray(stack),
+                                              image[box[1]:box[3], box[0]:box[2]])
+        else:
+            with Image.open(path) as sheet:
+                tile = sheet.crop((int(row['tile_x']), int(row['tile_y']),
+                                   int(row['tile_x']) + int(row['width']),
+                                   int(row['tile_y']) + int(row['height'])))
+                assert tile.size == (box[2] - box[0], box[3] - box[1])
+
+
+def test_unknown_crop_container(plate_image):
+    """Unknown container names are rejected before anything is written."""
+    image, boxes = plate_image
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with pytest.raises(ExportError):
+            export_crop_container(image, boxes, [0], Path(temp_dir), 'Cells', container='tar')
+        assert not any(Path(temp_dir).iterdir())
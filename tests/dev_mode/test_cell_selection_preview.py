@@ -20,9 +20,9 @@ from PySide6.QtGui import QPixmap
 
 from components.widgets.cell_selection_preview import (
     CellSelectionPreview, 
-    CellThumbnailWidget, 
     CellThumbnailData
 )
+from components.widgets.cell_list_model import CellListModel, CellThumbnailDelegate
 from headless.testing.framework import UITestCase, HeadlessTestRunner
 from utils.logging_config import setup_logging
 
@@ -72,19 +72,13 @@ class TestCellSelectionPreviewDEV(UITestCase):
         self.logger.debug(f"Created {count} mock cell data entries")
         return cell_data
     
-    def _simulate_click(self, widget) -> None:
-        """Simulate click on widget by calling click handler directly."""
-        if hasattr(widget, 'cell_data'):
-            # For thumbnail widgets, emit the clicked signal directly
-            widget.clicked.emit(widget.cell_data.cell_index)
+    def _simulate_click(self, row: int) -> None:
+        """Simulate click on a thumbnail tile by emitting the view signal."""
+        self.preview.cell_view.clicked.emit(self.preview.cell_model.index(row))
     
-    def _simulate_double_click(self, widget) -> None:
-        """Simulate double-click on widget by toggling inclusion directly."""
-        if hasattr(widget, 'cell_data'):
-            # Toggle inclusion state and emit signal
-            widget.cell_data.is_included = not widget.cell_data.is_included
-            widget.inclusion_changed.emit(widget.cell_data.cell_index, widget.cell_data.is_included)
-            widget.update_appearance()
+    def _simulate_double_click(self, row: int) -> None:
+        """Simulate double-click on a thumbnail tile to toggle inclusion."""
+        self.preview.cell_view.doubleClicked.emit(self.preview.cell_model.index(row))
     
     def test_component_initialization_dev(self):
         """DEV: Test component initialization and UI setup."""
@@ -96,13 +90,13 @@ class TestCellSelectionPreviewDEV(UITestCase):
         
         # Verify initial state
         self.assertEqual(len(self.preview.cell_thumbnails), 0)
-        self.assertEqual(len(self.preview.thumbnail_widgets), 0)
+        self.assertEqual(self.preview.cell_model.rowCount(), 0)
         self.assertIsNone(self.preview.selected_cell_index)
         
         # Verify UI elements exist
         self.assertTrue(hasattr(self.preview, 'title_label'))
         self.assertTrue(hasattr(self.preview, 'subtitle_label'))
-        self.assertTrue(hasattr(self.preview, 'grid_container'))
+        self.assertTrue(hasattr(self.preview, 'cell_view'))
         self.assertTrue(hasattr(self.preview, 'confirm_button'))
         self.assertTrue(hasattr(self.preview, 'cancel_button'))
         
@@ -125,16 +119,19 @@ class TestCellSelectionPreviewDEV(UITestCase):
         
         # Verify cells loaded
         self.assertEqual(len(self.preview.cell_thumbnails), 10)
-        self.assertEqual(len(self.preview.thumbnail_widgets), 10)
+        self.assertEqual(self.preview.cell_model.rowCount(), 10)
         
-        # Verify thumbnail widgets created
-        for i, widget in enumerate(self.preview.thumbnail_widgets):
-            self.assertIsInstance(widget, CellThumbnailWidget)
-            self.assertEqual(widget.cell_data.cell_index, i)
-            self.assertTrue(widget.cell_data.is_included)
+        # Verify model rows created
+        model = self.preview.cell_model
+        for i in range(model.rowCount()):
+            index = model.index(i)
+            self.assertEqual(index.data(CellListModel.CellIndexRole), i)
+            self.assertTrue(index.data(CellListModel.IncludedRole))
+            self.assertEqual(index.data(CellListModel.ThumbnailRole).cacheKey(),
+                             cell_data[i].thumbnail_pixmap.cacheKey())
         
-        # Verify grid layout
-        self.assertEqual(self.preview.grid_layout.count(), 10)
+        # Verify grid view uses the thumbnail delegate
+        self.assertIsInstance(self.preview.cell_view.itemDelegate(), CellThumbnailDelegate)
         
         # Verify statistics updated
         stats_text = self.preview.total_cells_label.text()
@@ -155,10 +152,7 @@ class TestCellSelectionPreviewDEV(UITestCase):
         self.preview.cell_clicked.connect(lambda idx: cell_clicked_signals.append(idx))
         
         # Simulate clicking first thumbnail
-        first_widget = self.preview.thumbnail_widgets[0]
-        
-        # Simulate click
-        self._simulate_click(first_widget)
+        self._simulate_click(0)
         
         # Verify click was handled
         self.assertEqual(len(cell_clicked_signals), 1)
@@ -166,7 +160,8 @@ class TestCellSelectionPreviewDEV(UITestCase):
         self.assertEqual(self.preview.selected_cell_index, 0)
         
         # Verify visual state update
-        self.assertTrue(first_widget._is_selected)
+        self.assertTrue(self.preview.cell_model.index(0).data(CellListModel.SelectedRole))
+        self.assertFalse(self.preview.cell_model.index(1).data(CellListModel.SelectedRole))
         
         self.logger.info("✅ Thumbnail interaction simulation verified")
     
@@ -178,15 +173,16 @@ class TestCellSelectionPreviewDEV(UITestCase):
         cell_data = self._create_mock_cell_data(3)
         self.preview.load_cells(cell_data)
         
-        # Get first thumbnail widget
-        first_widget = self.preview.thumbnail_widgets[0]
-        initial_inclusion = first_widget.cell_data.is_included
+        # Get first cell's state
+        first_cell = self.preview.cell_thumbnails[0]
+        initial_inclusion = first_cell.is_included
         
         # Simulate double-click to toggle inclusion
-        self._simulate_double_click(first_widget)
+        self._simulate_double_click(0)
         
         # Verify inclusion toggled
-        self.assertNotEqual(first_widget.cell_data.is_included, initial_inclusion)
+        self.assertNotEqual(first_cell.is_included, initial_inclusion)
+        self.assertFalse(self.preview.cell_model.is_included(0))
         
         # Verify statistics updated
         included_count = sum(1 for cell in self.preview.cell_thumbnails if cell.is_included)
@@ -284,8 +280,11 @@ class TestCellSelectionPreviewDEV(UITestCase):
         """DEV: Test performance with large dataset."""
         self.logger.info("Testing large dataset performance...")
         
-        # Test with maximum allowed thumbnails
-        large_cell_data = self._create_mock_cell_data(50)  # Max limit
+        # A 20k-cell selection without pre-rendered thumbnails
+        large_cell_data = [
+            CellThumbnailData(cell_index=i, bounding_box=(i, i, i + 20, i + 20))
+            for i in range(20000)
+        ]
         
         import time
         start_time = time.time()
@@ -293,11 +292,11 @@ class TestCellSelectionPreviewDEV(UITestCase):
         load_time = time.time() - start_time
         
         # Verify all cells loaded
-        self.assertEqual(len(self.preview.cell_thumbnails), 50)
-        self.assertEqual(len(self.preview.thumbnail_widgets), 50)
+        self.assertEqual(len(self.preview.cell_thumbnails), 20000)
+        self.assertEqual(self.preview.cell_model.rowCount(), 20000)
         
-        # Performance should be reasonable (under 5 seconds for component creation)
-        self.assertLess(load_time, 5.0, f"Loading took too long: {load_time:.2f}s")
+        # Tiles are virtualized, so loading does not create per-cell widgets
+        self.assertLess(load_time, 1.0, f"Loading took too long: {load_time:.2f}s")
         
         self.logger.info(f"✅ Large dataset performance verified (load time: {load_time:.3f}s)")
     
@@ -305,7 +304,8 @@ class TestCellSelectionPreviewDEV(UITestCase):
         """DEV: Test handling of datasets exceeding limits."""
         self.logger.info("Testing exceeded limit handling...")
         
-        # Test with more than maximum allowed thumbnails
+        # Test with more than the configured maximum
+        self.preview.max_thumbnails = 50
         oversized_data = self._create_mock_cell_data(75)  # Over 50 limit
         
         with patch.object(self.preview, 'log_warning') as mock_warning:
@@ -317,7 +317,7 @@ class TestCellSelectionPreviewDEV(UITestCase):
         
         # Verify only max allowed cells were loaded
         self.assertEqual(len(self.preview.cell_thumbnails), self.preview.max_thumbnails)
-        self.assertEqual(len(self.preview.thumbnail_widgets), self.preview.max_thumbnails)
+        self.assertEqual(self.preview.cell_model.rowCount(), self.preview.max_thumbnails)
         
         self.logger.info("✅ Exceeded limit handling verified")
     
@@ -330,8 +330,7 @@ class TestCellSelectionPreviewDEV(UITestCase):
         
         # Verify empty state
         self.assertEqual(len(self.preview.cell_thumbnails), 0)
-        self.assertEqual(len(self.preview.thumbnail_widgets), 0)
-        self.assertEqual(self.preview.grid_layout.count(), 0)
+        self.assertEqual(self.preview.cell_model.rowCount(), 0)
         
         # Verify statistics
         self.assertEqual("Total: 0", self.preview.total_cells_label.text())
@@ -354,13 +353,13 @@ class TestCellSelectionPreviewDEV(UITestCase):
             
             # Verify current state
             self.assertEqual(len(self.preview.cell_thumbnails), 10)
-            self.assertEqual(len(self.preview.thumbnail_widgets), 10)
+            self.assertEqual(self.preview.cell_model.rowCount(), 10)
             
             # Clear and verify cleanup
             self.preview.clear_thumbnails()
             self.assertEqual(len(self.preview.cell_thumbnails), 0)
-            self.assertEqual(len(self.preview.thumbnail_widgets), 0)
-            self.assertEqual(self.preview.grid_layout.count(), 0)
+            self.assertEqual(self.preview.cell_model.rowCount(), 0)
+            self.assertIsNone(self.preview.cell_model.thumbnail(0))
         
         self.logger.info("✅ Memory management verified")
     
@@ -386,12 +385,12 @@ class TestCellSelectionPreviewDEV(UITestCase):
         self.preview.load_cells(cell_data)
         
         # 2. Interact with thumbnails
-        self._simulate_click(self.preview.thumbnail_widgets[0])
-        self._simulate_click(self.preview.thumbnail_widgets[2])
+        self._simulate_click(0)
+        self._simulate_click(2)
         
         # 3. Toggle some inclusions
-        self._simulate_double_click(self.preview.thumbnail_widgets[1])
-        self._simulate_double_click(self.preview.thumbnail_widgets[4])
+        self._simulate_double_click(1)
+        self._simulate_double_click(4)
         
         # 4. Confirm selection
         self.preview.confirm_button.click()
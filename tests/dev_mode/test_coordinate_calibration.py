@@ -175,7 +175,138 @@ class TestCoordinateCalibrationDev(UITestCase):
             assert abs(trans_min_y - top_left.stage_y) < 0.1, f"Min Y transformation mismatch for box {i}"
             assert abs(trans_max_x - bottom_right.stage_x) < 0.1, f"Max X transformation mismatch for box {i}"
             assert abs(trans_max_y - bottom_right.stage_y) < 0.1, f"Max Y transformation mismatch for box {i}"
-    
+
+    def test_array_transformation(self):
+        """Test vectorized pixel/stage transformation of point arrays."""
+        # Models import exceptions via the 'utils' package on sys.path
+        from utils.exceptions import TransformationError as array_error
+
+        # Array API requires calibration
+        with pytest.raises(array_error):
+            self.transformer.pixel_to_stage_array(np.zeros((1, 2)))
+
+        for point in self.test_points:
+            self.transformer.add_calibration_point(
+                point.pixel_x, point.pixel_y, point.stage_x, point.stage_y, point.label
+            )
+
+        pixels = np.array([[100, 150], [800, 600], [400, 300], [0, 0]])
+        stage = self.transformer.pixel_to_stage_array(pixels)
+
+        assert stage.shape == (4, 2), "Should return one stage point per input point"
+        for (px, py), (sx, sy) in zip(pixels, stage):
+            single = self.transformer.pixel_to_stage(int(px), int(py))
+            assert abs(single.stage_x - sx) < 1e-6, "Array and scalar X results should match"
+            assert abs(single.stage_y - sy) < 1e-6, "Array and scalar Y results should match"
+
+        # Inverse transformation round-trips
+        round_trip = self.transformer.stage_to_pixel_array(stage)
+        np.testing.assert_allclose(round_trip, pixels, atol=1e-6)
+
+        # Empty input and malformed shapes
+        assert self.transformer.pixel_to_stage_array(np.empty((0, 2))).shape == (0, 2)
+        with pytest.raises(array_error):
+            self.transformer.pixel_to_stage_array(np.zeros((3, 3)))
+
+    def test_n_point_least_squares_models(self):
+        """Test N-point least-squares fits for each transformation model."""
+        rng = np.random.default_rng(7)
+        pixels = np.round(rng.uniform(0, 5000, (10, 2)))
+        affine = np.array([[10.2, 0.4, 1000.0], [-0.3, 9.8, 2000.0]])
+        stage = pixels @ affine[:, :2].T + affine[:, 2]
+        points = [
+            CalibrationPoint(int(px), int(py), float(sx), float(sy), f"P{i}")
+            for i, ((px, py), (sx, sy)) in enumerate(zip(pixels, stage))
+        ]
+
+        # Full affine recovers the generating transform exactly
+        assert self.transformer.set_calibration_points(points, model='affine')
+        np.testing.assert_allclose(self.transformer.transform_matrix, affine, atol=1e-6)
+
+        quality = self.transformer.calibration_quality
+        assert quality['transformation_model'] == 'affine'
+        assert len(quality['residuals_um']) == len(points), "Should report one residual per point"
+        assert quality['loo_max_error_um'] < 1e-6, "Leave-one-out error should be ~0 for exact data"
+
+        # Projective model also fits an affine map and inverts consistently
+        assert self.transformer.set_calibration_points(points, model='projective')
+        assert self.transformer.transform_matrix.shape == (3, 3)
+        round_trip = self.transformer.stage_to_pixel_array(self.transformer.pixel_to_stage_array(pixels))
+        np.testing.assert_allclose(round_trip, pixels, atol=1e-4)
+
+        # Similarity cannot represent shear, so leave-one-out error is non-zero
+        assert self.transformer.set_calibration_points(points, model='similarity')
+        assert self.transformer.calibration_quality['loo_max_error_um'] > 1.0
+
+    def test_ransac_outlier_rejection(self):
+        """Test that RANSAC rejects a mistyped calibration point."""
+        pixels = np.array([[100, 100], [4000, 200], [300, 3500], [3800, 3900], [2000, 2000], [1000, 3000]])
+        stage = pixels * 10.0 + np.array([500.0, 700.0])
+        stage[4] += 250.0  # Mistyped stage reading
+        points = [
+            CalibrationPoint(int(px), int(py), float(sx), float(sy))
+            for (px, py), (sx, sy) in zip(pixels, stage)
+        ]
+
+        self.transformer.ransac_threshold_um = 1.0
+        assert self.transformer.set_calibration_points(points, model='affine')
+
+        quality = self.transformer.calibration_quality
+        assert quality['outlier_indices'] == [4], "Should reject only the mistyped point"
+        assert quality['inlier_count'] == 5
+        assert quality['max_error_um'] < 1e-6, "Inliers should fit exactly"
+        assert quality['residuals_um'][4] > 100, "Outlier residual should be reported"
+
+    def test_grid_warp_calibration(self):
+        """Test thin-plate spline warp correcting smooth stage nonlinearity."""
+        def stage_of(pixels):
+            x, y = pixels[:, 0], pixels[:, 1]
+            return np.column_stack([
+                4.0 * x + 1000.0 + 30.0 * np.sin(x / 3000.0),
+                4.0 * y + 2000.0 + 20.0 * np.cos(y / 2500.0)
+            ])
+
+        rng = np.random.default_rng(3)
+        pixels = np.round(rng.uniform(0, 20000, (60, 2)))
+        stage = stage_of(pixels)
+        points = [
+            CalibrationPoint(int(px), int(py), float(sx), float(sy))
+            for (px, py), (sx, sy) in zip(pixels, stage)
+        ]
+        test_pixels = rng.uniform(1000, 19000, (2000, 2))
+
+        # Global affine alone cannot follow the distortion
+        assert self.transformer.set_calibration_points(points, model='affine')
+        global_error = np.linalg.norm(
+            self.transformer.pixel_to_stage_array(test_pixels) - stage_of(test_pixels), axis=1
+        ).mean()
+
+        warped = CoordinateTransformer()
+        warped.warp_method = 'tps'
+        warped.warp_bounds = (0, 0, 20000, 20000)
+        warped.warp_grid_spacing = 128
+        assert warped.set_calibration_points(points, model='affine')
+        warped_stage = warped.pixel_to_stage_array(test_pixels)
+        warped_error = np.linalg.norm(warped_stage - stage_of(test_pixels), axis=1).mean()
+
+        assert warped_error < global_error / 5, "Warp should substantially reduce mapping error"
+
+        quality = warped.calibration_quality
+        assert quality['warp_method'] == 'tps'
+        assert quality['warp_grid_error_um'] < 1.0, "Lookup grid should track the exact spline"
+        assert quality['loo_average_error_um'] is not None
+
+        # Inverse and scalar paths agree with the warped array transform
+        np.testing.assert_allclose(warped.stage_to_pixel_array(warped_stage[:50]), test_pixels[:50], atol=1e-3)
+        single = warped.pixel_to_stage(int(test_pixels[0, 0]), int(test_pixels[0, 1]))
+        expected = warped.pixel_to_stage_array(np.trunc(test_pixels[:1]))[0]
+        assert abs(single.stage_x - expected[0]) < 1e-6
+
+        # Export/import rebuilds the same warp
+        restored = CoordinateTransformer()
+        assert restored.import_calibration(warped.export_calibration())
+        np.testing.assert_allclose(restored.pixel_to_stage_array(test_pixels[:10]), warped_stage[:10])
+
     def test_calibration_export_import(self):
         """Test calibration data serialization and deserialization."""
         # Set up calibration
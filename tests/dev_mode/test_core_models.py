@@ -0,0 +1,125 @@
+"""
+DEV Mode Tests for the Qt-free Core
+
+Tests that the core package and the batch processor import without
+PySide6, the callback interface, and that the Qt adapters in models/
+deliver core notifications as signals.
+"""
+
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, 'src')
+
+from core.observer import Callback
+from core.cell_table import CellTable
+from core.calibration import CalibrationModel
+from core.selections import SelectionModel
+from models.csv_parser import CSVParser
+from models.selection_manager import SelectionManager
+
+SRC_DIR = Path(__file__).resolve().parents[2] / 'src'
+
+
+@pytest.fixture
+def cell_csv(tmp_path):
+    """Small CellProfiler-style table."""
+    path = tmp_path / 'cells.csv'
+    pd.DataFrame({
+        'AreaShape_BoundingBoxMinimum_X': [0, 10, 20],
+        'AreaShape_BoundingBoxMinimum_Y': [0, 10, 20],
+        'AreaShape_BoundingBoxMaximum_X': [8, 18, 28],
+        'AreaShape_BoundingBoxMaximum_Y': [6, 16, 26],
+        'AreaShape_Area': [48.0, 48.0, 48.0],
+    }).to_csv(path, index=False)
+    return path
+
+
+def test_core_imports_without_qt():
+    """Workers importing the core and the batch processor never load PySide6."""
+    script = textwrap.dedent("""
+        import sys
+        sys.path.insert(0, '.')
+        import core, models.protocol_writer, services.batch_processor
+        from utils.error_handler import error_handler
+        print(sorted(name for name in sys.modules if name.startswith(('PySide6', 'shiboken6'))))
+    """)
+    result = subprocess.run([sys.executable, '-c', script], cwd=SRC_DIR,
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == '[]'
+
+
+def test_callbacks_are_per_instance():
+    """Callbacks are delivered in order, per instance, and a failing one does not stop the rest."""
+    class Model:
+        changed = Callback(str)
+
+    first, second = Model(), Model()
+    received = []
+    first.changed.connect(lambda value: 1 / 0)
+    first.changed.connect(received.append)
+
+    first.changed.emit('a')
+    second.changed.emit('b')
+    assert received == ['a']
+    assert len(second.changed) == 0
+
+    first.changed.disconnect(received.append)
+    first.changed.emit('c')
+    assert received == ['a']
+
+
+def test_core_models_notify_observers(cell_csv):
+    """Core models work synchronously with plain callbacks."""
+    table = CellTable()
+    loaded = []
+    table.csv_loaded.connect(loaded.append)
+    assert table.load_csv(str(cell_csv))
+    assert loaded == [str(cell_csv)]
+    assert table.get_data_by_index(1)['Location_Center_X'] == 14
+
+    failures = []
+    table.csv_load_failed.connect(failures.append)
+    assert not table.load_csv(str(cell_csv.with_name('missing.csv')))
+    assert table.data is None and 'File not found' in failures[0]
+
+    selections = SelectionModel()
+    added = []
+    selections.selection_added.connect(added.append)
+    selection_id = selections.add_selection([0, 2], label='Pair')
+    assert added == [selection_id]
+    assert selections.get_selection(selection_id).well_position == 'A01'
+
+    calibration = CalibrationModel()
+    updates = []
+    calibration.calibration_updated.connect(updates.append)
+    calibration.add_calibration_point(0, 0, 100.0, 200.0)
+    calibration.add_calibration_point(100, 100, 150.0, 250.0)
+    assert updates[-1] is True
+    result = calibration.pixel_to_stage(50, 50)
+    assert np.allclose((result.stage_x, result.stage_y), (125.0, 225.0))
+
+
+def test_qt_adapters_emit_signals():
+    """The models/ classes are QObjects whose signals carry the core notifications."""
+    from PySide6.QtCore import QObject
+
+    manager = SelectionManager()
+    assert isinstance(manager, QObject) and isinstance(manager, SelectionModel)
+    assert manager.max_selections == 96, "Core state is initialized through QObject"
+
+    added = []
+    manager.selection_added.connect(added.append)
+    selection_id = manager.add_selection([1, 2, 3])
+    assert added == [selection_id]
+    assert type(manager.selection_added).__name__ == 'SignalInstance'
+
+    parser = CSVParser()
+    assert isinstance(parser, CellTable) and parser.data is None and parser.parse_thread is None
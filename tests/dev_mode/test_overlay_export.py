@@ -0,0 +1,130 @@
+"""
+DEV Mode Tests for Overlay Image Export
+
+Tests the strip-wise overlay renderer against PIL drawing, tiled TIFF and
+BigTIFF streaming, downsampled previews and the ExportWorker image path.
+"""
+
+import sys
+import threading
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, 'src')
+
+from models.overlay_renderer import (
+    iter_overlay_strips, overlay_layer, render_overlay, overlay_size
+)
+from components.dialogs.export_dialog import ExportWorker
+
+
+@pytest.fixture
+def slide():
+    """Random RGB image with boxes crossing every edge and strip boundary."""
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 255, (700, 900, 3), dtype=np.uint8)
+    xs = rng.integers(-30, 930, (2000, 2))
+    ys = rng.integers(-30, 730, (2000, 2))
+    boxes = np.stack([xs.min(1), ys.min(1), xs.max(1), ys.max(1)], axis=1)
+    return image, boxes
+
+
+def pil_overlay(image, boxes, cell_indices, color):
+    """Reference rendering with ImageDraw, as the exporters used to do it."""
+    reference = Image.fromarray(image).convert('RGB')
+    draw = ImageDraw.Draw(reference)
+    for cell_index in cell_indices:
+        draw.rectangle(list(boxes[cell_index]), outline=color, width=1)
+    return np.asarray(reference)
+
+
+@pytest.mark.parametrize('channels', [3, 1])
+def test_outlines_match_pil(slide, channels):
+    """Vectorized outlines are pixel-identical to ImageDraw rectangles."""
+    image, boxes = slide
+    if channels == 1:
+        image = image[:, :, 0]
+    cell_indices = list(range(0, len(boxes), 3))
+
+    strips = [strip for _, strip in iter_overlay_strips(
+        image, [overlay_layer(boxes, cell_indices, '#00FF00')], strip_rows=100)]
+
+    np.testing.assert_array_equal(np.concatenate(strips),
+                                  pil_overlay(image, boxes, cell_indices, (0, 255, 0)))
+    assert not np.shares_memory(strips[0], image), "Source image must not be drawn on"
+
+
+@pytest.mark.parametrize('bigtiff', [False, True])
+def test_tiled_tiff_stream(slide, bigtiff):
+    """Tiled (Big)TIFF output decodes to the same pixels as the reference."""
+    image, boxes = slide
+    layers = [overlay_layer(boxes, range(100), '#FF0000')]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = render_overlay(image, layers, Path(temp_dir) / 'overlay.tif', 'tiff', bigtiff=bigtiff)
+        assert path.read_bytes()[:4] == (b'II+\x00' if bigtiff else b'II*\x00')
+        with Image.open(path) as written:
+            assert written.size == (900, 700)
+            np.testing.assert_array_equal(np.asarray(written),
+                                          pil_overlay(image, boxes, range(100), (255, 0, 0)))
+
+
+def test_preview_scale(slide):
+    """Previews are block averages of the source with boxes scaled down."""
+    image, boxes = slide
+    assert overlay_size(image.shape, 4) == (225, 175, 4)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = render_overlay(image, [], Path(temp_dir) / 'preview.png', 'png', downsample=4)
+        with Image.open(path) as preview:
+            pixels = np.asarray(preview).astype(float)
+
+    expected = image.reshape(175, 4, 225, 4, 3).mean(axis=(1, 3))
+    assert np.abs(pixels - expected).max() <= 0.5
+
+
+def test_render_cancellation_removes_file(slide):
+    """A cancelled render leaves no partial output behind."""
+    image, boxes = slide
+    cancel_event = threading.Event()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / 'overlay.tif'
+        result = render_overlay(image, [overlay_layer(boxes, range(10), '#FF0000')], path,
+                                progress_callback=lambda done, total: cancel_event.set(),
+                                cancel_event=cancel_event)
+        assert result is None
+        assert not path.exists()
+
+
+def test_export_worker_draws_session_boxes(slide):
+    """ExportWorker outlines the session's real bounding boxes over a translucent fill."""
+    image, _ = slide
+    boxes = [(10, 10, 50, 60), (300, 200, 340, 260)]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        image_file = Path(temp_dir) / 'slide.png'
+        Image.fromarray(image).save(image_file)
+        session_data = {'data': {
+            'image_file': str(image_file),
+            'bounding_boxes': boxes,
+            'selections': [{'color': '#0000FF', 'cell_indices': [1]}],
+        }}
+        worker = ExportWorker({'output_directory': temp_dir, 'image_format': 'TIFF',
+                               'image_downsample': 1}, session_data)
+        worker._export_image()
+
+        exported = list(Path(temp_dir).glob('cellsorter_image_*.tiff'))
+        assert len(exported) == 1
+        with Image.open(exported[0]) as written:
+            pixels = np.asarray(written)
+
+    assert tuple(pixels[200, 320]) == (0, 0, 255)      # outline
+    assert tuple(pixels[30, 10]) == tuple(image[30, 10])  # unselected cell untouched
+    inside = pixels[230, 320].astype(int)
+    expected = (image[230, 320].astype(int) + np.array([0, 0, 255])) / 2
+    assert np.abs(inside - expected).max() <= 1          # 50% fill
@@ -13,6 +13,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../.
 import pytest
 import tempfile
 import configparser
+import numpy as np
 from pathlib import Path
 from typing import List, Dict, Any
 from unittest.mock import Mock, patch
@@ -170,7 +171,28 @@ class TestProtocolExporterDev(UITestCase):
         
         assert crop_region is not None, "Should handle huge bounding box"
         assert crop_region.size <= self.extractor.max_crop_size_pixels, "Should enforce maximum crop size"
-    
+
+    def test_batch_square_crops_match_single(self):
+        """Test that the vectorized crop engine matches per-box calculation."""
+        rng = np.random.default_rng(0)
+        origins = rng.uniform(-20, 1020, (500, 2))
+        sizes = rng.uniform(-5, 300, (500, 2))
+        boxes = np.hstack([origins, origins + sizes])
+        image_bounds = (self.image_info['width'], self.image_info['height'])
+
+        crops = self.extractor.calculate_square_crops(boxes, image_bounds)
+
+        assert len(crops) == len(boxes), "Should return one record per box"
+        for box, crop in zip(boxes, crops):
+            single = self.extractor.calculate_square_crop(BoundingBox(*box), image_bounds)
+            assert bool(crop['valid']) == (single is not None), f"Validity mismatch for {box}"
+            if single is not None:
+                np.testing.assert_allclose(
+                    [crop['min_x'], crop['min_y'], crop['max_x'], crop['max_y'], crop['size']],
+                    [single.min_x, single.min_y, single.max_x, single.max_y, single.size]
+                )
+                assert crop['min_x'] >= 0 and crop['max_x'] <= image_bounds[0], "Crop should stay in bounds"
+
     def test_extraction_points_creation(self):
         """Test creation of extraction points from selections and bounding boxes."""
         extraction_points = self.extractor.create_extraction_points(
@@ -273,6 +295,115 @@ class TestProtocolExporterDev(UITestCase):
         
         # Clean up
         protocol_file.unlink()
+
+    def test_streaming_protocol_writer(self):
+        """Test chunked protocol writing, atomic replace and linked backup."""
+        from src.models.protocol_writer import write_protocol
+        import time
+
+        count = 50000
+        rng = np.random.default_rng(0)
+        boxes = rng.uniform(0, 50000, size=(count, 4))
+        colors = ['ff0000'] * count
+        wells = ['A01'] * count
+        labels = [f'Cell_{i}' for i in range(count)]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = Path(temp_dir) / 'large.cxprotocol'
+            backup_path = Path(temp_dir) / 'large.backup.cxprotocol'
+
+            start = time.perf_counter()
+            result = write_protocol(output_path, {'FILE': 'large.tiff'}, boxes, colors, wells,
+                                    labels, backup_path=backup_path, chunk_size=4096)
+            elapsed = time.perf_counter() - start
+            size_mb = output_path.stat().st_size / 1e6
+            print(f"\n{count} points in {elapsed:.3f}s "
+                  f"({count / elapsed:,.0f} points/s, {size_mb / elapsed:.1f} MB/s)")
+
+            assert result == backup_path
+            assert backup_path.read_bytes() == output_path.read_bytes(), "Backup should match output"
+            assert not list(Path(temp_dir).glob('*.tmp')), "No temporary files should remain"
+            assert elapsed < 10.0, "Streaming writer should handle 50k points quickly"
+
+            # Output must stay readable by ConfigParser
+            config = configparser.ConfigParser()
+            config.read(output_path)
+            layout = config['IMAGING_LAYOUT']
+            assert int(layout['Points']) == count
+            first = [p.strip() for p in layout['P_1'].split(';')]
+            assert float(first[0]) == pytest.approx(boxes[0, 0], abs=1e-4)
+            assert first[4:7] == ['ff0000', 'A01', 'Cell_0']
+            assert layout[f'P_{count}'].split(';')[6].strip() == f'Cell_{count - 1}'
+
+            # A failing write leaves the previous file untouched
+            before = output_path.read_bytes()
+            with pytest.raises(ValueError):
+                write_protocol(output_path, {'FILE': 'x'}, np.zeros(5), colors[:2], wells[:2],
+                               labels[:2], chunk_size=1)
+            assert output_path.read_bytes() == before
+            assert not list(Path(temp_dir).glob('*.tmp'))
+
+    def test_batch_protocol_export_96_wells(self):
+        """Test exporting a full plate of selections in the worker pool."""
+        import threading
+        
+        rng = np.random.default_rng(1)
+        mins = rng.uniform(0, 900, size=(960, 2))
+        boxes = np.hstack([mins, mins + rng.uniform(5, 40, size=(960, 2))]).tolist()
+        wells = [f"{row}{col:02d}" for row in "ABCDEFGH" for col in range(1, 13)]
+        selections = [
+            {'id': f'sel_{i}', 'label': f'Population {i}', 'color': '#00FF00',
+             'well_position': well, 'cell_indices': list(range(i, 960, 96))}
+            for i, well in enumerate(wells)
+        ]
+        image_info = {'file_path': '/path/to/plate.tif', 'shape': (1000, 1000)}
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            progress = []
+            paths = self.extractor.export_protocol_batch(
+                selections, boxes, self.coordinate_transformer, temp_dir, image_info,
+                image_bounds=(1000, 1000), max_workers=4,
+                progress_callback=lambda done, total: progress.append((done, total))
+            )
+            
+            assert len(paths) == 96, "Should write one protocol per well"
+            assert paths[0].name == 'A01_Population_0.cxprotocol'
+            assert progress[-1] == (96, 96) and len(progress) == 96
+            
+            for path in (paths[0], paths[-1]):
+                validation = self.extractor.validate_protocol_file(str(path))
+                assert validation['is_valid'], validation['errors']
+                assert validation['point_count'] == 10
+            
+            # Per-well files hold the same entries as the single-selection path
+            single = Path(temp_dir) / 'single.cxprotocol'
+            assert self.extractor.export_protocol(
+                [selections[5]], boxes, self.coordinate_transformer, str(single), image_info,
+                image_bounds=(1000, 1000), backup=False
+            )
+            assert paths[5].read_bytes() == single.read_bytes()
+            
+            # Combined mode writes every well into one protocol
+            combined = self.extractor.export_protocol_batch(
+                selections, boxes, self.coordinate_transformer, Path(temp_dir) / 'combined',
+                image_info, image_bounds=(1000, 1000), combined=True
+            )
+            assert len(combined) == 1
+            assert self.extractor.validate_protocol_file(str(combined[0]))['point_count'] == 960
+        
+        # Cancellation stops the remaining files
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cancel_event = threading.Event()
+            
+            def cancel_after_first(done, total):
+                cancel_event.set()
+            
+            paths = self.extractor.export_protocol_batch(
+                selections, boxes, self.coordinate_transformer, temp_dir, image_info,
+                max_workers=1, progress_callback=cancel_after_first, cancel_event=cancel_event
+            )
+            assert 1 <= len(paths) < 96, "Cancelled export should stop early"
+            assert len(list(Path(temp_dir).glob('*.cxprotocol'))) == len(paths)
     
     def test_protocol_file_validation(self):
         """Test protocol file validation functionality."""
@@ -14,15 +14,16 @@ import logging
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
 
-from PySide6.QtWidgets import QApplication, QWidget
-from PySide6.QtCore import Qt, QTimer
-from PySide6.QtGui import QPixmap
+from PySide6.QtWidgets import QApplication, QWidget, QStyleOptionViewItem
+from PySide6.QtCore import Qt, QTimer, QEvent, QPointF
+from PySide6.QtGui import QPixmap, QMouseEvent
 
 from components.widgets.row_cell_manager import (
     RowCellManager, 
-    CellRowItem, 
-    CellRowData
+    CellRowData,
+    CellMetadataView
 )
+from components.widgets.cell_list_model import CellListModel, CellRowDelegate
 from headless.testing.framework import UITestCase, HeadlessTestRunner
 from utils.logging_config import setup_logging
 
@@ -76,20 +77,20 @@ class TestRowCellManagerDEV(UITestCase):
         return row_data
     
     def _simulate_cell_click(self, cell_index: int) -> None:
-        """Simulate clicking on a cell item."""
-        for item in self.manager.cell_items:
-            if item.cell_index == cell_index:
-                item.cell_selected.emit(cell_index)
-                break
+        """Simulate clicking on a cell row."""
+        index = self.manager.cell_model.index_of(cell_index)
+        self.manager.cell_list_view.clicked.emit(index)
     
     def _simulate_inclusion_toggle(self, cell_index: int) -> None:
-        """Simulate toggling cell inclusion."""
-        for item in self.manager.cell_items:
-            if item.cell_index == cell_index:
-                current_state = item.is_included
-                new_state = not current_state
-                item.inclusion_checkbox.setChecked(new_state)
-                break
+        """Simulate toggling cell inclusion through the row checkbox."""
+        model = self.manager.cell_model
+        index = model.index_of(cell_index)
+        new_state = Qt.Unchecked if model.is_included(cell_index) else Qt.Checked
+        model.setData(index, new_state, Qt.CheckStateRole)
+    
+    def _included_states(self) -> List[bool]:
+        """Inclusion state of each row."""
+        return [is_included for _, is_included in self.manager.cell_model.cell_states()]
     
     def test_component_initialization_dev(self):
         """DEV: Test component initialization."""
@@ -101,13 +102,13 @@ class TestRowCellManagerDEV(UITestCase):
         
         # Verify initial state
         self.assertIsNone(self.manager.current_row_data)
-        self.assertEqual(len(self.manager.cell_items), 0)
+        self.assertEqual(self.manager.cell_model.rowCount(), 0)
         self.assertIsNone(self.manager.selected_cell_index)
         
         # Verify UI elements exist
         self.assertTrue(hasattr(self.manager, 'title_label'))
         self.assertTrue(hasattr(self.manager, 'selection_info_label'))
-        self.assertTrue(hasattr(self.manager, 'cell_list_widget'))
+        self.assertTrue(hasattr(self.manager, 'cell_list_view'))
         self.assertTrue(hasattr(self.manager, 'navigate_button'))
         self.assertTrue(hasattr(self.manager, 'close_button'))
         
@@ -133,17 +134,19 @@ class TestRowCellManagerDEV(UITestCase):
         
         # Verify data loaded
         self.assertEqual(self.manager.current_row_data, row_data)
-        self.assertEqual(len(self.manager.cell_items), 8)
+        self.assertEqual(self.manager.cell_model.rowCount(), 8)
         
         # Verify UI updated
         expected_info = "Selection: Test Selection (8 cells)"
         self.assertEqual(expected_info, self.manager.selection_info_label.text())
         
-        # Verify cell items created correctly
-        for i, item in enumerate(self.manager.cell_items):
-            self.assertIsInstance(item, CellRowItem)
-            self.assertEqual(item.cell_index, i)
-            self.assertTrue(item.is_included)  # Default state
+        # Verify model rows created correctly
+        model = self.manager.cell_model
+        for i in range(model.rowCount()):
+            index = model.index(i)
+            self.assertEqual(index.data(CellListModel.CellIndexRole), i)
+            self.assertEqual(index.data(Qt.DisplayRole), f"Cell {i}")
+            self.assertTrue(index.data(CellListModel.IncludedRole))  # Default state
         
         # Verify statistics updated
         self.assertEqual("Total: 8", self.manager.total_cells_label.text())
@@ -173,11 +176,9 @@ class TestRowCellManagerDEV(UITestCase):
         self.assertEqual(self.manager.selected_cell_index, 2)
         
         # Verify visual state
-        for item in self.manager.cell_items:
-            if item.cell_index == 2:
-                self.assertTrue(item._is_selected)
-            else:
-                self.assertFalse(item._is_selected)
+        model = self.manager.cell_model
+        for i in range(model.rowCount()):
+            self.assertEqual(model.index(i).data(CellListModel.SelectedRole), i == 2)
         
         # Verify details panel updated
         self.assertEqual("Cell 2", self.manager.selected_cell_label.text())
@@ -206,18 +207,14 @@ class TestRowCellManagerDEV(UITestCase):
         )
         
         # Initially all cells should be included
-        included_count = sum(1 for item in self.manager.cell_items if item.is_included)
-        self.assertEqual(included_count, 4)
+        self.assertEqual(self.manager.cell_model.included_count(), 4)
         
         # Simulate excluding cells 1 and 3
         self._simulate_inclusion_toggle(1)
         self._simulate_inclusion_toggle(3)
         
         # Verify inclusion states changed
-        self.assertFalse(self.manager.cell_items[1].is_included)
-        self.assertFalse(self.manager.cell_items[3].is_included)
-        self.assertTrue(self.manager.cell_items[0].is_included)
-        self.assertTrue(self.manager.cell_items[2].is_included)
+        self.assertEqual(self._included_states(), [True, False, True, False])
         
         # Verify signals emitted
         self.assertEqual(len(inclusion_signals), 2)
@@ -271,15 +268,13 @@ class TestRowCellManagerDEV(UITestCase):
         self._simulate_inclusion_toggle(5)
         
         # Verify mixed state
-        included_count = sum(1 for item in self.manager.cell_items if item.is_included)
-        self.assertEqual(included_count, 3)
+        self.assertEqual(self.manager.cell_model.included_count(), 3)
         
         # Test "Include All"
         self.manager.select_all_button.click()
         
         # Verify all cells included
-        for item in self.manager.cell_items:
-            self.assertTrue(item.is_included)
+        self.assertTrue(all(self._included_states()))
         
         # Verify statistics
         self.assertEqual("Included: 6", self.manager.included_cells_label.text())
@@ -289,8 +284,7 @@ class TestRowCellManagerDEV(UITestCase):
         self.manager.exclude_all_button.click()
         
         # Verify all cells excluded
-        for item in self.manager.cell_items:
-            self.assertFalse(item.is_included)
+        self.assertFalse(any(self._included_states()))
         
         # Verify statistics
         self.assertEqual("Included: 0", self.manager.included_cells_label.text())
@@ -318,65 +312,93 @@ class TestRowCellManagerDEV(UITestCase):
         
         self.logger.info("✅ Close functionality verified")
     
-    def test_cell_item_initialization_dev(self):
-        """DEV: Test individual cell item initialization."""
-        self.logger.info("Testing cell item initialization...")
-        
-        # Create test metadata
-        metadata = {
-            'area': 150.5,
-            'intensity': 75.2,
-            'perimeter': 45.8
-        }
+    def test_metadata_fetched_on_demand_dev(self):
+        """DEV: Test that row metadata is looked up only for displayed rows."""
+        self.logger.info("Testing on-demand metadata...")
         
-        # Create cell item
-        cell_item = CellRowItem(cell_index=10, cell_metadata=metadata, is_included=True)
+        csv_parser = Mock()
+        csv_parser.get_data_by_index.side_effect = lambda index: Mock(
+            to_dict=lambda: {'area': 150.5 + index, 'intensity': 75.2}
+        )
+        manager = RowCellManager(csv_parser=csv_parser)
+        manager.load_row_data(CellRowData("sel", "Lazy", "#00FF00", list(range(1000))))
         
-        # Verify initialization
-        self.assertEqual(cell_item.cell_index, 10)
-        self.assertEqual(cell_item.cell_metadata, metadata)
-        self.assertTrue(cell_item.is_included)
-        self.assertFalse(cell_item._is_selected)
+        # Loading does not touch the cell table
+        csv_parser.get_data_by_index.assert_not_called()
         
-        # Verify UI elements
-        self.assertTrue(hasattr(cell_item, 'inclusion_checkbox'))
-        self.assertTrue(hasattr(cell_item, 'index_label'))
-        self.assertTrue(hasattr(cell_item, 'metadata_label'))
-        self.assertTrue(hasattr(cell_item, 'thumbnail_label'))
+        index = manager.cell_model.index(10)
+        self.assertEqual({'area': 160.5, 'intensity': 75.2}, index.data(CellListModel.MetadataRole))
+        self.assertIn("Area: 160.5", index.data(Qt.ToolTipRole))
+        self.assertIn("Intensity: 75.2", index.data(Qt.ToolTipRole))
         
-        # Verify content
-        self.assertEqual("Cell 10", cell_item.index_label.text())
-        self.assertIn("Area: 150.5", cell_item.metadata_label.text())
-        self.assertIn("Intensity: 75.2", cell_item.metadata_label.text())
-        self.assertIn("Perimeter: 45.8", cell_item.metadata_label.text())
+        # Repeated lookups are served from the model cache
+        index.data(CellListModel.MetadataRole)
+        csv_parser.get_data_by_index.assert_called_once_with(10)
         
-        # Clean up
-        cell_item.deleteLater()
+        manager.deleteLater()
         
-        self.logger.info("✅ Cell item initialization verified")
+        self.logger.info("✅ On-demand metadata verified")
     
-    def test_cell_item_thumbnail_dev(self):
-        """DEV: Test cell item thumbnail functionality."""
-        self.logger.info("Testing cell item thumbnail...")
-        
-        # Create cell item
-        cell_item = CellRowItem(cell_index=5, cell_metadata={}, is_included=True)
-        
-        # Create test pixmap
-        pixmap = QPixmap(100, 100)
-        pixmap.fill(Qt.GlobalColor.red)
-        
-        # Set thumbnail
-        cell_item.set_thumbnail(pixmap)
+    def test_metadata_view_of_cell_table_dev(self):
+        """DEV: Test the lazy metadata view over a wide cell table."""
+        self.logger.info("Testing metadata view...")
+        
+        import numpy as np
+        import pandas as pd
+        table = pd.DataFrame(np.arange(2000 * 300).reshape(2000, 300),
+                             columns=[f"feature_{i}" for i in range(300)])
+        table['area'] = np.arange(2000) * 1.5
+        cell_indices = [5, 42, 1999]
+        
+        view = CellMetadataView.from_table(table, cell_indices)
+        self.assertEqual(3, len(view))
+        self.assertEqual(cell_indices, list(view))
+        self.assertIn(42, view)
+        self.assertNotIn(6, view)
+        self.assertEqual(63.0, view[42]['area'])
+        self.assertEqual(301, len(view[1999]))
+        with self.assertRaises(KeyError):
+            view[6]
+        
+        # Rows are only read from the table when displayed
+        self.manager.load_row_data(CellRowData("sel", "Wide", "#0000FF", cell_indices, view))
+        index = self.manager.cell_model.index(1)
+        self.assertEqual(63.0, index.data(CellListModel.MetadataRole)['area'])
+        
+        self.logger.info("✅ Metadata view verified")
+    
+    def test_row_delegate_checkbox_dev(self):
+        """DEV: Test the row delegate size and checkbox toggling."""
+        self.logger.info("Testing row delegate...")
         
-        # Verify thumbnail was set (pixmap should be scaled to 60x60)
-        thumbnail_pixmap = cell_item.thumbnail_label.pixmap()
-        self.assertIsNotNone(thumbnail_pixmap)
+        self.manager.load_row_data(self._create_mock_row_data(3))
+        view = self.manager.cell_list_view
+        delegate = view.itemDelegate()
+        self.assertIsInstance(delegate, CellRowDelegate)
+        self.assertTrue(view.uniformItemSizes())
         
-        # Clean up
-        cell_item.deleteLater()
+        inclusion_signals = []
+        self.manager.cell_inclusion_changed.connect(
+            lambda sel_id, cell_idx, included: inclusion_signals.append((cell_idx, included))
+        )
         
-        self.logger.info("✅ Cell item thumbnail verified")
+        # Clicking the checkbox area toggles inclusion
+        view.resize(300, 200)
+        option = QStyleOptionViewItem()
+        option.initFrom(view)
+        option.rect = view.visualRect(self.manager.cell_model.index(1))
+        self.assertEqual(delegate.sizeHint(option, self.manager.cell_model.index(1)).height(),
+                         CellRowDelegate.ROW_HEIGHT)
+        
+        center = QPointF(delegate.checkbox_rect(option).center())
+        release = QMouseEvent(QEvent.MouseButtonRelease, center, center,
+                              Qt.LeftButton, Qt.NoButton, Qt.NoModifier)
+        self.assertTrue(delegate.editorEvent(release, self.manager.cell_model, option,
+                                             self.manager.cell_model.index(1)))
+        self.assertEqual([(1, False)], inclusion_signals)
+        self.assertEqual("Excluded: 1", self.manager.excluded_cells_label.text())
+        
+        self.logger.info("✅ Row delegate verified")
     
     def test_empty_row_data_handling_dev(self):
         """DEV: Test handling of empty row data."""
@@ -395,7 +417,7 @@ class TestRowCellManagerDEV(UITestCase):
         self.manager.load_row_data(empty_row_data)
         
         # Verify empty state
-        self.assertEqual(len(self.manager.cell_items), 0)
+        self.assertEqual(self.manager.cell_model.rowCount(), 0)
         self.assertIsNone(self.manager.selected_cell_index)
         
         # Verify UI reflects empty state
@@ -413,8 +435,8 @@ class TestRowCellManagerDEV(UITestCase):
         """DEV: Test performance with large dataset."""
         self.logger.info("Testing large dataset performance...")
         
-        # Create large dataset (simulate many cells)
-        large_row_data = self._create_mock_row_data(100)
+        # Create large dataset (a 20k-cell selection)
+        large_row_data = self._create_mock_row_data(20000)
         
         import time
         start_time = time.time()
@@ -422,10 +444,10 @@ class TestRowCellManagerDEV(UITestCase):
         load_time = time.time() - start_time
         
         # Verify all cells loaded
-        self.assertEqual(len(self.manager.cell_items), 100)
+        self.assertEqual(self.manager.cell_model.rowCount(), 20000)
         
-        # Performance should be reasonable (under 5 seconds)
-        self.assertLess(load_time, 5.0, f"Loading took too long: {load_time:.2f}s")
+        # Rows are virtualized, so loading does not scale with widget creation
+        self.assertLess(load_time, 1.0, f"Loading took too long: {load_time:.2f}s")
         
         # Test bulk operations performance
         start_time = time.time()
@@ -436,8 +458,7 @@ class TestRowCellManagerDEV(UITestCase):
         self.assertLess(bulk_time, 2.0, f"Bulk operation took too long: {bulk_time:.2f}s")
         
         # Verify all excluded
-        excluded_count = sum(1 for item in self.manager.cell_items if not item.is_included)
-        self.assertEqual(excluded_count, 100)
+        self.assertEqual(len(self.manager.get_excluded_cells()), 20000)
         
         self.logger.info(f"✅ Large dataset performance verified (load: {load_time:.3f}s, bulk: {bulk_time:.3f}s)")
     
@@ -451,11 +472,11 @@ class TestRowCellManagerDEV(UITestCase):
             self.manager.load_row_data(row_data)
             
             # Verify current state
-            self.assertEqual(len(self.manager.cell_items), 10)
+            self.assertEqual(self.manager.cell_model.rowCount(), 10)
             
             # Clear and verify cleanup
             self.manager.clear_cell_items()
-            self.assertEqual(len(self.manager.cell_items), 0)
+            self.assertEqual(self.manager.cell_model.rowCount(), 0)
             self.assertIsNone(self.manager.selected_cell_index)
         
         self.logger.info("✅ Memory management verified")
@@ -467,6 +488,7 @@ class TestRowCellManagerDEV(UITestCase):
         # Mock all signal connections
         signals_log = {
             'cell_inclusion_changed': [],
+            'cells_inclusion_changed': [],
             'cell_navigation_requested': [],
             'row_management_closed': []
         }
@@ -474,6 +496,9 @@ class TestRowCellManagerDEV(UITestCase):
         self.manager.cell_inclusion_changed.connect(
             lambda sel_id, cell_idx, included: signals_log['cell_inclusion_changed'].append((sel_id, cell_idx, included))
         )
+        self.manager.cells_inclusion_changed.connect(
+            lambda sel_id, cells, included: signals_log['cells_inclusion_changed'].append((sel_id, cells, included))
+        )
         self.manager.cell_navigation_requested.connect(
             lambda idx: signals_log['cell_navigation_requested'].append(idx)
         )
@@ -503,13 +528,14 @@ class TestRowCellManagerDEV(UITestCase):
         self.manager.close_button.click()
         
         # Verify complete workflow
-        self.assertEqual(len(signals_log['cell_inclusion_changed']), 2 + 2)  # 2 toggles + 2 from select all
+        self.assertEqual(len(signals_log['cell_inclusion_changed']), 2)  # 2 toggles
+        # Select all reports the re-included cells in one bulk signal
+        self.assertEqual(signals_log['cells_inclusion_changed'], [("test_selection_1", [1, 3], True)])
         self.assertEqual(len(signals_log['cell_navigation_requested']), 1)
         self.assertEqual(len(signals_log['row_management_closed']), 1)
         
         # Verify final state - all cells should be included after select all
-        included_count = sum(1 for item in self.manager.cell_items if item.is_included)
-        self.assertEqual(included_count, 6)
+        self.assertEqual(self.manager.cell_model.included_count(), 6)
         
         self.logger.info("✅ Comprehensive workflow verified")
         self.logger.info("🎉 All DEV mode tests completed successfully!")
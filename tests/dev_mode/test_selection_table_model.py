@@ -0,0 +1,102 @@
+"""
+DEV Mode Tests for the Selection Table Model
+
+Tests that the selection panel's table follows selections_data through
+row-level model updates and that its delegates toggle, recolor and delete
+without changing the row selection.
+"""
+
+import sys
+
+import pytest
+from PySide6.QtCore import Qt
+from PySide6.QtTest import QTest
+from PySide6.QtWidgets import QApplication
+
+sys.path.insert(0, 'src')
+
+from components.widgets.selection_panel import SelectionPanel
+from components.widgets.selection_table_model import SelectionTableModel
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    return app
+
+
+@pytest.fixture
+def panel(qapp):
+    panel = SelectionPanel()
+    panel.resize(600, 700)
+    panel.show()
+    QTest.qWaitForWindowExposed(panel)
+    for i in range(3):
+        panel.add_selection({'id': f'sel_{i}', 'label': f'Selection {i}', 'color': '#FF0000',
+                             'well_position': '', 'cell_indices': [1, 2], 'enabled': True})
+    yield panel
+    panel.close()
+
+
+def click(panel, row, column):
+    table = panel.selection_table
+    rect = table.visualRect(panel.table_model.index(row, column))
+    QTest.mouseClick(table.viewport(), Qt.LeftButton, pos=rect.center())
+
+
+def test_rows_follow_selections_data(qapp):
+    """Appends insert rows, one deletion removes its row and updates repaint one row."""
+    model = SelectionTableModel()
+    selections = {'a': {'label': 'A', 'cell_indices': [1]}, 'b': {'label': 'B', 'well_position': 'B02'}}
+    events = []
+    model.rowsInserted.connect(lambda parent, first, last: events.append(('inserted', first, last)))
+    model.rowsRemoved.connect(lambda parent, first, last: events.append(('removed', first, last)))
+    model.modelReset.connect(lambda: events.append(('reset',)))
+    model.dataChanged.connect(lambda first, last, roles: events.append(('changed', first.row(), last.row())))
+
+    model.set_selections(selections)
+    selections['c'] = {'label': 'C'}
+    model.set_selections(selections)
+    del selections['b']
+    model.set_selections(selections)
+    assert model.update_selection('c')
+    assert not model.update_selection('b')
+    assert events == [('inserted', 0, 1), ('inserted', 2, 2), ('removed', 1, 1), ('changed', 1, 1)]
+
+    assert model.index(0, SelectionTableModel.CELLS_COLUMN).data() == '1'
+    assert model.index(1, SelectionTableModel.LABEL_COLUMN).data(SelectionTableModel.SelectionIdRole) == 'c'
+    assert model.row_of('c') == 1
+
+
+def test_checkbox_and_edits_update_the_panel(panel):
+    """Toggling a checkbox or editing a label updates the data without selecting the row."""
+    toggled = []
+    panel.selection_toggled.connect(lambda selection_id, enabled: toggled.append((selection_id, enabled)))
+
+    click(panel, 1, SelectionTableModel.ENABLED_COLUMN)
+    assert toggled == [('sel_1', False)]
+    assert panel.selections_data['sel_1']['enabled'] is False
+    assert panel.table_model.index(1, 0).data(Qt.CheckStateRole) == Qt.Unchecked
+    assert not panel.selection_table.selectionModel().hasSelection()
+
+    updated = []
+    panel.selection_updated.connect(lambda selection_id, data: updated.append((selection_id, data)))
+    panel.table_model.setData(panel.table_model.index(2, SelectionTableModel.LABEL_COLUMN), 'Tumor')
+    assert panel.selections_data['sel_2']['label'] == 'Tumor'
+    assert updated == [('sel_2', {'label': 'Tumor'})]
+
+
+def test_delete_button_keeps_row_selection(panel):
+    """The delete cell removes its row; the selected row stays selected."""
+    click(panel, 2, SelectionTableModel.CELLS_COLUMN)
+    assert panel.selected_row_id == 'sel_2'
+
+    deleted = []
+    panel.selection_deleted.connect(deleted.append)
+    click(panel, 0, SelectionTableModel.DELETE_COLUMN)
+    assert deleted == ['sel_0']
+    assert panel.selection_table.rowCount() == 2
+    assert [index.row() for index in panel.selection_table.selectionModel().selectedRows()] == [1]
+    assert panel.selection_table.indexWidget(panel.table_model.index(0, 5)) is None
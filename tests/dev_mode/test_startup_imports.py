@@ -0,0 +1,60 @@
+"""
+DEV Mode Tests for Application Start-up
+
+Tests that the main window module defers dialogs, matplotlib and OpenCV
+until first use, and the import breakdown behind --profile-startup.
+"""
+
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+sys.path.insert(0, 'src')
+
+from utils.startup_profiler import StartupProfiler
+
+SRC_DIR = Path(__file__).resolve().parents[2] / 'src'
+
+
+def test_main_window_defers_heavy_imports():
+    """Importing the main window loads no dialogs, plotting, OpenCV or expression engine."""
+    script = textwrap.dedent("""
+        import sys
+        sys.path.insert(0, '.')
+        import pages.main_window as main_window
+        deferred = ('matplotlib', 'cv2', 'utils.expression_parser',
+                    'components.dialogs.protocol_export_dialog',
+                    'components.widgets.scatter_plot_canvas')
+        print(sorted(name for name in deferred if name in sys.modules))
+        main_window.ProtocolExportDialog
+        print('components.dialogs.protocol_export_dialog' in sys.modules)
+    """)
+    result = subprocess.run([sys.executable, '-c', script], cwd=SRC_DIR, capture_output=True,
+                            text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split('\n')[:2] == ['[]', 'True']
+
+
+def test_startup_profiler_reports_imports(tmp_path, monkeypatch):
+    """Imports made while installed are timed and grouped by package."""
+    package = tmp_path / 'profiled_pkg'
+    package.mkdir()
+    (package / '__init__.py').write_text('')
+    (package / 'module.py').write_text('VALUE = sum(range(1000))\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    profiler = StartupProfiler().install()
+    try:
+        import profiled_pkg.module  # noqa: F401
+        profiler.mark('Imported')
+    finally:
+        profiler.uninstall()
+
+    self_time, cumulative = profiler.imports['profiled_pkg.module']
+    assert 0 <= self_time <= cumulative
+    assert set(profiler.package_totals()) == {'profiled_pkg'}
+
+    report = profiler.report()
+    assert 'Imported' in report and 'profiled_pkg.module' in report
+    assert not any(type(finder).__name__ == '_TimingFinder' for finder in sys.meta_path)
@@ -0,0 +1,65 @@
+"""
+DEV Mode Tests for the Stylesheet Cache
+
+Tests that convert_css_to_qt memoizes compiled stylesheets per theme
+colors and that theme switches invalidate them.
+"""
+
+import sys
+
+import pytest
+
+sys.path.insert(0, 'src')
+
+from utils.style_converter import (
+    convert_css_to_qt, invalidate_stylesheet_cache, stylesheet_cache_info
+)
+
+CSS = """
+QPushButton {
+    background-color: var(--primary);
+    color: var(--primary-foreground);
+    border: 1px solid var(--missing, #123456);
+    transition: all 0.2s ease;
+    box-shadow: 0 1px 2px black;
+}
+QPushButton:disabled { opacity: 0.5; }
+QLabel { }
+"""
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    invalidate_stylesheet_cache()
+    yield
+    invalidate_stylesheet_cache()
+
+
+def test_conversion_output():
+    """Variables are resolved and unsupported properties removed."""
+    result = convert_css_to_qt(CSS, {'primary': 'hsl(222.2, 47.4%, 11.2%)',
+                                     'primary_foreground': '210 40% 98%'})
+    assert result == ('QPushButton { background-color: #0f172a; color: #f7f9fb; '
+                      'border: 1px solid #123456; } '
+                      'QPushButton:disabled { background-color: 0.5; } QLabel')
+
+
+def test_stylesheets_are_compiled_once_per_theme():
+    """Repeated conversions reuse the compiled stylesheet until invalidated."""
+    light = convert_css_to_qt(CSS)
+    assert convert_css_to_qt(CSS) == light
+    assert convert_css_to_qt(CSS, {'primary': '#ff0000'}) != light
+    assert convert_css_to_qt(CSS, is_dark_theme=True) != light
+    assert stylesheet_cache_info() == {'compiles': 3, 'hits': 1, 'entries': 3}
+
+    assert invalidate_stylesheet_cache()['compiles'] == 3
+    assert stylesheet_cache_info() == {'compiles': 0, 'hits': 0, 'entries': 0}
+    assert convert_css_to_qt(CSS) == light
+
+
+def test_unhashable_colors_are_converted_uncached():
+    """Color tables with unhashable values still convert, bypassing the cache."""
+    result = convert_css_to_qt('QLabel { color: var(--primary); }',
+                               {'primary': '#abcdef', 'palette': ['#000000']})
+    assert result == 'QLabel { color: #abcdef; }'
+    assert stylesheet_cache_info()['entries'] == 0
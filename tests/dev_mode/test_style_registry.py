@@ -0,0 +1,61 @@
+"""
+DEV Mode Tests for the Style Registry
+
+Tests that repeated widgets take their rules from the application
+stylesheet and that state changes only flip dynamic properties.
+"""
+
+import sys
+
+import pytest
+from PySide6.QtWidgets import QApplication, QPushButton
+
+sys.path.insert(0, 'src')
+
+from services.style_registry import StyleRegistry, set_style_property, style_registry
+from components.scientific_widgets import WellPlateWidget
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    return app
+
+
+def test_rules_are_compiled_into_the_application_stylesheet(qapp):
+    """Rules are registered once, compiled, and follow the theme stylesheet."""
+    registry = StyleRegistry()
+    assert registry.register('test-rows', 'QLabel#testRow { color: var(--primary); }')
+    assert not registry.register('test-rows', 'QLabel#testRow { color: red; }')
+
+    registry.set_theme_stylesheet('QWidget { font-size: 12px; }', qapp)
+    assert qapp.styleSheet() == registry.stylesheet()
+    assert qapp.styleSheet().startswith('QWidget { font-size: 12px; }')
+    assert 'QLabel#testRow { color: #0f172a; }' in qapp.styleSheet()
+
+    # Restore the shared registry's stylesheet for the other tests
+    qapp.setStyleSheet(style_registry().stylesheet())
+
+
+def test_state_changes_flip_properties(qapp):
+    """set_style_property only repolishes when the value changes."""
+    button = QPushButton()
+    assert set_style_property(button, "state", "assigned")
+    assert not set_style_property(button, "state", "assigned")
+    assert button.property("state") == "assigned"
+
+
+def test_repeated_widgets_have_no_own_stylesheet(qapp):
+    """Wells rely on the registered application rules."""
+    assert style_registry().is_registered('well-plate')
+
+    plate = WellPlateWidget()
+    assert all(button.styleSheet() == "" for button in plate.wells.values())
+    plate.set_well_state("A01", "assigned", "#ff0000")
+    assert "#ff0000" in plate.wells["A01"].styleSheet()
+    plate.set_well_state("A01", "empty")
+    assert plate.wells["A01"].styleSheet() == ""
+    assert plate.get_empty_wells() == list(plate.wells)
+
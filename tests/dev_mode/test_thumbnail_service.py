@@ -0,0 +1,160 @@
+"""
+DEV Mode Tests for Thumbnail Service
+
+Tests background thumbnail generation, the LRU cache and its use by
+CellSelectionPreview and RowCellManager.
+"""
+
+import sys
+import time
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+from PySide6.QtWidgets import QApplication
+from PySide6.QtGui import QImage
+
+sys.path.insert(0, 'src')
+
+from services.thumbnail_service import ThumbnailService, make_thumbnail
+from components.widgets.cell_selection_preview import CellSelectionPreview, CellThumbnailData
+from components.widgets.row_cell_manager import RowCellManager, CellRowData
+
+
+@pytest.fixture
+def app():
+    """Create QApplication instance for testing."""
+    yield QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def image():
+    """Random RGB slide."""
+    return np.random.default_rng(0).integers(0, 255, (2000, 2000, 3), dtype=np.uint8)
+
+
+@pytest.fixture
+def service(app, image):
+    """Thumbnail service with the slide loaded."""
+    service = ThumbnailService(max_workers=2)
+    service.set_image(image, 'slide.tif')
+    yield service
+    service.shutdown()
+
+
+def wait_for(app, service, timeout=10.0):
+    """Process events until all pending thumbnails are delivered."""
+    deadline = time.perf_counter() + timeout
+    while service.pending_count() and time.perf_counter() < deadline:
+        app.processEvents()
+    assert service.pending_count() == 0, "Thumbnails were not delivered"
+
+
+def test_make_thumbnail_downsamples_square_crop(image):
+    """Regions become squares inside the image, block-averaged to the size limit."""
+    thumbnail = make_thumbnail(image, (100, 100, 500, 300), 80)
+    assert thumbnail.shape == (80, 80, 3)
+    expected = image[0:400, 100:500].reshape(80, 5, 80, 5, 3).mean(axis=(1, 3))
+    assert np.abs(thumbnail - expected).max() <= 0.5
+
+    # Small regions keep their resolution; 16-bit data is normalized
+    small = make_thumbnail(image[:, :, 0].astype(np.uint16) * 100, (1990, 1990, 2010, 2010), 80)
+    assert small.shape == (20, 20) and small.dtype == np.uint8 and small.max() == 255
+
+
+def test_background_delivery_and_cache(app, service):
+    """Misses are generated in the pool and delivered on the GUI thread, then cached."""
+    delivered = {}
+    service.thumbnail_ready.connect(lambda cell, size, qimage: delivered.setdefault(cell, qimage))
+
+    for cell_index in range(100):
+        assert service.request(cell_index, (cell_index * 10, 0, cell_index * 10 + 40, 40), 64) is None
+    wait_for(app, service)
+
+    assert sorted(delivered) == list(range(100))
+    assert isinstance(service.request(5, (50, 0, 90, 40), 64), QImage), "Second request hits the cache"
+    assert service.cache_info()['hits'] == 1
+
+    # Keys include the image: another slide starts cold
+    service.set_image(np.zeros((100, 100), dtype=np.uint8), 'other.tif')
+    assert service.get(5, 64) is None
+
+
+def test_lru_eviction(app, image):
+    """The least recently used thumbnails are evicted once over budget."""
+    service = ThumbnailService(max_workers=1, cache_bytes=3 * 40 * 40 * 3)
+    service.set_image(image, 'slide.tif')
+    try:
+        for cell_index in range(3):
+            service.request(cell_index, (0, 0, 40, 40), 40)
+        wait_for(app, service)
+        service.get(0, 40)  # Touch cell 0
+        service.request(3, (0, 0, 40, 40), 40)
+        wait_for(app, service)
+
+        assert service.get(1, 40) is None, "Least recently used entry should be evicted"
+        assert service.get(0, 40) is not None and service.get(3, 40) is not None
+    finally:
+        service.shutdown()
+
+
+def test_preview_fills_missing_thumbnails(app, service):
+    """CellSelectionPreview generates images for cells that only have a bounding box."""
+    preview = CellSelectionPreview()
+    preview.set_thumbnail_service(service)
+    preview.load_cells([
+        CellThumbnailData(cell_index=i, bounding_box=(i * 30, 0, i * 30 + 25, 25)) for i in range(20)
+    ])
+
+    # Explicit request for all loaded cells
+    preview.request_thumbnails()
+    wait_for(app, service)
+
+    assert all(data.thumbnail_pixmap is not None for data in preview.cell_thumbnails)
+    assert preview.cell_model.thumbnail(0).width() > 0
+    preview.deleteLater()
+
+
+def test_preview_requests_visible_thumbnails_only(app, service):
+    """Only tiles that are painted request thumbnails from the service."""
+    preview = CellSelectionPreview()
+    preview.set_thumbnail_service(service)
+    preview.load_cells([
+        CellThumbnailData(cell_index=i, bounding_box=((i % 60) * 30, (i // 60) % 60 * 30,
+                                                      (i % 60) * 30 + 25, (i // 60) % 60 * 30 + 25))
+        for i in range(5000)
+    ])
+    assert service.pending_count() == 0, "Loading alone does not generate thumbnails"
+
+    preview.resize(900, 700)
+    preview.show()
+    deadline = time.perf_counter() + 10
+    while not service.cache_info()['entries'] and time.perf_counter() < deadline:
+        app.processEvents()
+    wait_for(app, service)
+
+    generated = service.cache_info()['entries']
+    assert 0 < generated < 100, f"Expected only visible tiles, got {generated}"
+    assert preview.cell_thumbnails[0].thumbnail_pixmap is not None
+    assert preview.cell_thumbnails[-1].thumbnail_pixmap is None
+    preview.deleteLater()
+
+
+def test_row_cell_manager_uses_service(app, service, image):
+    """RowCellManager prefetches cell images and shows them when ready."""
+    image_handler = Mock(image_data=image, current_file_path='slide.tif')
+    csv_parser = Mock()
+    csv_parser.get_xy_columns.return_value = ('x', 'y')
+    csv_parser.get_data_by_index.side_effect = lambda index: {'x': 100 + index * 20, 'y': 300}
+
+    manager = RowCellManager(image_handler=image_handler, csv_parser=csv_parser,
+                             thumbnail_service=service)
+    manager.load_row_data(CellRowData('sel_1', 'Positive', '#FF0000', list(range(10))))
+    wait_for(app, service)
+    assert service.cache_info()['entries'] == 10, "Row cells are prefetched on load"
+
+    manager.on_cell_selected(3)
+    assert not manager.cell_image_label.pixmap().isNull(), "Prefetched image is shown immediately"
+    assert service.cache_info()['hits'] >= 1
+    image_handler.get_image_region.assert_not_called()
+    manager.deleteLater()
@@ -213,6 +213,99 @@ class TestExportConsistencyDual(UITestCase):
         assert success, "Main window export should succeed"
         self.main_adapter.export_protocol.assert_called_once_with(output_path, self.test_image_info)
 
+    
+    def test_protocol_paths_match_golden_file(self):
+        """Test that all protocol export entry points render the same golden file."""
+        from PIL import Image
+        from src.components.dialogs.export_dialog import ExportWorker
+        from src.components.dialogs.protocol_export_dialog import ProtocolExportDialog
+        
+        app = QApplication.instance() or QApplication([])
+        golden = (Path(__file__).parent / 'golden' / 'protocol_export.cxprotocol').read_text(encoding='utf-8')
+        
+        # Include a cell whose crop must be shifted inside the image
+        bounding_boxes = self.test_bounding_boxes + [BoundingBox(min_x=2, min_y=5, max_x=22, max_y=25)]
+        selection = dict(self.test_selections[0], cell_indices=[0, 2, 3])
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_dir = Path(temp_dir)
+            image_path = temp_dir / 'test_image.tif'
+            Image.new('L', (1000, 800)).save(image_path)
+            
+            # 1. Extraction points through Extractor.generate_protocol_file
+            points = self.extractor.create_extraction_points(
+                [selection], bounding_boxes, self.coordinate_transformer, (1000, 800)
+            )
+            extractor_path = temp_dir / 'extractor' / 'protocol.cxprotocol'
+            extractor_path.parent.mkdir()
+            assert self.extractor.generate_protocol_file(
+                points, str(extractor_path), {'file_path': str(image_path), 'shape': (800, 1000)}
+            )
+            
+            # 2. Per-selection export from ProtocolExportDialog
+            dialog = ProtocolExportDialog(
+                {selection['id']: selection}, image_data=None,
+                bounding_boxes=[tuple(box) for box in bounding_boxes],
+                coordinate_transformer=self.coordinate_transformer,
+                image_info={'file_path': str(image_path), 'width': 1000, 'height': 800,
+                            'format': 'TIF', 'filename': 'test_image'}
+            )
+            dialog_content = dialog._generate_protocol_content(selection)
+            dialog.deleteLater()
+            
+            # 3. Session export from ExportWorker
+            worker_dir = temp_dir / 'worker'
+            worker = ExportWorker(
+                {'output_directory': worker_dir, 'include_backup': False},
+                {'data': {
+                    'selections': [selection],
+                    'calibration': self.coordinate_transformer.export_calibration(),
+                    'image_file': str(image_path),
+                    'bounding_boxes': bounding_boxes,
+                }}
+            )
+            worker._export_protocol()
+            worker_files = list(worker_dir.glob('*.cxprotocol'))
+            assert len(worker_files) == 1, "Worker should write exactly one protocol"
+            
+            assert extractor_path.read_text(encoding='utf-8') == golden
+            assert dialog_content == golden
+            assert worker_files[0].read_text(encoding='utf-8') == golden
+
+    
+    def test_batch_export_dialog_matches_headless(self):
+        """Test that the dialog's background batch export matches the headless engine."""
+        from src.components.dialogs.protocol_export_dialog import ProtocolExportDialog
+        
+        app = QApplication.instance() or QApplication([])
+        selections = {selection['id']: selection for selection in self.test_selections}
+        image_info = {'file_path': '/path/to/test_image.tif', 'width': 1000, 'height': 800}
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            dialog = ProtocolExportDialog(
+                selections, image_data=None,
+                bounding_boxes=[tuple(box) for box in self.test_bounding_boxes],
+                coordinate_transformer=self.coordinate_transformer, image_info=image_info
+            )
+            worker = dialog.start_batch_export(str(Path(temp_dir) / 'gui'))
+            assert not dialog.export_all_button.isEnabled(), "Buttons should be disabled while exporting"
+            assert worker.wait(10000), "Batch export should finish"
+            app.processEvents()
+            
+            assert dialog.progress_bar.value() == 100
+            assert dialog.export_all_button.isEnabled()
+            
+            headless = self.extractor.export_protocol_batch(
+                self.test_selections, self.test_bounding_boxes, self.coordinate_transformer,
+                Path(temp_dir) / 'headless', image_info, image_bounds=(1000, 800)
+            )
+            assert [path.name for path in worker.written_paths] == [path.name for path in headless]
+            assert [path.name for path in headless] == ['A01_Positive_Cells.cxprotocol',
+                                                        'A02_Negative_Cells.cxprotocol']
+            for gui_path, headless_path in zip(worker.written_paths, headless):
+                assert gui_path.read_bytes() == headless_path.read_bytes()
+            dialog.deleteLater()
+
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v']) 
\ No newline at end of file
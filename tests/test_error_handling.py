@@ -7,6 +7,7 @@ robust error handling according to TESTING_STRATEGY.md specifications.
 
 import pytest
 import logging
+import logging.handlers
 import time
 from unittest.mock import Mock, patch, MagicMock
 from pathlib import Path
@@ -18,7 +19,9 @@ from utils.exceptions import (
     CoordinateTransformError, CalibrationError, ExportError, ERROR_CODES
 )
 from utils.error_handler import ErrorHandler, error_handler, safe_execute
-from utils.logging_config import setup_logging, get_logger
+from utils.logging_config import (
+    setup_logging, shutdown_logging, get_logger, LogThrottle, aggregated_log
+)
 
 
 @pytest.mark.unit
@@ -249,11 +252,18 @@ class TestLoggingConfiguration:
         logger = setup_logging(str(log_file))
         
         assert logger.name == "cellsorter"
-        assert len(logger.handlers) >= 2  # File and console handlers
         
-        # Test that log file is created
+        # File and console handlers run behind a queue
+        assert len(logger.handlers) == 1
+        queue_handler = logger.handlers[0]
+        assert isinstance(queue_handler, logging.handlers.QueueHandler)
+        assert len(queue_handler.listener.handlers) == 2
+        
+        # Test that log file is created and written off the calling thread
         logger.info("Test log message")
         assert log_file.exists()
+        shutdown_logging()
+        assert "Test log message" in log_file.read_text(encoding="utf-8")
     
     def test_get_logger(self):
         """Test get_logger function."""
@@ -280,6 +290,43 @@ class TestLoggingConfiguration:
         
         # Test logging methods (should not raise exceptions)
         obj.test_logging()
+        
+        # The logger is looked up once per class
+        assert obj.logger is TestClass().logger
+    
+    def test_log_throttle(self):
+        """Test that repeated messages are throttled and counted."""
+        logger = Mock(spec=logging.Logger)
+        logger.isEnabledFor.return_value = True
+        throttle = LogThrottle(interval=60)
+        
+        assert throttle.log(logger, logging.INFO, 'drag', "Moved 1")
+        assert not throttle.log(logger, logging.INFO, 'drag', "Moved 2")
+        assert not throttle.log(logger, logging.INFO, 'drag', "Moved 3")
+        assert throttle.log(logger, logging.INFO, 'other', "Other")
+        assert throttle.log(logger, logging.INFO, 'drag', "Moved 4", interval=0)
+        
+        messages = [call.args[1] for call in logger.log.call_args_list]
+        assert messages == ["Moved 1", "Other", "Moved 4 (+2 similar messages)"]
+        
+        logger.isEnabledFor.return_value = False
+        assert not throttle.log(logger, logging.DEBUG, 'quiet', "Not logged")
+    
+    def test_aggregated_log(self):
+        """Test that a loop logs one summary line."""
+        logger = Mock(spec=logging.Logger)
+        with aggregated_log(logger, "Exported cell images") as exported:
+            for _ in range(5):
+                exported.add()
+        
+        logger.log.assert_called_once()
+        level, message = logger.log.call_args.args
+        assert level == logging.INFO
+        assert message.startswith("Exported cell images: 5 in ")
+        
+        with aggregated_log(logger, "Nothing"):
+            pass
+        assert logger.log.call_count == 1
 
 
 @pytest.mark.integration
@@ -132,6 +132,39 @@ class TestExpressionParser:
         assert 'unknown_column' in validation['unknown_columns']
 
 
+    def test_keywords_inside_column_names_preserved(self, parser):
+        """Test that AND/OR/NOT inside CellProfiler column names are not rewritten."""
+        data = pd.DataFrame({
+            'Intensity_MeanIntensity_ORIGINAL': [1.0, 5.0, 9.0],
+            'AreaShape_Orientation': [3.0, 2.0, 1.0],
+        })
+
+        result = parser.evaluate_expression(
+            "Intensity_MeanIntensity_ORIGINAL > 2 AND AreaShape_Orientation > 1", data
+        )
+
+        assert result.error_message is None
+        np.testing.assert_array_equal(result.value, np.array([False, True, False]))
+        assert set(result.column_dependencies) == {
+            'Intensity_MeanIntensity_ORIGINAL', 'AreaShape_Orientation'
+        }
+
+    def test_standalone_keywords_any_case(self, parser):
+        """Test that standalone logical keywords are normalized in any case."""
+        normalized = parser._normalize_expression("NOT (a > 1)   Or b < 2 and c")
+
+        assert normalized == "not (a > 1) or b < 2 and c"
+
+    def test_column_named_like_keyword(self, parser):
+        """Test that a column spelled like a keyword stays a variable."""
+        data = pd.DataFrame({'Or': [0.0, 1.0], 'area': [10.0, 20.0]})
+
+        result = parser.evaluate_expression("Or > 0 OR area > 15", data)
+
+        assert result.error_message is None
+        np.testing.assert_array_equal(result.value, np.array([False, True]))
+
+
 class TestConvenienceFunctions:
     """Test convenience functions."""
     
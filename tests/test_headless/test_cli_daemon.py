@@ -0,0 +1,96 @@
+"""
+Tests for the headless CLI daemon
+"""
+
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+
+import pytest
+
+# Add src to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from headless.cli.cli_commands import HeadlessCLI
+from headless.cli.daemon import (
+    CLIDaemon, DaemonError, METHOD_NOT_FOUND, INVALID_PARAMS, call_daemon, forward_command
+)
+from headless.serializers import YAMLSerializer
+from headless.ui_model import UIModel, Widget, WidgetType
+
+
+@pytest.fixture
+def ui_file(tmp_path):
+    model = UIModel(root_widget=Widget(name="root", type=WidgetType.MAIN_WINDOW))
+    path = tmp_path / "ui.yaml"
+    YAMLSerializer().save(model, str(path))
+    return str(path)
+
+
+def request(method, params=None, request_id=1):
+    return json.dumps({'jsonrpc': '2.0', 'id': request_id, 'method': method, 'params': params or {}})
+
+
+class TestCLIDaemon:
+    """Requests served by one warm CLI."""
+
+    def test_stdio_requests_share_state(self, ui_file):
+        daemon = CLIDaemon(HeadlessCLI())
+        lines = [
+            request('load_ui', {'input_path': ui_file}, 1),
+            request('dump_ui', {}, 2),
+            request('validate_ui', {'input_path': ui_file}, 3),
+            request('stats', {}, 4),
+            request('shutdown', {}, 5),
+            request('ping', {}, 6),
+        ]
+        output = io.StringIO()
+        daemon.serve_stdio(io.StringIO('\n'.join(lines) + '\n'), output)
+        responses = [json.loads(line) for line in output.getvalue().splitlines()]
+
+        assert [r['id'] for r in responses] == [1, 2, 3, 4, 5]  # stops after shutdown
+        load, dump, validate, stats = (r['result'] for r in responses[:4])
+        assert load['exit_code'] == 0 and 'loaded' in load['stdout']
+        assert 'root' in dump['stdout']  # the model loaded by the previous request
+        assert 'UI definition is valid!' in validate['stdout']
+        assert validate['elapsed_ms'] >= 0
+        assert stats['validate_ui']['count'] == 1
+
+    def test_errors(self, ui_file):
+        daemon = CLIDaemon(HeadlessCLI())
+        assert json.loads(daemon.handle_line('not json'))['error']['code'] == -32700
+        assert json.loads(daemon.handle_line(request('format_disk')))['error']['code'] == METHOD_NOT_FOUND
+        assert json.loads(daemon.handle_line(request('load_ui', {'path': ui_file})))['error']['code'] == INVALID_PARAMS
+        assert json.loads(daemon.handle_line(request('run_command', {'args': []})))['error']['code'] == INVALID_PARAMS
+
+        failed = json.loads(daemon.handle_line(request('validate_ui', {'input_path': ui_file + '.missing'})))
+        assert 'No such file' in failed['error']['message']
+        assert 'Error validating UI' in failed['error']['data']['stdout']
+
+    @pytest.mark.skipif(not hasattr(__import__('socket'), 'AF_UNIX'), reason="needs Unix sockets")
+    def test_socket_forwarding(self, ui_file, capsys):
+        socket_path = os.path.join(tempfile.mkdtemp(), 'cli.sock')
+        assert forward_command('validate_ui', {'input_path': ui_file}, socket_path) is None
+
+        daemon = CLIDaemon(HeadlessCLI())
+        ready = threading.Event()
+        thread = threading.Thread(target=daemon.serve_socket, args=(socket_path, ready), daemon=True)
+        thread.start()
+        assert ready.wait(5)
+
+        try:
+            with pytest.raises(DaemonError):
+                CLIDaemon(HeadlessCLI()).serve_socket(socket_path)
+
+            assert forward_command('validate_ui', {'input_path': ui_file}, socket_path) == 0
+            assert 'UI definition is valid!' in capsys.readouterr().out
+            assert forward_command('run', {'args': ['mode-info']}, socket_path) == 0
+        finally:
+            call_daemon('shutdown', socket_path=socket_path)
+            thread.join(5)
+
+        assert not thread.is_alive()
+        assert not os.path.exists(socket_path)
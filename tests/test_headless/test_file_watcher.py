@@ -0,0 +1,110 @@
+"""
+Tests for the UI file watcher polling fallback
+"""
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add src to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from headless.sync import watcher as watcher_module
+from headless.sync.watcher import UIFileWatcher
+
+
+def write(path: Path, text: str, age: float = 60.0) -> Path:
+    """Write a file and date it in the past, outside the racy window."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    stamp = time.time() - age
+    os.utime(path, (stamp, stamp))
+    return path
+
+
+def age_directories(root: Path, age: float = 60.0):
+    stamp = time.time() - age
+    for directory in [root, *[p for p in root.rglob('*') if p.is_dir()]]:
+        os.utime(directory, (stamp, stamp))
+
+
+@pytest.fixture
+def ui_dir(tmp_path):
+    write(tmp_path / 'main.yaml', 'widgets: []')
+    write(tmp_path / 'nested' / 'dialog.json', '{}')
+    write(tmp_path / 'notes.txt', 'ignored')
+    age_directories(tmp_path)
+    return tmp_path
+
+
+def pending(watcher):
+    return {path.name: event.event_type for path, event in watcher._pending_events.items()}
+
+
+def test_idle_polls_do_not_read_or_list(ui_dir):
+    """Unchanged files are only stat'ed; contents and directories are not read again."""
+    watcher = UIFileWatcher([ui_dir])
+    watcher._scan_initial_files()
+    assert sorted(path.name for path in watcher.get_watched_files()) == ['dialog.json', 'main.yaml']
+
+    with patch.object(watcher, '_calculate_checksum', wraps=watcher._calculate_checksum) as checksum, \
+            patch.object(watcher_module.os, 'scandir', wraps=os.scandir) as scandir:
+        watcher._check_file_changes()
+        watcher._check_file_changes()
+
+    assert checksum.call_count == 0
+    assert scandir.call_count == 0
+    assert watcher._pending_events == {}
+
+
+def test_changes_are_detected_from_stat_and_content(ui_dir):
+    """Stat changes are confirmed by content; new and removed files are found via directory mtimes."""
+    watcher = UIFileWatcher([ui_dir])
+    watcher._scan_initial_files()
+
+    write(ui_dir / 'main.yaml', 'widgets: [label]', age=30.0)
+    write(ui_dir / 'nested' / 'settings.yml', 'a: 1')
+    (ui_dir / 'nested' / 'dialog.json').unlink()
+    age_directories(ui_dir, age=30.0)
+    watcher._check_file_changes()
+    assert pending(watcher) == {'main.yaml': 'modified', 'settings.yml': 'created', 'dialog.json': 'deleted'}
+
+    # A touch without a content change is not reported
+    watcher._pending_events.clear()
+    stamp = time.time() - 10.0
+    os.utime(ui_dir / 'main.yaml', (stamp, stamp))
+    watcher._check_file_changes()
+    assert watcher._pending_events == {}
+
+
+def test_single_debounce_worker_delivers_events(ui_dir):
+    """Events within a debounce window are delivered once by one worker thread."""
+    watcher = UIFileWatcher([ui_dir], debounce_delay=0.05)
+    delivered = []
+    received = threading.Event()
+
+    def on_event(event):
+        delivered.append((event.file_path.name, event.event_type))
+        received.set()
+
+    watcher.add_callback('any', on_event)
+    assert watcher.start()
+    try:
+        for _ in range(5):
+            watcher._handle_file_event(ui_dir / 'main.yaml', 'modified')
+        assert received.wait(2.0)
+        workers = [thread for thread in threading.enumerate() if thread.name == 'UIFileWatcher-debounce']
+        assert len(workers) == 1
+
+        watcher._handle_file_event(ui_dir / 'main.yaml', 'deleted')
+    finally:
+        watcher.stop()
+
+    # Pending events are flushed when stopping
+    assert delivered == [('main.yaml', 'modified'), ('main.yaml', 'deleted')]
+    assert not any(thread.name == 'UIFileWatcher-debounce' for thread in threading.enumerate())
@@ -0,0 +1,110 @@
+"""
+Tests for the structural diff of UI models and the YAML loader used on reload
+"""
+
+import os
+import sys
+
+import yaml
+
+# Add src to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from headless.serializers import YAMLSerializer
+from headless.serializers import yaml_serializer
+from headless.ui_compatibility import UI
+from headless.ui_diff import diff_ui_models
+from headless.ui_model import Geometry, UIModel, Widget, WidgetType
+
+
+def window_model() -> UIModel:
+    """Main window with a panel of three widgets and a status label."""
+    panel = Widget(name="panel", type=WidgetType.WIDGET, children=[
+        Widget(name="title", type=WidgetType.LABEL, properties={"text": "Cells"}),
+        Widget(name="load", type=WidgetType.PUSH_BUTTON, properties={"text": "Load"}),
+        Widget(name="count", type=WidgetType.SPIN_BOX, properties={"value": 3, "maximum": 10}),
+    ])
+    root = Widget(name="root", type=WidgetType.MAIN_WINDOW, children=[
+        panel,
+        Widget(name="status", type=WidgetType.LABEL),
+    ])
+    return UIModel(metadata={"name": "main"}, root_widget=root)
+
+
+class TestDiffUIModels:
+    """Widget-level changes between two versions of a model."""
+
+    def test_identical_models_have_empty_diff(self):
+        diff = diff_ui_models(window_model(), window_model())
+        assert diff.is_empty and not diff.requires_rebuild
+        assert diff.summary() == "no widget changes"
+
+    def test_first_load_adds_everything(self):
+        diff = diff_ui_models(None, window_model())
+        assert diff.root_changed and diff.requires_rebuild
+        assert diff.added == ["root", "panel", "title", "load", "count", "status"]
+
+    def test_property_and_field_changes(self):
+        old, new = window_model(), window_model()
+        new.find_widget("load").properties["text"] = "Open"
+        del new.find_widget("count").properties["maximum"]
+        new.find_widget("status").tooltip = "Ready"
+        new.find_widget("status").geometry = Geometry(width=200)
+
+        diff = diff_ui_models(old, new)
+        assert diff.changed == {
+            "load": {"properties.text"},
+            "count": {"properties.maximum"},
+            "status": {"tooltip", "geometry"},
+        }
+        assert diff.changed_properties("load") == {"text"}
+        assert not diff.added and not diff.removed and not diff.requires_rebuild
+
+    def test_added_removed_and_retyped_widgets(self):
+        old, new = window_model(), window_model()
+        panel = new.find_widget("panel")
+        panel.remove_child("title")
+        panel.remove_child("count")
+        panel.add_child(Widget(name="count", type=WidgetType.SLIDER))
+        panel.add_child(Widget(name="clear", type=WidgetType.PUSH_BUTTON))
+
+        diff = diff_ui_models(old, new)
+        assert sorted(diff.removed) == ["count", "title"]
+        assert diff.added == ["count", "clear"]
+        assert not diff.changed and not diff.requires_rebuild
+
+    def test_moves_require_rebuild(self):
+        old, new = window_model(), window_model()
+        panel = new.find_widget("panel")
+        panel.children.reverse()
+        diff = diff_ui_models(old, new)
+        assert diff.moved == ["count", "title"] and diff.requires_rebuild
+
+        new = window_model()
+        status = new.find_widget("status")
+        new.root_widget.remove_child("status")
+        new.find_widget("panel").add_child(status)
+        assert diff_ui_models(old, new).moved == ["status"]
+
+    def test_flattened_ui_matches_model(self):
+        ui = UI.from_ui_model(window_model())
+        assert [w.name for w in ui.widgets] == ["root", "panel", "title", "load", "count", "status"]
+        assert [w.name for w in ui.children_of("panel")] == ["title", "load", "count"]
+        assert ui.get_widget("root").parent is None
+
+
+class TestYAMLSerializer:
+    """The serializer uses the LibYAML classes when PyYAML has them."""
+
+    def test_uses_c_loader_when_available(self):
+        if hasattr(yaml, 'CSafeLoader'):
+            assert yaml_serializer._SafeLoader is yaml.CSafeLoader
+            assert yaml_serializer._SafeDumper is yaml.CSafeDumper
+        else:
+            assert yaml_serializer._SafeLoader is yaml.SafeLoader
+
+    def test_round_trip_has_no_diff(self):
+        serializer = YAMLSerializer()
+        model = window_model()
+        loaded = serializer.deserialize(serializer.serialize(model))
+        assert diff_ui_models(model, loaded).is_empty
@@ -0,0 +1,112 @@
+"""
+Tests for the widget lookup indexes of UI definitions
+"""
+
+import os
+import sys
+
+# Add src to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from headless.ui_compatibility import UI, Widget
+from headless.ui_model import UIModel, Widget as ModelWidget, WidgetType
+from headless.testing.framework import UITestCase
+
+
+def generated_ui(width: int = 50, depth: int = 3) -> UI:
+    """Root with `width` panels, each holding a chain of `depth` nested widgets."""
+    widgets = [Widget(name="root", type=WidgetType.MAIN_WINDOW)]
+    for i in range(width):
+        parent = "root"
+        for level in range(depth):
+            name = f"w{i}_{level}"
+            widgets.append(Widget(name=name, type=WidgetType.WIDGET, parent=parent))
+            parent = name
+    return UI(widgets=widgets)
+
+
+class TestUIIndex:
+    """Name and parent lookups on the flat UI definition."""
+
+    def test_lookups_follow_edits(self):
+        ui = generated_ui(width=3, depth=2)
+        assert [w.name for w in ui.children_of("root")] == ["w0_0", "w1_0", "w2_0"]
+        assert ui.get_widget("w1_1").parent == "w1_0"
+        assert [w.name for w in ui.children_of(None)] == ["root"]
+
+        ui.add_widget(Widget(name="status", type=WidgetType.LABEL, parent="root"))
+        ui.set_parent("w2_1", "root")
+        assert [w.name for w in ui.children_of("root")] == ["w0_0", "w1_0", "w2_0", "w2_1", "status"]
+        assert ui.children_of("w2_0") == []
+
+        removed = ui.remove_widget("w0_0")
+        assert removed.name == "w0_0" and ui.get_widget("w0_0") is None
+        assert [w.name for w in ui.children_of("root")] == ["w1_0", "w2_0", "w2_1", "status"]
+
+    def test_direct_edits_are_detected(self):
+        ui = generated_ui(width=2, depth=1)
+        assert ui.get_widget("w0_0") is not None
+
+        # Growing the list and renaming are noticed without invalidate_index()
+        ui.widgets.append(Widget(name="late", type=WidgetType.LABEL, parent="w0_0"))
+        assert [w.name for w in ui.children_of("w0_0")] == ["late"]
+        ui.get_widget("late").name = "renamed"
+        assert ui.get_widget("late") is None
+        assert ui.get_widget("renamed").parent == "w0_0"
+
+    def test_large_definition_builds_mock_tree(self):
+        ui = generated_ui(width=400, depth=5)
+
+        class Case(UITestCase):
+            def runTest(self):
+                pass
+
+        case = Case()
+        case.setUp()
+        try:
+            root = case.create_ui_from_definition(ui)
+            assert len(root.children) == 400
+            assert root.find_child("w399_4").name == "w399_4"
+            assert len(case.created_widgets) == len(ui.widgets)
+        finally:
+            case.tearDown()
+
+
+class TestModelIndex:
+    """Recursive lookups in the widget tree model."""
+
+    def build_model(self) -> UIModel:
+        root = ModelWidget(name="root", type=WidgetType.MAIN_WINDOW)
+        panel = ModelWidget(name="panel", type=WidgetType.WIDGET)
+        root.add_child(panel)
+        panel.add_child(ModelWidget(name="button", type=WidgetType.PUSH_BUTTON))
+        root.add_child(ModelWidget(name="button", type=WidgetType.LABEL))
+        model = UIModel()
+        model.set_root(root)
+        return model
+
+    def test_find_widget_uses_depth_first_order(self):
+        model = self.build_model()
+        assert model.find_widget("button").type == WidgetType.PUSH_BUTTON
+        assert model.root_widget.find_child("button", recursive=False).type == WidgetType.LABEL
+        assert model.find_widget("root") is model.root_widget
+
+    def test_nested_edits_update_ancestor_lookups(self):
+        model = self.build_model()
+        panel = model.find_widget("panel")
+        assert model.find_widget("slider") is None
+
+        panel.add_child(ModelWidget(name="slider", type=WidgetType.SLIDER))
+        assert model.find_widget("slider").parent_name == "panel"
+
+        panel.remove_child("button")
+        assert model.find_widget("button").type == WidgetType.LABEL
+
+        model.find_widget("slider").name = "volume"
+        assert model.find_widget("slider") is None
+        assert model.find_widget("volume").type == WidgetType.SLIDER
+
+    def test_round_trip_keeps_links(self):
+        model = UIModel.from_dict(self.build_model().to_dict())
+        assert model.find_widget("button").parent_name == "panel"
+        assert model.validate() == ["Duplicate widget name: button"]